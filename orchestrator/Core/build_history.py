@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Build History Store (v2.5.0)
+DIREKTIVE: Goldstandard, persistent, indiziert.
+
+Zweck:
+BuildEngine._builds und LLMOrchestrator._workflows leben nur im aktuellen Prozess.
+Dieser Store hält jeden Build dauerhaft fest (Config, Stage-Zeiten, Artefakte,
+Ressourcen-Peaks, Ergebnis) und beantwortet Abfragen nach Target, Modell, Status
+und Zeitraum über SQLite-Indizes in Millisekunden – auch bei >100k Builds.
+
+SQLite läuft im WAL-Modus: CLI, GUI und Orchestrator können parallel lesen,
+während die BuildEngine schreibt. Schreibzugriffe sind kurze Upserts pro
+Statuswechsel (Admission und Abschluss).
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+from orchestrator.utils.logging import get_logger
+from orchestrator.utils.helpers import ensure_directory
+
+SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    build_id      TEXT PRIMARY KEY,
+    request_id    TEXT,
+    target        TEXT,
+    model         TEXT,
+    quantization  TEXT,
+    target_format TEXT,
+    status        TEXT,
+    worker        TEXT,
+    started_at    REAL,
+    ended_at      REAL,
+    duration_s    REAL,
+    model_size_bytes INTEGER,
+    queue_wait_s  REAL,
+    output_dir    TEXT,
+    config        TEXT,
+    stage_timings TEXT,
+    artifacts     TEXT,
+    resources     TEXT,
+    errors        TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_builds_started ON builds(started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_builds_target ON builds(target, started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_builds_model ON builds(model, started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_builds_status ON builds(status, started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_builds_request ON builds(request_id);
+"""
+
+# Schema-Migrationen: user_version -> Statements
+_MIGRATIONS = {
+    2: ["ALTER TABLE builds ADD COLUMN model_size_bytes INTEGER"],
+    3: ["ALTER TABLE builds ADD COLUMN queue_wait_s REAL"],
+}
+
+_JSON_COLUMNS = ("config", "stage_timings", "artifacts", "resources", "errors")
+
+
+def _ts(value: Any) -> Optional[float]:
+    if value is None: return None
+    if isinstance(value, datetime): return value.timestamp()
+    return float(value)
+
+
+@dataclass
+class BuildRecord:
+    build_id: str
+    request_id: Optional[str] = None
+    target: str = ""
+    model: str = ""
+    quantization: Optional[str] = None
+    target_format: Optional[str] = None
+    status: str = "queued"
+    worker: Optional[str] = None
+    started_at: Optional[float] = None
+    ended_at: Optional[float] = None
+    duration_s: Optional[float] = None
+    model_size_bytes: int = 0
+    queue_wait_s: float = 0.0
+    output_dir: str = ""
+    config: Dict[str, Any] = field(default_factory=dict)
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    artifacts: List[str] = field(default_factory=list)
+    resources: Dict[str, Any] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_build(cls, config, progress) -> "BuildRecord":
+        """Snapshot of a BuildConfiguration + BuildProgress pair."""
+        cfg = asdict(config)
+        started, ended = _ts(progress.start_time), _ts(progress.end_time)
+        return cls(
+            build_id=config.build_id,
+            request_id=getattr(config, "request_id", None),
+            target=config.target_arch,
+            model=config.model_source,
+            quantization=config.quantization,
+            target_format=getattr(config.target_format, "value", config.target_format),
+            status=progress.status.value,
+            worker=progress.worker,
+            started_at=started,
+            ended_at=ended,
+            duration_s=round(ended - started, 2) if started and ended else None,
+            model_size_bytes=int(getattr(progress, "model_size_bytes", 0) or 0),
+            queue_wait_s=float(getattr(progress, "queue_wait_s", 0.0) or 0.0),
+            output_dir=str(config.output_dir),
+            config=json.loads(json.dumps(cfg, default=lambda o: getattr(o, "value", str(o)))),
+            stage_timings=dict(getattr(progress, "stage_timings", {}) or {}),
+            artifacts=list(progress.artifacts),
+            resources=dict(progress.resource_summary),
+            errors=list(progress.errors),
+        )
+
+
+class BuildHistoryStore:
+    """SQLite backed, indexed build history. Thread-safe, multi-process safe (WAL)."""
+
+    def __init__(self, db_path: Path):
+        self.logger = get_logger("BuildHistory")
+        self.db_path = Path(db_path)
+        ensure_directory(self.db_path.parent)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10.0)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='builds'").fetchone()
+            if exists:
+                for v in range(version + 1, SCHEMA_VERSION + 1):
+                    for stmt in _MIGRATIONS.get(v, []):
+                        self._conn.execute(stmt)
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- WRITE ---
+
+    def record(self, record: BuildRecord):
+        """Insert or update (upsert) a build."""
+        row = asdict(record)
+        for col in _JSON_COLUMNS:
+            row[col] = json.dumps(row[col], default=str)
+        cols = list(row)
+        sql = (f"INSERT INTO builds ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) "
+               f"ON CONFLICT(build_id) DO UPDATE SET "
+               + ", ".join(f"{c}=excluded.{c}" for c in cols if c != "build_id"))
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(sql, [row[c] for c in cols])
+        except sqlite3.Error as e:
+            # History is best effort, never fail a build because of it
+            self.logger.warning(f"Failed to record build {record.build_id}: {e}")
+
+    def delete_before(self, timestamp: float) -> int:
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM builds WHERE started_at < ?", (timestamp,)).rowcount
+
+    # --- READ ---
+
+    @staticmethod
+    def _row_to_record(row: sqlite3.Row) -> BuildRecord:
+        data = dict(row)
+        for col in _JSON_COLUMNS:
+            data[col] = json.loads(data[col]) if data[col] else ({} if col in ("config", "stage_timings", "resources") else [])
+        return BuildRecord(**data)
+
+    @staticmethod
+    def _where(target: Optional[str] = None, model: Optional[str] = None,
+               status: Optional[Any] = None, since: Optional[Any] = None,
+               until: Optional[Any] = None, request_id: Optional[str] = None):
+        clauses, params = [], []
+        if target: clauses.append("target = ?"); params.append(target)
+        if model: clauses.append("model = ?"); params.append(model)
+        if request_id: clauses.append("request_id = ?"); params.append(request_id)
+        if status:
+            statuses = [status] if isinstance(status, str) else list(status)
+            clauses.append(f"status IN ({', '.join('?' * len(statuses))})"); params.extend(statuses)
+        if since is not None: clauses.append("started_at >= ?"); params.append(_ts(since))
+        if until is not None: clauses.append("started_at < ?"); params.append(_ts(until))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def get(self, build_id: str) -> Optional[BuildRecord]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM builds WHERE build_id = ?", (build_id,)).fetchone()
+        return self._row_to_record(row) if row else None
+
+    def query(self, limit: int = 50, offset: int = 0, **filters) -> List[BuildRecord]:
+        """Newest first. Filters: target, model, status (str or list), since, until, request_id."""
+        where, params = self._where(**filters)
+        sql = f"SELECT * FROM builds{where} ORDER BY started_at DESC LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self._conn.execute(sql, params + [int(limit), int(offset)]).fetchall()
+        return [self._row_to_record(r) for r in rows]
+
+    def count(self, **filters) -> int:
+        where, params = self._where(**filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM builds{where}", params).fetchone()[0]
+
+    def status_counts(self, **filters) -> Dict[str, int]:
+        where, params = self._where(**filters)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT status, COUNT(*) FROM builds{where} GROUP BY status", params).fetchall()
+        return {r[0]: r[1] for r in rows}
+
+    def list_artifacts(self, limit: int = 100, **filters) -> List[Dict[str, Any]]:
+        """Artifacts of completed builds, newest first."""
+        filters["status"] = "completed"
+        return [{"build_id": r.build_id, "target": r.target, "model": r.model,
+                 "quantization": r.quantization, "ended_at": r.ended_at, "path": path}
+                for r in self.query(limit=limit, **filters) for path in r.artifacts]
@@ -11,6 +11,18 @@ Updates v2.4.0-IMatrix:
 - Two-stage build process: 1. Generate IMatrix (if requested), 2. Build Model.
 - Integration with Dataset for importance matrix calculation.
 - Robust ConfigManager integration (retained from v2.3).
+
+Updates v2.5.0:
+- Multi-host placement via WorkerPoolManager, streaming resource stats, Docker events.
+- Model prefetch into cache/models runs concurrently with the image build.
+- Local model sources are bind-mounted read-only (zero copy) at /build-cache/source.
+- Cache quotas: everything a running build uses is pinned against GC.
+- Disk preflight: estimated F16/quant footprint is reserved per filesystem on admission.
+- Persistent, indexed build history (SQLite) incl. per-stage timings.
+- Stage cost model trained on that history: ETAs and time-based progress.
+- Injectable Docker client (FakeDockerClient for load tests, see load_harness.py).
+- Sharded GGUF builds for very large models: split F16, --keep-split quantization,
+  split artifacts with manifest (gguf_split.py).
 """
 
 import os
@@ -27,7 +39,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any, Union, Callable, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
 from enum import Enum
 import asyncio
 
@@ -38,6 +50,17 @@ from docker.models.images import Image
 from docker.types import DeviceRequest
 
 from orchestrator.utils.logging import get_logger
+from orchestrator.Core.worker_pool import WorkerPoolManager, WorkerUnavailableError
+from orchestrator.Core.stats_collector import ContainerStatsCollector, StatsSample, module_stage
+from orchestrator.Core.container_pool import WarmContainerPool
+from orchestrator.Core.model_stager import ModelStager, StagedModel, ModelIntegrityError
+from orchestrator.Core.cache_warmer import git_mirror_path, git_mirror_fetched_at, update_git_mirror
+from orchestrator.Core.cache_manager import CacheManager
+from orchestrator.Core.build_history import BuildHistoryStore, BuildRecord
+from orchestrator.Core.disk_planner import DiskSpaceEstimator, DiskReservationManager, InsufficientDiskSpaceError, DiskEstimate, GB
+from orchestrator.Core.gguf_split import SplitManifest, write_manifests, MANIFEST_SUFFIX
+from orchestrator.Core.cost_model import StageCostModel, BuildEstimate
+from orchestrator.Core.event_monitor import DockerEventMonitor, ContainerEvent, LABEL_BUILD_ID, LABEL_ROLE
 
 # Fallback Helper if utils module not fully ready during bootstrap
 def ensure_directory(path: Path):
@@ -60,9 +83,13 @@ class BuildStatus(Enum):
     PACKAGING = "packaging"
     COMPLETED = "completed"
     FAILED = "failed"
+    OOM_KILLED = "oom_killed" # Container killed by the kernel OOM killer (Docker event)
     CANCELLED = "cancelled"
     CLEANING = "cleaning"
 
+# Endzustände eines Builds (für Monitor-Loops und Completion-Listener)
+TERMINAL_STATUSES = (BuildStatus.COMPLETED, BuildStatus.FAILED, BuildStatus.OOM_KILLED, BuildStatus.CANCELLED)
+
 class ModelFormat(Enum):
     HUGGINGFACE = "hf"
     GGUF = "gguf"
@@ -122,6 +149,9 @@ class BuildConfiguration:
     use_gpu: bool = False
     use_imatrix: bool = False # New flag for IMatrix generation
     dataset_path: Optional[str] = None
+    request_id: Optional[str] = None # Orchestrator request (history grouping)
+    shard_mode: Optional[str] = None  # 'auto' | 'on' | 'off' (split GGUF), None = config 'shard_mode'
+    shard_max_gb: Optional[float] = None
 
 @dataclass
 class BuildProgress:
@@ -136,10 +166,60 @@ class BuildProgress:
     errors: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
     artifacts: List[str] = field(default_factory=list)
+    worker: Optional[str] = None
+    resource_summary: Dict[str, Any] = field(default_factory=dict)
+    stage_timings: Dict[str, float] = field(default_factory=dict)  # stage -> seconds
+    model_size_bytes: int = 0
+    eta_seconds: Optional[float] = None
+    queue_wait_s: float = 0.0  # Submission -> worker slot (wait_for_worker)
+    module_stage: str = ""  # Phase inside the build container (from module log markers)
+    _stage_mark: Optional[float] = field(default=None, repr=False, compare=False)
+    _log_listeners: List[Callable[[str], None]] = field(default_factory=list, repr=False, compare=False)
+    _log_lock: Any = field(default_factory=threading.RLock, repr=False, compare=False)
+    
+    def enter_stage(self, stage: str):
+        """Switches current_stage and books the elapsed time to the previous stage."""
+        self.close_stage()
+        self.current_stage = stage
+        self.module_stage = ""
+        self._stage_mark = time.monotonic()
     
+    def close_stage(self):
+        if self._stage_mark is not None:
+            elapsed = time.monotonic() - self._stage_mark
+            self.stage_timings[self.current_stage] = round(self.stage_timings.get(self.current_stage, 0.0) + elapsed, 3)
+            self._stage_mark = None
+    
+    def track_module_output(self, line: str):
+        """Follows phase markers in container output (convert, quantize, package, ...)."""
+        stage = module_stage(line)
+        if stage:
+            self.module_stage = stage
+
+    @property
+    def stats_stage(self) -> str:
+        """Stage label for resource samples: '<engine stage> / <module phase>'."""
+        return f"{self.current_stage} / {self.module_stage}" if self.module_stage else self.current_stage
+
     def add_log(self, message: str, level: str = "INFO"):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.logs.append(f"[{timestamp}] [{level}] {message}")
+        line = f"[{timestamp}] [{level}] {message}"
+        with self._log_lock:
+            self.logs.append(line)
+            for cb in self._log_listeners:
+                try: cb(line)
+                except Exception: pass  # A broken listener must not break the build
+
+    def subscribe_logs(self, callback: Callable[[str], None]):
+        """Replays the log lines so far to 'callback', then streams each new line in order."""
+        with self._log_lock:
+            for line in self.logs:
+                callback(line)
+            self._log_listeners.append(callback)
+
+    def unsubscribe_logs(self):
+        with self._log_lock:
+            self._log_listeners.clear()
     
     def add_error(self, error: str):
         self.errors.append(error)
@@ -165,7 +245,8 @@ class BuildEngine:
     6. Artifact Extraction
     """
     
-    def __init__(self, config_or_framework, max_concurrent_builds: int = 2, default_timeout: int = 3600):
+    def __init__(self, config_or_framework, max_concurrent_builds: int = 2, default_timeout: int = 3600,
+                 docker_client=None):
         self.logger = get_logger("BuildEngine")
         self.max_concurrent_builds = max_concurrent_builds
         self.default_timeout = default_timeout
@@ -187,6 +268,10 @@ class BuildEngine:
             self.config = config_or_framework
             self.base_dir = Path(".").resolve()
             self.docker_client = None
+        
+        # Injected client (e.g. FakeDockerClient in load tests) takes precedence
+        if docker_client is not None:
+            self.docker_client = docker_client
 
         # Docker Client Fallback
         if not self.docker_client:
@@ -198,19 +283,60 @@ class BuildEngine:
         self._lock = threading.Lock()
         self._builds: Dict[str, BuildProgress] = {}
         self._active_containers: Dict[str, Container] = {}
-        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_builds)
+        self._stats_collectors: Dict[str, ContainerStatsCollector] = {}
+        
+        # Docker Events (v2.5): one monitor per worker, exit codes routed per (build_id, role)
+        self._event_monitors: Dict[str, DockerEventMonitor] = {}
+        self._container_exits: Dict[Tuple[str, str], threading.Event] = {}
+        self._exit_codes: Dict[Tuple[str, str], int] = {}
+        self._oom_events: set = set()  # (build_id, role) that saw an 'oom' event (decided at exit)
+        self._completion_listeners: Dict[str, List[Callable[[BuildProgress], None]]] = {}
+        
+        # Warm Container Pools (v2.5): short exec jobs (trivy, perplexity, bench) per worker
+        self._container_pools: Dict[str, WarmContainerPool] = {}
+        
+        # Worker Pool (v2.5): Single local worker unless 'build_workers' are configured
+        self.worker_pool = WorkerPoolManager(self.config, default_client=self.docker_client,
+                                             default_capacity=max_concurrent_builds)
+        self._executor = ThreadPoolExecutor(max_workers=self.worker_pool.total_capacity)
         
         # Paths initialization using centralized config getter
         self.targets_dir = self.base_dir / self._get_conf("targets_dir", "targets")
         self.models_dir = self.base_dir / self._get_conf("models_dir", "models")
         self.output_dir = self.base_dir / self._get_conf("output_dir", "output")
         self.cache_dir = self.base_dir / self._get_conf("cache_dir", "cache")
+        self.logs_dir = self.base_dir / self._get_conf("logs_dir", "logs")
         
         self._ensure_directories()
+        
+        # Model Prefetch (v2.5): staging runs on a separate IO pool, overlapped with the image build
+        self.model_stager = ModelStager(self.cache_dir, token_fn=self._hf_token,
+                                        mount_roots=[self.models_dir, self.cache_dir / "models"])
+        self._io_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="model-prefetch")
+        self._staged_models: Dict[str, StagedModel] = {}
+        
+        # Cache Quotas (v2.5): access tracking + pinning of everything a running build uses
+        self.cache_manager = CacheManager(self.cache_dir, self.config, self.docker_client)
+        
+        # Build History (v2.5): survives the process, shared by CLI/GUI/Orchestrator
+        history_db = self._get_conf("build_history_db") or (self.logs_dir / "build_history.db")
+        self.history = BuildHistoryStore(self.base_dir / history_db)
+        self._build_configs: Dict[str, BuildConfiguration] = {}
+        
+        # Cost Model (v2.5): stage durations learned from the history -> ETA, SJF scheduling
+        self.cost_model = StageCostModel(self.history)
+        self._build_estimates: Dict[str, BuildEstimate] = {}
+        self._model_estimates: Dict[Tuple[str, str, str], DiskEstimate] = {}
+        
+        # Disk Preflight (v2.5): concurrent builds never promise the same free space twice
+        self.disk_estimator = DiskSpaceEstimator(token_fn=self._hf_token)
+        self.disk_reservations = DiskReservationManager(float(self._get_conf("disk_min_free_gb", 2.0)))
+        
         if self.docker_client:
             self._validate_docker_environment()
         
-        self.logger.info(f"Build Engine initialized (max_workers: {max_concurrent_builds})")
+        self.logger.info(f"Build Engine initialized (workers: {len(self.worker_pool.list_workers())}, "
+                         f"capacity: {self.worker_pool.total_capacity})")
 
     def _get_conf(self, key: str, default: Any = None) -> Any:
         """Centralized safe configuration retrieval."""
@@ -220,6 +346,16 @@ class BuildEngine:
             return getattr(self.config, key, default)
         return default
     
+    def _hf_token(self) -> Optional[str]:
+        framework = getattr(self, 'framework', None)
+        secrets = getattr(framework, 'secrets_manager', None) if framework else None
+        if secrets:
+            try:
+                token = secrets.get_secret("hf_token")
+                if token: return token
+            except Exception: pass
+        return os.environ.get("HF_TOKEN")
+
     def _ensure_directories(self):
         dirs = [self.targets_dir, self.models_dir, self.output_dir, self.cache_dir, 
                 self.cache_dir / "docker", self.cache_dir / "models", self.cache_dir / "tools"]
@@ -258,34 +394,350 @@ class BuildEngine:
                 except Exception: pass
         return targets
 
-    def build_model(self, config: BuildConfiguration) -> str:
-        """Submits a new build job."""
+    def _resolve_target_arch(self, target_name: str) -> Optional[str]:
+        """Reads the architecture family (e.g. aarch64) from the target definition."""
+        target_yml = self.targets_dir / target_name / "target.yml"
+        if not target_yml.exists(): return None
+        try:
+            with open(target_yml, "r") as f:
+                meta = (yaml.safe_load(f) or {}).get("metadata", {})
+            return meta.get("architecture_family")
+        except Exception:
+            return None
+
+    def build_model(self, config: BuildConfiguration, wait_for_worker: bool = False) -> str:
+        """
+        Submits a new build job.
+        Args:
+            wait_for_worker: Block until a matching worker has a free slot
+                             (Orchestrator). Default raises immediately (GUI).
+        """
         self._validate_build_config(config)
+        submitted = time.monotonic()
         
-        # Check concurrency
-        active = len([b for b in self._builds.values() if b.status not in 
-                      [BuildStatus.COMPLETED, BuildStatus.FAILED, BuildStatus.CANCELLED]])
-        if active >= self.max_concurrent_builds:
-            raise RuntimeError("Max concurrent builds reached")
-            
-        progress = BuildProgress(config.build_id, BuildStatus.QUEUED, "Initializing", start_time=datetime.now())
+        # Placement on a worker (replaces the global concurrency check)
+        arch = self._resolve_target_arch(config.target_arch)
+        try:
+            worker = self.worker_pool.acquire(
+                config.build_id, arch=arch,
+                required_labels=["gpu"] if config.use_gpu and self.worker_pool.has_label("gpu") else [],
+                timeout=None if wait_for_worker else 0
+            )
+        except WorkerUnavailableError as e:
+            raise RuntimeError(f"Max concurrent builds reached: {e}")
+        queue_wait = time.monotonic() - submitted
         
-        with self._lock: 
-            self._builds[config.build_id] = progress
-            
-        self._executor.submit(self._execute_build, config)
-        self.logger.info(f"Build started: {config.build_id}")
+        try:
+            # Disk preflight, size estimate (HF metadata) and ETA run on the build thread
+            progress = BuildProgress(config.build_id, BuildStatus.QUEUED, "Preflight",
+                                     start_time=datetime.now(), worker=worker.name)
+            progress.queue_wait_s = round(queue_wait, 3)
+            with self._lock:
+                self._builds[config.build_id] = progress
+                self._build_configs[config.build_id] = config
+
+            self._subscribe_container_events(config.build_id, worker)
+            self._executor.submit(self._execute_build, config)
+        except Exception:
+            # Nothing runs yet: hand back slot and event routing
+            self._abort_submission(config.build_id)
+            raise
+        self.logger.info(f"Build started: {config.build_id} (worker: {worker.name})")
         return config.build_id
 
+    def _abort_submission(self, build_id: str):
+        """Undoes everything build_model acquired for a build that never started."""
+        self.worker_pool.release(build_id)
+        for monitor in self._event_monitors.values():
+            monitor.unsubscribe(build_id)
+        with self._lock:
+            self._builds.pop(build_id, None)
+            self._build_configs.pop(build_id, None)
+
+    # --- DISK PREFLIGHT ---
+
+    def _preflight_build(self, config: BuildConfiguration, progress: BuildProgress):
+        """Pins the build, reserves disk space and predicts its duration (build thread)."""
+        self.cache_manager.pin("builds", config.build_id, config.build_id)
+        worker = self.worker_pool.worker_for(config.build_id)
+        if worker:
+            self._reserve_disk(config, worker)
+        progress.model_size_bytes = self.estimate_model(config).source_bytes
+        estimate = self.predict_build(config, host=progress.worker)
+        progress.eta_seconds = estimate.total
+        with self._lock:
+            self._build_estimates[config.build_id] = estimate
+        self._record_history(config.build_id)
+
+    def _scratch_dir(self) -> Optional[Path]:
+        scratch = self._get_conf("build_scratch_dir")
+        return Path(scratch) if scratch else None
+
+    def _container_tmp_dir(self, client) -> Path:
+        """Host path backing the container's /tmp (Docker root), if visible from here."""
+        try:
+            root = Path(client.info().get("DockerRootDir", ""))
+            if root.is_absolute() and root.exists(): return root
+        except Exception: pass
+        return self.cache_dir / "builds"
+
+    def estimate_model(self, config: BuildConfiguration) -> DiskEstimate:
+        """Model size / F16 / quant footprint (cached per source, branch and quantization)."""
+        key = (config.model_source, config.model_branch or "main", config.quantization or "")
+        cached = self._model_estimates.get(key)
+        if cached is not None: return cached
+        staged = None
+        if self.model_stager.is_hf_repo(config.model_source):
+            staged = self.model_stager.hf_dest(config.model_source, config.model_branch or "main")
+        try:
+            est = self.disk_estimator.estimate(config.model_source, config.quantization,
+                                               staged_path=staged if staged and staged.exists() else None,
+                                               safety_margin=float(self._get_conf("disk_safety_margin", 1.1)))
+        except Exception as e:
+            self.logger.debug(f"Model size estimate failed: {e}")
+            est = DiskEstimate()
+        self._model_estimates[key] = est
+        return est
+
+    def _disk_requirements(self, config: BuildConfiguration, client) -> Dict[Path, int]:
+        """Bytes needed per location: download, F16 scratch, quant output and its copy."""
+        est = self.estimate_model(config)
+        if not est.known:
+            self.logger.warning(f"Disk preflight: size of '{config.model_source}' unknown, no reservation")
+            return {}
+
+        builds = self.cache_dir / "builds" / config.build_id
+        scratch = self._scratch_dir()
+        needs: Dict[Path, int] = {}
+
+        def add(path: Path, size: int):
+            needs[path] = needs.get(path, 0) + size
+
+        add(self.cache_dir / "models", est.download_bytes)
+        # F16 intermediate: scratch volume if configured, else container /tmp (imatrix) and build output
+        if scratch:
+            add(scratch, est.f16_bytes)
+        else:
+            if config.use_imatrix: add(self._container_tmp_dir(client), est.f16_bytes)
+            add(builds, est.f16_bytes)
+        add(builds, est.quant_bytes)
+        add(Path(config.output_dir), est.quant_bytes)
+        return needs
+
+    def _reserve_disk(self, config: BuildConfiguration, worker):
+        if not self._get_conf("disk_preflight", True): return
+        if worker.base_url or worker.context:
+            # Remote daemon: its filesystems are not visible from this host
+            return
+        needs = self._disk_requirements(config, worker.client or self.docker_client)
+        try:
+            self.disk_reservations.reserve(config.build_id, needs)
+        except InsufficientDiskSpaceError:
+            # One GC pass over the quota'd caches, then retry once
+            report = self.cache_manager.collect()
+            if not report.get("evicted"): raise
+            self.disk_reservations.reserve(config.build_id, needs)
+
+    # --- DOCKER EVENTS & COMPLETION ---
+
+    def _subscribe_container_events(self, build_id: str, worker):
+        """Starts (once) the event monitor of the worker and routes events of this build."""
+        if worker.client is None or not hasattr(worker.client, "events"): return
+        monitor = self._event_monitors.get(worker.name)
+        if not monitor:
+            monitor = DockerEventMonitor(worker.client, worker.name)
+            self._event_monitors[worker.name] = monitor
+        monitor.subscribe(build_id, self._on_container_event)
+        monitor.start()
+
+    def _on_container_event(self, event: ContainerEvent):
+        progress = self._builds.get(event.build_id)
+        if not progress: return
+        key = (event.build_id, event.role)
+        
+        if event.action == "oom":
+            # Docker meldet 'oom' auch, wenn nur ein Kindprozess gekillt wurde und der
+            # Container weiterläuft/mit 0 endet -> nur vormerken, Entscheidung beim Exit
+            self._oom_events.add(key)
+            progress.add_log(f"Container '{event.role}' hit the memory limit (OOM event)", "WARNING")
+        elif event.action == "kill":
+            progress.add_log(f"Container '{event.role}' received kill signal {event.signal or ''}".strip(), "WARNING")
+        elif event.action == "die":
+            self._exit_codes[key] = event.exit_code if event.exit_code is not None else 1
+            exit_event = self._container_exits.get(key)
+            if exit_event: exit_event.set()
+        elif event.action == "start":
+            progress.add_log(f"Container '{event.role}' started ({event.container_id[:12]})")
+
+    def _resolve_oom(self, progress: BuildProgress, role: str, container: Container, exit_code: int) -> bool:
+        """
+        OOM-Kill des Containers: 'oom' Event plus Exit-Code != 0, oder State.OOMKilled.
+        Ein 'oom' Event mit Exit 0 (nur ein Kindprozess gekillt) bleibt eine Warnung.
+        """
+        seen = (progress.build_id, role) in self._oom_events
+        self._oom_events.discard((progress.build_id, role))
+        killed = False
+        try:
+            container.reload()
+            killed = bool(((container.attrs or {}).get("State") or {}).get("OOMKilled"))
+        except Exception:
+            pass
+        if not killed and seen and exit_code != 0:
+            killed = True
+        if killed:
+            progress.status = BuildStatus.OOM_KILLED
+            progress.add_error(f"Container '{role}' was killed by the OOM killer (exit code {exit_code}). "
+                               f"Increase memory or use a smaller model/quantization.")
+            self.logger.error(f"Build {progress.build_id}: container {role} OOM-killed")
+        elif seen:
+            progress.add_warning(f"A process in container '{role}' was OOM-killed, but the container exited "
+                                 f"with code {exit_code}.")
+        return killed
+
+    def _container_labels(self, build_id: str, role: str) -> Dict[str, str]:
+        self._container_exits[(build_id, role)] = threading.Event()
+        self._oom_events.discard((build_id, role))
+        return {LABEL_BUILD_ID: build_id, LABEL_ROLE: role}
+
+    def _wait_container_exit(self, build_id: str, role: str, container: Container, timeout: int) -> int:
+        """
+        Exit code via 'die' event. Falls back to container.wait() when no
+        event monitor is running (e.g. daemon without event API).
+        """
+        key = (build_id, role)
+        exit_event = self._container_exits.get(key)
+        worker = self.worker_pool.worker_for(build_id)
+        monitor = self._event_monitors.get(worker.name) if worker else None
+        try:
+            if exit_event and monitor and monitor.running:
+                # Short grace period: events are usually delivered before the log stream closes
+                if exit_event.wait(timeout=min(timeout, 30)) and key in self._exit_codes:
+                    return self._exit_codes[key]
+            res = container.wait(timeout=timeout)
+            return res.get('StatusCode', 1)
+        finally:
+            self._container_exits.pop(key, None)
+            self._exit_codes.pop(key, None)
+
+    def add_completion_listener(self, build_id: str, callback: Callable[[BuildProgress], None]):
+        """Registers a callback fired once the build reaches a terminal status."""
+        # Check and append atomically: _notify_completion pops the listeners under the same lock
+        with self._lock:
+            progress = self._builds.get(build_id)
+            finished = progress is not None and progress.status in TERMINAL_STATUSES
+            if not finished:
+                self._completion_listeners.setdefault(build_id, []).append(callback)
+        if finished:
+            callback(progress)
+
+    def add_log_listener(self, build_id: str, callback: Callable[[str], None]) -> bool:
+        """Streams the build's log lines (backlog first) to 'callback' until it finishes."""
+        progress = self._builds.get(build_id)
+        if progress is None:
+            return False
+        progress.subscribe_logs(callback)
+        return True
+
+    def _notify_completion(self, progress: BuildProgress):
+        progress.unsubscribe_logs()
+        with self._lock:
+            callbacks = self._completion_listeners.pop(progress.build_id, [])
+        for worker_monitor in self._event_monitors.values():
+            worker_monitor.unsubscribe(progress.build_id)
+        for cb in callbacks:
+            try: cb(progress)
+            except Exception as e:
+                self.logger.warning(f"Completion listener failed for {progress.build_id}: {e}")
+
+    def get_container_pool(self, worker_name: Optional[str] = None) -> Optional[WarmContainerPool]:
+        """Warm container pool of a worker (default: the local/first worker)."""
+        worker = self.worker_pool.get_worker(worker_name) if worker_name else None
+        if worker is None:
+            workers = self.worker_pool.list_workers()
+            worker = next((w for w in workers if w.client is self.docker_client), workers[0] if workers else None)
+        client = worker.client if worker else self.docker_client
+        if client is None: return None
+        
+        name = worker.name if worker else "local"
+        with self._lock:
+            pool = self._container_pools.get(name)
+            if pool is None:
+                pool = WarmContainerPool(client, self.config, name=name)
+                pool.cleanup_orphans()
+                self._container_pools[name] = pool
+        return pool
+
+    def shutdown(self):
+        """Stops background monitors and removes warm pool containers."""
+        for monitor in self._event_monitors.values():
+            monitor.stop()
+        for pool in self._container_pools.values():
+            pool.shutdown()
+        self._executor.shutdown(wait=False)
+        self._io_executor.shutdown(wait=False)
+        self.history.close()
+
+    def _client_for(self, build_id: str):
+        """Returns the Docker client of the worker assigned to the build."""
+        worker = self.worker_pool.worker_for(build_id)
+        if worker and worker.client is not None:
+            return worker.client
+        return self.docker_client
+
+    def _worker_path(self, build_id: str, path: Union[str, Path]) -> str:
+        """Maps a local path to the bind-mount path on the assigned worker host."""
+        worker = self.worker_pool.worker_for(build_id)
+        return worker.map_path(str(path)) if worker else str(path)
+
+    def _map_volumes(self, build_id: str, vols: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+        return {self._worker_path(build_id, k) if os.path.isabs(k) else k: v for k, v in vols.items()}
+
     def get_build_status(self, build_id: str) -> Optional[BuildProgress]:
-        return self._builds.get(build_id)
+        progress = self._builds.get(build_id)
+        if progress and progress.status not in TERMINAL_STATUSES:
+            self._update_eta(progress)
+        return progress
+
+    # --- COST MODEL / ETA ---
+
+    def predict_build(self, config: BuildConfiguration, host: Optional[str] = None) -> BuildEstimate:
+        """Predicted per-stage durations of a (not yet started) build."""
+        return self.cost_model.predict(config.target_arch, config.quantization, host,
+                                       self.estimate_model(config).source_bytes, config.use_imatrix)
+
+    def _update_eta(self, progress: BuildProgress):
+        estimate = self._build_estimates.get(progress.build_id)
+        if not estimate: return
+        elapsed = time.monotonic() - progress._stage_mark if progress._stage_mark is not None else 0.0
+        remaining = self.cost_model.remaining(estimate, progress.current_stage, elapsed, progress.stage_timings)
+        progress.eta_seconds = round(remaining, 1)
+        if estimate.samples and progress.start_time:
+            # Learned durations available: time-based progress instead of fixed stage percentages
+            spent = (datetime.now() - progress.start_time).total_seconds()
+            progress.progress_percent = max(progress.progress_percent, min(99, int(100 * spent / max(spent + remaining, 1e-6))))
+
+    def remaining_seconds(self) -> List[float]:
+        """Predicted remaining time of every running build (for queue-wide ETAs)."""
+        with self._lock:
+            running = [p for p in self._builds.values() if p.status not in TERMINAL_STATUSES]
+        for p in running: self._update_eta(p)
+        return [p.eta_seconds or 0.0 for p in running]
+
+    def get_resource_stats(self, build_id: str) -> Optional[StatsSample]:
+        """Latest sample of the streaming stats collector (non-blocking)."""
+        collector = self._stats_collectors.get(build_id)
+        return collector.latest() if collector else None
+
+    def get_build_log_dir(self, build_id: str) -> Path:
+        """Persistent per-build log directory (survives cleanup_build)."""
+        return self.logs_dir / "builds" / build_id
     
     def list_builds(self) -> List[BuildProgress]:
         with self._lock: return list(self._builds.values())
     
     def cancel_build(self, build_id: str) -> bool:
         progress = self._builds.get(build_id)
-        if not progress or progress.status in [BuildStatus.COMPLETED, BuildStatus.FAILED, BuildStatus.CANCELLED]:
+        if not progress or progress.status in TERMINAL_STATUSES:
             return False
             
         progress.status = BuildStatus.CANCELLED
@@ -317,6 +769,10 @@ class BuildEngine:
                         del self._active_containers[build_id]
                 except Exception: pass
             
+            with self._lock:
+                self._stats_collectors.pop(build_id, None)
+                self._staged_models.pop(build_id, None)
+            
             # Remove temp dirs
             build_temp = self.cache_dir / "builds" / build_id
             if build_temp.exists(): 
@@ -331,8 +787,14 @@ class BuildEngine:
         prog = self._builds[bid]
         
         try:
+            # 0. Admission: disk reservation (incl. GC fallback), size estimate, ETA
+            self._preflight_build(config, prog)
             prog.status = BuildStatus.PREPARING
             
+            # 0a. Keep caches within quota before this build adds to them (throttled)
+            try: self.cache_manager.maybe_collect()
+            except Exception as e: self.logger.warning(f"Cache GC skipped: {e}")
+            
             # 1. Resolve Target Path
             target_path = self.targets_dir / config.target_arch
             if not target_path.exists():
@@ -349,15 +811,22 @@ class BuildEngine:
             # 2. Prepare Environment
             self._prepare_build_environment(config, prog, target_path)
             
+            # 2a. Model Prefetch (network/disk IO overlaps with the CPU-bound image build)
+            prefetch = self._start_model_prefetch(config, prog)
+            
             # 3. Generate Dockerfile
             df_path = self._generate_dockerfile(config, prog, target_path)
             
             # 4. Build Docker Image
             image = self._build_docker_image(config, prog, df_path)
+            self.cache_manager.pin("images", image.tags[0], bid)
             
             # 5. Security Scan
             self._scan_image_security(image.tags[0], prog)
             
+            # 5b. Staged model must be ready before any container reads it
+            self._await_model_prefetch(config, prog, prefetch)
+            
             # 5a. Generate IMatrix (NEW: Smart Calibration)
             # Only if use_imatrix is True AND a dataset is provided
             if config.use_imatrix:
@@ -384,20 +853,90 @@ class BuildEngine:
             prog.progress_percent = 100
             
         except Exception as e:
-            prog.status = BuildStatus.FAILED
-            prog.end_time = datetime.now()
+            # OOM (Docker event) and user cancellation keep their specific status
+            final_status = prog.status if prog.status in (BuildStatus.OOM_KILLED, BuildStatus.CANCELLED) else BuildStatus.FAILED
             prog.add_error(str(e))
             self.logger.error(f"Build {bid} failed: {e}", exc_info=True)
-            # Try cleanup even on failure
+            # Try cleanup even on failure (sets CLEANING, so the final status is applied afterwards)
             try: self.cleanup_build(bid)
             except Exception: pass
+            prog.status = final_status
+            prog.end_time = datetime.now()
+        finally:
+            # Every step is guarded on its own: listeners (workflow jobs) must fire regardless
+            try:
+                for step, action in (("worker release", lambda: self.worker_pool.release(bid)),
+                                     ("disk release", lambda: self.disk_reservations.release(bid)),
+                                     ("scratch cleanup", lambda: self._remove_scratch(bid)),
+                                     ("cache unpin", lambda: self.cache_manager.unpin(bid)),
+                                     ("stage close", prog.close_stage),
+                                     ("build log", lambda: self._persist_build_log(prog)),
+                                     ("history", lambda: self._record_history(bid)),
+                                     ("cost model", self.cost_model.invalidate)):
+                    try: action()
+                    except Exception as e:
+                        self.logger.warning(f"Build {bid}: {step} failed during finalization: {e}")
+            finally:
+                prog.eta_seconds = 0.0
+                self._notify_completion(prog)
+
+    def _remove_scratch(self, build_id: str):
+        scratch = self._scratch_dir()
+        if scratch and (scratch / build_id).exists():
+            shutil.rmtree(scratch / build_id, ignore_errors=True)
+
+    def _record_history(self, build_id: str):
+        config, progress = self._build_configs.get(build_id), self._builds.get(build_id)
+        if config and progress:
+            try:
+                self.history.record(BuildRecord.from_build(config, progress))
+            except Exception as e:
+                self.logger.warning(f"Build history write for {build_id} failed: {e}")
+
+    def query_history(self, limit: int = 50, offset: int = 0, **filters) -> List[BuildRecord]:
+        """Persistent builds of all processes (newest first), see BuildHistoryStore.query."""
+        return self.history.query(limit=limit, offset=offset, **filters)
+
+    def _persist_build_log(self, progress: BuildProgress):
+        try:
+            log_dir = self.get_build_log_dir(progress.build_id)
+            ensure_directory(log_dir)
+            with open(log_dir / "build.log", "w", encoding="utf-8") as f:
+                f.write("\n".join(progress.logs))
+        except Exception as e:
+            self.logger.warning(f"Failed to persist build log for {progress.build_id}: {e}")
+
+    def _start_stats(self, container: Container, progress: BuildProgress) -> ContainerStatsCollector:
+        collector = ContainerStatsCollector(
+            container, progress.build_id,
+            interval=float(self._get_conf("stats_interval", 2.0)),
+            stage_fn=lambda: progress.stats_stage
+        )
+        collector.start()
+        with self._lock:
+            self._stats_collectors[progress.build_id] = collector
+        return collector
+
+    def _finish_stats(self, key: str, collector: ContainerStatsCollector, progress: BuildProgress):
+        """Stops the sampler and stores series + summary next to the build log."""
+        collector.stop()
+        summary = collector.summary()
+        if key == "build":
+            progress.resource_summary.update(summary)
+        else:
+            progress.resource_summary[key] = summary
+        suffix = "" if key == "build" else f"_{key}"
+        collector.save(self.get_build_log_dir(progress.build_id) / f"resource_stats{suffix}.json")
+        if summary.get("samples"):
+            progress.add_log(f"Resources ({key}): CPU avg {summary['cpu_percent']['avg']}% / peak {summary['cpu_percent']['peak']}%, "
+                             f"RAM peak {summary['mem_mb']['peak']:.0f} MB")
 
     def _validate_build_config(self, config: BuildConfiguration):
         if not config.build_id or not config.model_source or not config.output_dir:
             raise ValidationError("Missing required build config (ID, Source, or Output)")
 
     def _prepare_build_environment(self, config: BuildConfiguration, progress: BuildProgress, target_path: Path):
-        progress.current_stage = "Preparing env"
+        progress.enter_stage("Preparing env")
         progress.progress_percent = 10
         progress.add_log(f"Preparing build environment for {config.target_arch}")
         
@@ -409,8 +948,156 @@ class BuildEngine:
         with open(build_temp / "build_config.json", 'w') as f:
             json.dump(asdict(config), f, indent=2, default=str)
 
+    def _local_model_mode(self, config: BuildConfiguration) -> str:
+        """'mount' (zero-copy read-only bind) unless the worker cannot see the host path."""
+        mode = self._get_conf("local_model_mode", "mount")
+        worker = self.worker_pool.worker_for(config.build_id)
+        if mode == "mount" and worker and (worker.base_url or worker.context):
+            src = str(Path(config.model_source).resolve())
+            if worker.map_path(src) == src:
+                # Remote daemon without shared path: copy into the (path-mapped) cache instead
+                return "copy"
+        return mode
+
+    def _start_model_prefetch(self, config: BuildConfiguration, progress: BuildProgress) -> Optional[Future]:
+        mode = self._local_model_mode(config)
+        # Local mounts only stat the source: they are set up even with prefetch disabled
+        local_mount = mode == "mount" and bool(config.model_source) and os.path.exists(config.model_source)
+        if not local_mount and not self._get_conf("model_prefetch", True): return None
+        return self._io_executor.submit(
+            self.model_stager.stage, config.model_source, config.model_branch,
+            lambda msg: progress.add_log(f"PREFETCH: {msg}"), mode,
+            lambda dest: self._pin_cache_path(dest, config.build_id)
+        )
+
+    def _pin_cache_path(self, path: Path, owner: str):
+        """Pins the cache entry containing 'path' before it is written (GC must not evict it)."""
+        entry = self.cache_manager.entry_for_path(path)
+        if entry: self.cache_manager.pin(*entry, owner)
+
+    def _await_model_prefetch(self, config: BuildConfiguration, progress: BuildProgress, prefetch: Optional[Future]):
+        if prefetch is None: return
+        if not prefetch.done():
+            progress.enter_stage("Waiting for model download")
+            progress.add_log("Image ready, waiting for model prefetch to finish...")
+        try:
+            staged = prefetch.result()
+        except ModelIntegrityError:
+            raise
+        except Exception as e:
+            # Offline / huggingface_hub missing: the container resolves the source itself (legacy path)
+            progress.add_warning(f"Model prefetch failed ({e}). Falling back to in-container download.")
+            return
+        if staged:
+            self._staged_models[config.build_id] = staged
+            entry = self.cache_manager.entry_for_path(Path(staged.host_path))
+            if entry:
+                self.cache_manager.touch(*entry)
+                self.cache_manager.pin(*entry, config.build_id)
+            how = "mounted read-only" if staged.kind == "mount" else "staged"
+            progress.add_log(f"Model {how} at {staged.container_path} ({staged.size_bytes / (1024 ** 3):.2f} GB)")
+
+    def _model_source_env(self, config: BuildConfiguration) -> str:
+        """MODEL_SOURCE as seen inside the container (staged path if prefetched)."""
+        staged = self._staged_models.get(config.build_id)
+        return staged.container_path if staged else config.model_source
+
+    def _inject_repo_overrides(self, env: Dict[str, str], vols: Dict[str, Dict[str, str]], progress: BuildProgress):
+        """SSOT repo URLs as *_REPO_OVERRIDE; warmed git mirrors (cache/git) take precedence."""
+        source_repos = self._get_conf("source_repositories", {})
+        if not source_repos: return
+        for k, v in source_repos.items():
+            if not (isinstance(v, dict) and 'url' in v): continue
+            name = k.split('.')[-1]
+            mirror = self._fresh_git_mirror(name, v['url'], progress)
+            if mirror:
+                vols[str(mirror.parent)] = {"bind": "/build-cache/git", "mode": "ro"}
+                env[f"{name.upper()}_REPO_OVERRIDE"] = f"/build-cache/git/{mirror.name}"
+            else:
+                env[f"{name.upper()}_REPO_OVERRIDE"] = v['url']
+
+    def _fresh_git_mirror(self, name: str, url: str, progress: BuildProgress) -> Optional[Path]:
+        """
+        Warmed mirror for 'name' if present. Mirrors older than 'git_mirror_max_age_hours'
+        (0 = never) are refreshed first; if that fails the build uses upstream.
+        """
+        mirror = git_mirror_path(self.cache_dir, name)
+        if not mirror.exists(): return None
+        max_age = float(self._get_conf("git_mirror_max_age_hours", 24.0)) * 3600
+        age = max(0.0, time.time() - (git_mirror_fetched_at(mirror) or 0.0))
+        if max_age > 0 and age > max_age:
+            progress.add_log(f"Git mirror '{name}' is {age / 3600:.1f}h old, refreshing from {url}...")
+            try:
+                update_git_mirror(mirror, url, timeout=600)
+                age = 0.0
+            except Exception as e:
+                progress.add_warning(f"Git mirror '{name}' is stale ({age / 3600:.1f}h) and refresh failed ({e}). Using upstream {url}.")
+                return None
+        progress.add_log(f"Using git mirror for '{name}' (fetched {age / 3600:.1f}h ago)")
+        return mirror
+
+    def _inject_scratch(self, config: BuildConfiguration, env: Dict[str, str], vols: Dict[str, Dict[str, str]]):
+        """Places the F16 intermediate on 'build_scratch_dir' (SCRATCH_DIR in build.sh)."""
+        scratch = self._scratch_dir()
+        if not scratch: return
+        job_dir = scratch / config.build_id
+        ensure_directory(job_dir)
+        vols[str(job_dir)] = {"bind": "/build-scratch", "mode": "rw"}
+        env["SCRATCH_DIR"] = "/build-scratch"
+
+    def _shard_size_gb(self, config: BuildConfiguration) -> Optional[float]:
+        """
+        Max shard size if the build should run sharded, else None.
+        'auto': only when the F16 intermediate reaches 'shard_threshold_gb' (default 40).
+        """
+        mode = (config.shard_mode or self._get_conf("shard_mode", "auto")).lower()
+        if mode == "off" or config.target_format != ModelFormat.GGUF: return None
+        size = float(config.shard_max_gb or self._get_conf("shard_max_gb", 8.0))
+        if mode == "on": return size
+        f16 = self.estimate_model(config).f16_bytes
+        return size if f16 and f16 >= float(self._get_conf("shard_threshold_gb", 40.0)) * GB else None
+
+    def _cpu_budget(self, build_id: str) -> int:
+        """CPUs a build container may use: 'build_cpus', else the worker's NCPU."""
+        configured = self._get_conf("build_cpus")
+        if configured: return max(1, int(configured))
+        client = self._client_for(build_id)
+        try:
+            ncpu = int(client.info().get("NCPU") or 0) if client else 0
+        except Exception:
+            ncpu = 0
+        return max(1, ncpu or os.cpu_count() or 1)
+
+    @staticmethod
+    def _supports_sharding(target_path: Path) -> bool:
+        """Whether the target's build.sh handles SHARDED_BUILD (older generated targets do not)."""
+        try:
+            return "SHARDED_BUILD" in (target_path / "modules" / "build.sh").read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return False
+
+    def _inject_sharding(self, config: BuildConfiguration, env: Dict[str, str], progress: BuildProgress,
+                         target_path: Path):
+        """SHARDED_BUILD / SPLIT_MAX_SIZE / QUANT_THREADS for build.sh (llama.cpp split GGUF)."""
+        size = self._shard_size_gb(config)
+        if not size: return
+        if not self._supports_sharding(target_path):
+            progress.add_warning(f"Target '{target_path.name}' does not handle SHARDED_BUILD in modules/build.sh, "
+                                 f"building an unsplit GGUF instead.")
+            return
+        threads = self._cpu_budget(config.build_id)
+        env["SHARDED_BUILD"] = "1"
+        env["SPLIT_MAX_SIZE"] = f"{max(1, int(size))}G"
+        env["QUANT_THREADS"] = str(threads)
+        progress.add_log(f"Sharded build: split GGUF (max {env['SPLIT_MAX_SIZE']} per shard), "
+                         f"quantization on {threads} threads")
+
+    def _model_volumes(self, config: BuildConfiguration) -> Dict[str, Dict[str, str]]:
+        staged = self._staged_models.get(config.build_id)
+        return staged.volumes() if staged else {}
+
     def _generate_dockerfile(self, config: BuildConfiguration, progress: BuildProgress, target_path: Path) -> Path:
-        progress.current_stage = "Generating Dockerfile"
+        progress.enter_stage("Generating Dockerfile")
         progress.progress_percent = 20
         
         build_temp = self.cache_dir / "builds" / config.build_id
@@ -437,13 +1124,16 @@ class BuildEngine:
         return df_path
 
     def _validate_dockerfile_hadolint(self, path: Path, prog: BuildProgress):
+        # Prefer the binary provisioned by 'llm-cli cache warm'
+        cached = self.cache_dir / "tools" / "hadolint"
+        hadolint = str(cached) if cached.exists() else "hadolint"
         try: 
-            subprocess.run(["hadolint", str(path)], check=True, capture_output=True) 
+            subprocess.run([hadolint, str(path)], check=True, capture_output=True) 
         except Exception: 
             prog.add_warning("Hadolint check skipped (tool not found or failed)")
 
     def _build_docker_image(self, config: BuildConfiguration, progress: BuildProgress, path: Path) -> Image:
-        progress.current_stage = "Building Image"
+        progress.enter_stage("Building Image")
         progress.progress_percent = 40
         
         tag = f"llm-framework/{config.target_arch.lower()}:{config.build_id.lower()}"
@@ -462,7 +1152,7 @@ class BuildEngine:
                 buildargs["USER_ID"] = str(os.getuid())
                 buildargs["GROUP_ID"] = str(os.getgid())
 
-            resp = self.docker_client.api.build(
+            resp = self._client_for(config.build_id).api.build(
                 path=str(context),
                 dockerfile=str(rel_df),
                 tag=tag,
@@ -477,7 +1167,7 @@ class BuildEngine:
                 if 'error' in chunk:
                     raise RuntimeError(chunk['error'])
             
-            return self.docker_client.images.get(tag)
+            return self._client_for(config.build_id).images.get(tag)
             
         except Exception as e:
             raise RuntimeError(f"Image build failed: {e}")
@@ -488,20 +1178,22 @@ class BuildEngine:
             scan_cmd = ["image", "--exit-code", "1", "--severity", "HIGH,CRITICAL", image_tag]
             trivy_image = self._get_conf('image_trivy', "aquasec/trivy:latest")
             
-            log_stream = self.docker_client.containers.run(
-                trivy_image, 
-                command=scan_cmd,
+            worker = self.worker_pool.worker_for(progress.build_id)
+            pool = self.get_container_pool(worker.name if worker else None)
+            # Warm trivy container: socket + DB cache stay mounted, scan runs via exec
+            exit_code, _ = pool.run(
+                trivy_image,
+                ["trivy"] + scan_cmd,
                 volumes={
                     '/var/run/docker.sock': {'bind': '/var/run/docker.sock', 'mode': 'ro'}, 
                     'trivy_cache': {'bind': '/root/.cache/', 'mode': 'rw'}
                 },
-                remove=True, 
-                stream=True
+                on_output=lambda line: progress.add_log(f"TRIVY: {line.strip()}")
             )
-            for line in log_stream: progress.add_log(f"TRIVY: {line.decode().strip()}")
-            progress.add_log("Security scan passed.")
-        except docker.errors.ContainerError:
-            progress.add_warning(f"Security vulnerabilities found! Review logs above.")
+            if exit_code == 0:
+                progress.add_log("Security scan passed.")
+            else:
+                progress.add_warning(f"Security vulnerabilities found! Review logs above.")
         except Exception as e:
             progress.add_warning(f"Security scan failed to run: {e}")
 
@@ -509,7 +1201,7 @@ class BuildEngine:
         """
         NEW in v2.4.0: Runs a pre-build container to generate the importance matrix.
         """
-        progress.current_stage = "Calculating IMatrix"
+        progress.enter_stage("Calculating IMatrix")
         progress.status = BuildStatus.CALIBRATING
         progress.progress_percent = 50
         progress.add_log("Starting IMatrix Generation (Smart Calibration)...")
@@ -523,22 +1215,20 @@ class BuildEngine:
             str(self.cache_dir / "models"): {"bind": "/build-cache/models", "mode": "rw"},
             str(target_path / "modules"): {"bind": "/app/modules", "mode": "ro"},
             # IMPORTANT: Mount dataset
-            str(config.dataset_path): {"bind": "/build-cache/dataset.txt", "mode": "ro"}
+            str(config.dataset_path): {"bind": "/build-cache/dataset.txt", "mode": "ro"},
+            **self._model_volumes(config)
         }
         
         env = {
             "JOB_TYPE": "imatrix", # Signal to build.sh to run --imatrix mode
             "BUILD_ID": config.build_id,
-            "MODEL_SOURCE": config.model_source,
+            "MODEL_SOURCE": self._model_source_env(config),
             "DATASET_PATH": "/build-cache/dataset.txt"
         }
         
         # SSOT Repo Injection
-        source_repos = self._get_conf("source_repositories", {})
-        if source_repos:
-            for k, v in source_repos.items():
-                if isinstance(v, dict) and 'url' in v:
-                    env[f"{k.split('.')[-1].upper()}_REPO_OVERRIDE"] = v['url']
+        self._inject_repo_overrides(env, vols, progress)
+        self._inject_scratch(config, env, vols)
 
         # GPU Handling for Calculation
         device_requests = []
@@ -546,22 +1236,31 @@ class BuildEngine:
              device_requests = [DeviceRequest(count=-1, capabilities=[['gpu']])]
              
         try:
-            container = self.docker_client.containers.create(
+            container = self._client_for(config.build_id).containers.create(
                 image=image.id,
                 command=["/app/modules/build.sh"],
-                volumes=vols,
+                volumes=self._map_volumes(config.build_id, vols),
                 environment=env,
                 name=f"llm-imatrix-{config.build_id}",
                 user="0:0",
-                device_requests=device_requests
+                device_requests=device_requests,
+                labels=self._container_labels(config.build_id, "imatrix")
             )
             
             container.start()
-            for line in container.logs(stream=True, follow=True):
-                progress.add_log(f"IMATRIX: {line.decode().strip()}")
-                
-            res = container.wait(timeout=config.build_timeout)
-            if res.get('StatusCode', 1) != 0:
+            collector = self._start_stats(container, progress)
+            try:
+                for line in container.logs(stream=True, follow=True):
+                    text = line.decode().strip()
+                    progress.track_module_output(text)
+                    progress.add_log(f"IMATRIX: {text}")
+                    
+                exit_code = self._wait_container_exit(config.build_id, "imatrix", container, config.build_timeout)
+            finally:
+                self._finish_stats("imatrix", collector, progress)
+            if self._resolve_oom(progress, "imatrix", container, exit_code):
+                raise RuntimeError("IMatrix container was OOM-killed.")
+            if exit_code != 0:
                 raise RuntimeError("IMatrix calculation failed.")
                 
             # Verify Output
@@ -579,7 +1278,7 @@ class BuildEngine:
             except: pass
 
     def _execute_build_modules(self, config: BuildConfiguration, progress: BuildProgress, image: Image, target_path: Path):
-        progress.current_stage = "Running modules"
+        progress.enter_stage("Running modules")
         progress.status = BuildStatus.BUILDING
         progress.progress_percent = 60
         progress.add_log("Starting Main Build Container...")
@@ -590,14 +1289,15 @@ class BuildEngine:
         vols = {
             str(build_temp / "output"): {"bind": "/build-cache/output", "mode": "rw"},
             str(self.cache_dir / "models"): {"bind": "/build-cache/models", "mode": "rw"},
-            str(target_path / "modules"): {"bind": "/app/modules", "mode": "ro"}
+            str(target_path / "modules"): {"bind": "/app/modules", "mode": "ro"},
+            **self._model_volumes(config)
         }
         
         # 2. Environment Setup
         env = {
             "JOB_TYPE": "build", # Default mode
             "BUILD_ID": config.build_id,
-            "MODEL_SOURCE": config.model_source,
+            "MODEL_SOURCE": self._model_source_env(config),
             "MODEL_TASK": config.model_task, 
             "TARGET_ARCH": config.target_arch,
             "OPTIMIZATION_LEVEL": config.optimization_level.value,
@@ -615,11 +1315,9 @@ class BuildEngine:
             progress.add_log("Using generated IMatrix for Quantization.")
         
         # Inject SSOT Vars
-        source_repos = self._get_conf("source_repositories", {})
-        if source_repos:
-            for k, v in source_repos.items():
-                if isinstance(v, dict) and 'url' in v:
-                    env[f"{k.split('.')[-1].upper()}_REPO_OVERRIDE"] = v['url']
+        self._inject_repo_overrides(env, vols, progress)
+        self._inject_scratch(config, env, vols)
+        self._inject_sharding(config, env, progress, target_path)
 
         # Dataset Injection (Optional for Build, but good for validation)
         if config.dataset_path and os.path.exists(config.dataset_path):
@@ -636,33 +1334,41 @@ class BuildEngine:
                 devices = ["/dev/dri:/dev/dri"]
 
         # 5. Run Container
-        container = self.docker_client.containers.create(
+        container = self._client_for(config.build_id).containers.create(
             image=image.id, 
             command=["/app/modules/build.sh"], 
-            volumes=vols, 
+            volumes=self._map_volumes(config.build_id, vols), 
             environment=env, 
             name=f"llm-build-{config.build_id}", 
             user="0:0",
             device_requests=device_requests,
-            devices=devices
+            devices=devices,
+            labels=self._container_labels(config.build_id, "build")
         )
         
         with self._lock: 
             self._active_containers[config.build_id] = container
             
         container.start()
+        collector = self._start_stats(container, progress)
         
-        for line in container.logs(stream=True, follow=True):
-            progress.add_log(f"CONT: {line.decode().strip()}")
-            
-        res = container.wait(timeout=config.build_timeout)
-        exit_code = res.get('StatusCode', 1)
+        try:
+            for line in container.logs(stream=True, follow=True):
+                text = line.decode().strip()
+                progress.track_module_output(text)
+                progress.add_log(f"CONT: {text}")
+                
+            exit_code = self._wait_container_exit(config.build_id, "build", container, config.build_timeout)
+        finally:
+            self._finish_stats("build", collector, progress)
         
+        if self._resolve_oom(progress, "build", container, exit_code):
+            raise RuntimeError(f"Build container was OOM-killed (exit code {exit_code})")
         if exit_code != 0:
             raise RuntimeError(f"Build script failed with exit code {exit_code}")
 
     def _extract_artifacts(self, config, progress):
-        progress.current_stage = "Extracting"
+        progress.enter_stage("Extracting")
         progress.progress_percent = 85
         
         src = self.cache_dir / "builds" / config.build_id / "output"
@@ -671,8 +1377,8 @@ class BuildEngine:
         progress.add_log(f"Copying artifacts to {dst}...")
         ensure_directory(dst)
         
+        extracted: List[Path] = []
         if src.exists():
-            count = 0
             for f in src.rglob("*"):
                 if f.is_file():
                     rel = f.relative_to(src)
@@ -680,16 +1386,41 @@ class BuildEngine:
                     ensure_directory(target.parent)
                     shutil.copy2(f, target)
                     progress.artifacts.append(str(target))
-                    count += 1
-            progress.add_log(f"Extracted {count} artifacts.")
+                    extracted.append(target)
+            progress.add_log(f"Extracted {len(extracted)} artifacts.")
+        
+        # Split GGUF sets of this build (output_dir may be shared): must be complete,
+        # manifest (with checksums) becomes an artifact too
+        try:
+            manifests = write_manifests(dst, config.quantization, files=extracted)
+        except ValueError as e:
+            raise RuntimeError(str(e))
+        for m in manifests:
+            manifest = SplitManifest.load(m)
+            progress.artifacts.append(str(m))
+            progress.add_log(f"Split GGUF '{manifest.name}': {manifest.count} shards, "
+                             f"{manifest.total_bytes / GB:.2f} GB (entry: {manifest.entry})")
 
-    def _generate_model_card(self, config: BuildConfiguration, output_dir: Path):
+    def _generate_model_card(self, config: BuildConfiguration, output_dir: Path, manifest_paths: List[Path]):
         readme_path = output_dir / "Model_Card.md"
         model_hash = "Calculating..."
+        
+        # Split GGUF: checksums per shard are already in the manifest
+        split_info = ""
+        manifests = [SplitManifest.load(p) for p in sorted(manifest_paths)]
+        if manifests:
+            lines = []
+            for m in manifests:
+                lines.append(f"- **{m.name}:** {m.count} shards, {m.total_bytes / GB:.2f} GB, "
+                             f"load via `{m.entry}` (manifest `{m.name}{MANIFEST_SUFFIX}`)")
+                lines.extend(f"  - `{sh.file}` `{sh.sha256}`" for sh in m.shards)
+            split_info = "## 🧩 Split GGUF\n" + "\n".join(lines) + "\n\n"
+            model_hash = f"see {manifests[0].name}{MANIFEST_SUFFIX}"
+        
         try:
             target_ext = f".{config.target_format.value}"
-            candidates = list(output_dir.glob(f"*{target_ext}"))
-            if not candidates:
+            candidates = [] if manifests else list(output_dir.glob(f"*{target_ext}"))
+            if not candidates and not manifests:
                 files = list(output_dir.glob("*"))
                 if files:
                     candidates = [max(files, key=lambda p: p.stat().st_size if p.is_file() else 0)]
@@ -718,6 +1449,7 @@ class BuildEngine:
             f"## 🛡️ Security & Integrity\n"
             f"- **Primary Artifact Hash (SHA256):** `{model_hash}`\n"
             f"- **Base Image:** {config.base_image}\n\n"
+            f"{split_info}"
             f"## 🚀 Usage\n"
             f"To deploy this model on your edge device:\n\n"
             f"1. Transfer the archive to the target.\n"
@@ -733,18 +1465,25 @@ class BuildEngine:
             self.logger.error(f"Failed to write Model Card: {e}")
 
     def _create_golden_artifact(self, config: BuildConfiguration, progress: BuildProgress):
-        progress.current_stage = "Archiving"
+        progress.enter_stage("Archiving")
         progress.progress_percent = 95
         
         output_dir = Path(config.output_dir)
         
+        # This build's split manifests only: output_dir may hold those of earlier builds
+        manifests = [Path(a) for a in progress.artifacts if a.endswith(MANIFEST_SUFFIX)]
         progress.add_log("Generating Model Card...")
-        self._generate_model_card(config, output_dir)
+        self._generate_model_card(config, output_dir, manifests)
         
         archive_name = output_dir.name 
         root_dir = output_dir.parent
         base_dir = output_dir.name
         
+        if manifests:
+            # Split GGUF: the shard set + manifest is the deliverable, no second full copy as ZIP
+            progress.add_log("Split GGUF artifacts: skipping Golden Artifact ZIP (manifest is the entry point).")
+            return
+        
         try:
             progress.add_log(f"Creating Golden Artifact ZIP...")
             zip_path = shutil.make_archive(
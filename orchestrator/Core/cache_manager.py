@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Cache Manager (v2.5.0)
+DIREKTIVE: Goldstandard, Quota-basiert, niemals in-use Daten löschen.
+
+Zweck:
+Begrenzt das Wachstum von cache/ und der Framework-Docker-Ressourcen.
+Jeder Subtree hat eine eigene Quota (GB). Überschreitet er sie, werden Einträge
+nach LRU (last access) oder LFU (hits, dann last access) entfernt, bis er wieder
+unter der Quota liegt.
+
+Einträge:
+- models      -> cache/models/<entry>   (cache/models/local/<hash>/ für lokale Kopien)
+- builds      -> cache/builds/<build_id>
+- calibration -> cache/calibration/<file>
+- git         -> cache/git/<repo>.git
+- tools       -> cache/tools/<binary>
+- images      -> Docker Images 'llm-framework/*' (per-build Images + warm Toolchains)
+- trivy       -> Docker Volume 'trivy_cache' (nur als Ganzes entfernbar)
+
+Pinning: Laufende Builds pinnen ihr Build-Verzeichnis, ihr Modell und ihr Image.
+Gepinnte Einträge werden nie entfernt. Pins tragen Owner + Zeitstempel; Pins
+abgestürzter Prozesse verfallen nach 'pin_ttl'.
+
+Der Index (Zugriffe/Pins) liegt als JSON in cache/cache_index.json (atomar geschrieben).
+Load-Modify-Save läuft unter einem Datei-Lock (cache_index.lock), damit parallele
+Prozesse (CLI, Worker, GUI) sich nicht gegenseitig Pins überschreiben. Die GC prüft
+den Pin eines Eintrags unter demselben Lock direkt vor dem Löschen.
+"""
+
+import calendar
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple
+
+from orchestrator.utils.logging import get_logger
+from orchestrator.utils.helpers import ensure_directory, file_lock
+
+GB = 1024 ** 3
+
+FS_SUBTREES = ["models", "builds", "calibration", "git", "tools"]
+DOCKER_SUBTREES = ["images", "trivy"]
+
+DEFAULT_QUOTAS_GB = {
+    "models": 200.0, "builds": 50.0, "calibration": 10.0, "git": 20.0,
+    "tools": 2.0, "images": 100.0, "trivy": 5.0
+}
+
+# Unterverzeichnisse, deren Kinder die eigentlichen Einträge sind
+NESTED_CONTAINERS = {"models": ["local"]}
+
+IMAGE_PREFIX = "llm-framework/"
+TRIVY_VOLUME = "trivy_cache"
+
+
+@dataclass
+class CacheEntry:
+    subtree: str
+    name: str
+    size_bytes: int
+    last_access: float
+    hits: int = 0
+    pinned: bool = False
+
+
+def _dir_size(path: Path) -> int:
+    if path.is_file() or path.is_symlink():
+        try: return path.lstat().st_size
+        except OSError: return 0
+    total = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            try: total += os.lstat(os.path.join(root, f)).st_size
+            except OSError: pass
+    return total
+
+
+class CacheManager:
+    """Access tracking, pinning and quota based eviction for all caches."""
+
+    def __init__(self, cache_dir: Path, config_manager=None, docker_client=None):
+        self.logger = get_logger("CacheManager")
+        self.cache_dir = Path(cache_dir)
+        self.config = config_manager
+        self.client = docker_client
+        self.index_path = self.cache_dir / "cache_index.json"
+        self.index_lock_path = self.cache_dir / "cache_index.lock"
+        self._lock = threading.RLock()
+        self._last_auto_gc = 0.0
+        ensure_directory(self.cache_dir)
+
+        self.policy = str(self._get_conf("cache_eviction_policy", "lru")).lower()
+        self.pin_ttl = float(self._get_conf("cache_pin_ttl", 24 * 3600))
+        quotas = dict(DEFAULT_QUOTAS_GB)
+        quotas.update(self._get_conf("cache_quotas", {}) or {})
+        self.quotas = {k: float(v) for k, v in quotas.items()}
+
+    def _get_conf(self, key: str, default: Any = None) -> Any:
+        if self.config:
+            if hasattr(self.config, 'get'):
+                return self.config.get(key, default)
+            return getattr(self.config, key, default)
+        return default
+
+    # --- INDEX ---
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            data = {}
+        data.setdefault("access", {})
+        data.setdefault("pins", {})
+        return data
+
+    def _save(self, data: Dict[str, Any]):
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        tmp.replace(self.index_path)
+
+    @contextmanager
+    def _index(self):
+        """Load-modify-save of the index, exclusive across threads and processes."""
+        with self._lock, file_lock(self.index_lock_path):
+            data = self._load()
+            yield data
+            self._save(data)
+
+    @staticmethod
+    def _key(subtree: str, name: str) -> str:
+        return f"{subtree}:{name}"
+
+    def _pinned_keys(self, data: Dict[str, Any]) -> set:
+        now = time.time()
+        return {k for k, owners in data["pins"].items()
+                if any(now - ts < self.pin_ttl for ts in owners.values())}
+
+    def touch(self, subtree: str, name: str):
+        """Records an access (hit) of a cache entry."""
+        with self._index() as data:
+            rec = data["access"].setdefault(self._key(subtree, name), {"hits": 0})
+            rec["hits"] += 1
+            rec["last_access"] = time.time()
+
+    def pin(self, subtree: str, name: str, owner: str):
+        with self._index() as data:
+            data["pins"].setdefault(self._key(subtree, name), {})[owner] = time.time()
+
+    def unpin(self, owner: str):
+        """Releases all pins held by 'owner' (e.g. a build id)."""
+        with self._index() as data:
+            for key in list(data["pins"]):
+                data["pins"][key].pop(owner, None)
+                if not data["pins"][key]: del data["pins"][key]
+
+    def entry_for_path(self, path: Path) -> Optional[Tuple[str, str]]:
+        """Maps a host path inside cache/ to its (subtree, entry name)."""
+        try:
+            rel = Path(path).resolve().relative_to(self.cache_dir.resolve()).parts
+        except ValueError:
+            return None
+        if len(rel) < 2 or rel[0] not in FS_SUBTREES: return None
+        if rel[1] in NESTED_CONTAINERS.get(rel[0], []):
+            return (rel[0], f"{rel[1]}/{rel[2]}") if len(rel) > 2 else None
+        return rel[0], rel[1]
+
+    # --- SCANNING ---
+
+    def _fs_entries(self, subtree: str) -> List[Tuple[str, Path]]:
+        root = self.cache_dir / subtree
+        if not root.exists(): return []
+        out = []
+        for child in root.iterdir():
+            if child.name.startswith("."): continue  # Sidecars (z.B. .<name>.staged.json)
+            if child.is_dir() and child.name in NESTED_CONTAINERS.get(subtree, []):
+                out.extend((f"{child.name}/{c.name}", c) for c in child.iterdir() if not c.name.startswith("."))
+            else:
+                out.append((child.name, child))
+        return out
+
+    def _docker_entries(self, subtree: str) -> List[Tuple[str, int, float]]:
+        """(name, size, created) of framework Docker resources."""
+        if not self.client: return []
+        out = []
+        try:
+            if subtree == "images":
+                for img in self.client.images.list():
+                    created = img.attrs.get("Created", "")
+                    ts = calendar.timegm(time.strptime(created[:19], "%Y-%m-%dT%H:%M:%S")) if created else 0.0
+                    for tag in img.tags:
+                        if tag.startswith(IMAGE_PREFIX):
+                            out.append((tag, int(img.attrs.get("Size", 0)), ts))
+            elif subtree == "trivy":
+                for vol in (self.client.df().get("Volumes") or []):
+                    if vol.get("Name") == TRIVY_VOLUME:
+                        out.append((TRIVY_VOLUME, int((vol.get("UsageData") or {}).get("Size", 0)), 0.0))
+        except Exception as e:
+            self.logger.debug(f"Docker scan for {subtree} failed: {e}")
+        return out
+
+    def scan(self, subtree: str) -> List[CacheEntry]:
+        data = self._load()
+        pinned = self._pinned_keys(data)
+
+        entries = []
+        if subtree in FS_SUBTREES:
+            for name, path in self._fs_entries(subtree):
+                try: mtime = path.lstat().st_mtime
+                except OSError: continue
+                entries.append(CacheEntry(subtree, name, _dir_size(path), mtime))
+        else:
+            entries = [CacheEntry(subtree, n, size, ts) for n, size, ts in self._docker_entries(subtree)]
+
+        for e in entries:
+            rec = data["access"].get(self._key(subtree, e.name))
+            if rec:
+                e.hits = rec.get("hits", 0)
+                e.last_access = max(e.last_access, rec.get("last_access", 0.0))
+            e.pinned = self._key(subtree, e.name) in pinned
+            # Warm toolchain images are the point of 'cache warm' -> implicitly pinned
+            if subtree == "images" and e.name.endswith(":warm"): e.pinned = True
+        return entries
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for subtree in FS_SUBTREES + DOCKER_SUBTREES:
+            entries = self.scan(subtree)
+            used = sum(e.size_bytes for e in entries)
+            quota = self.quotas.get(subtree, 0.0)
+            result[subtree] = {
+                "entries": len(entries),
+                "pinned": sum(1 for e in entries if e.pinned),
+                "used_gb": round(used / GB, 2),
+                "quota_gb": quota,
+                "usage_percent": round(used / (quota * GB) * 100, 1) if quota else 0.0
+            }
+        return result
+
+    # --- EVICTION ---
+
+    def _order(self, entries: List[CacheEntry], policy: str) -> List[CacheEntry]:
+        if policy == "lfu":
+            return sorted(entries, key=lambda e: (e.hits, e.last_access))
+        return sorted(entries, key=lambda e: e.last_access)
+
+    def _remove(self, entry: CacheEntry) -> bool:
+        """Removes an entry unless another process pinned it since the scan."""
+        with self._index() as data:
+            key = self._key(entry.subtree, entry.name)
+            if key in self._pinned_keys(data): return False
+            if entry.subtree in FS_SUBTREES:
+                path = self.cache_dir / entry.subtree / entry.name
+                if path.is_dir() and not path.is_symlink(): shutil.rmtree(path)
+                elif path.exists() or path.is_symlink(): path.unlink()
+                for sidecar in path.parent.glob(f".{path.name}.*"):
+                    sidecar.unlink()
+            elif entry.subtree == "images":
+                self.client.images.remove(entry.name, noprune=False)
+            elif entry.subtree == "trivy":
+                self.client.volumes.get(entry.name).remove(force=True)
+            data["access"].pop(key, None)
+        return True
+
+    def collect(self, subtrees: Optional[List[str]] = None, dry_run: bool = False,
+                policy: Optional[str] = None) -> Dict[str, Any]:
+        """Evicts unpinned entries from every subtree that exceeds its quota."""
+        policy = (policy or self.policy).lower()
+        report: Dict[str, Any] = {"policy": policy, "dry_run": dry_run, "freed_gb": 0.0, "evicted": [], "errors": []}
+
+        for subtree in subtrees or (FS_SUBTREES + DOCKER_SUBTREES):
+            quota = self.quotas.get(subtree)
+            if not quota: continue
+            entries = self.scan(subtree)
+            used = sum(e.size_bytes for e in entries)
+            limit = quota * GB
+            if used <= limit: continue
+
+            for entry in self._order([e for e in entries if not e.pinned], policy):
+                if used <= limit: break
+                try:
+                    if not dry_run and not self._remove(entry): continue
+                    used -= entry.size_bytes
+                    report["freed_gb"] += entry.size_bytes / GB
+                    report["evicted"].append({"subtree": subtree, "name": entry.name,
+                                              "size_gb": round(entry.size_bytes / GB, 3)})
+                except Exception as e:
+                    report["errors"].append(f"{subtree}:{entry.name}: {e}")
+            if used > limit:
+                self.logger.warning(f"Cache '{subtree}' still over quota ({used / GB:.1f}/{quota} GB), remaining entries are pinned")
+
+        report["freed_gb"] = round(report["freed_gb"], 2)
+        if report["evicted"] and not dry_run:
+            self.logger.info(f"Cache GC ({policy}) freed {report['freed_gb']} GB in {len(report['evicted'])} entries")
+        return report
+
+    def maybe_collect(self, min_interval: float = 600.0) -> Optional[Dict[str, Any]]:
+        """Throttled automatic GC (called on build admission)."""
+        if not self._get_conf("cache_auto_gc", True): return None
+        now = time.time()
+        with self._lock:
+            if now - self._last_auto_gc < min_interval: return None
+            self._last_auto_gc = now
+        return self.collect()
+
+    @staticmethod
+    def entries_to_dicts(entries: List[CacheEntry]) -> List[Dict[str, Any]]:
+        return [asdict(e) for e in entries]
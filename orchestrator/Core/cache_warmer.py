@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Cache Warmer (v2.5.0)
+DIREKTIVE: Goldstandard, parallel, idempotent.
+
+Zweck:
+Befüllt alle Caches eines (neuen) Build-Hosts vorab statt lazy mitten im ersten Build:
+- Framework-Images (trivy, qdrant, inference runtime, base image) -> docker pull
+- Toolchain-Images der gewählten Targets -> docker build (Layer-Cache für spätere Builds)
+- Git-Mirrors der SSOT 'source_repositories' -> cache/git/<name>.git
+  (die BuildEngine nutzt vorhandene Mirrors automatisch als *_REPO_OVERRIDE; der
+  Fetch-Zeitpunkt steht in '.<name>.git.fetched', Mirrors älter als
+  'git_mirror_max_age_hours' werden vor dem Build aktualisiert)
+- Native Tool-Binaries ('cache_warm_tools' + target.yml 'tools') -> cache/tools/<name>
+  Format: [{name: hadolint, url: https://..., sha256: ...}]
+
+Aufruf über 'llm-cli cache warm' oder im Hintergrund beim Framework-Boot
+('cache_warm_on_boot'). Jede Aufgabe ist idempotent (vorhandene Mirrors werden
+nur aktualisiert, vorhandene Images/Tools übersprungen bzw. erneut validiert).
+"""
+
+import os
+import stat
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Any, Callable
+
+import yaml
+
+from orchestrator.utils.logging import get_logger
+from orchestrator.utils.helpers import ensure_directory, calculate_file_checksum, file_lock
+
+# Framework-Images aus der SSOT Config (v2.3)
+IMAGE_KEYS = ["image_trivy", "image_qdrant", "image_inference_runtime", "image_base_debian"]
+
+
+@dataclass
+class WarmTask:
+    kind: str                  # "image" | "target_image" | "git" | "tool"
+    name: str
+    source: str                # image ref, target dir, repo url or download url
+    status: str = "pending"    # pending | running | done | skipped | failed
+    size_bytes: int = 0
+    duration_s: float = 0.0
+    error: str = ""
+    sha256: Optional[str] = None
+
+
+def git_mirror_path(cache_dir: Path, name: str) -> Path:
+    return Path(cache_dir) / "git" / f"{name.lower()}.git"
+
+
+def _git_mirror_stamp(mirror: Path) -> Path:
+    return mirror.parent / f".{mirror.name}.fetched"
+
+
+def git_mirror_fetched_at(mirror: Path) -> Optional[float]:
+    """Epoch of the last successful clone/update (FETCH_HEAD for mirrors without stamp)."""
+    try:
+        return float(_git_mirror_stamp(mirror).read_text(encoding='utf-8').strip())
+    except (OSError, ValueError):
+        pass
+    for p in (mirror / "FETCH_HEAD", mirror):
+        if p.exists(): return p.stat().st_mtime
+    return None
+
+
+def update_git_mirror(mirror: Path, url: str, timeout: int = 1800):
+    """Clones or updates a bare mirror (serialized per mirror) and records the fetch time."""
+    if not shutil.which("git"):
+        raise RuntimeError("git not found in PATH")
+    ensure_directory(mirror.parent)
+    with file_lock(mirror.parent / f".{mirror.name}.lock"):
+        if mirror.exists():
+            cmd = ["git", "--git-dir", str(mirror), "remote", "update", "--prune"]
+        else:
+            cmd = ["git", "clone", "--mirror", url, str(mirror)]
+        subprocess.run(cmd, check=True, capture_output=True, timeout=timeout)
+        _git_mirror_stamp(mirror).write_text(f"{time.time():.0f}", encoding='utf-8')
+
+
+class CacheWarmer:
+    """Plans and executes cache warming tasks in parallel."""
+
+    def __init__(self, build_engine, config_manager=None):
+        self.logger = get_logger("CacheWarmer")
+        self.engine = build_engine
+        self.config = config_manager if config_manager is not None else build_engine.config
+        self.cache_dir: Path = build_engine.cache_dir
+        self.targets_dir: Path = build_engine.targets_dir
+        self._thread: Optional[threading.Thread] = None
+        self.last_run: List[WarmTask] = []
+
+    def _get_conf(self, key: str, default: Any = None) -> Any:
+        if self.config:
+            if hasattr(self.config, 'get'):
+                return self.config.get(key, default)
+            return getattr(self.config, key, default)
+        return default
+
+    @property
+    def client(self):
+        return self.engine.docker_client
+
+    # --- PLANNING ---
+
+    def available_targets(self) -> List[str]:
+        if not self.targets_dir.exists(): return []
+        return sorted(p.name for p in self.targets_dir.iterdir()
+                      if p.is_dir() and not p.name.startswith("_") and (p / "target.yml").exists())
+
+    def plan(self, targets: Optional[List[str]] = None, kinds: Optional[List[str]] = None) -> List[WarmTask]:
+        """Builds the task list. targets=None -> all targets, kinds=None -> everything."""
+        want = set(kinds or ["image", "target_image", "git", "tool"])
+        tasks: List[WarmTask] = []
+
+        if "image" in want:
+            for key in IMAGE_KEYS:
+                ref = self._get_conf(key)
+                if ref: tasks.append(WarmTask("image", key.replace("image_", ""), ref))
+
+        if "target_image" in want:
+            for target in (targets or self.available_targets()):
+                tasks.append(WarmTask("target_image", target, str(self.targets_dir / target)))
+
+        if "git" in want:
+            for key, val in (self._get_conf("source_repositories", {}) or {}).items():
+                url = val.get("url") if isinstance(val, dict) else val
+                if isinstance(url, str) and (url.startswith("http") or url.startswith("git@")) \
+                        and "huggingface.co" not in url:
+                    tasks.append(WarmTask("git", key.split(".")[-1], url))
+
+        if "tool" in want:
+            tool_defs = list(self._get_conf("cache_warm_tools", []) or [])
+            for target in (targets or self.available_targets()):
+                tool_defs.extend(self._target_yaml(self.targets_dir / target).get("tools") or [])
+            seen = set()
+            for tool in tool_defs:
+                if isinstance(tool, dict) and tool.get("name") and tool.get("url") and tool["name"] not in seen:
+                    seen.add(tool["name"])
+                    tasks.append(WarmTask("tool", tool["name"], tool["url"], sha256=tool.get("sha256")))
+        return tasks
+
+    @staticmethod
+    def _target_yaml(target_dir: Path) -> Dict[str, Any]:
+        try:
+            with open(target_dir / "target.yml", 'r', encoding='utf-8') as f:
+                return yaml.safe_load(f) or {}
+        except Exception:
+            return {}
+
+    # --- EXECUTION ---
+
+    def warm(self, tasks: List[WarmTask], max_workers: int = 4,
+             on_progress: Optional[Callable[[WarmTask], None]] = None) -> List[WarmTask]:
+        handlers = {"image": self._pull_image, "target_image": self._build_target_image,
+                    "git": self._mirror_repo, "tool": self._fetch_tool}
+
+        def run(task: WarmTask) -> WarmTask:
+            task.status = "running"
+            if on_progress: on_progress(task)
+            start = time.monotonic()
+            try:
+                handlers[task.kind](task)
+                if task.status == "running": task.status = "done"
+            except Exception as e:
+                task.status = "failed"
+                task.error = str(e)
+                self.logger.warning(f"Cache warm {task.kind} '{task.name}' failed: {e}")
+            task.duration_s = round(time.monotonic() - start, 1)
+            if on_progress: on_progress(task)
+            return task
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="cache-warm") as pool:
+            for f in as_completed([pool.submit(run, t) for t in tasks]):
+                f.result()
+        self.last_run = tasks
+        return tasks
+
+    def start_background(self, targets: Optional[List[str]] = None, max_workers: int = 2):
+        """Fire-and-forget warming at framework boot (never blocks startup)."""
+        if self._thread and self._thread.is_alive(): return
+        tasks = self.plan(targets)
+        self._thread = threading.Thread(target=self.warm, args=(tasks, max_workers),
+                                        name="cache-warm-boot", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Background cache warming started ({len(tasks)} tasks)")
+
+    # --- HANDLERS ---
+
+    def _require_docker(self):
+        if not self.client:
+            raise RuntimeError("Docker not available")
+
+    def _pull_image(self, task: WarmTask):
+        self._require_docker()
+        from docker.errors import ImageNotFound
+        from docker.utils import parse_repository_tag
+        try:
+            image = self.client.images.get(task.source)
+            task.status = "skipped"
+        except ImageNotFound:
+            # 'repo@sha256:<hex>' -> tag 'sha256:<hex>' (pulled by digest), registry ports stay in the repo
+            repo, tag = parse_repository_tag(task.source)
+            image = self.client.images.pull(repo, tag=tag or "latest")
+        task.size_bytes = int(image.attrs.get("Size", 0))
+
+    def _target_build_args(self, target_dir: Path) -> Dict[str, str]:
+        data = self._target_yaml(target_dir)
+        args = {k: str(v) for k, v in ((data.get("docker") or {}).get("build_args") or {}).items()}
+        # Same args as the BuildEngine, otherwise the layer cache would not match
+        if sys.platform != "win32":
+            args["USER_ID"] = str(os.getuid())
+            args["GROUP_ID"] = str(os.getgid())
+        return args
+
+    def _build_target_image(self, task: WarmTask):
+        self._require_docker()
+        target_dir = Path(task.source)
+        dockerfile = next((target_dir / n for n in ("Dockerfile", "dockerfile") if (target_dir / n).exists()), None)
+        if not dockerfile:
+            task.status = "skipped"
+            task.error = "no Dockerfile"
+            return
+        context = self.engine.base_dir
+        try: rel_df = dockerfile.relative_to(context)
+        except ValueError: rel_df = dockerfile.absolute()
+
+        tag = f"llm-framework/{task.name.lower()}:warm"
+        for chunk in self.client.api.build(path=str(context), dockerfile=str(rel_df), tag=tag,
+                                           buildargs=self._target_build_args(target_dir), decode=True):
+            if 'error' in chunk:
+                raise RuntimeError(chunk['error'])
+        task.size_bytes = int(self.client.images.get(tag).attrs.get("Size", 0))
+
+    def _mirror_repo(self, task: WarmTask):
+        mirror = git_mirror_path(self.cache_dir, task.name)
+        update_git_mirror(mirror, task.source)
+        task.size_bytes = sum(p.stat().st_size for p in mirror.rglob("*") if p.is_file())
+
+    def _fetch_tool(self, task: WarmTask):
+        import requests
+        dest = self.cache_dir / "tools" / task.name
+        ensure_directory(dest.parent)
+        if dest.exists() and (not task.sha256 or calculate_file_checksum(dest) == task.sha256):
+            task.status = "skipped"
+            task.size_bytes = dest.stat().st_size
+            return
+
+        tmp = dest.with_suffix(".part")
+        with requests.get(task.source, stream=True, timeout=60) as r:
+            r.raise_for_status()
+            with open(tmp, 'wb') as f:
+                for chunk in r.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
+        if task.sha256 and calculate_file_checksum(tmp) != task.sha256:
+            tmp.unlink()
+            raise RuntimeError("SHA256 mismatch")
+        tmp.replace(dest)
+        dest.chmod(dest.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        task.size_bytes = dest.stat().st_size
+
+    @staticmethod
+    def summarize(tasks: List[WarmTask]) -> Dict[str, Any]:
+        by_status: Dict[str, int] = {}
+        for t in tasks: by_status[t.status] = by_status.get(t.status, 0) + 1
+        return {"tasks": len(tasks), "by_status": by_status,
+                "total_mb": round(sum(t.size_bytes for t in tasks) / (1024 * 1024), 1),
+                "items": [asdict(t) for t in tasks]}
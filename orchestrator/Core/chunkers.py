@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Structure-Aware Chunkers (v2.5.0)
+DIREKTIVE: Goldstandard, Chunks folgen der Struktur der Quelle.
+
+Zweck:
+Statt fester 1500-Zeichen-Fenster (die Funktionen, YAML-Blöcke und Markdown-
+Abschnitte halbieren) wird jede Quelle an ihren natürlichen Grenzen zerlegt:
+
+- python:   ast -> Top-Level-Funktionen/Klassen (inkl. Decorators und Kommentarblock);
+            zu große Klassen werden in ihre Methoden zerlegt
+- shell:    Regex auf Funktionsdefinitionen ('name() {' / 'function name'), Rest = Skript
+- markdown: je Überschrift (außerhalb von Code-Fences), Label = Überschriften-Pfad
+- yaml:     je Top-Level-Key (Kommentare davor gehören zum Key)
+- sonst:    Zeichenfenster (bisheriges Verhalten)
+
+Anschließend werden die Segmente token-basiert gepackt: kleine Nachbarn werden bis
+'max_tokens' zusammengelegt, zu große zeilenweise (notfalls zeichenweise) geteilt.
+Eigene Chunker: register_chunker("kind", fn, [".ext"]), fn(text, max_tokens) -> [(label, text)].
+"""
+
+import ast
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from orchestrator.Core.embedding_pipeline import estimate_tokens
+
+# Bump when chunk boundaries change: ingest manifests then re-chunk every file
+CHUNKER_VERSION = 1
+DEFAULT_MAX_TOKENS = 512
+
+Segment = Tuple[str, str]  # (label, text)
+FILE_HEADER_PREFIX = "FILE: "
+
+
+@dataclass
+class Chunk:
+    text: str
+    label: str = ""  # symbol, heading path or YAML key
+
+
+def chunk_chars(text: str, chunk_size: int = 1500, overlap: int = 200) -> List[str]:
+    """Overlapping character windows (fallback for unstructured text)."""
+    chunks = []
+    start = 0
+    while start < len(text):
+        chunks.append(text[start:start + chunk_size])
+        start += chunk_size - overlap
+    return chunks
+
+
+# --- PYTHON ---
+
+_DEF_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def _split_nodes(lines: List[str], body: List[ast.stmt], start: int, end: int, prefix: str,
+                 rest_label: str, max_tokens: int) -> List[Segment]:
+    segments: List[Segment] = []
+    cursor = start
+    for node in body:
+        if not isinstance(node, _DEF_NODES): continue
+        first = min([node.lineno] + [d.lineno for d in node.decorator_list]) - 1
+        while first > cursor and lines[first - 1].lstrip().startswith("#"):
+            first -= 1  # comment block belongs to the definition
+        if first > cursor:
+            segments.append((rest_label, "".join(lines[cursor:first])))
+        label = f"{prefix}{node.name}"
+        text = "".join(lines[first:node.end_lineno])
+        if isinstance(node, ast.ClassDef) and estimate_tokens(text) > max_tokens and \
+                any(isinstance(n, _DEF_NODES) for n in node.body):
+            segments.extend(_split_nodes(lines, node.body, first, node.end_lineno, f"{label}.", label, max_tokens))
+        else:
+            segments.append((label, text))
+        cursor = node.end_lineno
+    if cursor < end:
+        segments.append((rest_label, "".join(lines[cursor:end])))
+    return segments
+
+
+def split_python(text: str, max_tokens: int) -> List[Segment]:
+    tree = ast.parse(text)
+    lines = text.splitlines(keepends=True)
+    return _split_nodes(lines, tree.body, 0, len(lines), "", "module", max_tokens)
+
+
+# --- SHELL ---
+
+_SH_FUNC_RE = re.compile(r"^(?:function\s+([\w:.-]+)\s*(?:\(\s*\))?|([\w:.-]+)\s*\(\s*\))\s*\{?\s*(?:#.*)?$")
+
+
+def _peel_comments(pending: List[str]) -> List[str]:
+    """Trailing comment lines of 'pending' (moved to the following definition)."""
+    cut = len(pending)
+    while cut > 0 and pending[cut - 1].lstrip().startswith("#") and not pending[cut - 1].startswith("#!"):
+        cut -= 1
+    moved = pending[cut:]
+    del pending[cut:]
+    return moved
+
+
+def split_shell(text: str, max_tokens: int) -> List[Segment]:
+    segments: List[Segment] = []
+    pending: List[str] = []
+    func: Optional[str] = None
+    body: List[str] = []
+    for line in text.splitlines(keepends=True):
+        if func is None:
+            match = _SH_FUNC_RE.match(line)
+            if match:
+                lead = _peel_comments(pending)
+                if pending: segments.append(("script", "".join(pending)))
+                pending, func, body = [], match.group(1) or match.group(2), lead + [line]
+                if line.rstrip().endswith("}"):  # one-liner
+                    segments.append((func, "".join(body)))
+                    func = None
+            else:
+                pending.append(line)
+        else:
+            body.append(line)
+            if line.rstrip() == "}":
+                segments.append((func, "".join(body)))
+                func = None
+    if func is not None: segments.append((func, "".join(body)))
+    if pending: segments.append(("script", "".join(pending)))
+    return segments
+
+
+# --- MARKDOWN ---
+
+_MD_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_MD_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+
+
+def split_markdown(text: str, max_tokens: int) -> List[Segment]:
+    segments: List[Segment] = []
+    path: List[Tuple[int, str]] = []
+    current: List[str] = []
+    label = ""
+    fence = None
+    for line in text.splitlines(keepends=True):
+        fence_match = _MD_FENCE_RE.match(line)
+        if fence_match:
+            fence = None if fence == fence_match.group(1) else (fence or fence_match.group(1))
+        heading = None if fence else _MD_HEADING_RE.match(line)
+        if heading:
+            if current: segments.append((label, "".join(current)))
+            level = len(heading.group(1))
+            path = [(lvl, title) for lvl, title in path if lvl < level] + [(level, heading.group(2))]
+            label = " > ".join(title for _, title in path)
+            current = []
+        current.append(line)
+    if current: segments.append((label, "".join(current)))
+    return segments
+
+
+# --- YAML ---
+
+def split_yaml(text: str, max_tokens: int) -> List[Segment]:
+    segments: List[Segment] = []
+    current: List[str] = []
+    label = ""
+    for line in text.splitlines(keepends=True):
+        top_level = line[:1] not in ("", " ", "\t", "#", "\n", "\r", "-", ".") and ":" in line
+        if top_level:
+            lead = _peel_comments(current)
+            if any(l.strip() for l in current): segments.append((label, "".join(current)))
+            current = lead
+            label = line.split(":", 1)[0].strip().strip("\"'")
+        current.append(line)
+    if any(l.strip() for l in current): segments.append((label, "".join(current)))
+    return segments
+
+
+# --- REGISTRY ---
+
+CHUNKERS: Dict[str, Callable[[str, int], List[Segment]]] = {
+    "python": split_python,
+    "shell": split_shell,
+    "markdown": split_markdown,
+    "yaml": split_yaml,
+}
+EXTENSION_KINDS: Dict[str, str] = {
+    ".py": "python", ".sh": "shell", ".bash": "shell",
+    ".md": "markdown", ".markdown": "markdown", ".yml": "yaml", ".yaml": "yaml",
+}
+
+
+def register_chunker(kind: str, fn: Callable[[str, int], List[Segment]], extensions: Iterable[str] = ()):
+    CHUNKERS[kind] = fn
+    for ext in extensions:
+        EXTENSION_KINDS[ext.lower()] = kind
+
+
+def detect_kind(path: str) -> Optional[str]:
+    return EXTENSION_KINDS.get(Path(path.split("?", 1)[0]).suffix.lower()) if path else None
+
+
+# --- PACKING ---
+
+def _split_oversized(text: str, max_tokens: int, overlap_lines: int = 2) -> List[str]:
+    """Line windows below 'max_tokens' (a few lines overlap); over-long lines fall back to characters."""
+    pieces, window, tokens = [], [], 0
+    for line in text.splitlines(keepends=True):
+        t = estimate_tokens(line)
+        if t > max_tokens:
+            if window: pieces.append("".join(window))
+            pieces.extend(chunk_chars(line, max_tokens * 4, max_tokens // 2))
+            window, tokens = [], 0
+            continue
+        if window and tokens + t > max_tokens:
+            pieces.append("".join(window))
+            window = window[-overlap_lines:] if overlap_lines else []
+            tokens = sum(estimate_tokens(l) for l in window)
+            if tokens + t > max_tokens: window, tokens = [], 0
+        window.append(line)
+        tokens += t
+    if window: pieces.append("".join(window))
+    return pieces
+
+
+def _join_labels(labels: List[str]) -> str:
+    unique = [l for l in dict.fromkeys(labels) if l]
+    return ", ".join(unique[:3]) + (", ..." if len(unique) > 3 else "")
+
+
+def pack_segments(segments: List[Segment], max_tokens: int) -> List[Chunk]:
+    """Merges neighbouring small segments up to 'max_tokens' and splits oversized ones."""
+    chunks: List[Chunk] = []
+    buf: List[str] = []
+    labels: List[str] = []
+    tokens = 0
+
+    def flush():
+        nonlocal buf, labels, tokens
+        if buf: chunks.append(Chunk("".join(buf), _join_labels(labels)))
+        buf, labels, tokens = [], [], 0
+
+    for label, text in segments:
+        if not text.strip(): continue
+        t = estimate_tokens(text)
+        if t > max_tokens:
+            flush()
+            chunks.extend(Chunk(piece, label) for piece in _split_oversized(text, max_tokens))
+            continue
+        if tokens + t > max_tokens: flush()
+        buf.append(text)
+        labels.append(label)
+        tokens += t
+    flush()
+    return chunks
+
+
+def chunk_document(text: str, path: str = "", max_tokens: int = DEFAULT_MAX_TOKENS,
+                   kind: Optional[str] = None) -> List[Chunk]:
+    """Structure-aware chunks of 'text'; unknown types and unparsable sources use character windows."""
+    kind = kind or detect_kind(path)
+    splitter = CHUNKERS.get(kind) if kind else None
+    if splitter:
+        try:
+            chunks = pack_segments(splitter(text, max_tokens), max_tokens)
+            if chunks: return chunks
+        except (SyntaxError, ValueError, RecursionError):
+            pass  # e.g. Python 2 sources, templates -> character windows
+    return [Chunk(c) for c in chunk_chars(text, max_tokens * 4, max_tokens // 2) if c.strip()]
+
+
+def chunk_source(text: str, path: str = "", mode: str = "structure",
+                 max_tokens: int = DEFAULT_MAX_TOKENS) -> List[Chunk]:
+    """Chunks for the configured mode ('chars' = legacy 1500/200 character windows)."""
+    if mode == "chars":
+        return [Chunk(c) for c in chunk_chars(text)]
+    return chunk_document(text, path, max_tokens=max_tokens)
+
+
+def with_file_header(filepath: str, chunk: Chunk) -> str:
+    """File (and symbol/section) header gives every code chunk its context (added once)."""
+    if chunk.text.startswith(FILE_HEADER_PREFIX): return chunk.text
+    header = f"{FILE_HEADER_PREFIX}{filepath}" + (f" :: {chunk.label}" if chunk.label else "")
+    return f"{header}\n\n{chunk.text}"
@@ -215,11 +215,15 @@ class CommunityManager:
                 # ------------------------
 
                 if isinstance(data, list):
+                    documents = []
                     for entry in data:
                         meta = entry.get("metadata", {})
                         meta["origin_pack"] = json_file.name
-                        if rag_manager.ingest_document(entry.get("source", ""), entry.get("content", ""), meta):
-                            imported_count += 1
+                        documents.append((entry.get("source", ""), entry.get("content", ""), meta))
+                    stats = rag_manager.ingest_documents(documents)
+                    imported_count += stats["documents"]
+                    self.logger.info(f"{json_file.name}: {stats['documents']} entries, {stats['chunks']} chunks "
+                                     f"({stats['chunks_per_s']} chunks/s)")
                 
                 with open(json_file.with_suffix(".imported"), 'w') as f: f.write(datetime.now().isoformat())
             except Exception as e: self.logger.error(f"Sync failed {json_file.name}: {e}")
@@ -236,7 +240,7 @@ class CommunityManager:
         next_offset = None
         try:
             while True:
-                rec, next_offset = rag_manager.client.scroll("framework_knowledge", limit=100, offset=next_offset, with_payload=True, with_vectors=False)
+                rec, next_offset = rag_manager.client.scroll(rag_manager.collection_name, limit=100, offset=next_offset, with_payload=True, with_vectors=False)
                 all_points.extend(rec)
                 if next_offset is None: break
         except: return None
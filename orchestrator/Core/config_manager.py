@@ -253,6 +253,31 @@ class ConfigManager:
             ConfigSchema("auto_cleanup", bool, False, True, "Enable automatic cleanup"),
             ConfigSchema("docker_registry", str, False, "ghcr.io", "Docker registry URL"),
             ConfigSchema("docker_namespace", str, False, "llm-framework", "Docker namespace"),
+            ConfigSchema("build_workers", list, False, [], "Docker endpoints for distributed builds (name, base_url/context, capacity, labels)"),
+            ConfigSchema("stats_interval", float, False, 2.0, "Resolution of container resource time series (seconds)"),
+            ConfigSchema("model_prefetch", bool, False, True, "Stage model sources into cache/models while the image builds"),
+            ConfigSchema("local_model_mode", str, False, "mount", "Local model sources: 'mount' (read-only, zero copy) or 'copy'", ["regex:^(mount|copy)$"]),
+            ConfigSchema("cache_warm_on_boot", bool, False, False, "Prefetch images, git mirrors and tools in the background at startup"),
+            ConfigSchema("cache_warm_targets", list, False, [], "Targets warmed at boot (empty = all)"),
+            ConfigSchema("cache_warm_tools", list, False, [], "Native tool binaries to provision (name, url, sha256)"),
+            ConfigSchema("git_mirror_max_age_hours", float, False, 24.0, "Refresh warmed git mirrors older than this before a build (0 = never)"),
+            ConfigSchema("cache_quotas", dict, False, {}, "Per-subtree cache quotas in GB (models, builds, calibration, git, tools, images, trivy)"),
+            ConfigSchema("cache_eviction_policy", str, False, "lru", "Cache eviction policy: 'lru' or 'lfu'", ["regex:^(lru|lfu)$"]),
+            ConfigSchema("cache_auto_gc", bool, False, True, "Run quota GC automatically on build admission"),
+            ConfigSchema("disk_preflight", bool, False, True, "Estimate and reserve disk space before admitting a build"),
+            ConfigSchema("disk_safety_margin", float, False, 1.1, "Multiplier applied to estimated F16/quant sizes", ["min:1.0"]),
+            ConfigSchema("disk_min_free_gb", float, False, 2.0, "Free space (GB) never handed out to reservations", ["min:0"]),
+            ConfigSchema("scheduler_policy", str, False, "sjf", "Job order within a request: 'sjf' (shortest predicted first) or 'fifo'", ["regex:^(sjf|fifo)$"]),
+            ConfigSchema("build_status_poll_s", float, False, 30.0, "Workflow jobs re-check build status this often if no completion event arrives", ["min:1"]),
+            ConfigSchema("build_history_db", str, False, "", "SQLite build history (relative to install dir), empty = logs/build_history.db"),
+            ConfigSchema("build_scratch_dir", str, False, "", "Host dir for F16 intermediates (mounted as /build-scratch), empty = container /tmp"),
+            ConfigSchema("shard_mode", str, False, "auto", "Split GGUF builds: 'auto' (above shard_threshold_gb), 'on' or 'off'", ["regex:^(auto|on|off)$"]),
+            ConfigSchema("shard_threshold_gb", float, False, 40.0, "F16 size (GB) from which 'auto' builds run sharded", ["min:1"]),
+            ConfigSchema("shard_max_gb", float, False, 8.0, "Maximum size (GB) per GGUF shard", ["min:1"]),
+            ConfigSchema("warm_pool_enabled", bool, False, True, "Reuse pre-started containers for short jobs (perplexity, bench, trivy)"),
+            ConfigSchema("warm_pool_max_idle", int, False, 2, "Idle warm containers kept per image/volume set"),
+            ConfigSchema("warm_pool_max_uses", int, False, 20, "Executions before a warm container is recycled"),
+            ConfigSchema("warm_pool_idle_timeout", float, False, 300.0, "Seconds before an unused warm container is removed"),
             
             # --- SSOT: Centralized Image Definitions (v2.3) ---
             ConfigSchema("image_trivy", str, False, "aquasec/trivy:latest", "Security Scanner Image"),
@@ -281,6 +306,42 @@ class ConfigManager:
             
             # Local RAG / Vector Database (v1.5.0)
             ConfigSchema("enable_rag_knowledge", bool, False, False, "Enable local Qdrant Vector DB for AI"),
+            ConfigSchema("rag_embedding_backend", str, False, "auto", "Embeddings: 'auto', 'litellm', 'onnx', 'sentence-transformers' or 'hashing' (offline)", ["regex:^(auto|litellm|onnx|sentence-transformers|local|hashing)$"]),
+            ConfigSchema("rag_local_embedding_model", str, False, "", "Local embedding model dir, empty = first one in models/tiny_models"),
+            ConfigSchema("rag_embedding_threads", int, False, 0, "CPU threads for local embeddings (0 = all cores)", ["min:0"]),
+            ConfigSchema("rag_hashing_dim", int, False, 512, "Vector size of the hashing embedding backend", ["min:32"]),
+            ConfigSchema("rag_embed_batch_size", int, False, 96, "Chunks per embedding request (litellm)", ["min:1"]),
+            ConfigSchema("rag_embed_batch_tokens", int, False, 60000, "Token budget per embedding request", ["min:1"]),
+            ConfigSchema("rag_embed_concurrency", int, False, 4, "Embedding requests in flight (litellm)", ["min:1"]),
+            ConfigSchema("rag_embed_retries", int, False, 4, "Retries per failed embedding batch", ["min:0"]),
+            ConfigSchema("rag_embedding_cache", bool, False, True, "Persistent embedding cache (cache/rag/embeddings.db)"),
+            ConfigSchema("rag_embedding_cache_mb", float, False, 512.0, "Size cap of the embedding cache (LRU eviction)", ["min:1"]),
+            ConfigSchema("rag_local_fallback", bool, False, True, "Embedded vector store when Qdrant is unreachable (needs numpy)"),
+            ConfigSchema("rag_local_ivf_lists", int, False, 0, "IVF partitions of the embedded store (0 = exact search)", ["min:0"]),
+            ConfigSchema("rag_snapshot_keep", int, False, 5, "RAG snapshots kept per collection before ingests (0 = keep all)", ["min:0"]),
+            ConfigSchema("rag_local_ivf_nprobe", int, False, 8, "IVF partitions scanned per query", ["min:1"]),
+            ConfigSchema("rag_qdrant_retry_s", float, False, 60.0, "Max backoff between Qdrant reconnect attempts (circuit breaker)", ["min:1"]),
+            ConfigSchema("rag_qdrant_timeout", float, False, 2.0, "Qdrant request timeout (s)", ["min:0.1"]),
+            ConfigSchema("rag_qdrant_grpc", bool, False, False, "Use the gRPC transport for Qdrant"),
+            ConfigSchema("rag_qdrant_grpc_port", int, False, 6334, "Qdrant gRPC port", ["min:1", "max:65535"]),
+            ConfigSchema("rag_qdrant_health_s", float, False, 15.0, "Interval of the background Qdrant health check (s)", ["min:1"]),
+            ConfigSchema("rag_query_cache", bool, False, True, "Cache query embeddings and search results in memory"),
+            ConfigSchema("rag_query_cache_ttl_s", float, False, 600.0, "TTL of cached queries/results (s)", ["min:1"]),
+            ConfigSchema("rag_query_cache_size", int, False, 1024, "Max cached queries and result sets each", ["min:1"]),
+            ConfigSchema("rag_chunker", str, False, "structure", "Chunking: 'structure' (code/Markdown/YAML aware) or 'chars'", ["regex:^(structure|chars)$"]),
+            ConfigSchema("rag_chunk_tokens", int, False, 512, "Max tokens per chunk (structure chunker)", ["min:32"]),
+            ConfigSchema("rag_ingest_readers", int, False, 8, "Threads for directory scan and file reads (codebase ingest)", ["min:1"]),
+            ConfigSchema("rag_ingest_processes", int, False, -1, "Chunking processes (-1 = CPU count, 0 = inline)", ["min:-1"]),
+            ConfigSchema("rag_ingest_embed_workers", int, False, 2, "Concurrent embedding batches in the ingest pipeline", ["min:1"]),
+            ConfigSchema("rag_ingest_queue_size", int, False, 64, "Capacity of each ingest pipeline queue (bounds memory)", ["min:1"]),
+            ConfigSchema("rag_score_threshold", float, False, 0.0, "Dense search cosine cut-off (0 = calibrated per embedding backend)", ["min:0"]),
+            ConfigSchema("rag_hybrid", bool, False, True, "Hybrid retrieval: BM25 + vector search fused with RRF"),
+            ConfigSchema("rag_hybrid_candidates", int, False, 20, "Dense and sparse candidates per query before fusion", ["min:1"]),
+            ConfigSchema("rag_rrf_k", int, False, 60, "Reciprocal Rank Fusion constant", ["min:1"]),
+            ConfigSchema("rag_sparse_min_score", float, False, 0.5, "Normalized BM25 score a hit without a dense match needs (0-1)", ["min:0", "max:1"]),
+            ConfigSchema("rag_reranker_model", str, False, "", "Local cross-encoder model dir for reranking (empty = off)"),
+            ConfigSchema("rag_rerank_candidates", int, False, 20, "Fused candidates scored by the reranker", ["min:1"]),
+            ConfigSchema("rag_rerank_batch_size", int, False, 16, "(query, chunk) pairs per reranker batch", ["min:1"]),
             
             # Deep Crawler Settings (v1.6.0)
             ConfigSchema("crawler_respect_robots", bool, False, True, "Respect robots.txt rules"),
@@ -474,7 +535,16 @@ class ConfigManager:
                 # v2.3
                 "image_trivy", "image_qdrant", "image_base_debian", "image_inference_runtime",
                 # v2.4 (SSOT & IMatrix)
-                "source_repositories", "default_enable_imatrix", "default_calibration_dataset"
+                "source_repositories", "default_enable_imatrix", "default_calibration_dataset",
+                # v2.5 (Build Infrastructure)
+                "build_workers", "cache_warm_on_boot", "cache_warm_targets", "cache_warm_tools",
+                "git_mirror_max_age_hours", "cache_quotas", "cache_eviction_policy", "cache_auto_gc",
+                "disk_preflight", "disk_safety_margin", "build_scratch_dir", "scheduler_policy",
+                "shard_mode", "shard_threshold_gb", "shard_max_gb",
+                # v2.5 (RAG)
+                "rag_embedding_backend", "rag_local_embedding_model", "rag_embedding_cache_mb", "rag_local_fallback",
+                "rag_local_ivf_lists", "rag_snapshot_keep", "rag_qdrant_grpc", "rag_score_threshold", "rag_hybrid", "rag_reranker_model",
+                "rag_chunker", "rag_chunk_tokens", "rag_ingest_processes"
             ]
             
             for key, val in self.config_values.items():
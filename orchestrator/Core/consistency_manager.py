@@ -12,17 +12,39 @@ Updates v2.0.1:
 - Removed hardcoded assumptions.
 - Implemented dynamic parsing of Target Dockerfiles to determine required SDK versions.
 - Strict mapping of CUDA/Driver versions based on NVIDIA compatibility matrix.
+
+Updates v2.5.0:
+- Matrix Preflight: evaluate_matrix() prüft alle Jobs eines Requests vor dem ersten Container.
+- Caching von Hardware-Profil, Target-Definitionen und Dockerfile CUDA-Versionen (mtime-basiert).
+- Quantisierungs-Support Check (RKNN / target.yml output formats).
 """
 
 import logging
 import re
+import yaml
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
 from packaging import version
 from orchestrator.utils.logging import get_logger
 
+# Parameter count in model names: '7b', '0.5b', '8x7b' (MoE); not the '7b' in '27b'
+PARAM_COUNT_PATTERN = re.compile(r"(?<![a-z0-9.])(?:(\d+)x)?(\d+(?:\.\d+)?)b(?![a-z0-9])")
+# (max. parameters in billions, host RAM in MB needed for conversion)
+RAM_REQUIREMENTS_MB = [(3.0, 4000), (8.0, 8000), (14.0, 16000), (34.0, 32000)]
+RAM_REQUIREMENT_MAX_MB = 48000
+RAM_REQUIREMENT_DEFAULT_MB = 4000
+
+
+def parse_param_billions(model_name: str) -> Optional[float]:
+    """Parameter count (billions) from a model name, None if it names none."""
+    match = PARAM_COUNT_PATTERN.search(model_name.lower())
+    if not match: return None
+    experts = int(match.group(1)) if match.group(1) else 1
+    return experts * float(match.group(2))
+
+
 @dataclass
 class ConsistencyIssue:
     component: str
@@ -38,10 +60,23 @@ class ConsistencyManager:
     Validates prerequisites before execution using semantic versioning.
     """
     
+    # Quantisierungen, die rknn_module.sh explizit abbildet (Fallback, falls das Modul fehlt).
+    # Quelle der Wahrheit ist die case-Zuordnung im Modul, siehe _load_rknn_quants().
+    RKNN_QUANTS = {"INT8": "i8", "i8": "i8", "Q8_0": "i8", "FP16": "fp16", "f16": "fp16"}
+    _RKNN_CASE_RE = re.compile(r'^\s*((?:"[^"]+"\s*\|?\s*)+)\)\s*Q_TYPE="?([\w.-]+)"?')
+    _RKNN_DEFAULT_RE = re.compile(r'^\s*\*\)[^\n]*?Q_TYPE="?([\w.-]+)"?')
+
     def __init__(self, framework_manager):
         self.logger = get_logger(__name__)
+        # Accept FrameworkManager or ConfigManager directly (Orchestrator standalone)
         self.framework = framework_manager
-        self.config = framework_manager.config
+        self.config = getattr(framework_manager, 'config', None) or framework_manager
+        
+        # Preflight Caches: key -> (mtime signature, value)
+        self._profile_cache: Optional[Tuple[float, Optional[Dict[str, str]]]] = None
+        self._cuda_cache: Dict[str, Tuple[Tuple[float, ...], str]] = {}
+        self._target_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._rknn_cache: Dict[str, Tuple[float, Tuple[Dict[str, str], str]]] = {}
         
         # NVIDIA Compatibility Matrix (Lookup Table)
         # Maps CUDA Toolkit Version -> Minimum Linux Driver Version
@@ -68,23 +103,28 @@ class ConsistencyManager:
     def check_build_compatibility(self, build_config: Dict[str, Any]) -> List[ConsistencyIssue]:
         """Haupt-Prüfmethode."""
         issues = []
-        target = build_config.get("target", "").lower()
+        target = build_config.get("target", "")
+        target_key = target.lower()
+        
+        # 0. Statische Checks (unabhängig von der Hardware)
+        issues.extend(self._check_quantization_support(build_config, target))
         
         # 1. Lade Hardware-Profil (Ist-Zustand)
         hw_profile = self._load_hardware_profile()
         if not hw_profile:
             self.logger.warning("No hardware profile found (target_hardware_config.txt). Skipping consistency checks.")
             # In strict mode, this might be an error, but for flexibility we allow it with warning
-            return []
+            return issues
 
         self.logger.info(f"Running Consistency Check for Target: {target}...")
 
         # 2. Router zu spezifischen Checks
-        if "rockchip" in target:
+        if "rockchip" in target_key:
             issues.extend(self._check_rockchip(hw_profile, build_config))
-        elif "nvidia" in target or "cuda" in target:
+        elif "nvidia" in target_key or "cuda" in target_key or \
+                (build_config.get("use_gpu") and (Path(self.config.targets_dir) / target / "Dockerfile.gpu").exists()):
             issues.extend(self._check_nvidia(hw_profile, build_config, target))
-        elif "intel" in target:
+        elif "intel" in target_key:
             issues.extend(self._check_intel(hw_profile, build_config))
 
         # 3. Ressourcen Checks
@@ -92,9 +132,46 @@ class ConsistencyManager:
 
         return issues
 
+    def evaluate_matrix(self, jobs: List[Dict[str, Any]]) -> Dict[str, List[ConsistencyIssue]]:
+        """
+        Preflight für die komplette Build-Matrix.
+        Jeder Job ist ein build_config Dict mit zusätzlichem 'job_id'.
+        Identische Kombinationen werden nur einmal geprüft.
+        """
+        results: Dict[str, List[ConsistencyIssue]] = {}
+        memo: Dict[Tuple, List[ConsistencyIssue]] = {}
+        
+        for job in jobs:
+            key = tuple(sorted((k, str(v)) for k, v in job.items() if k != "job_id"))
+            if key not in memo:
+                memo[key] = self.check_build_compatibility(job)
+            results[job["job_id"]] = memo[key]
+            
+        blocked = sum(1 for issues in results.values() if self.is_blocking(issues))
+        self.logger.info(f"Preflight evaluated {len(jobs)} jobs ({len(memo)} unique): {blocked} blocked.")
+        return results
+
+    @staticmethod
+    def is_blocking(issues: List[ConsistencyIssue]) -> bool:
+        return any(i.severity == "ERROR" for i in issues)
+
+    @staticmethod
+    def _mtime(path: Path) -> float:
+        try: return path.stat().st_mtime
+        except OSError: return -1.0
+
     def _load_hardware_profile(self) -> Optional[Dict[str, str]]:
-        """Liest die target_hardware_config.txt aus dem Cache."""
+        """Liest die target_hardware_config.txt aus dem Cache (gecached bis zur nächsten Änderung)."""
         profile_path = Path(self.config.cache_dir) / "target_hardware_config.txt"
+        mtime = self._mtime(profile_path)
+        if self._profile_cache and self._profile_cache[0] == mtime:
+            return self._profile_cache[1]
+        
+        profile = self._parse_hardware_profile(profile_path)
+        self._profile_cache = (mtime, profile)
+        return profile
+
+    def _parse_hardware_profile(self, profile_path: Path) -> Optional[Dict[str, str]]:
         if not profile_path.exists():
             return None
             
@@ -122,13 +199,24 @@ class ConsistencyManager:
         """
         Determines the CUDA version required by the target's Dockerfile.
         Scans targets/{name}/Dockerfile for 'FROM ...cuda:X.Y'.
+        Result is cached per target until one of the Dockerfiles changes.
         """
         # Path resolution
         target_dir = Path(self.config.targets_dir) / target_name
+        candidates = [target_dir / fname for fname in ["Dockerfile.gpu", "Dockerfile"]]
+        signature = tuple(self._mtime(p) for p in candidates)
         
+        cached = self._cuda_cache.get(target_name)
+        if cached and cached[0] == signature:
+            return cached[1]
+        
+        ver = self._parse_cuda_version(target_name, candidates)
+        self._cuda_cache[target_name] = (signature, ver)
+        return ver
+
+    def _parse_cuda_version(self, target_name: str, candidates: List[Path]) -> str:
         # Try Dockerfile.gpu first (Priority), then Dockerfile
-        for fname in ["Dockerfile.gpu", "Dockerfile"]:
-            fpath = target_dir / fname
+        for fpath in candidates:
             if fpath.exists():
                 try:
                     content = fpath.read_text(encoding="utf-8")
@@ -137,16 +225,101 @@ class ConsistencyManager:
                     match = re.search(r'cuda:(\d+\.\d+)', content)
                     if match:
                         ver = match.group(1)
-                        self.logger.debug(f"Detected CUDA Requirement {ver} from {fname}")
+                        self.logger.debug(f"Detected CUDA Requirement {ver} from {fpath.name}")
                         return ver
                 except Exception as e:
-                    self.logger.warning(f"Failed to parse {fname}: {e}")
+                    self.logger.warning(f"Failed to parse {fpath.name}: {e}")
         
         self.logger.warning(f"Could not detect CUDA version in {target_name} Dockerfiles. Assuming baseline 11.8.")
         return "11.8" # Safe fallback
 
+    def _load_target_definition(self, target_name: str) -> Dict[str, Any]:
+        """Lädt target.yml (gecached, mtime-basiert)."""
+        path = Path(self.config.targets_dir) / target_name / "target.yml"
+        mtime = self._mtime(path)
+        cached = self._target_cache.get(target_name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        data: Dict[str, Any] = {}
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = yaml.safe_load(f) or {}
+            except Exception as e:
+                self.logger.warning(f"Failed to parse {path}: {e}")
+        self._target_cache[target_name] = (mtime, data)
+        return data
+
+    def _load_rknn_quants(self, target_name: str) -> Tuple[Dict[str, str], str]:
+        """
+        Quantisierungs-Zuordnung aus rknn_module.sh (case "${QUANTIZATION}"): (Wert -> Q_TYPE, Default).
+        Targets ohne eigenes Modul nutzen das Rockchip-Modul; ohne Modul gilt RKNN_QUANTS.
+        """
+        targets_dir = Path(self.config.targets_dir)
+        path = targets_dir / target_name / "modules" / "rknn_module.sh"
+        if not path.exists():
+            path = targets_dir / "Rockchip" / "modules" / "rknn_module.sh"
+        mtime = self._mtime(path)
+        cached = self._rknn_cache.get(str(path))
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        mapping: Dict[str, str] = {}
+        default = "i8"
+        if path.exists():
+            try:
+                for line in path.read_text(encoding="utf-8").splitlines():
+                    match = self._RKNN_CASE_RE.match(line)
+                    if match:
+                        for value in re.findall(r'"([^"]+)"', match.group(1)):
+                            mapping[value] = match.group(2)
+                        continue
+                    match = self._RKNN_DEFAULT_RE.match(line)
+                    if match: default = match.group(1)
+            except Exception as e:
+                self.logger.warning(f"Failed to parse {path}: {e}")
+        result = (mapping or dict(self.RKNN_QUANTS), default)
+        self._rknn_cache[str(path)] = (mtime, result)
+        return result
+
     # --- SPECIFIC CHECKS ---
 
+    def _check_quantization_support(self, cfg: Dict[str, Any], target_name: str) -> List[ConsistencyIssue]:
+        issues = []
+        quant = str(cfg.get("quantization") or "").upper()
+        fmt = str(cfg.get("format", "")).lower()
+        if not quant:
+            return issues
+
+        if fmt == "rknn":
+            # Modul vergleicht case-sensitiv: Rohwert prüfen, nicht den upper()-Wert
+            raw = str(cfg.get("quantization")).strip()
+            mapping, default = self._load_rknn_quants(target_name)
+            if raw not in mapping:
+                issues.append(ConsistencyIssue(
+                    component="Quantization", severity="WARNING",
+                    message=f"Quantization '{raw}' is not mapped by rknn_module.sh; the module falls back to '{default}'.",
+                    detected_value=raw, required_value="/".join(sorted(mapping)),
+                    suggested_fix=f"Use one of {', '.join(sorted(mapping))} to select the RKNN quantization explicitly."
+                ))
+            return issues
+
+        # Output-Formate aus target.yml (z.B. GGUF -> quantization_methods)
+        outputs = (self._load_target_definition(target_name).get("supported_formats", {}) or {}).get("output", []) or []
+        for out in outputs:
+            if not isinstance(out, dict) or str(out.get("name", "")).lower() != fmt:
+                continue
+            methods = [str(m).upper() for m in out.get("quantization_methods", []) or []]
+            if methods and quant not in methods and quant not in ("F16", "FP16", "F32"):
+                issues.append(ConsistencyIssue(
+                    component="Quantization", severity="ERROR",
+                    message=f"Target '{target_name}' does not support {fmt.upper()} quantization '{quant}'.",
+                    detected_value=quant, required_value=", ".join(methods),
+                    suggested_fix="Choose one of the quantization methods listed in target.yml."
+                ))
+        return issues
+
     def _check_rockchip(self, hw: Dict[str, str], cfg: Dict[str, str]) -> List[ConsistencyIssue]:
         issues = []
         
@@ -225,14 +398,17 @@ class ConsistencyManager:
             total_ram = int(hw.get("Total_RAM_MB", 0))
             model_name = str(cfg.get("model_name", "")).lower()
             
-            req = 4000
-            if "7b" in model_name: req = 8000
-            if "13b" in model_name: req = 16000
-            if "70b" in model_name: req = 48000
+            params = parse_param_billions(model_name)
+            req = RAM_REQUIREMENT_DEFAULT_MB
+            if params is not None:
+                req = next((mb for limit, mb in RAM_REQUIREMENTS_MB if params <= limit), RAM_REQUIREMENT_MAX_MB)
             
             if total_ram > 0 and total_ram < req:
+                 # Unter der Hälfte des Bedarfs rettet auch Swap den Build nicht mehr.
+                 # Ohne bekannte Modellgröße bleibt es eine Warnung (Job wird nicht verworfen).
+                 blocking = params is not None and total_ram < req / 2
                  issues.append(ConsistencyIssue(
-                    component="RAM", severity="WARNING",
+                    component="RAM", severity="ERROR" if blocking else "WARNING",
                     message=f"Low RAM for model {model_name}.",
                     detected_value=f"{total_ram} MB", required_value=f">{req} MB",
                     suggested_fix="Ensure Swap is active or choose smaller model."
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Warm Container Pool (v2.5.0)
+DIREKTIVE: Goldstandard, kurze Jobs ohne Kaltstart.
+
+Zweck:
+Hält pro (Image, Volumes) vorgestartete, idle Laufzeit-Container bereit und führt
+kurze Kommandos (llama-perplexity, llama-bench, trivy) per 'exec' darin aus.
+Container-Erstellung, Runtime-Init und Layer-Mount fallen nur einmal an –
+compare_quantizations über 8 Kandidaten zahlt einen statt 8 Kaltstarts.
+
+Lebenszyklus:
+- Health Check vor jeder Ausleihe (container.reload() -> status 'running').
+- Recycling nach 'max_uses' Ausführungen oder 'max_age' Sekunden.
+- Idle-Container älter als 'idle_timeout' werden bei jeder Rückgabe entfernt.
+- Verwaiste Pool-Container werden per Label aufgeräumt: jeder Container trägt die
+  Instanz-ID, Host, PID und Startzeit seines Prozesses. Entfernt werden nur
+  Container, deren Besitzer nicht mehr läuft oder die älter als 'max_age' sind –
+  warme Container paralleler Prozesse am selben Daemon bleiben unangetastet.
+
+Volumes sind Teil des Pool-Schlüssels, da Bind-Mounts nur beim Erzeugen gesetzt werden.
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Callable, Tuple
+
+from orchestrator.utils.logging import get_logger
+
+LABEL_POOL = "llm-framework.pool"
+LABEL_OWNER = "llm-framework.pool-owner"      # per-process instance id
+LABEL_OWNER_HOST = "llm-framework.pool-host"
+LABEL_OWNER_PID = "llm-framework.pool-pid"
+LABEL_OWNER_STARTED = "llm-framework.pool-started"  # owner process start (epoch s)
+LABEL_CREATED = "llm-framework.pool-created"  # container creation (epoch s)
+
+INSTANCE_ID = uuid.uuid4().hex[:12]
+
+
+def _process_start() -> float:
+    try:
+        import psutil
+        return psutil.Process().create_time()
+    except Exception:
+        return time.time()
+
+
+PROCESS_STARTED = _process_start()
+
+
+def owner_labels() -> Dict[str, str]:
+    """Labels identifying this process as owner of a pool container."""
+    return {
+        LABEL_OWNER: INSTANCE_ID,
+        LABEL_OWNER_HOST: socket.gethostname(),
+        LABEL_OWNER_PID: str(os.getpid()),
+        LABEL_OWNER_STARTED: f"{PROCESS_STARTED:.0f}",
+    }
+
+
+def _owner_alive(labels: Dict[str, str]) -> Optional[bool]:
+    """True/False for owners on this host, None if liveness cannot be checked."""
+    if labels.get(LABEL_OWNER_HOST) != socket.gethostname():
+        return None
+    try:
+        pid = int(labels.get(LABEL_OWNER_PID, ""))
+        started = float(labels.get(LABEL_OWNER_STARTED, ""))
+    except ValueError:
+        return None
+    try:
+        import psutil
+        try:
+            # Start time guards against PID reuse by an unrelated process
+            return abs(psutil.Process(pid).create_time() - started) < 2.0
+        except psutil.NoSuchProcess:
+            return False
+    except ImportError:
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+# Hält den Container ohne eigenen Prozess am Leben; Jobs laufen per exec
+KEEPALIVE_CMD = ["sh", "-c", "trap 'exit 0' TERM; while :; do sleep 3600 & wait $!; done"]
+
+
+@dataclass
+class PooledContainer:
+    key: Tuple[str, str]
+    container: Any
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    uses: int = 0
+
+
+class WarmContainerPool:
+    """Pool idle Container je Docker-Client. Thread-safe."""
+
+    def __init__(self, client, config_manager=None, name: str = "local"):
+        self.logger = get_logger("ContainerPool")
+        self.client = client
+        self.config = config_manager
+        self.name = name
+
+        self.enabled = bool(self._get_conf("warm_pool_enabled", True))
+        self.max_idle = int(self._get_conf("warm_pool_max_idle", 2))
+        self.max_uses = int(self._get_conf("warm_pool_max_uses", 20))
+        self.max_age = float(self._get_conf("warm_pool_max_age", 3600.0))
+        self.idle_timeout = float(self._get_conf("warm_pool_idle_timeout", 300.0))
+
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str], List[PooledContainer]] = {}
+        self._busy: Dict[str, PooledContainer] = {}
+        self.stats = {"cold_starts": 0, "warm_hits": 0, "recycled": 0}
+
+    def _get_conf(self, key: str, default: Any = None) -> Any:
+        if self.config:
+            if hasattr(self.config, 'get'):
+                return self.config.get(key, default)
+            return getattr(self.config, key, default)
+        return default
+
+    @staticmethod
+    def _key(image: str, volumes: Optional[Dict[str, Dict[str, str]]]) -> Tuple[str, str]:
+        vols = ",".join(f"{h}:{v.get('bind')}:{v.get('mode', 'rw')}" for h, v in sorted((volumes or {}).items()))
+        return image, vols
+
+    # --- LIFECYCLE ---
+
+    def _create(self, key: Tuple[str, str], image: str, volumes, **kwargs) -> PooledContainer:
+        container = self.client.containers.run(
+            image,
+            entrypoint=KEEPALIVE_CMD[:1],
+            command=KEEPALIVE_CMD[1:],
+            volumes=volumes or {},
+            labels={LABEL_POOL: self.name, LABEL_CREATED: f"{time.time():.0f}", **owner_labels()},
+            name=f"llm-warm-{uuid.uuid4().hex[:10]}",
+            detach=True,
+            **kwargs
+        )
+        self.stats["cold_starts"] += 1
+        self.logger.debug(f"Started warm container {container.name} for {image}")
+        return PooledContainer(key=key, container=container)
+
+    def _healthy(self, pc: PooledContainer) -> bool:
+        if pc.uses >= self.max_uses or time.time() - pc.created_at > self.max_age:
+            return False
+        try:
+            pc.container.reload()
+            return pc.container.status == "running"
+        except Exception:
+            return False
+
+    def _discard(self, pc: PooledContainer):
+        self.stats["recycled"] += 1
+        try:
+            pc.container.remove(force=True)
+        except Exception as e:
+            self.logger.debug(f"Failed to remove pooled container: {e}")
+
+    def _acquire(self, image: str, volumes, **kwargs) -> PooledContainer:
+        key = self._key(image, volumes)
+        while True:
+            with self._lock:
+                candidates = self._idle.get(key, [])
+                pc = candidates.pop() if candidates else None
+            if pc is None:
+                pc = self._create(key, image, volumes, **kwargs)
+                break
+            if self._healthy(pc):
+                self.stats["warm_hits"] += 1
+                break
+            self._discard(pc)
+
+        with self._lock:
+            self._busy[pc.container.id] = pc
+        return pc
+
+    def _release(self, pc: PooledContainer, reusable: bool = True):
+        pc.uses += 1
+        pc.last_used = time.time()
+        with self._lock:
+            self._busy.pop(pc.container.id, None)
+            idle = self._idle.setdefault(pc.key, [])
+            keep = reusable and pc.uses < self.max_uses and len(idle) < self.max_idle
+            if keep: idle.append(pc)
+        if not keep:
+            self._discard(pc)
+        self.prune()
+
+    def prewarm(self, image: str, volumes: Optional[Dict[str, Dict[str, str]]] = None, count: int = 1, **kwargs):
+        """Startet vorab 'count' idle Container (z.B. vor einer Quant-Vergleichsserie)."""
+        if not self.enabled: return
+        key = self._key(image, volumes)
+        with self._lock:
+            missing = min(count, self.max_idle) - len(self._idle.get(key, []))
+        for _ in range(max(0, missing)):
+            pc = self._create(key, image, volumes, **kwargs)
+            with self._lock:
+                self._idle.setdefault(key, []).append(pc)
+
+    def prune(self, max_idle_seconds: Optional[float] = None) -> int:
+        """Entfernt Container, die länger als idle_timeout ungenutzt sind."""
+        limit = self.idle_timeout if max_idle_seconds is None else max_idle_seconds
+        now = time.time()
+        expired = []
+        with self._lock:
+            for key, idle in self._idle.items():
+                keep = [pc for pc in idle if now - pc.last_used <= limit]
+                expired.extend(pc for pc in idle if now - pc.last_used > limit)
+                self._idle[key] = keep
+        for pc in expired:
+            self._discard(pc)
+        return len(expired)
+
+    def shutdown(self):
+        """Entfernt alle Pool-Container (idle und busy)."""
+        with self._lock:
+            all_pcs = [pc for idle in self._idle.values() for pc in idle] + list(self._busy.values())
+            self._idle.clear()
+            self._busy.clear()
+        for pc in all_pcs:
+            self._discard(pc)
+
+    def cleanup_orphans(self) -> int:
+        """
+        Entfernt Pool-Container, die ein abgestürzter Prozess hinterlassen hat.
+        Container laufender Prozesse (auch auf anderen Hosts am selben Daemon)
+        werden erst nach 'max_age' entfernt, eigene nie. Container ohne
+        Besitzer-Labels (ältere Versionen) gelten als verwaist.
+        """
+        removed = 0
+        now = time.time()
+        try:
+            for c in self.client.containers.list(all=True, filters={"label": f"{LABEL_POOL}={self.name}"}):
+                labels = c.labels or {}
+                if labels.get(LABEL_OWNER) == INSTANCE_ID:
+                    continue
+                try:
+                    age = now - float(labels[LABEL_CREATED])
+                except (KeyError, ValueError):
+                    age = None
+                alive = _owner_alive(labels) if LABEL_OWNER in labels else None
+                if alive is False or age is None or age > self.max_age:
+                    c.remove(force=True)
+                    removed += 1
+        except Exception as e:
+            self.logger.debug(f"Orphan cleanup failed: {e}")
+        if removed:
+            self.logger.info(f"Removed {removed} orphaned warm container(s) on worker '{self.name}'")
+        return removed
+
+    # --- EXECUTION ---
+
+    def run(self, image: str, command: List[str], volumes: Optional[Dict[str, Dict[str, str]]] = None,
+            environment: Optional[Dict[str, str]] = None, workdir: Optional[str] = None,
+            on_output: Optional[Callable[[str], None]] = None, **create_kwargs) -> Tuple[int, str]:
+        """
+        Führt 'command' (volles argv, Entrypoint des Images wird ignoriert) aus.
+        Returns (exit_code, combined stdout/stderr). Bei deaktiviertem Pool
+        wird wie bisher ein Einweg-Container gestartet.
+        """
+        if not self.enabled:
+            return self._run_cold(image, command, volumes, environment, workdir, on_output, **create_kwargs)
+
+        pc = self._acquire(image, volumes, **create_kwargs)
+        reusable = True
+        try:
+            api = self.client.api
+            exec_id = api.exec_create(pc.container.id, command, stdout=True, stderr=True,
+                                      environment=environment, workdir=workdir)["Id"]
+            chunks = []
+            for chunk in api.exec_start(exec_id, stream=True):
+                text = chunk.decode('utf-8', errors='replace')
+                chunks.append(text)
+                if on_output:
+                    for line in text.splitlines():
+                        if line.strip(): on_output(line)
+            exit_code = api.exec_inspect(exec_id).get("ExitCode")
+            return (exit_code if exit_code is not None else 1), "".join(chunks)
+        except Exception:
+            reusable = False
+            raise
+        finally:
+            self._release(pc, reusable)
+
+    def _run_cold(self, image, command, volumes, environment, workdir, on_output, **create_kwargs) -> Tuple[int, str]:
+        container = self.client.containers.run(
+            image, entrypoint=command[:1], command=command[1:], volumes=volumes or {},
+            environment=environment, working_dir=workdir, detach=True, **create_kwargs
+        )
+        try:
+            chunks = []
+            for chunk in container.logs(stream=True, follow=True):
+                text = chunk.decode('utf-8', errors='replace')
+                chunks.append(text)
+                if on_output and text.strip(): on_output(text.rstrip())
+            exit_code = container.wait().get('StatusCode', 1)
+            return exit_code, "".join(chunks)
+        finally:
+            try: container.remove(force=True)
+            except Exception: pass
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            idle = sum(len(v) for v in self._idle.values())
+            busy = len(self._busy)
+        return {"worker": self.name, "enabled": self.enabled, "idle": idle, "busy": busy, **self.stats}
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Stage Cost Model (v2.5.0)
+DIREKTIVE: Goldstandard, datengetrieben statt fester Prozentwerte.
+
+Zweck:
+Lernt aus der Build History (BuildHistoryStore) die Dauer jeder Build-Stage
+und sagt damit Laufzeiten, ETAs und Queue-Fertigstellungszeiten vorher.
+
+Modell je Stage:
+    dauer = a + b * modellgröße_gb   (kleinste Quadrate, a, b >= 0)
+Bei zu wenigen/unskalierten Samples: Median der Dauer.
+
+Schlüssel (spezifisch -> allgemein, erster mit genug Samples gewinnt):
+    (target, quantization, host) -> (target, quantization) -> (target,) -> ()
+
+Verwendung:
+- BuildEngine: ETA + zeitbasierter Fortschritt laufender Builds.
+- LLMOrchestrator: Shortest-Job-First Reihenfolge, Workflow-ETA.
+"""
+
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Tuple
+
+from orchestrator.utils.logging import get_logger
+
+GB = 1024 ** 3
+
+# Fallback ohne History (grobe Erfahrungswerte eines 7B Q4 Builds auf x86)
+DEFAULT_STAGE_SECONDS = {
+    "Preparing env": 1.0, "Generating Dockerfile": 2.0, "Building Image": 300.0,
+    "Waiting for model download": 0.0, "Calculating IMatrix": 600.0,
+    "Running modules": 900.0, "Extracting": 20.0, "Archiving": 60.0,
+}
+
+
+@dataclass
+class StageFit:
+    intercept: float
+    slope: float = 0.0          # seconds per GB of model weights
+    samples: int = 0
+
+    def predict(self, size_gb: Optional[float]) -> float:
+        return max(0.0, self.intercept + self.slope * (size_gb or 0.0))
+
+
+@dataclass
+class BuildEstimate:
+    stages: Dict[str, float] = field(default_factory=dict)   # ordered stage -> seconds
+    samples: int = 0                                          # 0 = defaults only
+
+    @property
+    def total(self) -> float:
+        return sum(self.stages.values())
+
+
+def _fit(points: List[Tuple[float, Optional[float]]]) -> StageFit:
+    durations = [d for d, _ in points]
+    sized = [(d, s) for d, s in points if s]
+    if len(sized) >= 3 and len({round(s, 2) for _, s in sized}) >= 2:
+        n = len(sized)
+        mx = sum(s for _, s in sized) / n
+        my = sum(d for d, _ in sized) / n
+        var = sum((s - mx) ** 2 for _, s in sized)
+        slope = max(0.0, sum((s - mx) * (d - my) for d, s in sized) / var) if var else 0.0
+        intercept = max(0.0, my - slope * mx)
+        return StageFit(intercept, slope, len(points))
+    return StageFit(statistics.median(durations), 0.0, len(points))
+
+
+class StageCostModel:
+    """Per-stage duration predictor trained on the persistent build history."""
+
+    def __init__(self, history=None, min_samples: int = 2, max_records: int = 5000, refit_interval: float = 60.0):
+        self.logger = get_logger("CostModel")
+        self.history = history
+        self.min_samples = min_samples
+        self.max_records = max_records
+        self.refit_interval = refit_interval
+        self._lock = threading.Lock()
+        self._fits: Dict[Tuple, Dict[str, StageFit]] = {}
+        self._stage_order: Dict[Tuple, List[str]] = {}
+        self._fitted_at = 0.0
+        self._stale = True
+
+    # --- TRAINING ---
+
+    @staticmethod
+    def _levels(target: str, quant: Optional[str], host: Optional[str]) -> List[Tuple]:
+        quant = (quant or "").upper()
+        return [(target, quant, host or ""), (target, quant), (target,), ()]
+
+    def invalidate(self):
+        """Marks the model stale (a build finished); refit happens lazily."""
+        self._stale = True
+
+    def fit(self, records: Optional[List[Any]] = None):
+        """Trains from BuildRecords (default: recent completed builds in the history)."""
+        if records is None:
+            records = self.history.query(limit=self.max_records, status="completed") if self.history else []
+        points: Dict[Tuple, Dict[str, List[Tuple[float, Optional[float]]]]] = {}
+        order: Dict[Tuple, List[str]] = {}
+        for r in records:
+            if not r.stage_timings: continue
+            size_gb = (r.model_size_bytes or 0) / GB or None
+            for level in self._levels(r.target, r.quantization, r.worker):
+                per_stage = points.setdefault(level, {})
+                for stage, secs in r.stage_timings.items():
+                    per_stage.setdefault(stage, []).append((float(secs), size_gb))
+                # Stage order of the newest record at this level (records are newest first)
+                order.setdefault(level, list(r.stage_timings))
+
+        fits = {level: {stage: _fit(pts) for stage, pts in stages.items()} for level, stages in points.items()}
+        with self._lock:
+            self._fits, self._stage_order = fits, order
+            self._fitted_at = time.monotonic()
+            self._stale = False
+
+    def _ensure_fitted(self):
+        if not self._fitted_at or (self._stale and time.monotonic() - self._fitted_at >= self.refit_interval):
+            try:
+                self.fit()
+            except Exception as e:
+                self.logger.warning(f"Cost model refit failed: {e}")
+                self._fitted_at = time.monotonic()
+
+    # --- PREDICTION ---
+
+    def predict(self, target: str, quantization: Optional[str] = None, host: Optional[str] = None,
+                model_size_bytes: int = 0, use_imatrix: bool = False) -> BuildEstimate:
+        """Predicted duration per stage (ordered) for a build that has not started yet."""
+        self._ensure_fitted()
+        size_gb = model_size_bytes / GB if model_size_bytes else None
+        levels = self._levels(target, quantization, host)
+        with self._lock:
+            order = next((self._stage_order[l] for l in levels if l in self._stage_order), None)
+            stages = list(order or DEFAULT_STAGE_SECONDS)
+            if use_imatrix and "Calculating IMatrix" not in stages:
+                stages.insert(stages.index("Running modules") if "Running modules" in stages else len(stages),
+                              "Calculating IMatrix")
+            elif not use_imatrix and "Calculating IMatrix" in stages:
+                stages.remove("Calculating IMatrix")
+
+            estimate = BuildEstimate()
+            for stage in stages:
+                fit = next((self._fits[l][stage] for l in levels
+                            if stage in self._fits.get(l, {}) and self._fits[l][stage].samples >= self.min_samples), None)
+                if fit:
+                    estimate.stages[stage] = round(fit.predict(size_gb), 1)
+                    estimate.samples = max(estimate.samples, fit.samples)
+                else:
+                    estimate.stages[stage] = DEFAULT_STAGE_SECONDS.get(stage, 0.0)
+        return estimate
+
+    @staticmethod
+    def remaining(estimate: BuildEstimate, current_stage: str, stage_elapsed: float,
+                  finished: Optional[Dict[str, float]] = None) -> float:
+        """Seconds left for a running build in 'current_stage' for 'stage_elapsed' seconds."""
+        stages = list(estimate.stages)
+        if current_stage not in stages:
+            done = set(finished or {})
+            return sum(v for k, v in estimate.stages.items() if k not in done)
+        idx = stages.index(current_stage)
+        left = max(estimate.stages[current_stage] - stage_elapsed, 0.0)
+        return left + sum(estimate.stages[s] for s in stages[idx + 1:])
+
+    @staticmethod
+    def schedule(durations: Dict[str, float], slots: int, busy_until: Optional[List[float]] = None,
+                 shortest_first: bool = True) -> Dict[str, float]:
+        """
+        List scheduling on 'slots' parallel workers. Returns job -> completion time
+        (seconds from now). busy_until: remaining seconds of already running builds.
+        """
+        slots = max(1, slots)
+        free = (sorted(busy_until or []) + [0.0] * slots)[:slots]
+        jobs = sorted(durations.items(), key=lambda kv: kv[1]) if shortest_first else list(durations.items())
+        done = {}
+        for job, dur in jobs:
+            free.sort()
+            start = free[0]
+            free[0] = start + dur
+            done[job] = free[0]
+        return done
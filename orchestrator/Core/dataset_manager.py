@@ -10,6 +10,9 @@ automatisierte Qualitätsmessungen (Perplexity/PPL) durch.
 Updates v2.4.0:
 - Added measure_perplexity logic using Docker.
 - Added compare_quantizations regression testing logic.
+
+Updates v2.5.0:
+- PPL runs execute in a warm runtime container (exec) instead of one cold container per model.
 """
 
 import json
@@ -83,16 +86,7 @@ class DatasetManager:
         # We assume standard llama.cpp container logic
         # Mount paths must be absolute
         abs_model = model_path.resolve()
-        abs_data = dataset_path.resolve()
-        
-        # Prepare volumes
-        volumes = {
-            str(abs_model.parent): {'bind': '/models', 'mode': 'ro'},
-            str(abs_data): {'bind': '/data/calibration.txt', 'mode': 'ro'}
-        }
-        
-        # Use runtime image from config or default
-        img = getattr(self.config, 'image_inference_runtime', 'ghcr.io/smilez1985/llm-runtime:latest')
+        img, volumes = self._ppl_runtime(abs_model.parent, dataset_path)
         
         # Command: llama-perplexity -m /models/model.gguf -f /data/calibration.txt -c 512
         cmd = [
@@ -104,17 +98,11 @@ class DatasetManager:
         ]
 
         try:
-            # Run Container
-            logs = docker.client.containers.run(
-                img,
-                command=cmd,
-                volumes=volumes,
-                remove=True,
-                stdout=True,
-                stderr=True # PPL is often printed to stderr
-            )
-            
-            output = logs.decode('utf-8')
+            # Run via warm container (exec); identical volume sets share one container
+            pool = docker.container_pool
+            exit_code, output = pool.run(img, cmd, volumes=volumes) # stdout + stderr (PPL is often on stderr)
+            if exit_code != 0:
+                self.logger.warning(f"llama-perplexity exited with code {exit_code}")
             
             # Parse Output for "Final Estimate: PPL = 5.4321"
             # Regex for standard llama.cpp output
@@ -135,6 +123,16 @@ class DatasetManager:
             self.logger.error(f"Perplexity measurement failed: {e}")
             return 999.99
 
+    def _ppl_runtime(self, model_dir: Path, dataset_path: Path) -> Tuple[str, Dict[str, Dict[str, str]]]:
+        """Image and volume set of a PPL run (the warm pool key)."""
+        volumes = {
+            str(model_dir.resolve()): {'bind': '/models', 'mode': 'ro'},
+            str(dataset_path.resolve()): {'bind': '/data/calibration.txt', 'mode': 'ro'}
+        }
+        # Use runtime image from config or default
+        img = getattr(self.config, 'image_inference_runtime', 'ghcr.io/smilez1985/llm-runtime:latest')
+        return img, volumes
+
     def compare_quantizations(self, base_model: Path, quant_models: List[Path], dataset: Path) -> Dict[str, Any]:
         """
         Runs PPL measurements on a list of quantized models and compares them to a baseline (or each other).
@@ -142,6 +140,17 @@ class DatasetManager:
         """
         results = {}
         
+        # 0. Pre-start one runtime container per model directory; all candidates reuse it via exec
+        docker = self._get_docker()
+        if docker and docker.client and dataset.exists():
+            try:
+                model_dirs = {p.resolve().parent for p in quant_models + ([base_model] if base_model else []) if p.exists()}
+                for model_dir in model_dirs:
+                    img, volumes = self._ppl_runtime(model_dir, dataset)
+                    docker.container_pool.prewarm(img, volumes)
+            except Exception as e:
+                self.logger.debug(f"Warm pool prewarm skipped: {e}")
+        
         # 1. Measure Baseline (Optional, if base_model provided and supported)
         # Often base_model is FP16 GGUF.
         base_ppl = None
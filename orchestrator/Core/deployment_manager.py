@@ -8,6 +8,9 @@ Features:
 - Air-Gap Image Export (Docker Tarballs).
 - Slim-RAG: Target gets empty DB structure, learns locally.
 - Centralized Security Validation.
+
+Updates v2.5.0:
+- Split-GGUF: Shard oder Manifest als Artefakt -> komplettes Set wird paketiert.
 """
 
 import os
@@ -30,6 +33,7 @@ except ImportError:
 
 import docker
 from orchestrator.utils.logging import get_logger
+from orchestrator.Core.gguf_split import SplitManifest, split_set_files, MANIFEST_SUFFIX
 
 # NEU: Import der zentralen Validierungslogik
 from orchestrator.utils.validation import validate_ip_address
@@ -61,8 +65,12 @@ class DeploymentManager:
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
             
-            # A. Copy Binary / Artifact
-            shutil.copy2(artifact_path, temp_path / artifact_path.name)
+            # A. Copy Binary / Artifact (split GGUF: manifest + all shards)
+            entry_name = artifact_path.name
+            for f in split_set_files(artifact_path):
+                shutil.copy2(f, temp_path / f.name)
+            if artifact_path.name.endswith(MANIFEST_SUFFIX):
+                entry_name = SplitManifest.load(artifact_path).entry
             
             # B. Configs (User Profiles, Prompts)
             self._bundle_user_configs(temp_path / "data" / "configs")
@@ -82,7 +90,7 @@ class DeploymentManager:
                 self._export_docker_images(images, temp_path / "images")
 
             # D. Script Generation (Deploy + Compose Logic)
-            script_content = self._generate_deploy_script(artifact_path.name, flags_str, use_docker)
+            script_content = self._generate_deploy_script(entry_name, flags_str, use_docker)
             
             deploy_script_path = temp_path / "deploy.sh"
             with open(deploy_script_path, "w", newline='\n') as f:
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Disk Space Planner (v2.5.0)
+DIREKTIVE: Goldstandard, früh scheitern statt ENOSPC nach Stunden.
+
+Zweck:
+1. Schätzt den temporären Platzbedarf eines Builds (HF -> F16 -> Quant) aus
+   safetensors-Headern, config.json oder HF-Repo-Metadaten.
+2. Reserviert diesen Platz pro Dateisystem, sodass parallele Jobs sich den
+   freien Platz nicht doppelt "versprechen". Die BuildEngine lässt einen Build
+   nur zu, wenn seine Reservierung passt.
+
+Bedarf je Ort:
+- cache/models   : Download (nur HF, falls noch nicht gestaged)
+- Scratch        : F16 Zwischenstufe ('build_scratch_dir', sonst cache/builds bzw. Docker Root)
+- cache/builds   : Quant-Ergebnis
+- output_dir     : Kopie der Artefakte
+"""
+
+import json
+import os
+import re
+import shutil
+import struct
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any
+
+from orchestrator.utils.logging import get_logger
+
+GB = 1024 ** 3
+
+WEIGHT_SUFFIXES = {".safetensors", ".bin", ".pt", ".pth", ".gguf", ".onnx"}
+
+# Effektive Bits pro Gewicht (llama.cpp Mittelwerte inkl. Scales)
+QUANT_BITS = {
+    "Q2_K": 3.35, "Q3_K_S": 3.5, "Q3_K_M": 3.91, "Q3_K_L": 4.27,
+    "Q4_0": 4.55, "Q4_1": 5.0, "Q4_K_S": 4.58, "Q4_K_M": 4.85,
+    "Q5_0": 5.54, "Q5_1": 6.0, "Q5_K_S": 5.54, "Q5_K_M": 5.69,
+    "Q6_K": 6.59, "Q8_0": 8.5, "INT8": 8.0, "W8A8": 8.0, "INT4": 4.0, "W4A16": 4.5,
+    "F16": 16.0, "FP16": 16.0, "BF16": 16.0, "F32": 32.0,
+}
+
+DTYPE_BYTES = {"F64": 8, "F32": 4, "F16": 2, "BF16": 2, "I64": 8, "I32": 4, "I16": 2, "I8": 1, "U8": 1, "BOOL": 1,
+               "F8_E4M3": 1, "F8_E5M2": 1,
+               "float32": 4, "float16": 2, "bfloat16": 2, "float64": 8}
+
+
+class InsufficientDiskSpaceError(RuntimeError):
+    """Raised when a build's disk reservation cannot be satisfied."""
+    pass
+
+
+@dataclass
+class DiskEstimate:
+    params: int = 0
+    source_bytes: int = 0
+    download_bytes: int = 0
+    f16_bytes: int = 0
+    quant_bytes: int = 0
+    basis: str = "unknown"      # safetensors | files | config | huggingface | unknown
+
+    @property
+    def known(self) -> bool:
+        return self.source_bytes > 0 or self.params > 0
+
+
+def _safetensors_header(path: Path) -> Dict[str, Any]:
+    with open(path, 'rb') as f:
+        (length,) = struct.unpack("<Q", f.read(8))
+        if length > 100 * 1024 * 1024: return {}
+        return json.loads(f.read(length))
+
+
+def _params_from_config(cfg: Dict[str, Any]) -> int:
+    """Rough decoder-only transformer parameter count from config.json."""
+    h = cfg.get("hidden_size") or cfg.get("n_embd") or cfg.get("d_model")
+    layers = cfg.get("num_hidden_layers") or cfg.get("n_layer") or cfg.get("num_layers")
+    vocab = cfg.get("vocab_size")
+    if not (h and layers and vocab): return 0
+    inter = cfg.get("intermediate_size") or 4 * h
+    heads = cfg.get("num_attention_heads") or 1
+    kv_heads = cfg.get("num_key_value_heads") or heads
+    attn = h * h * 2 + 2 * h * (h * kv_heads // heads)
+    mlp = 3 * h * inter if cfg.get("intermediate_size") else 2 * h * inter
+    embed = vocab * h * (1 if cfg.get("tie_word_embeddings") else 2)
+    return int(layers * (attn + mlp) + embed)
+
+
+class DiskSpaceEstimator:
+    """Estimates the on-disk footprint of a conversion job."""
+
+    def __init__(self, token_fn=None):
+        self.logger = get_logger("DiskEstimator")
+        self._token_fn = token_fn
+
+    def estimate(self, model_source: str, quantization: Optional[str] = None,
+                 staged_path: Optional[Path] = None, safety_margin: float = 1.1) -> DiskEstimate:
+        src = Path(staged_path) if staged_path else Path(model_source)
+        if src.exists():
+            est = self._estimate_local(src)
+        elif re.match(r"^[\w.-]+/[\w.-]+$", model_source or ""):
+            est = self._estimate_hf(model_source)
+            est.download_bytes = est.source_bytes
+        else:
+            return DiskEstimate()
+
+        if not est.known: return est
+        is_gguf = src.suffix.lower() == ".gguf" if src.exists() else False
+        if est.params and not is_gguf:
+            est.f16_bytes = int(est.params * 2 * safety_margin)
+        bits = QUANT_BITS.get((quantization or "F16").upper(), 16.0)
+        base = est.params * bits / 8 if est.params else est.source_bytes
+        est.quant_bytes = int(base * safety_margin)
+        est.download_bytes = int(est.download_bytes * safety_margin)
+        return est
+
+    def _estimate_local(self, src: Path) -> DiskEstimate:
+        files = [src] if src.is_file() else [p for p in src.rglob("*") if p.is_file() and p.suffix.lower() in WEIGHT_SUFFIXES]
+        est = DiskEstimate(source_bytes=sum(p.stat().st_size for p in files), basis="files")
+
+        # 1. safetensors headers -> exact parameter count
+        params = 0
+        for p in files:
+            if p.suffix.lower() != ".safetensors": continue
+            try:
+                header = _safetensors_header(p)
+            except Exception:
+                params = 0
+                break
+            for name, t in header.items():
+                if name == "__metadata__" or not isinstance(t, dict): continue
+                n = 1
+                for d in t.get("shape", []): n *= d
+                params += n
+        if params:
+            est.params, est.basis = params, "safetensors"
+            return est
+
+        # 2. config.json -> bytes per param or architecture estimate
+        cfg_path = (src if src.is_dir() else src.parent) / "config.json"
+        if cfg_path.exists():
+            try:
+                cfg = json.loads(cfg_path.read_text(encoding='utf-8'))
+                if est.source_bytes:
+                    est.params = est.source_bytes // DTYPE_BYTES.get(str(cfg.get("torch_dtype", "float16")), 2)
+                else:
+                    est.params = _params_from_config(cfg)
+                est.basis = "config"
+            except Exception: pass
+        return est
+
+    def _estimate_hf(self, repo_id: str) -> DiskEstimate:
+        try:
+            from huggingface_hub import HfApi
+            token = self._token_fn() if self._token_fn else None
+            info = HfApi(token=token).model_info(repo_id, files_metadata=True)
+        except Exception as e:
+            self.logger.debug(f"HF metadata for {repo_id} unavailable: {e}")
+            return DiskEstimate()
+
+        size = sum((s.size or 0) for s in (info.siblings or [])
+                   if Path(s.rfilename).suffix.lower() in WEIGHT_SUFFIXES)
+        est = DiskEstimate(source_bytes=size, basis="huggingface")
+        st = getattr(info, "safetensors", None)
+        total = getattr(st, "total", None) if st is not None else None
+        if total:
+            est.params = int(total)
+        elif size:
+            est.params = size // 2
+        return est
+
+
+@dataclass
+class Reservation:
+    build_id: str
+    needs: Dict[str, int] = field(default_factory=dict)  # filesystem key -> bytes
+    baseline_used: Dict[str, int] = field(default_factory=dict)  # filesystem key -> used bytes at reserve time
+    probes: Dict[str, str] = field(default_factory=dict)  # filesystem key -> path on it (disk_usage probe)
+
+
+class DiskReservationManager:
+    """
+    Thread-safe reservation ledger per filesystem (st_dev).
+    available = disk_usage(fs).free - outstanding reservations on fs - min_free
+
+    Bytes a running build already wrote are gone from 'free', so only the
+    unconsumed part counts as outstanding: growth of 'used' since the oldest
+    active baseline on the filesystem is credited against the reserved total.
+    When a build finishes, its writes stay in 'used' but are no longer reserved:
+    the remaining reservations on that filesystem are re-baselined, so they
+    never take credit for the finished build (or for writes before its release).
+    """
+
+    def __init__(self, min_free_gb: float = 2.0):
+        self.logger = get_logger("DiskReservations")
+        self.min_free = int(min_free_gb * GB)
+        self._lock = threading.Lock()
+        self._reservations: Dict[str, Reservation] = {}
+
+    @staticmethod
+    def _existing(path: Path) -> Path:
+        """Nearest existing ancestor (reservations may target dirs not created yet)."""
+        p = Path(path)
+        while not p.exists() and p != p.parent:
+            p = p.parent
+        return p
+
+    def _fs_key(self, path: Path) -> str:
+        return str(os.stat(self._existing(path)).st_dev)
+
+    def _outstanding(self, key: str, used_now: int) -> int:
+        active = [r for r in self._reservations.values() if r.needs.get(key)]
+        if not active: return 0
+        reserved = sum(r.needs[key] for r in active)
+        baseline = min(r.baseline_used.get(key, used_now) for r in active)
+        consumed = max(0, used_now - baseline)
+        return max(0, reserved - consumed)
+
+    def _available(self, key: str, probe: Path) -> int:
+        usage = shutil.disk_usage(self._existing(probe))
+        return usage.free - self._outstanding(key, usage.used) - self.min_free
+
+    def available(self, path: Path) -> int:
+        with self._lock:
+            return self._available(self._fs_key(path), Path(path))
+
+    def reserve(self, build_id: str, needs: Dict[Path, int]) -> Reservation:
+        """Reserves bytes on the filesystems of the given paths (all or nothing)."""
+        per_fs: Dict[str, int] = {}
+        probes: Dict[str, Path] = {}
+        for path, size in needs.items():
+            if size <= 0: continue
+            key = self._fs_key(path)
+            per_fs[key] = per_fs.get(key, 0) + int(size)
+            probes.setdefault(key, Path(path))
+
+        with self._lock:
+            shortages = []
+            for key, size in per_fs.items():
+                free = self._available(key, probes[key])
+                if size > free:
+                    shortages.append(f"{probes[key]}: needs {size / GB:.1f} GB, available {max(free, 0) / GB:.1f} GB")
+            if shortages:
+                raise InsufficientDiskSpaceError("Insufficient disk space: " + "; ".join(shortages))
+            res = Reservation(build_id, per_fs, {key: shutil.disk_usage(self._existing(probes[key])).used
+                                                 for key in per_fs},
+                              {key: str(probes[key]) for key in per_fs})
+            self._reservations[build_id] = res
+        if per_fs:
+            self.logger.info(f"Reserved {sum(per_fs.values()) / GB:.1f} GB for {build_id}")
+        return res
+
+    def release(self, build_id: str):
+        with self._lock:
+            res = self._reservations.pop(build_id, None)
+            if not res: return
+            for key in res.needs:
+                others = [r for r in self._reservations.values() if key in r.needs]
+                if not others: continue
+                # Conservative: the others' own writes so far are dropped from the credit as well
+                used_now = shutil.disk_usage(self._existing(Path(res.probes[key]))).used
+                for other in others:
+                    other.baseline_used[key] = used_now
+
+    def get_status(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"build_id": r.build_id, "reserved_gb": round(sum(r.needs.values()) / GB, 2)}
+                    for r in self._reservations.values()]
@@ -202,7 +202,7 @@ class DittoCoder:
         if rag:
             self.logger.info(f"Querying Knowledge Base for '{sdk_name}'...")
             query = f"{sdk_name} SDK compilation flags build configuration optimization parameters"
-            results = rag.search(query, limit=5, score_threshold=0.65)
+            results = rag.search(query, limit=5)
             
             if results:
                 context_text += "--- EXPERT KNOWLEDGE (Local RAG) ---\n"
@@ -9,12 +9,15 @@ It handles thread management, signal emission, and configuration mapping.
 Updates v2.3.0:
 - Use centralized ConfigManager for Docker images (No Hardcoding).
 - Robust initialization (Support for calling with/without framework ref).
+
+Updates v2.5.0:
+- Resource stats come from the BuildEngine's streaming StatsCollector (no blocking stats call).
+- Exposes 'client' and the warm 'container_pool' for short-lived jobs.
 """
 
 import os
 import logging
 import threading
-import time
 from datetime import datetime
 from typing import Dict, Optional, Any
 from pathlib import Path
@@ -34,6 +37,8 @@ except ImportError:
     ModelFormat = Any
     BuildStatus = Any
 
+from orchestrator.Core.stats_collector import calculate_cpu_percent
+
 # v2.0 Self-Healing Integration
 try:
     from orchestrator.Core.self_healing_manager import SelfHealingManager
@@ -104,6 +109,16 @@ class DockerManager(QObject):
             
         return True
 
+    @property
+    def client(self):
+        """Docker client of the local BuildEngine (None if Docker is unavailable)."""
+        return self.builder.docker_client if self.builder else None
+
+    @property
+    def container_pool(self):
+        """Warm container pool for short exec jobs (perplexity, benchmarks)."""
+        return self.builder.get_container_pool() if self.builder else None
+
     def ensure_qdrant_service(self) -> Optional[str]:
         """DYNAMIC SIDECAR LOGIC: Checks if Qdrant is required and running."""
         # Use config_manager directly for robustness
@@ -217,73 +232,55 @@ class DockerManager(QObject):
             self.build_completed.emit("error", False, str(e))
 
     def _calculate_cpu_percent(self, stats):
-        try:
-            cpu_stats = stats['cpu_stats']
-            precpu_stats = stats['precpu_stats']
-            cpu_delta = cpu_stats['cpu_usage']['total_usage'] - precpu_stats['cpu_usage']['total_usage']
-            system_delta = cpu_stats['system_cpu_usage'] - precpu_stats['system_cpu_usage']
-            
-            if system_delta > 0.0 and cpu_delta > 0.0:
-                online_cpus = cpu_stats.get('online_cpus', len(cpu_stats['cpu_usage'].get('percpu_usage', []))) or 1
-                cpu_percent = (cpu_delta / system_delta) * online_cpus * 100.0
-                return round(cpu_percent, 2)
-            return 0.0
-        except KeyError:
-            return 0.0
+        return calculate_cpu_percent(stats)
 
     def _monitor_build(self, build_id: str):
-        """Polls logs, progress, stats AND checks for failures (Healing)."""
-        last_log_idx = 0
-        
-        while self._monitor_active:
-            if not self.builder: break
-            status = self.builder.get_build_status(build_id)
-            if not status: break
-            
-            # 1. Logs & Progress
-            current_logs = status.logs
-            while last_log_idx < len(current_logs):
-                self.build_output.emit(build_id, current_logs[last_log_idx])
-                last_log_idx += 1
-            self.build_progress.emit(build_id, status.progress_percent)
-            
-            # 2. Resource Monitoring
+        """Streams logs/progress via engine callbacks, samples stats AND handles failures (Healing)."""
+        progress = self.builder.get_build_status(build_id) if self.builder else None
+        if not progress: return
+        finished = threading.Event()
+
+        # 1. Logs & Progress: pushed by the engine as they are logged (no status polling)
+        def on_log(line: str):
+            self.build_output.emit(build_id, line)
+            self.build_progress.emit(build_id, progress.progress_percent)
+
+        self.builder.add_log_listener(build_id, on_log)
+        self.builder.add_completion_listener(build_id, lambda p: finished.set())
+
+        # 2. Resource Monitoring (v2.5: non-blocking, fed by the streaming StatsCollector)
+        while self._monitor_active and not finished.wait(timeout=1.0):
             try:
-                container = self.builder._active_containers.get(build_id)
-                if container:
-                    stats = container.stats(stream=False)
-                    cpu_pct = self._calculate_cpu_percent(stats)
-                    mem_usage = stats['memory_stats'].get('usage', 0) / (1024 * 1024)
-                    mem_limit = stats['memory_stats'].get('limit', 0) / (1024 * 1024)
-                    self.build_stats.emit(build_id, cpu_pct, mem_usage, mem_limit)
+                sample = self.builder.get_resource_stats(build_id)
+                if sample:
+                    self.build_stats.emit(build_id, sample.cpu_percent, sample.mem_mb, sample.mem_limit_mb)
             except Exception: pass
-            
-            # 3. Check Termination & HEALING
-            if status.status in [BuildStatus.COMPLETED, BuildStatus.FAILED, BuildStatus.CANCELLED]:
-                success = (status.status == BuildStatus.COMPLETED)
-                
-                # --- v2.0 SELF HEALING TRIGGER ---
-                if status.status == BuildStatus.FAILED and self.healing_manager:
-                    self.logger.info(f"Build {build_id} failed. Attempting Self-Healing diagnosis...")
-                    
-                    error_context = "\n".join(status.logs[-50:])
-                    proposal = self.healing_manager.analyze_error(
-                        error_context, 
-                        f"Build Failure for ID: {build_id}"
-                    )
-                    
-                    if proposal:
-                        self.logger.info(f"Healing Proposal found: {proposal.error_summary}")
-                        self.healing_requested.emit(proposal)
-                    else:
-                        self.logger.warning("Self-Healing: No fix found.")
-
-                output_path = status.artifacts[0] if status.artifacts else "Check Output Directory"
-                self.build_completed.emit(build_id, success, output_path)
-                self._monitor_active = False
-                break
-            
-            time.sleep(1.0)
+        if not finished.is_set(): return
+
+        # 3. Termination & HEALING
+        status = progress
+        success = (status.status == BuildStatus.COMPLETED)
+        self.build_progress.emit(build_id, status.progress_percent)
+
+        # --- v2.0 SELF HEALING TRIGGER ---
+        if status.status in (BuildStatus.FAILED, BuildStatus.OOM_KILLED) and self.healing_manager:
+            self.logger.info(f"Build {build_id} failed. Attempting Self-Healing diagnosis...")
+
+            error_context = "\n".join(status.logs[-50:])
+            proposal = self.healing_manager.analyze_error(
+                error_context,
+                f"Build Failure for ID: {build_id}"
+            )
+
+            if proposal:
+                self.logger.info(f"Healing Proposal found: {proposal.error_summary}")
+                self.healing_requested.emit(proposal)
+            else:
+                self.logger.warning("Self-Healing: No fix found.")
+
+        output_path = status.artifacts[0] if status.artifacts else "Check Output Directory"
+        self.build_completed.emit(build_id, success, output_path)
+        self._monitor_active = False
 
     def stop_build(self, build_id: str):
         if self.builder: self.builder.cancel_build(build_id)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Embedding Backends (v2.5.0)
+DIREKTIVE: Goldstandard, RAG auch auf air-gapped Build-Hosts.
+
+Zweck:
+Austauschbare Embedding-Backends für den RAGManager ('rag_embedding_backend'):
+
+- litellm:               Cloud/Ollama über litellm ('ai_embedding_model'), bisheriges Verhalten
+- onnx:                  Lokales Sentence-Embedding-Modell (model.onnx + tokenizer.json),
+                         CPU, gebatcht, Sub-Batches parallel auf einem Thread-Pool
+- sentence-transformers: Lokales Modellverzeichnis über sentence-transformers (CPU)
+- hashing:               Abhängigkeitsfreier Feature-Hashing-Vektorisierer (Tokens + Bigramme);
+                         kein semantisches Modell, aber immer verfügbar und deterministisch
+- auto (Default):        lokales Modell falls vorhanden, sonst litellm falls installiert UND
+                         konfiguriert (API-Key, 'ai_embedding_model' oder OPENAI_API_BASE), sonst hashing
+
+Lokale Modelle: 'rag_local_embedding_model' (Pfad) oder das erste Embedding-Modell
+in models/tiny_models (erkannt an tokenizer.json + model.onnx bzw. modules.json).
+
+Jedes Backend nennt 'model_id' und 'dim'. Daraus folgen der Cache-Key des
+EmbeddingCache und der Name der Qdrant-Collection (Wechsel -> neue Collection).
+'score_threshold' ist der kalibrierte Default-Cut-off für RAGManager.search().
+"""
+
+import math
+import os
+import re
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from orchestrator.utils.logging import get_logger
+
+try:
+    import litellm
+except ImportError:
+    litellm = None
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+# Defaults of RAGManager._api_key when no key is configured
+_PLACEHOLDER_KEYS = {"", "sk-dummy"}
+
+# Bekannte Dimensionen (Cloud-Modelle liefern sie erst nach dem ersten Request)
+KNOWN_DIMS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+    "nomic-embed-text": 768,
+    "mxbai-embed-large": 1024,
+    "all-minilm": 384,
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+
+class EmbeddingBackend:
+    """Interface: embed(texts) -> vectors, plus identity (model_id) and dimension."""
+    name = "base"
+    model_id = "base"
+    dim = 0
+    # Requests the EmbeddingBatcher may run in parallel (local backends parallelize internally)
+    max_concurrency = 1
+    batch_size = 32
+    # Default search() cosine cut-off: cosine ranges differ per model, one value does not fit all
+    score_threshold = 0.65
+
+    @property
+    def request_size(self) -> int:
+        """Texts per embed() call the EmbeddingBatcher should send."""
+        return self.batch_size
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class LiteLLMBackend(EmbeddingBackend):
+    name = "litellm"
+
+    def __init__(self, model: str, api_key_fn: Callable[[], str], dim: Optional[int] = None,
+                 max_concurrency: int = 4, batch_size: int = 96):
+        if not litellm:
+            raise ImportError("litellm not installed")
+        self.logger = get_logger("LiteLLMEmbedding")
+        self.model = model
+        self.model_id = model
+        self._api_key_fn = api_key_fn
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        # 'ollama/nomic-embed-text:latest' -> 'nomic-embed-text'
+        known = KNOWN_DIMS.get(model.split("/")[-1].split(":")[0])
+        self.dim = int(dim or known or self._probe_dim())
+
+    def _probe_dim(self) -> int:
+        """Unknown model: one embedding request tells the dimension (collection size)."""
+        try:
+            dim = len(self.embed(["dimension probe"])[0])
+        except Exception as e:
+            raise RuntimeError(f"Embedding dimension of {self.model} unknown and probe failed "
+                               f"(set 'rag_embedding_dim'): {e}") from e
+        self.logger.info(f"Embedding model {self.model}: dimension {dim} (probed)")
+        return dim
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        try:
+            response = litellm.embedding(
+                model=self.model,
+                input=[t.replace("\n", " ") for t in texts],
+                api_key=self._api_key_fn()
+            )
+        except Exception as e:
+            self.logger.error(f"Embedding generation failed ({self.model}, {len(texts)} inputs): {e}")
+            raise e
+        # Order by 'index' (providers may return out of order)
+        data = sorted(response.data, key=lambda d: d.get("index", 0))
+        return [d["embedding"] for d in data]
+
+
+class HashingBackend(EmbeddingBackend):
+    """
+    Signed feature hashing of lower-cased word tokens and bigrams, sublinear TF,
+    L2-normalized. Stable across processes (crc32), pure Python.
+    """
+    name = "hashing"
+    # Off-topic queries score 0.12-0.22 against this repo's own code (scripts/rag_retrieval_benchmark.py);
+    # 0.65 would drop every dense hit
+    score_threshold = 0.25
+
+    def __init__(self, dim: int = 512, batch_size: int = 256):
+        self.dim = int(dim)
+        self.model_id = f"hashing-v1-{self.dim}"
+        self.batch_size = batch_size
+
+    def _vector(self, text: str) -> List[float]:
+        tokens = _TOKEN_RE.findall(text.lower())
+        features = Counter(tokens)
+        features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        vec = [0.0] * self.dim
+        for feature, tf in features.items():
+            h = zlib.crc32(feature.encode("utf-8"))
+            vec[h % self.dim] += (1.0 + math.log(tf)) * (1.0 if h & 0x80000000 else -1.0)
+        norm = math.sqrt(sum(v * v for v in vec))
+        return [v / norm for v in vec] if norm else vec
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self._vector(t) for t in texts]
+
+
+class OnnxBackend(EmbeddingBackend):
+    """Sentence-embedding ONNX model (mean pooling + L2 norm), sub-batches on a thread pool."""
+    name = "onnx"
+    score_threshold = 0.35  # MiniLM-class sentence embeddings
+
+    def __init__(self, model_dir: Path, threads: Optional[int] = None, batch_size: int = 32, max_length: int = 256):
+        import numpy as np
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self._np = np
+        model_dir = Path(model_dir)
+        model_file = next((p for p in (model_dir / "onnx" / "model.onnx", model_dir / "model.onnx") if p.exists()), None)
+        if model_file is None:
+            raise FileNotFoundError(f"No model.onnx in {model_dir}")
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+        self.threads = max(1, int(threads or os.cpu_count() or 1))
+        opts = ort.SessionOptions()
+        # Parallelism comes from concurrent sub-batches; InferenceSession.run() is thread-safe
+        opts.intra_op_num_threads = 1
+        self.session = ort.InferenceSession(str(model_file), sess_options=opts, providers=["CPUExecutionProvider"])
+        self._inputs = {i.name for i in self.session.get_inputs()}
+        self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="onnx-embed")
+        self.batch_size = batch_size
+        self.model_id = f"onnx-{model_dir.name}"
+        self.dim = len(self._run(["dimension probe"])[0])
+
+    @property
+    def request_size(self) -> int:
+        # One call fans out into 'threads' sub-batches
+        return self.batch_size * self.threads
+
+    def _run(self, texts: List[str]) -> List[List[float]]:
+        np = self._np
+        enc = self.tokenizer.encode_batch(texts)
+        ids = np.array([e.ids for e in enc], dtype=np.int64)
+        mask = np.array([e.attention_mask for e in enc], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self._inputs:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+        out = self.session.run(None, {k: v for k, v in feeds.items() if k in self._inputs})[0]
+        if out.ndim == 3:  # token embeddings -> mean pooling
+            m = mask[..., None].astype(out.dtype)
+            out = (out * m).sum(axis=1) / np.clip(m.sum(axis=1), 1e-9, None)
+        out = out / np.clip(np.linalg.norm(out, axis=1, keepdims=True), 1e-12, None)
+        return out.astype(np.float32).tolist()
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        parts = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(parts) == 1:
+            return self._run(parts[0])
+        return [v for part in self._pool.map(self._run, parts) for v in part]
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+
+class SentenceTransformersBackend(EmbeddingBackend):
+    name = "sentence-transformers"
+    score_threshold = 0.35
+
+    def __init__(self, model_dir: Path, threads: Optional[int] = None, batch_size: int = 32):
+        from sentence_transformers import SentenceTransformer
+        if threads:
+            import torch
+            torch.set_num_threads(int(threads))
+        self.model = SentenceTransformer(str(model_dir), device="cpu")
+        self.model_id = f"st-{Path(model_dir).name}"
+        self.dim = int(self.model.get_sentence_embedding_dimension())
+        self.batch_size = batch_size
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return self.model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True,
+                                 convert_to_numpy=True, show_progress_bar=False).tolist()
+
+
+def find_local_embedding_model(models_dir: Path) -> Optional[Path]:
+    """First sentence-embedding model below models/tiny_models (ONNX or sentence-transformers layout)."""
+    base = Path(models_dir) / "tiny_models"
+    if not base.exists(): return None
+    for d in sorted(p for p in base.iterdir() if p.is_dir()):
+        has_onnx = (d / "onnx" / "model.onnx").exists() or (d / "model.onnx").exists()
+        if (has_onnx and (d / "tokenizer.json").exists()) or (d / "modules.json").exists():
+            return d
+    return None
+
+
+def _local_backend(model_dir: Path, threads: Optional[int], batch_size: int) -> EmbeddingBackend:
+    has_onnx = (model_dir / "onnx" / "model.onnx").exists() or (model_dir / "model.onnx").exists()
+    if has_onnx:
+        try:
+            return OnnxBackend(model_dir, threads=threads, batch_size=batch_size)
+        except ImportError:
+            pass  # onnxruntime/tokenizers missing -> try sentence-transformers
+    return SentenceTransformersBackend(model_dir, threads=threads, batch_size=batch_size)
+
+
+def _remote_configured(get_conf: Callable[[str, Any], Any], api_key_fn: Callable[[], str]) -> bool:
+    """litellm is usable: an explicit embedding model/endpoint or a real API key."""
+    if get_conf("ai_embedding_model", None) or os.environ.get("OPENAI_API_BASE"):
+        return True
+    try:
+        key = api_key_fn() or ""
+    except Exception:
+        key = ""
+    return key not in _PLACEHOLDER_KEYS
+
+
+def create_backend(get_conf: Callable[[str, Any], Any], app_root: Path,
+                   api_key_fn: Callable[[], str]) -> EmbeddingBackend:
+    """
+    Selects the backend from config ('rag_embedding_backend'), falling back towards 'hashing'.
+    'auto' prefers a local model over litellm, which is used only when configured.
+    """
+    logger = get_logger("EmbeddingBackends")
+    kind = str(get_conf("rag_embedding_backend", "auto") or "auto").lower()
+    threads = get_conf("rag_embedding_threads", None)
+    batch_size = int(get_conf("rag_local_batch_size", 32))
+    hashing_dim = int(get_conf("rag_hashing_dim", 512))
+
+    def litellm_backend() -> Optional[EmbeddingBackend]:
+        model = get_conf("ai_embedding_model", None) or DEFAULT_EMBEDDING_MODEL
+        try:
+            return LiteLLMBackend(model, api_key_fn, dim=get_conf("rag_embedding_dim", None),
+                                  max_concurrency=int(get_conf("rag_embed_concurrency", 4)),
+                                  batch_size=int(get_conf("rag_embed_batch_size", 96)))
+        except RuntimeError as e:
+            logger.warning(f"{e}; falling back to a local embedding backend")
+            return None
+
+    if kind == "litellm":
+        backend = litellm_backend() if litellm else None
+        if backend: return backend
+        if not litellm: logger.warning("litellm not installed, falling back to a local embedding backend")
+
+    if kind != "hashing":
+        configured = get_conf("rag_local_embedding_model", None)
+        model_dir = Path(configured) if configured else find_local_embedding_model(
+            Path(app_root) / get_conf("models_dir", "models"))
+        if model_dir and model_dir.exists():
+            try:
+                backend = _local_backend(model_dir, threads, batch_size)
+                logger.info(f"Local embedding backend: {backend.name} ({model_dir.name}, dim {backend.dim})")
+                return backend
+            except Exception as e:
+                logger.warning(f"Local embedding model {model_dir} unusable ({e}), falling back")
+        elif kind in ("onnx", "sentence-transformers", "local"):
+            logger.warning("No local embedding model found (models/tiny_models), using hashing backend")
+
+    if kind == "auto" and litellm and _remote_configured(get_conf, api_key_fn):
+        backend = litellm_backend()
+        if backend: return backend
+    return HashingBackend(dim=hashing_dim)
+
+
+def backend_summary(backend: EmbeddingBackend) -> Dict[str, Any]:
+    return {"backend": backend.name, "model": backend.model_id, "dim": backend.dim}
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Persistent Embedding Cache (v2.5.0)
+DIREKTIVE: Goldstandard, identische Chunks werden nie zweimal bezahlt.
+
+Zweck:
+Re-Ingest derselben Doku, wiederholtes ingest_codebase oder ein erneut
+importiertes Swarm-Pack erzeugen dieselben Chunks. Dieser Cache hält deren
+Embeddings auf Disk (SQLite, WAL):
+
+    Key:   (embedding model, sha256(normalisierter Chunk-Text))
+    Wert:  float32 Blob (array('f'))
+
+Normalisierung: Whitespace zusammengefasst (wie der Embedding-Request selbst).
+Größenlimit 'max_bytes' mit LRU-Eviction über 'last_used' (Index); es wird bis
+auf 90 % des Limits geräumt, damit nicht jeder Insert eine Eviction auslöst.
+Hit-/Miss-Zähler liefern die Trefferquote für Ingest-Reports und get_status().
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from orchestrator.utils.logging import get_logger
+from orchestrator.utils.helpers import ensure_directory
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model     TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    dim       INTEGER NOT NULL,
+    vector    BLOB NOT NULL,
+    bytes     INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (model, text_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_embeddings_lru ON embeddings(last_used);
+"""
+
+_ROW_OVERHEAD = 96  # key + bookkeeping per row (approximation for the size cap)
+_EVICT_BATCH = 512
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate, 3),
+                "evictions": self.evictions, "entries": self.entries, "mb": round(self.bytes / 1024 ** 2, 1)}
+
+
+class EmbeddingCache:
+    """SQLite backed (model, text) -> float32 vector cache with LRU size cap. Thread-safe."""
+
+    def __init__(self, db_path: Path, max_bytes: int = 512 * 1024 ** 2):
+        self.logger = get_logger("EmbeddingCache")
+        self.db_path = Path(db_path)
+        self.max_bytes = int(max_bytes)
+        ensure_directory(self.db_path.parent)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10.0)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM embeddings").fetchone()
+        self.stats = CacheStats(entries=entries, bytes=total)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- READ ---
+
+    def _select(self, model: str, hashes: List[str], columns: str) -> List[tuple]:
+        """Rows for 'hashes' in chunks below SQLite's variable limit (caller holds the lock)."""
+        rows = []
+        for start in range(0, len(hashes), 500):
+            part = hashes[start:start + 500]
+            rows.extend(self._conn.execute(
+                f"SELECT {columns} FROM embeddings WHERE model = ? "
+                f"AND text_hash IN ({', '.join('?' * len(part))})", [model, *part]).fetchall())
+        return rows
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Cached vectors in input order (None = miss). Hits refresh their LRU timestamp."""
+        hashes = [text_hash(t) for t in texts]
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for h, blob in self._select(model, list(dict.fromkeys(hashes)), "text_hash, vector"):
+                vec = array("f")
+                vec.frombytes(blob)
+                found[h] = vec.tolist()
+            if found:
+                now = time.time()
+                with self._conn:
+                    self._conn.executemany("UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                                           [(now, model, h) for h in found])
+            result = [found.get(h) for h in hashes]
+            hits = sum(1 for v in result if v is not None)
+            self.stats.hits += hits
+            self.stats.misses += len(result) - hits
+        return result
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        return self.get_many(model, [text])[0]
+
+    # --- WRITE ---
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Optional[Sequence[float]]]):
+        rows, now = {}, time.time()
+        for text, vector in zip(texts, vectors):
+            if vector is None: continue
+            h, blob = text_hash(text), array("f", vector).tobytes()
+            rows[h] = (model, h, len(vector), blob, len(blob) + _ROW_OVERHEAD, now)
+        if not rows: return
+        try:
+            with self._lock, self._conn:
+                existing = {h for (h,) in self._select(model, list(rows), "text_hash")}
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, text_hash, dim, vector, bytes, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", list(rows.values()))
+                new = [r for h, r in rows.items() if h not in existing]
+                self.stats.entries += len(new)
+                self.stats.bytes += sum(r[4] for r in new)
+                if self.stats.bytes > self.max_bytes:
+                    self._evict(int(self.max_bytes * 0.9))
+        except sqlite3.Error as e:
+            # Cache is best effort, never fail an ingest because of it
+            self.logger.warning(f"Embedding cache write failed: {e}")
+
+    def put(self, model: str, text: str, vector: Sequence[float]):
+        self.put_many(model, [text], [vector])
+
+    def _evict(self, target_bytes: int):
+        """Drops least recently used rows until the cache is below 'target_bytes' (caller holds the lock)."""
+        while self.stats.bytes > target_bytes:
+            rows = self._conn.execute(
+                "SELECT model, text_hash, bytes FROM embeddings ORDER BY last_used LIMIT ?", (_EVICT_BATCH,)).fetchall()
+            if not rows: break
+            victims, freed = [], 0
+            for model, h, size in rows:
+                victims.append((model, h))
+                freed += size
+                if self.stats.bytes - freed <= target_bytes: break
+            self._conn.executemany("DELETE FROM embeddings WHERE model = ? AND text_hash = ?", victims)
+            self.stats.bytes -= freed
+            self.stats.entries -= len(victims)
+            self.stats.evictions += len(victims)
+
+    def clear(self, model: Optional[str] = None):
+        with self._lock, self._conn:
+            if model:
+                self._conn.execute("DELETE FROM embeddings WHERE model = ?", (model,))
+            else:
+                self._conn.execute("DELETE FROM embeddings")
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM embeddings").fetchone()
+            self.stats.entries, self.stats.bytes = entries, total
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Batched Embedding Pipeline (v2.5.0)
+DIREKTIVE: Goldstandard, tausende Chunks ohne tausende Round-Trips.
+
+Zweck:
+Bündelt Chunks zu Embedding-Requests (viele Inputs pro Request) und schickt
+mehrere Requests parallel an das Backend:
+
+- Batch-Größe nach Token-Budget ('max_batch_tokens') UND Anzahl ('max_batch_size')
+- Begrenzte Parallelität ('max_concurrency' Requests gleichzeitig)
+- Retry mit exponentiellem Backoff + Jitter (Rate Limits, Timeouts)
+- Ein Batch, der endgültig scheitert, liefert None für seine Positionen;
+  der Rest des Laufs geht weiter (wie das bisherige "Skipping chunk")
+
+Token-Schätzung: tiktoken (cl100k_base) falls installiert, sonst ~4 Zeichen/Token.
+"""
+
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+from orchestrator.utils.logging import get_logger
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+EmbedFn = Callable[[List[str]], List[List[float]]]
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count of 'text' (tiktoken if available, else a chars/4 estimate)."""
+    global _encoder
+    if tiktoken is not None:
+        with _encoder_lock:
+            if _encoder is None:
+                try:
+                    _encoder = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    _encoder = False
+        if _encoder:
+            return len(_encoder.encode(text, disallowed_special=()))
+    return max(1, math.ceil(len(text) / 4))
+
+
+@dataclass
+class EmbeddingStats:
+    chunks: int = 0
+    embedded: int = 0
+    failed: int = 0
+    batches: int = 0
+    retries: int = 0
+    tokens: int = 0
+    seconds: float = 0.0
+    cache_hits: int = 0
+
+    @property
+    def chunks_per_s(self) -> float:
+        return self.embedded / self.seconds if self.seconds else 0.0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        total = self.cache_hits + self.chunks
+        return self.cache_hits / total if total else 0.0
+
+    def merge(self, other: "EmbeddingStats"):
+        for key in ("chunks", "embedded", "failed", "batches", "retries", "tokens", "seconds", "cache_hits"):
+            setattr(self, key, getattr(self, key) + getattr(other, key))
+
+
+class EmbeddingBatcher:
+    """
+    Embeds many texts through a batch-capable 'embed_fn(texts) -> vectors'.
+    Args:
+        max_batch_size:   Inputs per request.
+        max_batch_tokens: Token budget per request (a single oversized text still gets its own batch).
+        max_concurrency:  Requests in flight.
+        max_retries:      Retries per batch after the first attempt.
+        backoff_base / backoff_max: Exponential backoff in seconds (with jitter).
+    """
+
+    def __init__(self, embed_fn: EmbedFn, max_batch_size: int = 96, max_batch_tokens: int = 60000,
+                 max_concurrency: int = 4, max_retries: int = 4, backoff_base: float = 0.5,
+                 backoff_max: float = 20.0, sleep: Callable[[float], None] = time.sleep):
+        self.logger = get_logger("EmbeddingBatcher")
+        self.embed_fn = embed_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_batch_tokens = max(1, int(max_batch_tokens))
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+
+    def plan_batches(self, texts: Sequence[str], token_counts: Optional[Sequence[int]] = None) -> List[List[int]]:
+        """Groups text indices into batches respecting count and token budget (order preserved)."""
+        token_counts = token_counts or [estimate_tokens(t) for t in texts]
+        batches: List[List[int]] = []
+        current: List[int] = []
+        budget = 0
+        for i, tokens in enumerate(token_counts):
+            if current and (len(current) >= self.max_batch_size or budget + tokens > self.max_batch_tokens):
+                batches.append(current)
+                current, budget = [], 0
+            current.append(i)
+            budget += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def _run_batch(self, batch: List[str], stats: EmbeddingStats, lock: threading.Lock) -> Optional[List[List[float]]]:
+        for attempt in range(self.max_retries + 1):
+            try:
+                vectors = self.embed_fn(batch)
+                if len(vectors) != len(batch):
+                    raise ValueError(f"backend returned {len(vectors)} vectors for {len(batch)} inputs")
+                return vectors
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    self.logger.warning(f"Embedding batch of {len(batch)} failed after {attempt + 1} attempts: {e}")
+                    return None
+                with lock:
+                    stats.retries += 1
+                delay = self._backoff(attempt)
+                self.logger.debug(f"Embedding batch failed ({e}), retry {attempt + 1} in {delay:.1f}s")
+                self._sleep(delay)
+        return None
+
+    def embed(self, texts: Sequence[str], stats: Optional[EmbeddingStats] = None) -> List[Optional[List[float]]]:
+        """Vectors in input order; None where the batch failed permanently."""
+        stats = stats if stats is not None else EmbeddingStats()
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        if not texts:
+            return results
+
+        t0 = time.perf_counter()
+        token_counts = [estimate_tokens(t) for t in texts]
+        plan = self.plan_batches(texts, token_counts)
+        lock = threading.Lock()
+        stats.chunks += len(texts)
+        stats.batches += len(plan)
+        stats.tokens += sum(token_counts)
+
+        def _work(indices: List[int]):
+            vectors = self._run_batch([texts[i] for i in indices], stats, lock)
+            with lock:
+                if vectors is None:
+                    stats.failed += len(indices)
+                    return
+                for i, v in zip(indices, vectors):
+                    results[i] = v
+                stats.embedded += len(indices)
+
+        if len(plan) == 1 or self.max_concurrency == 1:
+            for indices in plan: _work(indices)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(plan)),
+                                    thread_name_prefix="embed") as pool:
+                list(pool.map(_work, plan))
+
+        stats.seconds += time.perf_counter() - t0
+        return results
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Docker Event Monitor (v2.5.0)
+DIREKTIVE: Goldstandard, ereignisgesteuert statt Polling.
+
+Zweck:
+Ein einziger Subscriber pro Docker-Daemon auf den Docker Event-Stream.
+Beobachtet start/die/oom/kill für Container mit dem Framework-Label
+'llm-framework.build_id' und leitet die Events an die zugehörige Build-ID weiter.
+
+OOM-Events kommen sofort an (vor 'die'), statt erst nach dem Leerlaufen des
+Log-Streams als generischer Exit-Code 137. Docker meldet 'oom' aber auch, wenn
+nur ein Kindprozess gekillt wurde: die BuildEngine entscheidet erst beim Exit
+(Exit-Code != 0 oder State.OOMKilled), ob der Build OOM-gekillt wurde.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Callable
+
+from orchestrator.utils.logging import get_logger
+
+# Labels, mit denen die BuildEngine ihre Container markiert
+LABEL_BUILD_ID = "llm-framework.build_id"
+LABEL_ROLE = "llm-framework.role"
+
+WATCHED_ACTIONS = ["start", "die", "oom", "kill"]
+
+
+@dataclass
+class ContainerEvent:
+    build_id: str
+    action: str
+    role: str = "build"
+    container_id: str = ""
+    exit_code: Optional[int] = None
+    signal: Optional[str] = None
+    timestamp: float = 0.0
+
+    @classmethod
+    def from_docker(cls, raw: Dict[str, Any]) -> Optional["ContainerEvent"]:
+        actor = raw.get("Actor") or {}
+        attrs = actor.get("Attributes") or {}
+        build_id = attrs.get(LABEL_BUILD_ID)
+        if not build_id: return None
+
+        exit_code = attrs.get("exitCode")
+        return cls(
+            build_id=build_id,
+            action=str(raw.get("Action") or raw.get("status") or "").split(":")[0],
+            role=attrs.get(LABEL_ROLE, "build"),
+            container_id=actor.get("ID", raw.get("id", "")),
+            exit_code=int(exit_code) if exit_code not in (None, "") else None,
+            signal=attrs.get("signal"),
+            timestamp=float(raw.get("timeNano", 0)) / 1e9 or time.time()
+        )
+
+
+class DockerEventMonitor:
+    """Hintergrund-Thread, der den Event-Stream eines Docker-Clients verteilt."""
+
+    def __init__(self, client, name: str = "local", reconnect_delay: float = 2.0):
+        self.logger = get_logger("DockerEvents")
+        self.client = client
+        self.name = name
+        self.reconnect_delay = reconnect_delay
+
+        self._subscribers: Dict[str, List[Callable[[ContainerEvent], None]]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stream = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running: return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"docker-events-{self.name}", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Docker event monitor started for worker '{self.name}'")
+
+    def stop(self):
+        self._stop.set()
+        try:
+            if self._stream is not None and hasattr(self._stream, 'close'):
+                self._stream.close()
+        except Exception: pass
+
+    # --- SUBSCRIPTIONS ---
+
+    def subscribe(self, build_id: str, callback: Callable[[ContainerEvent], None]):
+        with self._lock:
+            self._subscribers.setdefault(build_id, []).append(callback)
+
+    def unsubscribe(self, build_id: str):
+        with self._lock:
+            self._subscribers.pop(build_id, None)
+
+    def dispatch(self, raw: Dict[str, Any]):
+        """Routet ein rohes Docker-Event an die Subscriber der Build-ID."""
+        event = ContainerEvent.from_docker(raw)
+        if not event or event.action not in WATCHED_ACTIONS: return
+        with self._lock:
+            callbacks = list(self._subscribers.get(event.build_id, []))
+        for cb in callbacks:
+            try:
+                cb(event)
+            except Exception as e:
+                self.logger.warning(f"Event callback failed for {event.build_id}: {e}")
+
+    # --- STREAM LOOP ---
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._stream = self.client.events(
+                    decode=True,
+                    filters={"type": "container", "label": LABEL_BUILD_ID, "event": WATCHED_ACTIONS}
+                )
+                for raw in self._stream:
+                    if self._stop.is_set(): break
+                    self.dispatch(raw)
+            except Exception as e:
+                if self._stop.is_set(): break
+                self.logger.debug(f"Event stream on '{self.name}' interrupted: {e}. Reconnecting...")
+            self._stop.wait(self.reconnect_delay)
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - In-Process Fake Docker Backend (v2.5.0)
+DIREKTIVE: Goldstandard, Framework-Overhead ohne Docker messbar.
+
+Zweck:
+Ersetzt docker.DockerClient für Lasttests (LoadHarness) und Tests. Die echte
+BuildEngine läuft unverändert (Image-Build-Stream, Container-Logs, Stats-Stream,
+Docker-Events, Warm-Pool Exec), nur die Container "arbeiten" simuliert:
+
+- api.build(): 'image_log_lines' Stream-Zeilen über 'image_seconds'
+- containers.create()/start(): 'log_lines' Zeilen über 'build_seconds',
+  danach 'die' Event mit 'exit_code' und ein Artefakt im Output-Volume
+  ('oom_event': vorher ein 'oom' Event, State.OOMKilled nur bei Exit != 0)
+- container.stats(): ein Frame alle 'stats_interval' Sekunden bis Exit
+- events(): echter Fan-Out an alle offenen Streams (gefiltert per Label)
+
+Unterstützt nur die Teilmenge der Docker SDK API, die das Framework nutzt.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Any
+
+_ids = itertools.count(1)
+
+
+def _fake_id() -> str:
+    return f"{next(_ids):012x}" + "0" * 52
+
+
+class _Stream:
+    """Closable blocking iterator (like the SDK's CancellableStream)."""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._closed = threading.Event()
+
+    def put(self, item: Any):
+        if not self._closed.is_set(): self._queue.put(item)
+
+    def close(self):
+        self._closed.set()
+        self._queue.put(StopIteration)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = self._queue.get()
+        if item is StopIteration or self._closed.is_set():
+            raise StopIteration
+        return item
+
+
+class FakeContainer:
+    def __init__(self, client: "FakeDockerClient", image: str, name: Optional[str] = None,
+                 labels: Optional[Dict[str, str]] = None, volumes: Optional[Dict[str, Dict[str, str]]] = None,
+                 keepalive: bool = False, **kwargs):
+        self.client = client
+        self.id = _fake_id()
+        self.name = name or f"fake-{self.id[:10]}"
+        self.image = image
+        self.labels = dict(labels or {})
+        self.volumes = dict(volumes or {})
+        self.keepalive = keepalive
+        self.status = "created"
+        self.attrs = {"Id": self.id, "Config": {"Labels": self.labels}}
+        self._done = threading.Event()
+        self._exit_code = client.exit_code
+
+    # --- LIFECYCLE ---
+
+    def start(self):
+        self.status = "running"
+        self.client._emit(self, "start")
+
+    def reload(self):
+        pass
+
+    def stop(self, timeout: int = 10):
+        self._finish(137, "kill")
+
+    def remove(self, force: bool = False):
+        if self.status == "running" and not force:
+            raise RuntimeError("container is running")
+        self._finish(self._exit_code if self._done.is_set() else 137)
+        self.client._containers.pop(self.id, None)
+        self.status = "removed"
+
+    def wait(self, timeout: Optional[int] = None) -> Dict[str, int]:
+        self._done.wait(timeout)
+        return {"StatusCode": self._exit_code}
+
+    def _finish(self, exit_code: int, action: Optional[str] = None):
+        if self._done.is_set(): return
+        self._exit_code = exit_code
+        self.status = "exited"
+        oom = self.client.oom_event and self.labels.get("llm-framework.role") == "build"
+        self.attrs["State"] = {"ExitCode": exit_code, "OOMKilled": bool(oom and exit_code != 0)}
+        self._done.set()
+        if oom: self.client._emit(self, "oom")
+        if action: self.client._emit(self, action, signal="SIGKILL")
+        self.client._emit(self, "die", exitCode=str(exit_code))
+
+    # --- STREAMS ---
+
+    def logs(self, stream: bool = False, follow: bool = False, **kwargs):
+        gen = self._log_lines()
+        return gen if stream else b"".join(gen)
+
+    def _log_lines(self):
+        c = self.client
+        n = c.log_lines
+        batches = max(1, min(n, c.log_batches))
+        per_batch, pause = n // batches, c.build_seconds / batches
+        payload = "x" * max(0, c.line_bytes - 24)
+        emitted = 0
+        for b in range(batches):
+            if self._done.wait(pause): break
+            count = per_batch + (n % batches if b == batches - 1 else 0)
+            for _ in range(count):
+                emitted += 1
+                yield f"[{emitted:06d}] step {payload}\n".encode()
+        self._write_artifact()
+        self._finish(self._exit_code)
+
+    def _write_artifact(self):
+        host = next((h for h, v in self.volumes.items() if v.get("bind") == "/build-cache/output"), None)
+        if host and self.client.artifact_bytes:
+            out = Path(host)
+            out.mkdir(parents=True, exist_ok=True)
+            (out / "model.gguf").write_bytes(b"\0" * self.client.artifact_bytes)
+
+    def stats(self, stream: bool = True, decode: bool = True, **kwargs):
+        s = _Stream()
+
+        def _pump():
+            total = 0
+            while not (self._done.is_set() or s.closed):
+                total += 10_000_000
+                s.put({
+                    "read": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "cpu_stats": {"cpu_usage": {"total_usage": total}, "system_cpu_usage": total * 4, "online_cpus": 4},
+                    "precpu_stats": {"cpu_usage": {"total_usage": total - 10_000_000},
+                                     "system_cpu_usage": (total - 10_000_000) * 4},
+                    "memory_stats": {"usage": 512 * 1024 * 1024, "limit": 8192 * 1024 * 1024},
+                })
+                self._done.wait(self.client.stats_interval)
+            s.close()
+
+        threading.Thread(target=_pump, name=f"fake-stats-{self.name}", daemon=True).start()
+        return s
+
+
+class _Containers:
+    def __init__(self, client: "FakeDockerClient"):
+        self.client = client
+
+    def create(self, image: str, command=None, name: Optional[str] = None, labels=None, volumes=None, **kwargs) -> FakeContainer:
+        c = FakeContainer(self.client, image, name=name, labels=labels, volumes=volumes)
+        self.client._containers[c.id] = c
+        return c
+
+    def run(self, image: str, command=None, detach: bool = False, name: Optional[str] = None, labels=None,
+            volumes=None, **kwargs) -> FakeContainer:
+        """Detached keepalive containers (warm pool) or one-shot runs."""
+        c = FakeContainer(self.client, image, name=name, labels=labels, volumes=volumes, keepalive=detach)
+        self.client._containers[c.id] = c
+        c.start()
+        return c
+
+    def get(self, container_id: str) -> FakeContainer:
+        c = self.client._containers.get(container_id) or next(
+            (c for c in list(self.client._containers.values()) if c.name == container_id), None)
+        if c is None: raise KeyError(container_id)
+        return c
+
+    def list(self, all: bool = False, filters: Optional[Dict[str, Any]] = None, **kwargs) -> List[FakeContainer]:
+        label = (filters or {}).get("label")
+        items = [c for c in list(self.client._containers.values()) if all or c.status == "running"]
+        if label:
+            key, _, value = str(label).partition("=")
+            items = [c for c in items if key in c.labels and (not value or c.labels[key] == value)]
+        return items
+
+
+class _Images:
+    def __init__(self, client: "FakeDockerClient"):
+        self.client = client
+
+    def get(self, tag: str):
+        image = self.client._images.get(tag)
+        if image is None: raise KeyError(f"No such image: {tag}")
+        return image
+
+    def list(self, **kwargs) -> list:
+        return []
+
+    def remove(self, image: str, **kwargs):
+        self.client._images.pop(image, None)
+
+
+class _API:
+    """Low-level API subset: image build stream + exec."""
+
+    def __init__(self, client: "FakeDockerClient"):
+        self.client = client
+        self._execs: Dict[str, List[str]] = {}
+
+    def build(self, path: str = None, dockerfile: str = None, tag: str = None, decode: bool = False, **kwargs):
+        c = self.client
+        n = c.image_log_lines
+        pause = c.image_seconds / max(n, 1)
+        for i in range(n):
+            if pause: time.sleep(pause)
+            yield {"stream": f"Step {i + 1}/{n} : RUN true\n"}
+        c._images[tag] = SimpleNamespace(id=f"sha256:{_fake_id()}", tags=[tag])
+        yield {"stream": f"Successfully tagged {tag}\n"}
+
+    def exec_create(self, container_id: str, cmd, **kwargs) -> Dict[str, str]:
+        exec_id = _fake_id()
+        self._execs[exec_id] = list(cmd)
+        return {"Id": exec_id}
+
+    def exec_start(self, exec_id: str, stream: bool = False, **kwargs):
+        out = [f"exec {' '.join(self._execs.get(exec_id, []))}: ok\n".encode()]
+        return iter(out) if stream else b"".join(out)
+
+    def exec_inspect(self, exec_id: str) -> Dict[str, Any]:
+        self._execs.pop(exec_id, None)
+        return {"ExitCode": 0}
+
+
+class FakeDockerClient:
+    """
+    In-process docker.DockerClient stand-in with simulated build containers.
+    Args:
+        build_seconds:   Runtime of each build/imatrix container.
+        log_lines:       Log lines each container emits (framework log handling load).
+        image_seconds / image_log_lines: Same for the image build stream.
+        exit_code:       Exit code of build containers (non-zero -> failed builds).
+        oom_event:       Build containers emit an 'oom' event before exiting (child process OOM-killed).
+    """
+
+    def __init__(self, build_seconds: float = 0.05, log_lines: int = 200, line_bytes: int = 80,
+                 image_seconds: float = 0.0, image_log_lines: int = 20, exit_code: int = 0,
+                 stats_interval: float = 0.05, log_batches: int = 10, artifact_bytes: int = 1024,
+                 oom_event: bool = False):
+        self.build_seconds = build_seconds
+        self.log_lines = log_lines
+        self.line_bytes = line_bytes
+        self.image_seconds = image_seconds
+        self.image_log_lines = image_log_lines
+        self.exit_code = exit_code
+        self.stats_interval = stats_interval
+        self.log_batches = log_batches
+        self.artifact_bytes = artifact_bytes
+        self.oom_event = oom_event
+
+        self._containers: Dict[str, FakeContainer] = {}
+        self._images: Dict[str, Any] = {}
+        self._event_streams: List[_Stream] = []
+        self._lock = threading.Lock()
+        self.events_emitted = 0
+
+        self.containers = _Containers(self)
+        self.images = _Images(self)
+        self.api = _API(self)
+        self.volumes = SimpleNamespace(get=lambda name: SimpleNamespace(remove=lambda force=False: None))
+
+    # --- DAEMON ---
+
+    def ping(self) -> bool:
+        return True
+
+    def info(self) -> Dict[str, Any]:
+        return {"DockerRootDir": "", "NCPU": 4, "OperatingSystem": "fake"}
+
+    def df(self) -> Dict[str, Any]:
+        return {"Images": [], "Volumes": []}
+
+    def close(self):
+        with self._lock:
+            streams, self._event_streams = self._event_streams, []
+        for s in streams: s.close()
+
+    # --- EVENTS ---
+
+    def events(self, decode: bool = False, filters: Optional[Dict[str, Any]] = None, **kwargs) -> _Stream:
+        s = _Stream()
+        s.label = (filters or {}).get("label")
+        with self._lock:
+            self._event_streams = [x for x in self._event_streams if not x.closed] + [s]
+        return s
+
+    def _emit(self, container: FakeContainer, action: str, **attrs):
+        raw = {
+            "Type": "container", "Action": action, "status": action, "id": container.id,
+            "timeNano": time.time_ns(),
+            "Actor": {"ID": container.id, "Attributes": {**container.labels, "name": container.name, **attrs}},
+        }
+        with self._lock:
+            streams = list(self._event_streams)
+        for s in streams:
+            if s.label and s.label not in container.labels: continue
+            s.put(raw)
+        self.events_emitted += 1
@@ -34,6 +34,8 @@ from orchestrator.Core.ditto_manager import DittoCoder
 from orchestrator.Core.self_healing_manager import SelfHealingManager
 from orchestrator.Core.deployment_manager import DeploymentManager
 from orchestrator.Core.community_manager import CommunityManager
+from orchestrator.Core.consistency_manager import ConsistencyManager
+from orchestrator.Core.cache_warmer import CacheWarmer
 from orchestrator.Core.orchestrator import LLMOrchestrator
 
 @dataclass
@@ -71,8 +73,10 @@ class FrameworkManager:
         self.self_healing_manager: Optional[SelfHealingManager] = None
         self.deployment_manager: Optional[DeploymentManager] = None
         self.community_manager: Optional[CommunityManager] = None
+        self.consistency_manager: Optional[ConsistencyManager] = None
         self.orchestrator: Optional[LLMOrchestrator] = None
         self.updater: Optional[UpdateManager] = None
+        self.cache_warmer: Optional[CacheWarmer] = None
 
         self._initialized = False
 
@@ -108,6 +112,8 @@ class FrameworkManager:
             
             self.community_manager = CommunityManager(self) # Swarm Logic
             
+            self.consistency_manager = ConsistencyManager(self) # Preflight Guardian
+            
             # === PHASE 3: AI SERVICES ===
             self.logger.info("[Boot Phase 3] AI & Knowledge Services")
             
@@ -140,9 +146,15 @@ class FrameworkManager:
             self.orchestrator.inject_self_healing(self.self_healing_manager)
             if self.ditto_manager:
                 self.orchestrator.inject_ditto(self.ditto_manager) # NEW: IMatrix Dataset Provider
+            self.orchestrator.inject_consistency(self.consistency_manager) # Matrix Preflight
             
             # Updater
             self.updater = UpdateManager(self)
+            
+            # Cache Warming (v2.5): never blocks the boot
+            if self.config.get("cache_warm_on_boot", False) and self.docker_manager and self.docker_manager.builder:
+                self.cache_warmer = CacheWarmer(self.docker_manager.builder)
+                self.cache_warmer.start_background(self.config.get("cache_warm_targets", []) or None)
 
             self._initialized = True
             self.logger.info("Framework successfully initialized.")
@@ -167,7 +179,10 @@ class FrameworkManager:
             "self_healing_manager": self.self_healing_manager,
             "deployment_manager": self.deployment_manager,
             "community_manager": self.community_manager,
+            "consistency_manager": self.consistency_manager,
             "orchestrator": self.orchestrator,
+            "docker_manager": self.docker_manager,
+            "cache_warmer": self.cache_warmer,
             "docker_client": self.docker_manager.client if self.docker_manager else None
         }
         return components.get(name)
@@ -178,4 +193,6 @@ class FrameworkManager:
         # Close DB connections, stop threads if needed
         if self.telemetry:
             self.telemetry.flush()
+        if self.docker_manager and self.docker_manager.builder:
+            self.docker_manager.builder.shutdown()
         self.logger.info("Shutdown complete.")
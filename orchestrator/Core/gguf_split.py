@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Split GGUF Artifacts (v2.5.0)
+DIREKTIVE: Goldstandard, 70B-Klasse ohne Riesen-Einzeldateien.
+
+Zweck:
+Im Sharded-Build (SHARDED_BUILD=1) entstehen llama.cpp Split-GGUFs
+('<name>-00001-of-00004.gguf' ...). Dieses Modul erkennt solche Sets,
+prüft ihre Vollständigkeit und schreibt ein Manifest daneben:
+
+    <name>.gguf-split.json
+    {"format": "gguf-split", "version": 1, "name", "count", "entry",
+     "total_bytes", "quantization", "shards": [{"file", "bytes", "sha256"}]}
+
+'entry' ist der erste Shard: llama.cpp (llama-cli/-server) lädt das Set über ihn.
+Manifest + Shards werden von Model Card, History und Packaging als Einheit behandelt.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Iterable
+
+SPLIT_RE = re.compile(r"^(?P<name>.+)-(?P<index>\d{5})-of-(?P<count>\d{5})\.gguf$")
+MANIFEST_SUFFIX = ".gguf-split.json"
+
+
+@dataclass
+class SplitShard:
+    file: str
+    bytes: int
+    sha256: str = ""
+
+
+@dataclass
+class SplitManifest:
+    name: str
+    count: int
+    shards: List[SplitShard] = field(default_factory=list)
+    quantization: Optional[str] = None
+    format: str = "gguf-split"
+    version: int = 1
+
+    @property
+    def entry(self) -> str:
+        return self.shards[0].file if self.shards else ""
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(s.bytes for s in self.shards)
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data.update(entry=self.entry, total_bytes=self.total_bytes)
+        return data
+
+    def save(self, directory: Path) -> Path:
+        path = Path(directory) / f"{self.name}{MANIFEST_SUFFIX}"
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "SplitManifest":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(name=data["name"], count=int(data["count"]),
+                   shards=[SplitShard(**s) for s in data.get("shards", [])],
+                   quantization=data.get("quantization"), format=data.get("format", "gguf-split"),
+                   version=int(data.get("version", 1)))
+
+    def verify(self, directory: Path, check_hash: bool = False) -> List[str]:
+        """Problems with the shards next to the manifest (empty = intact)."""
+        problems = []
+        if len(self.shards) != self.count:
+            problems.append(f"{self.name}: manifest lists {len(self.shards)} of {self.count} shards")
+        for s in self.shards:
+            p = Path(directory) / s.file
+            if not p.exists():
+                problems.append(f"{s.file}: missing")
+            elif p.stat().st_size != s.bytes:
+                problems.append(f"{s.file}: size {p.stat().st_size} != {s.bytes}")
+            elif check_hash and s.sha256 and _sha256(p) != s.sha256:
+                problems.append(f"{s.file}: checksum mismatch")
+        return problems
+
+
+def _sha256(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""): sha.update(chunk)
+    return sha.hexdigest()
+
+
+def is_split_shard(path: Path) -> bool:
+    return bool(SPLIT_RE.match(Path(path).name))
+
+
+def find_split_sets(paths: Iterable[Path]) -> Dict[Path, List[Path]]:
+    """Groups shard files by (directory, name, count). Key: path of the would-be manifest."""
+    sets: Dict[Path, List[Path]] = {}
+    for p in paths:
+        p = Path(p)
+        m = SPLIT_RE.match(p.name)
+        if not m: continue
+        key = p.parent / f"{m['name']}{MANIFEST_SUFFIX}"
+        sets.setdefault(key, []).append(p)
+    return {k: sorted(v, key=lambda p: p.name) for k, v in sets.items()}
+
+
+def build_manifest(shards: List[Path], quantization: Optional[str] = None, with_hashes: bool = True) -> SplitManifest:
+    """Validates one split set (all indices 1..count present) and describes it."""
+    first = SPLIT_RE.match(shards[0].name)
+    name, count = first["name"], int(first["count"])
+    indices = sorted(int(SPLIT_RE.match(p.name)["index"]) for p in shards)
+    if indices != list(range(1, count + 1)):
+        missing = sorted(set(range(1, count + 1)) - set(indices))
+        raise ValueError(f"Incomplete split GGUF '{name}': missing shard(s) {missing} of {count}")
+    return SplitManifest(name=name, count=count, quantization=quantization, shards=[
+        SplitShard(file=p.name, bytes=p.stat().st_size, sha256=_sha256(p) if with_hashes else "")
+        for p in shards])
+
+
+def write_manifests(directory: Path, quantization: Optional[str] = None,
+                    files: Optional[Iterable[Path]] = None) -> List[Path]:
+    """
+    Writes a manifest for every split set in 'directory' (recursive). Raises on incomplete sets.
+    'files' restricts this to the given shards (one build's artifacts in a shared output dir).
+    """
+    written = []
+    shards_in = Path(directory).rglob("*.gguf") if files is None else files
+    for key, shards in find_split_sets(shards_in).items():
+        written.append(build_manifest(shards, quantization).save(key.parent))
+    return written
+
+
+def split_set_files(path: Path) -> List[Path]:
+    """All files belonging to the split set of a shard or manifest (manifest first), else [path]."""
+    path = Path(path)
+    if path.name.endswith(MANIFEST_SUFFIX):
+        manifest = SplitManifest.load(path)
+        return [path] + [path.parent / s.file for s in manifest.shards]
+    m = SPLIT_RE.match(path.name)
+    if not m: return [path]
+    manifest_path = path.parent / f"{m['name']}{MANIFEST_SUFFIX}"
+    if manifest_path.exists():
+        return split_set_files(manifest_path)
+    return sorted(path.parent.glob(f"{m['name']}-?????-of-{m['count']}.gguf"))
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Hybrid Retrieval (v2.5.0)
+DIREKTIVE: Goldstandard, exakte Flags und Fehlerstrings werden gefunden.
+
+Zweck:
+Reine Dense-Suche verfehlt exakte Treffer auf Compiler-Flags, Fehlercodes und
+CMake-Optionen ('-DGGML_NEON=ON', 'rknn.build'), gerade die zählen beim Self-Healing.
+
+1. tokenize():   Behält zusammengesetzte Tokens (Flags, Pfade, dotted names) und
+                 liefert zusätzlich deren Teile: '-DGGML_NEON=ON' -> '-dggml_neon=on',
+                 'dggml_neon', 'on', 'ggml_neon' (Define-Name), 'ggml', 'neon'.
+2. BM25Index:    Invertierter Index (SQLite, WAL) je Collection, gepflegt bei
+                 Ingest/Delete/Clear. Speichert Payloads, damit reine Sparse-Treffer
+                 ohne Rückfrage an den Vector Store geliefert werden können.
+3. rrf_fuse():   Reciprocal Rank Fusion: score = Σ 1 / (k + rank) über Dense + Sparse.
+4. CrossEncoderReranker (optional): kleines CPU-Cross-Encoder-Modell
+                 (sentence-transformers), bewertet (Query, Chunk)-Paare gebatcht.
+"""
+
+import json
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from orchestrator.utils.logging import get_logger
+from orchestrator.utils.helpers import ensure_directory
+
+# Compound tokens: flags, dotted/namespaced names, paths, key=value (internal punctuation kept)
+_COMPOUND_RE = re.compile(r"-{0,2}\w[\w.:/=+\-]*")
+_PART_RE = re.compile(r"\w+")
+# -DNAME / -UNAME / -INAME / -LNAME: the option name itself is a term as well
+_DEFINE_RE = re.compile(r"^-[DUIL](\w+)")
+_TRAILING = ".:/=+-"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id      TEXT PRIMARY KEY,
+    length  INTEGER NOT NULL,
+    payload TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc  TEXT NOT NULL,
+    tf   INTEGER NOT NULL,
+    PRIMARY KEY (term, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings(doc);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased compound tokens plus their word parts, define names and snake_case pieces."""
+    tokens = []
+    for match in _COMPOUND_RE.findall(text):
+        match = match.rstrip(_TRAILING)
+        compound = match.lower()
+        if not compound: continue
+        parts = _PART_RE.findall(compound)
+        define = _DEFINE_RE.match(match)
+        if define: parts.append(define.group(1).lower())
+        if len(parts) != 1 or parts[0] != compound:
+            tokens.append(compound)
+        for part in parts:
+            tokens.append(part)
+            if "_" in part.strip("_"):
+                tokens.extend(p for p in part.split("_") if p)
+    return tokens
+
+
+def rrf_fuse(rankings: Sequence[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Reciprocal Rank Fusion of ranked ID lists -> [(id, score)] best first."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+
+
+class BM25Index:
+    """Persistent BM25 (Okapi, k1/b) inverted index over chunk IDs. Thread-safe."""
+
+    def __init__(self, db_path: Path, k1: float = 1.2, b: float = 0.75):
+        self.logger = get_logger("BM25Index")
+        self.db_path = Path(db_path)
+        self.k1, self.b = float(k1), float(b)
+        ensure_directory(self.db_path.parent)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10.0)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._n, self._total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs").fetchone()
+
+    @property
+    def doc_count(self) -> int:
+        return self._n
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- WRITE ---
+
+    def _remove_locked(self, ids: List[str]):
+        for start in range(0, len(ids), 500):
+            part = ids[start:start + 500]
+            marks = ", ".join("?" * len(part))
+            removed, length = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs WHERE id IN ({marks})", part).fetchone()
+            self._conn.execute(f"DELETE FROM postings WHERE doc IN ({marks})", part)
+            self._conn.execute(f"DELETE FROM docs WHERE id IN ({marks})", part)
+            self._n -= removed
+            self._total -= length
+
+    def add(self, docs: Iterable[Tuple[str, str, Optional[Dict[str, Any]]]]):
+        """Indexes (id, text, payload) triples; an existing ID is replaced."""
+        docs = list(docs)
+        if not docs: return
+        rows, postings = [], []
+        for doc_id, text, payload in docs:
+            tf = Counter(tokenize(text))
+            length = sum(tf.values())
+            rows.append((doc_id, length, json.dumps(payload or {}, default=str)))
+            postings.extend((term, doc_id, n) for term, n in tf.items())
+        with self._lock, self._conn:
+            self._remove_locked([r[0] for r in rows])
+            self._conn.executemany("INSERT OR REPLACE INTO docs (id, length, payload) VALUES (?, ?, ?)", rows)
+            self._conn.executemany("INSERT OR REPLACE INTO postings (term, doc, tf) VALUES (?, ?, ?)", postings)
+            self._n += len(rows)
+            self._total += sum(r[1] for r in rows)
+
+    def remove(self, ids: Iterable[str]):
+        ids = list(ids)
+        if not ids: return
+        with self._lock, self._conn:
+            self._remove_locked(ids)
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM postings")
+            self._conn.execute("DELETE FROM docs")
+            self._n, self._total = 0, 0
+
+    # --- READ ---
+
+    def search(self, query: str, limit: int = 10,
+               filters: Optional[Dict[str, Any]] = None,
+               normalize: bool = False) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """
+        Top 'limit' (id, bm25 score, payload); 'filters' = payload equality match.
+        'normalize': score in [0, 1] relative to a document that contains every query
+        term once at average length (unknown terms count with maximum IDF), so a
+        chunk that only shares filler words with the query scores low.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._n: return []
+        with self._lock:
+            n, avg_len = self._n, self._total / max(self._n, 1)
+            scores: Dict[str, float] = {}
+            ideal = 0.0
+            for term in terms:
+                rows = self._conn.execute(
+                    "SELECT p.doc, p.tf, d.length FROM postings p JOIN docs d ON d.id = p.doc WHERE p.term = ?",
+                    (term,)).fetchall()
+                idf = math.log(1.0 + (n - len(rows) + 0.5) / (len(rows) + 0.5))
+                ideal += idf
+                for doc_id, tf, length in rows:
+                    norm = tf + self.k1 * (1.0 - self.b + self.b * length / avg_len)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / norm
+            if normalize:
+                scores = {doc_id: min(1.0, score / ideal) for doc_id, score in scores.items()}
+            ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+
+            results = []
+            page = max(limit * 4, 64) if filters else limit
+            for start in range(0, len(ranked), page):
+                part = ranked[start:start + page]
+                payloads = dict(self._conn.execute(
+                    f"SELECT id, payload FROM docs WHERE id IN ({', '.join('?' * len(part))})",
+                    [doc_id for doc_id, _ in part]).fetchall())
+                for doc_id, score in part:
+                    payload = json.loads(payloads.get(doc_id) or "{}")
+                    if filters and any(payload.get(k) != v for k, v in filters.items()): continue
+                    results.append((doc_id, score, payload))
+                    if len(results) == limit: return results
+            return results
+
+
+class CrossEncoderReranker:
+    """Optional CPU cross-encoder (sentence-transformers CrossEncoder), scores (query, text) pairs in batches."""
+
+    def __init__(self, model_dir: Path, batch_size: int = 16, max_length: int = 512, threads: Optional[int] = None):
+        from sentence_transformers import CrossEncoder
+        if threads:
+            import torch
+            torch.set_num_threads(int(threads))
+        self.model = CrossEncoder(str(model_dir), device="cpu", max_length=max_length)
+        self.batch_size = int(batch_size)
+        self.name = Path(model_dir).name
+
+    def rerank(self, query: str, texts: Sequence[str]) -> List[float]:
+        if not texts: return []
+        scores = self.model.predict([(query, t) for t in texts], batch_size=self.batch_size,
+                                    show_progress_bar=False)
+        return [float(s) for s in scores]
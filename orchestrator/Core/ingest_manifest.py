@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Incremental Ingest Manifest (v2.5.0)
+DIREKTIVE: Goldstandard, Re-Ingest ist idempotent und inkrementell.
+
+Zweck:
+1. Deterministische Point-IDs: uuid5(source, chunk_index, sha256(chunk)).
+   Ein erneuter Upsert desselben Chunks überschreibt ihn statt ihn zu duplizieren.
+2. Manifest je Ingest-Quelle (z.B. Codebase-Root) mit Hash, mtime, Größe und
+   Point-IDs pro Datei. Change Detection:
+   - mtime + Größe unverändert  -> unverändert (Datei wird nicht gelesen)
+   - sonst sha256 vergleichen    -> nur echte Inhaltsänderungen werden neu embedded
+   - Datei fehlt                 -> ihre Points sind veraltet und werden gelöscht
+3. Das Manifest gehört zu einer Collection; wechselt sie (Reset, neues Backend),
+   gilt es als leer und der nächste Lauf indiziert vollständig neu.
+4. Es merkt sich den Chunker (Art, Version, Token-Limit). Ändert sich dieser, gelten
+   alle Dateien als geändert; die alten Points werden über das Manifest gelöscht.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Iterable, Tuple
+
+from orchestrator.utils.logging import get_logger
+from orchestrator.utils.helpers import ensure_directory
+
+# Fester Namespace: IDs sind über Prozesse/Hosts hinweg stabil
+POINT_NAMESPACE = uuid.UUID("6f1c3f4e-9a52-4c1e-8d7b-2f0e5a9c4b11")
+MANIFEST_VERSION = 1
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def point_id(source: str, chunk_index: int, chunk: str) -> str:
+    """Deterministic Qdrant point ID for one chunk of one source."""
+    return str(uuid.uuid5(POINT_NAMESPACE, f"{source}\0{chunk_index}\0{content_hash(chunk)}"))
+
+
+def file_sha256(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""): sha.update(block)
+    return sha.hexdigest()
+
+
+@dataclass
+class FileEntry:
+    sha256: str
+    mtime: float
+    size: int
+    point_ids: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ChangeSet:
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    # rel_path -> (sha256, mtime, size) of the current file (added/modified)
+    fingerprints: Dict[str, Tuple[str, float, int]] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> List[str]:
+        return self.added + self.modified
+
+    def summary(self) -> str:
+        return (f"{len(self.added)} added, {len(self.modified)} modified, "
+                f"{len(self.removed)} removed, {len(self.unchanged)} unchanged")
+
+
+class IngestManifest:
+    """JSON manifest of ingested files (rel_path -> FileEntry) for one source root and collection."""
+
+    def __init__(self, path: Path, collection: str, chunker: str = ""):
+        self.logger = get_logger("IngestManifest")
+        self.path = Path(path)
+        self.collection = collection
+        self.chunker = chunker
+        self.rechunk = False  # chunker changed since the last run -> every file counts as modified
+        self.files: Dict[str, FileEntry] = {}
+        self.pending_deletes: List[str] = []  # stale points whose delete failed (retried next run)
+        self._load()
+
+    @classmethod
+    def for_root(cls, manifest_dir: Path, root: Path, collection: str, chunker: str = "") -> "IngestManifest":
+        key = hashlib.sha1(str(Path(root).resolve()).encode()).hexdigest()[:12]
+        return cls(Path(manifest_dir) / f"codebase_{key}.json", collection, chunker)
+
+    def _load(self):
+        if not self.path.exists(): return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable ingest manifest {self.path}: {e}")
+            return
+        if data.get("version") != MANIFEST_VERSION or data.get("collection") != self.collection:
+            # Other collection / format: everything is re-ingested
+            return
+        self.files = {k: FileEntry(**v) for k, v in data.get("files", {}).items()}
+        self.pending_deletes = list(data.get("pending_deletes", []))
+        self.rechunk = bool(self.files) and data.get("chunker", "") != self.chunker
+
+    def save(self):
+        ensure_directory(self.path.parent)
+        data = {"version": MANIFEST_VERSION, "collection": self.collection, "chunker": self.chunker,
+                "pending_deletes": self.pending_deletes,
+                "files": {k: asdict(v) for k, v in sorted(self.files.items())}}
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def detect_changes(self, root: Path, rel_paths: Iterable[str], force: bool = False) -> ChangeSet:
+        """
+        Compares the current files against the manifest (mtime/size first, then content hash).
+        'force' reports every known file as modified (full re-ingest, stale points still tracked).
+        """
+        force = force or self.rechunk
+        changes = ChangeSet()
+        seen = set()
+        for rel in rel_paths:
+            seen.add(rel)
+            path = Path(root) / rel
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entry = self.files.get(rel)
+            if not force and entry and entry.mtime == st.st_mtime and entry.size == st.st_size:
+                changes.unchanged.append(rel)
+                continue
+            digest = file_sha256(path)
+            if not force and entry and entry.sha256 == digest:
+                # Touched but identical content: refresh the stat fingerprint only
+                entry.mtime, entry.size = st.st_mtime, st.st_size
+                changes.unchanged.append(rel)
+                continue
+            changes.fingerprints[rel] = (digest, st.st_mtime, st.st_size)
+            (changes.modified if entry else changes.added).append(rel)
+        changes.removed = sorted(set(self.files) - seen)
+        return changes
+
+    def stale_points(self, rel: str, new_ids: Iterable[str]) -> List[str]:
+        """Point IDs of 'rel' from the last run that the new run did not write again."""
+        entry = self.files.get(rel)
+        if not entry: return []
+        keep = set(new_ids)
+        return [pid for pid in entry.point_ids if pid not in keep]
+
+    def update(self, rel: str, fingerprint: Tuple[str, float, int], point_ids: List[str]):
+        digest, mtime, size = fingerprint
+        self.files[rel] = FileEntry(sha256=digest, mtime=mtime, size=size, point_ids=list(point_ids))
+
+    def invalidate(self, rel: str):
+        """Keeps the entry's points (stale tracking) but forces a re-ingest of 'rel' next run."""
+        entry = self.files.get(rel)
+        if entry: entry.sha256, entry.mtime = "", 0.0
+
+    def remove(self, rel: str) -> List[str]:
+        entry = self.files.pop(rel, None)
+        return entry.point_ids if entry else []
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Streaming Ingest Pipeline (v2.5.0)
+DIREKTIVE: Goldstandard, Ingest skaliert mit Kernen statt mit Dateien.
+
+Zweck:
+Bounded Producer/Consumer-Pipeline für ingest_codebase:
+
+    discover  paralleler Verzeichnis-Scan (Threads, os.scandir)
+    detect    Manifest-Vergleich (mtime/Größe, sonst sha256)
+    read      Dateien lesen (Thread-Pool, I/O-bound)
+    chunk     Chunking im Process-Pool (chunk_file ist top-level und damit picklebar;
+              bei wenigen Dateien inline, der Pool-Start lohnt sich dann nicht)
+    embed     Embedding-Worker (Threads), je Aufruf ein Batch über RAGManager.embed_texts
+              (Cache + EmbeddingBatcher mit eigener Parallelität)
+    upsert    ein Writer, Batches <= 'upsert_batch' Points, wait=False; BM25-Zeilen
+              werden gesammelt und je SPARSE_BATCH Points committet
+
+Zwischen den Stufen liegen Queues mit fester Größe: Dateiinhalte, Chunks und Vektoren
+sind nur für die Elemente im Flug im Speicher, der Bedarf ist unabhängig von der Baumgröße.
+Jede Stufe meldet Elemente, Volumen und Durchsatz (StageStats).
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from orchestrator.utils.logging import get_logger
+from orchestrator.Core.chunkers import chunk_source, with_file_header
+from orchestrator.Core.embedding_pipeline import EmbeddingStats
+from orchestrator.Core.ingest_manifest import point_id
+
+_DONE = object()
+SPARSE_BATCH = 2048  # points per BM25 commit (payloads only, no vectors)
+
+
+# --- WORKER FUNCTIONS (top-level: picklable for the process pool) ---
+
+def chunk_file(rel: str, content: str, mode: str, max_tokens: int) -> List[Tuple[str, str]]:
+    """(chunk text incl. FILE header, section label) for one source file."""
+    if not content.strip(): return []
+    return [(with_file_header(rel, c), c.label) for c in chunk_source(content, rel, mode, max_tokens)]
+
+
+def _chunk_job(rel: str, content: str, mode: str, max_tokens: int) -> Tuple[List[Tuple[str, str]], float]:
+    t0 = time.perf_counter()
+    return chunk_file(rel, content, mode, max_tokens), time.perf_counter() - t0
+
+
+def _scan_dir(root: str, path: str, ignored: Set[str], accept: Callable[[str], bool]) -> Tuple[List[str], List[str]]:
+    files, dirs = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in ignored: dirs.append(entry.path)
+                elif entry.is_file() and accept(entry.name):
+                    files.append(os.path.relpath(entry.path, root))
+    except OSError:
+        pass
+    return files, dirs
+
+
+def walk_parallel(root: Path, ignored: Set[str], accept: Callable[[str], bool], workers: int = 8) -> List[str]:
+    """Relative paths of accepted files below 'root'; directories are scanned concurrently."""
+    root = str(root)
+    found: List[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ingest-walk") as pool:
+        pending = {pool.submit(_scan_dir, root, root, ignored, accept)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, dirs = future.result()
+                found.extend(files)
+                pending.update(pool.submit(_scan_dir, root, d, ignored, accept) for d in dirs)
+    return sorted(found)
+
+
+# --- STATS ---
+
+@dataclass
+class StageStats:
+    """Items and volume a stage processed; throughput over the stage's active span."""
+    name: str
+    unit: str = ""
+    items: int = 0
+    units: int = 0
+    busy: float = 0.0
+    start: Optional[float] = None
+    end: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, items: int, units: int = 0, busy: float = 0.0):
+        now = time.perf_counter()
+        with self._lock:
+            self.items += items
+            self.units += units
+            self.busy += busy
+            self.start = min(self.start, now - busy) if self.start is not None else now - busy
+            self.end = now
+
+    @property
+    def seconds(self) -> float:
+        return (self.end - self.start) if self.start is not None else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        s = self.seconds
+        out = {"items": self.items, "seconds": round(s, 3), "busy_s": round(self.busy, 3),
+               "items_per_s": round(self.items / s, 1) if s else 0.0}
+        if self.unit:
+            out[self.unit] = self.units
+            out[f"{self.unit}_per_s"] = round(self.units / s, 1) if s else 0.0
+        return out
+
+
+@dataclass
+class PipelineResult:
+    point_ids: Dict[str, List[str]] = field(default_factory=dict)  # complete files only
+    incomplete: Set[str] = field(default_factory=set)
+    chunks: int = 0
+    failed_chunks: int = 0
+    cache_hit_rate: float = 0.0
+    seconds: float = 0.0
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def chunks_per_s(self) -> float:
+        return round(self.chunks / self.seconds, 1) if self.seconds else 0.0
+
+    def stage_summary(self) -> str:
+        return ", ".join(f"{name} {s['items_per_s']}/s" for name, s in self.stages.items())
+
+
+@dataclass
+class _Record:
+    rel: str
+    id: str  # point id (duck-types as a point for RAGManager._index_sparse)
+    text: str
+    payload: Dict[str, Any]
+
+
+class IngestPipeline:
+    """
+    Streaming codebase ingest for a RAGManager ('rag' provides chunker settings, embed_texts,
+    _make_point, _upsert, _index_sparse, _collection_changed and backend).
+    Args:
+        read_workers:    Threads reading files.
+        chunk_processes: Chunking processes (None = CPU count, 0 = inline).
+        embed_workers:   Concurrent embed_texts() calls.
+        queue_size:      Capacity of each inter-stage queue (files resp. batches).
+        upsert_batch:    Max points per upsert request.
+        process_min_files: Below this many files chunking runs inline (pool start-up is not worth it).
+    """
+
+    def __init__(self, rag: Any, read_workers: int = 8, chunk_processes: Optional[int] = None,
+                 embed_workers: int = 2, queue_size: int = 64, upsert_batch: int = 256,
+                 process_min_files: int = 16):
+        self.logger = get_logger("IngestPipeline")
+        self.rag = rag
+        self.read_workers = max(1, int(read_workers))
+        if chunk_processes is None:  # auto: one per core, inline on a single core
+            cores = os.cpu_count() or 1
+            chunk_processes = min(cores, 8) if cores > 1 else 0
+        self.chunk_processes = int(chunk_processes)
+        self.embed_workers = max(1, int(embed_workers))
+        self.queue_size = max(1, int(queue_size))
+        self.upsert_batch = max(1, int(upsert_batch))
+        self.process_min_files = int(process_min_files)
+        self.stats: Dict[str, StageStats] = {}
+        self._abort = threading.Event()
+
+    def _stage(self, name: str, unit: str = "") -> StageStats:
+        if name not in self.stats:
+            self.stats[name] = StageStats(name, unit)
+        return self.stats[name]
+
+    def _put(self, q: queue.Queue, item: Any):
+        """Blocking put that gives up once the pipeline aborted (no deadlock on a dead consumer)."""
+        while not self._abort.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    # --- DISCOVER / DETECT ---
+
+    def discover(self, root: Path, ignored: Set[str], accept: Callable[[str], bool]) -> List[str]:
+        t0 = time.perf_counter()
+        paths = walk_parallel(root, ignored, accept, self.read_workers)
+        self._stage("discover", "files").record(len(paths), len(paths), time.perf_counter() - t0)
+        return paths
+
+    def timed(self, name: str, fn: Callable[[], Any], items: int = 0) -> Any:
+        t0 = time.perf_counter()
+        result = fn()
+        self._stage(name).record(items, busy=time.perf_counter() - t0)
+        return result
+
+    # --- RUN ---
+
+    def run(self, root: Path, rel_paths: Iterable[str],
+            meta_fn: Callable[[str], Tuple[str, Dict[str, Any]]]) -> PipelineResult:
+        """
+        Reads, chunks, embeds and upserts 'rel_paths'. meta_fn(rel) -> (source name, payload metadata).
+        A file is complete when every chunk was upserted; others land in 'incomplete'.
+        """
+        t0 = time.perf_counter()
+        rel_paths = list(rel_paths)
+        self._abort.clear()
+        read_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        embed_q: queue.Queue = queue.Queue(maxsize=self.embed_workers * 2)
+        upsert_q: queue.Queue = queue.Queue(maxsize=self.embed_workers * 2)
+
+        lock = threading.Lock()
+        expected: Dict[str, int] = {}
+        written: Dict[str, int] = {}
+        ids: Dict[str, List[str]] = {}
+        failed: Set[str] = set()
+        embed_stats: List[EmbeddingStats] = []
+        counters = {"chunks": 0, "failed_chunks": 0}
+        st_read, st_chunk = self._stage("read", "chars"), self._stage("chunk", "chunks")
+        st_embed, st_upsert = self._stage("embed", "chunks"), self._stage("upsert", "points")
+        mode, max_tokens = self.rag.chunker_mode, self.rag.chunk_tokens
+        backend = self.rag.backend
+        # >= one upsert batch per embed_texts() call (cache round trip), the batcher splits it into requests
+        embed_batch = max(self.upsert_batch, backend.request_size * max(1, backend.max_concurrency))
+        ingested_at = datetime.now().isoformat()
+
+        # --- read ---
+        files_iter = iter(rel_paths)
+
+        def reader():
+            while not self._abort.is_set():
+                with lock:
+                    rel = next(files_iter, None)
+                if rel is None: return
+                start = time.perf_counter()
+                try:
+                    content = (Path(root) / rel).read_text(encoding="utf-8", errors="ignore")
+                except Exception as e:
+                    self.logger.warning(f"Failed to ingest {rel}: {e}")
+                    with lock: failed.add(rel)
+                    continue
+                st_read.record(1, len(content), time.perf_counter() - start)
+                self._put(read_q, (rel, content))
+
+        readers = [threading.Thread(target=reader, name=f"ingest-read-{i}", daemon=True)
+                   for i in range(min(self.read_workers, max(1, len(rel_paths))))]
+
+        def close_read():
+            for t in readers: t.join()
+            self._put(read_q, _DONE)
+
+        # --- chunk ---
+        def emit(rel: str, pieces: List[Tuple[str, str]], batch: List[_Record]) -> List[_Record]:
+            source, meta = meta_fn(rel)
+            file_ids = []
+            for i, (text, label) in enumerate(pieces):
+                pid = point_id(source, i, text)
+                payload = dict(meta, source=source, ingested_at=ingested_at, content=text, chunk_index=i)
+                if label: payload["section"] = label
+                file_ids.append(pid)
+                batch.append(_Record(rel, pid, text, payload))
+                if len(batch) >= embed_batch:
+                    self._put(embed_q, batch)
+                    batch = []
+            with lock:
+                expected[rel] = len(pieces)
+                ids[rel] = file_ids
+            return batch
+
+        def chunker():
+            executor = None
+            if self.chunk_processes and len(rel_paths) >= self.process_min_files:
+                try:
+                    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                    executor = ProcessPoolExecutor(max_workers=self.chunk_processes,
+                                                   mp_context=multiprocessing.get_context(method))
+                except (OSError, ValueError, NotImplementedError) as e:
+                    self.logger.warning(f"Chunking process pool unavailable ({e}), chunking inline")
+            pending: Dict[Future, Tuple[str, str]] = {}
+            batch: List[_Record] = []
+
+            def chunk_inline(rel: str, content: str):
+                nonlocal batch
+                try:
+                    pieces, busy = _chunk_job(rel, content, mode, max_tokens)
+                except Exception as e:
+                    self.logger.warning(f"Chunking {rel} failed: {e}")
+                    with lock: failed.add(rel)
+                    return
+                st_chunk.record(1, len(pieces), busy)
+                batch = emit(rel, pieces, batch)
+
+            def collect(futures):
+                nonlocal batch, executor
+                for future in futures:
+                    rel, content = pending.pop(future)
+                    try:
+                        pieces, busy = future.result()
+                    except BrokenProcessPool as e:
+                        if executor:
+                            self.logger.warning(f"Chunking process pool failed ({e}), chunking inline")
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            executor = None
+                        chunk_inline(rel, content)
+                        continue
+                    except Exception as e:
+                        self.logger.warning(f"Chunking {rel} failed: {e}")
+                        with lock: failed.add(rel)
+                        continue
+                    st_chunk.record(1, len(pieces), busy)
+                    batch = emit(rel, pieces, batch)
+
+            try:
+                while True:
+                    item = read_q.get()
+                    if item is _DONE: break
+                    if executor:
+                        try:
+                            pending[executor.submit(_chunk_job, item[0], item[1], mode, max_tokens)] = item
+                        except BrokenProcessPool:
+                            chunk_inline(*item)
+                        if len(pending) >= self.chunk_processes * 2:
+                            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                            collect(done)
+                    else:
+                        chunk_inline(*item)
+                collect(list(pending))
+                if batch: self._put(embed_q, batch)
+            except Exception as e:
+                self.logger.error(f"Chunk stage failed: {e}")
+                self._abort.set()
+            finally:
+                if executor: executor.shutdown(wait=True, cancel_futures=True)
+                for _ in range(self.embed_workers): self._put_final(embed_q)
+
+        # --- embed ---
+        def embedder():
+            stats = EmbeddingStats()
+            with lock: embed_stats.append(stats)
+            try:
+                while True:
+                    batch = embed_q.get()
+                    if batch is _DONE: break
+                    start = time.perf_counter()
+                    try:
+                        vectors = self.rag.embed_texts([r.text for r in batch], stats)
+                    except Exception as e:
+                        self.logger.error(f"Embedding batch failed: {e}")
+                        vectors = [None] * len(batch)
+                    points = []
+                    for record, vector in zip(batch, vectors):
+                        if vector is None:
+                            with lock:
+                                failed.add(record.rel)
+                                counters["failed_chunks"] += 1
+                            continue
+                        points.append((self.rag._make_point(record.id, vector, record.payload), record))
+                    st_embed.record(len(batch), len(points), time.perf_counter() - start)
+                    if points: self._put(upsert_q, points)
+            finally:
+                self._put_final(upsert_q)
+
+        # --- upsert ---
+        sparse: List[_Record] = []
+
+        def index_sparse(force: bool = False):
+            # BM25 rows are committed in larger groups: per-commit cost grows with the index
+            if sparse and (force or len(sparse) >= SPARSE_BATCH):
+                start = time.perf_counter()
+                self.rag._index_sparse(sparse)
+                self._stage("sparse", "points").record(1, len(sparse), time.perf_counter() - start)
+                sparse.clear()
+
+        def flush(items: List[Tuple[Any, _Record]]):
+            if not items: return
+            start = time.perf_counter()
+            ok = self.rag._upsert([p for p, _ in items], wait=False)
+            with lock:
+                for _, record in items:
+                    if ok: written[record.rel] = written.get(record.rel, 0) + 1
+                    else: failed.add(record.rel)
+                counters["chunks" if ok else "failed_chunks"] += len(items)
+            st_upsert.record(1, len(items) if ok else 0, time.perf_counter() - start)
+            if ok:
+                sparse.extend(record for _, record in items)
+                index_sparse()
+
+        def writer():
+            finished, buf = 0, []
+            while finished < self.embed_workers:
+                item = upsert_q.get()
+                if item is _DONE:
+                    finished += 1
+                    continue
+                buf.extend(item)
+                while len(buf) >= self.upsert_batch:
+                    flush(buf[:self.upsert_batch])
+                    buf = buf[self.upsert_batch:]
+            flush(buf)
+            index_sparse(force=True)
+
+        threads = readers + [
+            threading.Thread(target=close_read, name="ingest-read-close", daemon=True),
+            threading.Thread(target=chunker, name="ingest-chunk", daemon=True),
+            *[threading.Thread(target=embedder, name=f"ingest-embed-{i}", daemon=True)
+              for i in range(self.embed_workers)],
+            threading.Thread(target=writer, name="ingest-upsert", daemon=True),
+        ]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        if counters["chunks"]: self.rag._collection_changed()
+
+        result = PipelineResult(chunks=counters["chunks"], failed_chunks=counters["failed_chunks"])
+        for rel in rel_paths:
+            if rel not in failed and rel in expected and written.get(rel, 0) == expected[rel]:
+                result.point_ids[rel] = ids[rel]
+            else:
+                result.incomplete.add(rel)
+        total = EmbeddingStats()
+        for s in embed_stats: total.merge(s)
+        result.cache_hit_rate = round(total.cache_hit_rate, 3)
+        result.seconds = round(time.perf_counter() - t0, 3)
+        result.stages = {name: s.to_dict() for name, s in self.stats.items()}
+        return result
+
+    def _put_final(self, q: queue.Queue):
+        """End-of-stream marker; always delivered (consumers must terminate even after an abort)."""
+        q.put(_DONE)
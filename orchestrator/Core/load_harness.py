@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Orchestrator Load Harness (v2.5.0)
+DIREKTIVE: Goldstandard, Framework-Overhead messbar und als CI-Gate prüfbar.
+
+Zweck:
+Misst den Eigenaufwand von LLMOrchestrator + BuildEngine (Queueing, Status-Tracking,
+Log-Handling, Event-Fan-Out, History) unabhängig von Docker. Die echte Engine
+läuft gegen den FakeDockerClient, der Builds mit konfigurierbarer Dauer und
+Log-Menge simuliert. Tausende Requests werden auf einmal eingereicht.
+
+Metriken (LoadReport):
+- submit_*_ms:    Dauer von submit_build_request()
+- dispatch_*_ms:  Scheduler-Latenz. Zeit, die ein Build startbereit war (Request
+                  eingereicht UND ein Slot frei), bevor er tatsächlich lief
+- overhead_*_ms:  Build-Wall-Clock minus simulierte Container-Zeit
+- cpu_ms_per_job: Prozess-CPU-Zeit je Build (inkl. Log-/Event-Threads)
+- mem_kb_per_job: RSS-Zuwachs je Build (nach gc)
+
+LoadThresholds + LoadReport.check() liefern Verstöße für den CI-Gate
+(scripts/load_test.py --gate).
+"""
+
+import asyncio
+import gc
+import heapq
+import logging
+import tempfile
+import time
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+from orchestrator.utils.logging import get_logger
+from orchestrator.Core.builder import BuildEngine, BuildStatus, ModelFormat, OptimizationLevel
+from orchestrator.Core.fake_docker import FakeDockerClient
+from orchestrator.Core.replay_simulator import SimConfig, percentile
+
+LOAD_TARGET = "LoadTest"
+
+
+def _rss_bytes() -> int:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        import resource
+        # Linux: KB (peak, not current – growth is then an upper bound)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@dataclass
+class LoadProfile:
+    requests: int = 1000
+    quantizations: int = 1          # builds per request
+    capacity: int = 8               # local build slots
+    build_seconds: float = 0.02     # simulated container runtime
+    image_seconds: float = 0.0      # simulated image build
+    log_lines: int = 200            # container log lines per build
+    image_log_lines: int = 20
+    scheduler_policy: str = "fifo"
+    timeout: float = 600.0
+
+    @property
+    def builds(self) -> int:
+        return self.requests * self.quantizations
+
+
+@dataclass
+class LoadThresholds:
+    max_dispatch_p99_ms: float = 500.0
+    max_overhead_p99_ms: float = 1000.0
+    max_cpu_ms_per_job: float = 100.0
+    max_mem_kb_per_job: float = 1024.0
+    min_success_ratio: float = 1.0
+
+
+@dataclass
+class LoadReport:
+    requests: int = 0
+    builds: int = 0
+    completed: int = 0
+    failed: int = 0
+    wall_s: float = 0.0
+    builds_per_s: float = 0.0
+    submit_p50_ms: float = 0.0
+    submit_p99_ms: float = 0.0
+    dispatch_p50_ms: float = 0.0
+    dispatch_p99_ms: float = 0.0
+    overhead_p50_ms: float = 0.0
+    overhead_p99_ms: float = 0.0
+    cpu_ms_per_job: float = 0.0
+    mem_growth_mb: float = 0.0
+    mem_kb_per_job: float = 0.0
+    log_lines_per_s: float = 0.0
+    events: int = 0
+    timed_out: bool = False
+
+    def check(self, thresholds: LoadThresholds) -> List[str]:
+        """Threshold violations (empty = gate passed)."""
+        violations = []
+        ratio = self.completed / self.builds if self.builds else 0.0
+        if self.timed_out: violations.append("run timed out")
+        if ratio < thresholds.min_success_ratio:
+            violations.append(f"success ratio {ratio:.3f} < {thresholds.min_success_ratio}")
+        for metric, limit in (("dispatch_p99_ms", thresholds.max_dispatch_p99_ms),
+                              ("overhead_p99_ms", thresholds.max_overhead_p99_ms),
+                              ("cpu_ms_per_job", thresholds.max_cpu_ms_per_job),
+                              ("mem_kb_per_job", thresholds.max_mem_kb_per_job)):
+            value = getattr(self, metric)
+            if value > limit:
+                violations.append(f"{metric} {value:.1f} > {limit:.1f}")
+        return violations
+
+
+class LoadHarness:
+    """Drives the real orchestrator/engine against a FakeDockerClient."""
+
+    def __init__(self, profile: Optional[LoadProfile] = None):
+        self.logger = get_logger("LoadHarness")
+        self.profile = profile or LoadProfile()
+
+    def run(self) -> LoadReport:
+        # Per-build INFO logging to the console is not what we measure here
+        logging.disable(logging.INFO)
+        try:
+            return asyncio.run(self._run())
+        finally:
+            logging.disable(logging.NOTSET)
+
+    @staticmethod
+    def _prepare_tree(root: Path) -> Path:
+        target = root / "targets" / LOAD_TARGET
+        (target / "modules").mkdir(parents=True)
+        (target / "Dockerfile").write_text("FROM debian:bookworm-slim\n", encoding="utf-8")
+        (target / "modules" / "build.sh").write_text("#!/bin/sh\n", encoding="utf-8")
+        model = root / "models" / "load-model"
+        model.mkdir(parents=True)
+        (model / "config.json").write_text("{}", encoding="utf-8")
+        return model
+
+    async def _run(self) -> LoadReport:
+        from orchestrator.Core.orchestrator import LLMOrchestrator, BuildRequest, WorkflowType, PriorityLevel
+
+        p = self.profile
+        with tempfile.TemporaryDirectory(prefix="llm-load-") as tmp:
+            root = Path(tmp)
+            model = self._prepare_tree(root)
+            config = SimConfig(
+                targets_dir=str(root / "targets"), output_dir=str(root / "output"),
+                cache_dir=str(root / "cache"), logs_dir=str(root / "logs"), models_dir=str(root / "models"),
+                model_prefetch=False, disk_preflight=False, stats_interval=0.05,
+                scheduler_policy=p.scheduler_policy,
+            )
+            client = FakeDockerClient(build_seconds=p.build_seconds, log_lines=p.log_lines,
+                                      image_seconds=p.image_seconds, image_log_lines=p.image_log_lines)
+            engine = BuildEngine(config, max_concurrent_builds=p.capacity, docker_client=client)
+            orch = LLMOrchestrator(config, build_engine=engine)
+            quants = [f"Q{i}_K_M" for i in range(p.quantizations)]
+
+            gc.collect()
+            rss0, cpu0, wall0 = _rss_bytes(), time.process_time(), time.monotonic()
+            submitted: Dict[str, float] = {}
+            submit_ms: List[float] = []
+            for i in range(p.requests):
+                rid = f"load{i:06d}"
+                req = BuildRequest(
+                    request_id=rid, workflow_type=WorkflowType.SIMPLE_CONVERSION, priority=PriorityLevel.NORMAL,
+                    models=[str(model)], targets=[LOAD_TARGET], target_formats=[ModelFormat.GGUF],
+                    optimization_level=OptimizationLevel.BALANCED, quantization_options=quants,
+                    parallel_builds=True, output_base_dir=str(root / "output" / rid), skip_preflight=True)
+                submitted[rid] = time.time()
+                t = time.perf_counter()
+                await orch.submit_build_request(req)
+                submit_ms.append((time.perf_counter() - t) * 1000)
+
+            deadline = wall0 + p.timeout
+            timed_out = True
+            while time.monotonic() < deadline:
+                if all(s.end_time is not None for s in orch._workflows.values()):
+                    timed_out = False
+                    break
+                await asyncio.sleep(0.01)
+            wall = time.monotonic() - wall0
+            cpu = time.process_time() - cpu0
+            gc.collect()
+            rss1 = _rss_bytes()
+
+            report = self._summarize(engine, submitted, submit_ms, wall, cpu, rss1 - rss0)
+            report.timed_out = timed_out
+            report.events = client.events_emitted
+            engine.shutdown()
+            client.close()
+        return report
+
+    def _summarize(self, engine: BuildEngine, submitted: Dict[str, float], submit_ms: List[float],
+                   wall: float, cpu: float, rss_growth: int) -> LoadReport:
+        p = self.profile
+        builds = [b for b in engine.list_builds() if b.start_time and b.end_time]
+        report = LoadReport(requests=p.requests, builds=p.builds, wall_s=round(wall, 2))
+        report.completed = sum(1 for b in builds if b.status == BuildStatus.COMPLETED)
+        report.failed = p.builds - report.completed
+        report.submit_p50_ms = round(percentile(submit_ms, 50), 2)
+        report.submit_p99_ms = round(percentile(submit_ms, 99), 2)
+        if not builds: return report
+
+        # Dispatch latency: greedy replay of slot usage in start order
+        configs = engine._build_configs
+        slots = [0.0] * engine.worker_pool.total_capacity
+        dispatch, overhead = [], []
+        simulated = p.build_seconds + p.image_seconds
+        for b in sorted(builds, key=lambda b: b.start_time):
+            start, end = b.start_time.timestamp(), b.end_time.timestamp()
+            free = heapq.heappop(slots)
+            cfg = configs.get(b.build_id)
+            ready = max(submitted.get(cfg.request_id if cfg else "", start), free)
+            dispatch.append(max(start - ready, 0.0) * 1000)
+            heapq.heappush(slots, end)
+            overhead.append(max(end - start - simulated, 0.0) * 1000)
+
+        report.builds_per_s = round(len(builds) / wall, 1) if wall else 0.0
+        report.dispatch_p50_ms = round(percentile(dispatch, 50), 2)
+        report.dispatch_p99_ms = round(percentile(dispatch, 99), 2)
+        report.overhead_p50_ms = round(percentile(overhead, 50), 2)
+        report.overhead_p99_ms = round(percentile(overhead, 99), 2)
+        report.cpu_ms_per_job = round(cpu * 1000 / len(builds), 2)
+        report.mem_growth_mb = round(rss_growth / 1024 ** 2, 1)
+        report.mem_kb_per_job = round(max(rss_growth, 0) / 1024 / len(builds), 2)
+        report.log_lines_per_s = round(len(builds) * p.log_lines / wall, 0) if wall else 0.0
+        return report
+
+    @staticmethod
+    def to_dict(report: LoadReport) -> Dict:
+        return asdict(report)
@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Embedded Vector Store (v2.5.0)
+DIREKTIVE: Goldstandard, RAG ohne Qdrant-Sidecar (Laptops ohne Docker).
+
+Zweck:
+In-Process Ersatz für den Qdrant-Container. Bietet die Teilmenge der
+QdrantClient-API, die RAGManager und CommunityManager nutzen (get_collections,
+create/delete/get_collection, upsert, delete, search, scroll, Snapshots), damit
+Ingest und Suche unverändert laufen.
+
+Speicher je Collection (<root>/<collection>/):
+- vectors.f32   float32 Matrix als np.memmap (L2-normalisiert, wächst durch Verdoppeln)
+- points.db     SQLite: row -> (point id, payload JSON), Tombstones bei Delete,
+                Schreib-Generation (state.generation)
+- meta.json     dim, Kapazität
+- ivf.npz       optional: IVF-Partitionierung (k-means Zentroiden + Row-Zuordnung)
+- write.lock    Datei-Lock für Schreiber
+
+Mehrere Prozesse: Schreiben (Upsert/Delete/IVF/Snapshot) läuft unter write.lock.
+Jeder Schreiber erhöht die Generation in derselben Transaktion; sieht ein Prozess
+eine fremde Generation, lädt er Row-Zuordnung, Kapazität und IVF neu, bevor er
+Rows vergibt oder sucht. Row-Allokation kollidiert so nicht zwischen Prozessen.
+
+Snapshots: Kopien unter <root>/.snapshots/<collection>/ (Namen chronologisch
+sortierbar); RAGManager behält nur die letzten 'rag_snapshot_keep'.
+
+Suche: Cosine = Skalarprodukt normalisierter Vektoren, vektorisiert mit NumPy
+(argpartition für Top-k). Ab 'ivf_min_points' Punkten und aktiviertem IVF werden
+nur die 'nprobe' nächsten Partitionen gescannt; neue Punkte werden der nächsten
+Partition zugeordnet, bei +50 % Wachstum wird neu trainiert.
+
+Voraussetzung: numpy (ohnehin Abhängigkeit von qdrant-client).
+"""
+
+import json
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from orchestrator.utils.logging import get_logger
+from orchestrator.utils.helpers import ensure_directory, file_lock
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+_INITIAL_CAPACITY = 1024
+
+
+@dataclass
+class LocalPoint:
+    """PointStruct equivalent when qdrant-client is not installed."""
+    id: str
+    vector: List[float]
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class LocalHit:
+    id: str
+    score: float
+    payload: Dict[str, Any]
+    vector: Optional[List[float]] = None
+
+
+def _ids_of(selector: Any) -> List[str]:
+    """Point IDs from a PointIdsList-like selector or a plain list."""
+    points = getattr(selector, "points", selector)
+    return [str(p) for p in points]
+
+
+class _Collection:
+    def __init__(self, path: Path, dim: int, ivf_lists: int, ivf_min_points: int, nprobe: int):
+        self.logger = get_logger("LocalVectorStore")
+        self.path = path
+        ensure_directory(path)
+        self.ivf_lists, self.ivf_min_points, self.nprobe = ivf_lists, ivf_min_points, nprobe
+        self._lock = threading.RLock()
+        self.write_lock_path = path / "write.lock"
+
+        self.db = sqlite3.connect(str(path / "points.db"), check_same_thread=False)
+        with file_lock(self.write_lock_path):
+            meta_file = path / "meta.json"
+            meta = json.loads(meta_file.read_text()) if meta_file.exists() else {"dim": dim, "capacity": _INITIAL_CAPACITY}
+            self.dim = int(meta["dim"])
+            self.capacity = int(meta["capacity"])
+            with self.db:
+                self.db.execute("PRAGMA journal_mode=WAL")
+                self.db.execute("CREATE TABLE IF NOT EXISTS points (row INTEGER PRIMARY KEY, id TEXT, payload TEXT, alive INTEGER)")
+                self.db.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_points_id ON points(id) WHERE alive = 1")
+                self.db.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value INTEGER)")
+                self.db.execute("INSERT OR IGNORE INTO state (key, value) VALUES ('generation', 0)")
+            self._open_matrix()
+            self._load_state()
+            self._save_meta()
+        self._load_ivf()
+
+    def _db_generation(self) -> int:
+        return self.db.execute("SELECT value FROM state WHERE key = 'generation'").fetchone()[0]
+
+    def _load_state(self):
+        """Row allocation from SQLite (source of truth across processes)."""
+        self._generation = self._db_generation()
+        rows = self.db.execute("SELECT row, id FROM points WHERE alive = 1").fetchall()
+        self.rows: Dict[str, int] = {pid: row for row, pid in rows}
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        for row in self.rows.values(): self.alive[row] = True
+        self.free: List[int] = [r for (r,) in self.db.execute("SELECT row FROM points WHERE alive = 0")]
+        self.next_row = (self.db.execute("SELECT COALESCE(MAX(row), -1) FROM points").fetchone()[0]) + 1
+
+    def _sync(self):
+        """Reloads state written by another process (caller holds self._lock)."""
+        if self._db_generation() == self._generation: return
+        meta = json.loads((self.path / "meta.json").read_text())
+        if int(meta["capacity"]) != self.capacity:
+            self.matrix.flush()
+            del self.matrix
+            self.capacity = int(meta["capacity"])
+            self._open_matrix()
+        self._load_state()
+        self._load_ivf()
+
+    def refresh(self):
+        """Picks up writes of other processes."""
+        with self._lock:
+            self._sync()
+
+    def _bump_generation(self):
+        """Inside the write transaction: marks the change for other processes."""
+        self.db.execute("UPDATE state SET value = value + 1 WHERE key = 'generation'")
+        self._generation = self._db_generation()
+
+    # --- STORAGE ---
+
+    def _open_matrix(self):
+        file = self.path / "vectors.f32"
+        if not file.exists() or file.stat().st_size < self.capacity * self.dim * 4:
+            with open(file, "ab") as f:
+                f.truncate(self.capacity * self.dim * 4)
+        self.matrix = np.memmap(file, dtype=np.float32, mode="r+", shape=(self.capacity, self.dim))
+
+    def _save_meta(self):
+        tmp = self.path / "meta.json.tmp"
+        tmp.write_text(json.dumps({"dim": self.dim, "capacity": self.capacity}))
+        tmp.replace(self.path / "meta.json")
+
+    def _grow(self, needed: int):
+        if needed <= self.capacity: return
+        capacity = self.capacity
+        while capacity < needed: capacity *= 2
+        self.matrix.flush()
+        del self.matrix
+        self.capacity = capacity
+        self._open_matrix()
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:len(self.alive)] = self.alive
+        self.alive = alive
+        if self.ivf is not None:
+            assign = np.full(capacity, -1, dtype=np.int32)
+            assign[:len(self.ivf_assign)] = self.ivf_assign
+            self.ivf_assign = assign
+        self._save_meta()
+
+    @property
+    def count(self) -> int:
+        return len(self.rows)
+
+    # --- WRITE ---
+
+    def upsert(self, points: Iterable[Any]):
+        points = list(points)
+        if not points: return
+        vectors = np.asarray([p.vector for p in points], dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Vector dimension {vectors.shape[1]} != collection dimension {self.dim}")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.clip(norms, 1e-12, None)
+        with self._lock, file_lock(self.write_lock_path):
+            self._sync()
+            rows = []
+            for p in points:
+                pid = str(p.id)
+                row = self.rows.get(pid)
+                if row is None:
+                    row = self.free.pop() if self.free else self.next_row
+                    if row == self.next_row: self.next_row += 1
+                rows.append(row)
+                self.rows[pid] = row
+            self._grow(self.next_row)
+            idx = np.asarray(rows)
+            self.matrix[idx] = vectors
+            self.alive[idx] = True
+            if self.ivf is not None:
+                self.ivf_assign[idx] = np.argmax(vectors @ self.ivf.T, axis=1)
+            self._maybe_train_ivf()
+            # Vectors and ivf.npz are complete before other processes see the new generation
+            self.matrix.flush()
+            with self.db:
+                self.db.executemany("INSERT OR REPLACE INTO points (row, id, payload, alive) VALUES (?, ?, ?, 1)",
+                                    [(r, str(p.id), json.dumps(p.payload or {}, default=str)) for r, p in zip(rows, points)])
+                self._bump_generation()
+
+    def delete(self, ids: List[str]) -> int:
+        with self._lock, file_lock(self.write_lock_path):
+            self._sync()
+            rows = [self.rows.pop(pid) for pid in ids if pid in self.rows]
+            if not rows: return 0
+            self.alive[rows] = False
+            self.free.extend(rows)
+            with self.db:
+                self.db.executemany("UPDATE points SET alive = 0, payload = NULL WHERE row = ?", [(r,) for r in rows])
+                self._bump_generation()
+            return len(rows)
+
+    def flush(self):
+        with self._lock:
+            self.matrix.flush()
+
+    def close(self):
+        with self._lock:
+            self.matrix.flush()
+            self.db.close()
+
+    # --- IVF ---
+
+    def _load_ivf(self):
+        self.ivf, self.ivf_assign, self.ivf_trained_at = None, None, 0
+        file = self.path / "ivf.npz"
+        if self.ivf_lists and file.exists():
+            data = np.load(file)
+            self.ivf = data["centroids"]
+            self.ivf_assign = np.full(self.capacity, -1, dtype=np.int32)
+            assign = data["assign"]
+            self.ivf_assign[:len(assign)] = assign[:self.capacity]
+            self.ivf_trained_at = int(data["trained_at"])
+            # Rows added after training (possibly by another process) -> nearest partition
+            missing = np.flatnonzero(self.alive[:self.next_row] & (self.ivf_assign[:self.next_row] < 0))
+            if len(missing):
+                self.ivf_assign[missing] = np.argmax(np.asarray(self.matrix[missing]) @ self.ivf.T, axis=1)
+
+    def _maybe_train_ivf(self):
+        if not self.ivf_lists or self.count < self.ivf_min_points: return
+        if self.ivf is not None and self.count < self.ivf_trained_at * 1.5: return
+        self._train_ivf()
+
+    def train_ivf(self, iterations: int = 10, sample: int = 50000):
+        """k-means (spherical) over a sample of the live rows, then assign every row."""
+        with self._lock, file_lock(self.write_lock_path):
+            self._sync()
+            self._train_ivf(iterations, sample)
+            with self.db:
+                self._bump_generation()
+
+    def _train_ivf(self, iterations: int = 10, sample: int = 50000):
+        """Caller holds the thread and write locks."""
+        live = np.flatnonzero(self.alive[:self.next_row])
+        if len(live) == 0: return
+        k = max(1, min(self.ivf_lists, len(live) // 39))
+        rng = np.random.default_rng(0)
+        train = np.asarray(self.matrix[rng.choice(live, size=min(sample, len(live)), replace=False)])
+        centroids = train[rng.choice(len(train), size=k, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(train @ centroids.T, axis=1)
+            for c in range(k):
+                members = train[labels == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[c] = centroid / max(np.linalg.norm(centroid), 1e-12)
+        assign = np.full(self.capacity, -1, dtype=np.int32)
+        for start in range(0, len(live), 65536):
+            part = live[start:start + 65536]
+            assign[part] = np.argmax(np.asarray(self.matrix[part]) @ centroids.T, axis=1)
+        self.ivf, self.ivf_assign, self.ivf_trained_at = centroids, assign, self.count
+        tmp = self.path / "ivf.npz.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, centroids=centroids, assign=assign[:self.next_row], trained_at=self.count)
+        tmp.replace(self.path / "ivf.npz")
+        self.logger.info(f"IVF trained: {k} lists over {self.count} points")
+
+    # --- READ ---
+
+    def _candidates(self, query: "np.ndarray") -> "np.ndarray":
+        n = self.next_row
+        if self.ivf is None:
+            return np.flatnonzero(self.alive[:n])
+        probe = np.argsort(-(self.ivf @ query))[:max(1, self.nprobe)]
+        return np.flatnonzero(self.alive[:n] & np.isin(self.ivf_assign[:n], probe))
+
+    def search(self, vector: List[float], limit: int, score_threshold: Optional[float] = None,
+               with_vectors: bool = False, payload_filter: Optional[Dict[str, Any]] = None) -> List[LocalHit]:
+        q = np.asarray(vector, dtype=np.float32)
+        q /= max(float(np.linalg.norm(q)), 1e-12)
+        with self._lock:
+            self._sync()
+            cand = self._candidates(q)
+            if len(cand) == 0: return []
+            scores = np.asarray(self.matrix[cand]) @ q
+            if payload_filter:
+                top, payloads = self._filtered_top(cand, scores, limit, score_threshold, payload_filter)
+            else:
+                k = min(limit, len(cand))
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top])]
+                if score_threshold is not None:
+                    top = top[scores[top] >= score_threshold]
+                payloads = self._payloads([int(cand[i]) for i in top])
+            rows = [int(cand[i]) for i in top]
+            vectors = np.asarray(self.matrix[rows]).tolist() if with_vectors else [None] * len(rows)
+        return [LocalHit(id=payloads[r][0], score=float(scores[i]), payload=payloads[r][1], vector=v)
+                for r, i, v in zip(rows, top, vectors)]
+
+    def _filtered_top(self, cand, scores, limit: int, score_threshold: Optional[float],
+                      payload_filter: Dict[str, Any]):
+        """Best 'limit' rows whose payload matches every key of 'payload_filter' (pages through the ranking)."""
+        order = np.argsort(-scores)
+        if score_threshold is not None:
+            order = order[scores[order] >= score_threshold]
+        top, payloads = [], {}
+        page = max(limit * 4, 64)
+        for start in range(0, len(order), page):
+            part = order[start:start + page]
+            found = self._payloads([int(cand[i]) for i in part])
+            for i in part:
+                row = int(cand[i])
+                if all(found[row][1].get(k) == v for k, v in payload_filter.items()):
+                    top.append(i)
+                    payloads[row] = found[row]
+                    if len(top) == limit: return top, payloads
+        return top, payloads
+
+    def _payloads(self, rows: List[int]) -> Dict[int, Tuple[str, Dict[str, Any]]]:
+        out = {}
+        for start in range(0, len(rows), 500):
+            part = rows[start:start + 500]
+            for row, pid, payload in self.db.execute(
+                    f"SELECT row, id, payload FROM points WHERE row IN ({', '.join('?' * len(part))})", part):
+                out[row] = (pid, json.loads(payload) if payload else {})
+        return out
+
+    def scroll(self, limit: int, offset: Optional[int], with_vectors: bool,
+               payload_filter: Optional[Dict[str, Any]] = None) -> Tuple[List[LocalHit], Optional[int]]:
+        """Pages in row order; 'payload_filter' keeps rows matching every key (offset = next row to scan)."""
+        records: List[LocalHit] = []
+        next_offset = int(offset or 0)
+        with self._lock:
+            self._sync()
+            while next_offset is not None and len(records) < limit:
+                rows = self.db.execute("SELECT row, id, payload FROM points WHERE alive = 1 AND row >= ? "
+                                       "ORDER BY row LIMIT ?", (next_offset, limit + 1)).fetchall()
+                next_offset = rows[limit][0] if len(rows) > limit else None
+                for row, pid, payload in rows[:limit]:
+                    data = json.loads(payload) if payload else {}
+                    if payload_filter and any(data.get(k) != v for k, v in payload_filter.items()):
+                        continue
+                    if len(records) == limit:
+                        next_offset = row
+                        break
+                    records.append(LocalHit(id=pid, score=0.0, payload=data,
+                                            vector=np.asarray(self.matrix[row]).tolist() if with_vectors else None))
+        return records, next_offset
+
+
+class LocalVectorStore:
+    """
+    Embedded vector store with a QdrantClient-compatible API subset.
+    Args:
+        root:           Storage directory (one subdirectory per collection).
+        ivf_lists:      Max IVF partitions (0 = exact search only).
+        ivf_min_points: Points before IVF is trained.
+        nprobe:         Partitions scanned per query.
+    """
+
+    def __init__(self, root: Path, ivf_lists: int = 0, ivf_min_points: int = 20000, nprobe: int = 8):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy not installed")
+        self.logger = get_logger("LocalVectorStore")
+        self.root = Path(root)
+        ensure_directory(self.root)
+        self.ivf_lists, self.ivf_min_points, self.nprobe = int(ivf_lists), int(ivf_min_points), int(nprobe)
+        self._collections: Dict[str, _Collection] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str) -> _Collection:
+        with self._lock:
+            col = self._collections.get(name)
+            if col is None:
+                if not (self.root / name / "meta.json").exists():
+                    raise KeyError(f"Collection '{name}' not found")
+                col = _Collection(self.root / name, 0, self.ivf_lists, self.ivf_min_points, self.nprobe)
+                self._collections[name] = col
+            return col
+
+    # --- COLLECTIONS ---
+
+    def get_collections(self):
+        names = sorted(p.name for p in self.root.iterdir() if (p / "meta.json").exists())
+        return SimpleNamespace(collections=[SimpleNamespace(name=n) for n in names])
+
+    def collection_exists(self, collection_name: str) -> bool:
+        return (self.root / collection_name / "meta.json").exists()
+
+    def create_collection(self, collection_name: str, vectors_config: Any, **kwargs) -> bool:
+        dim = int(getattr(vectors_config, "size", vectors_config))
+        with self._lock:
+            self._collections[collection_name] = _Collection(
+                self.root / collection_name, dim, self.ivf_lists, self.ivf_min_points, self.nprobe)
+        return True
+
+    def delete_collection(self, collection_name: str, **kwargs) -> bool:
+        with self._lock:
+            col = self._collections.pop(collection_name, None)
+            if col: col.close()
+        shutil.rmtree(self.root / collection_name, ignore_errors=True)
+        return True
+
+    def get_collection(self, collection_name: str):
+        col = self._get(collection_name)
+        col.refresh()
+        return SimpleNamespace(
+            points_count=col.count, vectors_count=col.count, status=SimpleNamespace(name="GREEN"),
+            config=SimpleNamespace(params=SimpleNamespace(vectors=SimpleNamespace(size=col.dim))))
+
+    def count(self, collection_name: str, **kwargs):
+        col = self._get(collection_name)
+        col.refresh()
+        return SimpleNamespace(count=col.count)
+
+    # --- POINTS ---
+
+    def upsert(self, collection_name: str, points: Iterable[Any], wait: bool = True, **kwargs):
+        col = self._get(collection_name)
+        col.upsert(points)
+        if wait: col.flush()
+        return SimpleNamespace(status="completed")
+
+    def delete(self, collection_name: str, points_selector: Any, wait: bool = True, **kwargs):
+        self._get(collection_name).delete(_ids_of(points_selector))
+        return SimpleNamespace(status="completed")
+
+    def search(self, collection_name: str, query_vector: List[float], limit: int = 10,
+               score_threshold: Optional[float] = None, with_vectors: bool = False,
+               query_filter: Optional[Dict[str, Any]] = None, **kwargs) -> List[LocalHit]:
+        """'query_filter': payload equality match {key: value} (Qdrant: rest.Filter)."""
+        return self._get(collection_name).search(query_vector, limit, score_threshold, with_vectors, query_filter)
+
+    def scroll(self, collection_name: str, limit: int = 10, offset: Optional[int] = None,
+               with_payload: bool = True, with_vectors: bool = False,
+               scroll_filter: Optional[Dict[str, Any]] = None, **kwargs):
+        """'scroll_filter': payload equality match {key: value} (Qdrant: rest.Filter)."""
+        return self._get(collection_name).scroll(limit, offset, with_vectors, scroll_filter)
+
+    # --- SNAPSHOTS (file copies) ---
+
+    def create_snapshot(self, collection_name: str, **kwargs):
+        col = self._get(collection_name)
+        now = time.time()  # one reading: seconds and milliseconds must agree for the names to sort
+        name = f"{collection_name}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1000) % 1000:03d}"
+        dest = self.root / ".snapshots" / collection_name / name
+        with col._lock, file_lock(col.write_lock_path):
+            col.matrix.flush()
+            shutil.copytree(col.path, dest, ignore=shutil.ignore_patterns("write.lock", "*.tmp"))
+        return SimpleNamespace(name=name)
+
+    def list_snapshots(self, collection_name: str, **kwargs):
+        base = self.root / ".snapshots" / collection_name
+        names = sorted(p.name for p in base.iterdir()) if base.exists() else []
+        return [SimpleNamespace(name=n) for n in names]
+
+    def delete_snapshot(self, collection_name: str, snapshot_name: str, **kwargs) -> bool:
+        shutil.rmtree(self.root / ".snapshots" / collection_name / snapshot_name, ignore_errors=True)
+        return True
+
+    def close(self):
+        with self._lock:
+            for col in self._collections.values(): col.close()
+            self._collections.clear()
+
+    # --- SYNC ---
+
+    def sync_to(self, client: Any, collection_name: str, target_collection: str,
+                point_factory=None, batch_size: int = 256) -> int:
+        """Copies all points of a local collection into another client (e.g. Qdrant). Returns the count."""
+        col = self._get(collection_name)
+        make = point_factory or (lambda pid, vec, payload: LocalPoint(pid, vec, payload))
+        offset, synced = None, 0
+        while True:
+            records, offset = col.scroll(batch_size, offset, with_vectors=True)
+            if records:
+                client.upsert(collection_name=target_collection,
+                              points=[make(r.id, r.vector, r.payload) for r in records])
+                synced += len(records)
+            if offset is None: break
+        return synced
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Model Stager (v2.5.0)
+DIREKTIVE: Goldstandard, IO parallel zur CPU-Arbeit, verifizierte Artefakte.
+
+Zweck:
+Löst die Modell-Quelle eines Builds auf und legt sie in 'cache/models' ab,
+während die BuildEngine parallel das Toolchain-Image baut:
+- Hugging Face Repo-ID  -> snapshot_download nach cache/models/<org>--<name>@<revision>/<name>
+  (letzte Pfadkomponente = Modellname, Module leiten MODEL_NAME per basename ab)
+- Lokaler Pfad (mount)  -> Read-Only Bind-Mount unter /build-cache/source/<name>, keine Kopie
+- Lokaler Pfad (copy)   -> Kopie nach cache/models/local/<hash der Quelle>/<name> (Remote-Worker ohne geteilten Pfad)
+
+Beim Mount wird der Mount-Root so gewählt, dass alle Symlinks der Quelle
+(z.B. HF-Cache snapshots/ -> blobs/) auch im Container auflösbar bleiben.
+Der Root wird höchstens bis zum Elternordner des Modells, zum HF-Repo-Ordner
+eines Snapshots oder zu einem konfigurierten Modell-/Cache-Root erweitert;
+müsste er darüber hinaus (z.B. bis $HOME), wird stattdessen kopiert.
+
+Integrität:
+- HF: Größe und (für LFS-Dateien) SHA256 gegen die Repo-Metadaten.
+- Lokal (copy): Größe jeder Datei gegen die Quelle.
+Ein Manifest '.<name>.staged.json' neben dem Stage hält das Ergebnis fest; unveränderte Stages
+(Größe + mtime) werden beim nächsten Build ohne erneutes Hashing übernommen.
+
+Nebenläufigkeit: Download/Kopie laufen unter einem Datei-Lock je Ziel
+('.<name>.lock'), parallele Builds (auch anderer Prozesse) warten und
+übernehmen danach das Manifest. 'pin' wird vor dem Schreiben mit dem Ziel
+aufgerufen, damit die Cache-GC einen laufenden Download nicht verdrängt.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, Optional, Tuple, Any, Callable
+
+from orchestrator.utils.logging import get_logger
+from orchestrator.utils.helpers import ensure_directory, calculate_file_checksum, sanitize_filename, file_lock
+
+HF_REPO_PATTERN = re.compile(r"^[\w.-]+/[\w.-]+$")
+COMMIT_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+MANIFEST_NAME = ".staged.json"
+LOCK_NAME = ".lock"
+
+# Container-Mountpunkt von cache/models (siehe BuildEngine Volumes)
+CONTAINER_MODELS_DIR = "/build-cache/models"
+# Stabiler Mountpunkt für Read-Only Host-Modelle
+CONTAINER_SOURCE_DIR = "/build-cache/source"
+
+
+class ModelIntegrityError(RuntimeError):
+    """Raised when a staged model does not match its expected size/hash."""
+    pass
+
+
+@dataclass
+class StagedModel:
+    source: str
+    kind: str                 # "huggingface" | "local" | "mount"
+    host_path: str
+    container_path: str
+    revision: Optional[str] = None
+    files: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # rel -> {size, mtime, sha256}
+    size_bytes: int = 0
+    mount_source: Optional[str] = None  # Host dir bind-mounted read-only (kind == "mount")
+
+    def volumes(self) -> Dict[str, Dict[str, str]]:
+        """Extra container volumes required to see the model."""
+        if self.kind != "mount" or not self.mount_source: return {}
+        bind = f"{CONTAINER_SOURCE_DIR}/{Path(self.mount_source).name}"
+        return {self.mount_source: {"bind": bind, "mode": "ro"}}
+
+
+class ModelStager:
+    """Stages model sources into cache/models with integrity verification."""
+
+    def __init__(self, cache_dir: Path, token_fn: Optional[Callable[[], Optional[str]]] = None,
+                 mount_roots: Iterable[Path] = ()):
+        self.logger = get_logger("ModelStager")
+        self.models_dir = Path(cache_dir) / "models"
+        self._token_fn = token_fn
+        # Directories a read-only mount may widen up to (besides the model's parent)
+        self.mount_roots = tuple(Path(r).resolve() for r in mount_roots)
+        ensure_directory(self.models_dir)
+
+    @staticmethod
+    def is_hf_repo(source: str) -> bool:
+        return bool(source) and not os.path.exists(source) and bool(HF_REPO_PATTERN.match(source))
+
+    def _container_path(self, host_path: Path) -> str:
+        return f"{CONTAINER_MODELS_DIR}/{host_path.relative_to(self.models_dir).as_posix()}"
+
+    def stage(self, source: str, revision: Optional[str] = "main",
+              log: Optional[Callable[[str], None]] = None, local_mode: str = "mount",
+              pin: Optional[Callable[[Path], None]] = None) -> Optional[StagedModel]:
+        """
+        Stages 'source'. Returns None if the source is neither a local path nor
+        a HF repo id (the container then resolves it itself, legacy behaviour).
+        local_mode: "mount" (zero-copy, read-only bind) or "copy".
+        pin: called with the cache destination before anything is written.
+        """
+        log = log or self.logger.info
+        pin = pin or (lambda dest: None)
+        if source and os.path.exists(source):
+            if local_mode == "mount":
+                staged = self._mount_local(Path(source).resolve(), log)
+                if staged: return staged
+            return self._stage_local(Path(source).resolve(), log, pin)
+        if self.is_hf_repo(source):
+            return self._stage_huggingface(source, revision or "main", log, pin)
+        return None
+
+    # --- LOCAL ---
+
+    @staticmethod
+    def _mount_root(src: Path) -> Path:
+        """Smallest directory containing the source and all its symlink targets."""
+        root = src if src.is_dir() else src.parent
+        candidates = [src] + ([p for p in src.rglob("*") if p.is_symlink()] if src.is_dir() else [])
+        for p in candidates:
+            if p.is_symlink() or p == src:
+                target = p.resolve()
+                while root != root.parent and root not in target.parents and root != target:
+                    root = root.parent
+        if root == root.parent:
+            # Links point across the filesystem root: never mount '/', links outside stay unresolved
+            return src if src.is_dir() else src.parent
+        return root
+
+    def _mount_ceilings(self, src_dir: Path) -> Tuple[Path, ...]:
+        """Highest directories a mount of 'src_dir' may widen to."""
+        ceilings = [src_dir.parent]
+        if src_dir.parent.name == "snapshots" and src_dir.parent.parent.name.startswith("models--"):
+            ceilings.append(src_dir.parent.parent)  # HF cache repo: snapshots/ -> blobs/
+        ceilings.extend(r for r in self.mount_roots if r == src_dir or r in src_dir.parents)
+        return tuple(ceilings)
+
+    def _mount_local(self, src: Path, log: Callable[[str], None]) -> Optional[StagedModel]:
+        """Read-only mount of 'src', None if its symlinks need a mount root above the allowed ceilings."""
+        mount_root = self._mount_root(src)
+        ceilings = self._mount_ceilings(src if src.is_dir() else src.parent)
+        if not any(mount_root == c or c in mount_root.parents for c in ceilings):
+            log(f"Symlinks of {src} point outside its directory (would mount {mount_root}), copying instead")
+            return None
+        rel = src.relative_to(mount_root).as_posix() if src != mount_root else ""
+        container_path = f"{CONTAINER_SOURCE_DIR}/{mount_root.name}" + (f"/{rel}" if rel else "")
+
+        staged = StagedModel(source=str(src), kind="mount", host_path=str(src),
+                             container_path=container_path, mount_source=str(mount_root))
+        for rel_file, p in self._walk(src).items():
+            st = p.stat()  # follows symlinks -> real blob size
+            staged.files[rel_file] = {"size": st.st_size, "mtime": st.st_mtime}
+        staged.size_bytes = sum(m["size"] for m in staged.files.values())
+        log(f"Mounting local model read-only: {mount_root} -> {CONTAINER_SOURCE_DIR}/{mount_root.name}")
+        return staged
+
+    def local_dest(self, src: Path) -> Path:
+        """cache/models/local/<sha1(source)[:12]>/<name>: same-named sources never share a stage."""
+        key = hashlib.sha1(str(Path(src).resolve()).encode("utf-8")).hexdigest()[:12]
+        return self.models_dir / "local" / key / sanitize_filename(Path(src).name)
+
+    def _stage_local(self, src: Path, log: Callable[[str], None], pin: Callable[[Path], None]) -> StagedModel:
+        dest = self.local_dest(src)
+        pin(dest)
+        with file_lock(self._lock_path(dest)):
+            return self._copy_local(src, dest, log)
+
+    def _copy_local(self, src: Path, dest: Path, log: Callable[[str], None]) -> StagedModel:
+        src_files = self._walk(src)
+        manifest = self._load_manifest(dest)
+        if manifest and manifest.source == str(src) and self._unchanged(dest, manifest) \
+                and {rel: meta["size"] for rel, meta in manifest.files.items()} == {rel: p.stat().st_size for rel, p in src_files.items()}:
+            log(f"Model already staged: {dest}")
+            return manifest
+
+        log(f"Staging local model {src} -> {dest}")
+        if dest.exists(): shutil.rmtree(dest) if dest.is_dir() else dest.unlink()
+        if src.is_dir():
+            shutil.copytree(src, dest)
+        else:
+            ensure_directory(dest.parent)
+            shutil.copy2(src, dest)
+
+        staged = StagedModel(source=str(src), kind="local", host_path=str(dest),
+                             container_path=self._container_path(dest))
+        for rel, p in self._walk(dest).items():
+            expected = src_files.get(rel)
+            if expected is None or p.stat().st_size != expected.stat().st_size:
+                raise ModelIntegrityError(f"Staged copy of '{rel}' does not match source")
+            staged.files[rel] = {"size": p.stat().st_size, "mtime": p.stat().st_mtime}
+        staged.size_bytes = sum(m["size"] for m in staged.files.values())
+        self._save_manifest(dest, staged)
+        return staged
+
+    # --- HUGGING FACE ---
+
+    def hf_dest(self, repo_id: str, revision: str) -> Path:
+        """cache/models/<org>--<name>@<revision>/<name>: basename is the model name."""
+        entry = f"{repo_id.replace('/', '--')}@{sanitize_filename(revision)}"
+        return self.models_dir / entry / repo_id.split("/")[-1]
+
+    def _stage_huggingface(self, repo_id: str, revision: str, log: Callable[[str], None],
+                           pin: Callable[[Path], None]) -> StagedModel:
+        dest = self.hf_dest(repo_id, revision)
+        pin(dest)
+        with file_lock(self._lock_path(dest)):
+            return self._download_huggingface(repo_id, revision, dest, log)
+
+    def _download_huggingface(self, repo_id: str, revision: str, dest: Path, log: Callable[[str], None]) -> StagedModel:
+        from huggingface_hub import HfApi, snapshot_download
+
+        manifest = self._load_manifest(dest)
+        if manifest and COMMIT_SHA_PATTERN.match(revision) and self._unchanged(dest, manifest):
+            # Pinned commit: content cannot move, no need to ask the Hub
+            log(f"Model already staged: {repo_id}@{revision[:12]}")
+            return manifest
+
+        token = self._token_fn() if self._token_fn else None
+        try:
+            info = HfApi(token=token).model_info(repo_id, revision=revision, files_metadata=True)
+        except Exception as e:
+            if manifest and self._unchanged(dest, manifest):
+                log(f"Cannot resolve {repo_id}@{revision} ({e}), using staged commit {str(manifest.revision)[:12]}")
+                return manifest
+            raise
+        # Branches/tags move: the stage is only current if it holds the commit the ref points to now
+        if manifest and info.sha and manifest.revision == info.sha and self._unchanged(dest, manifest):
+            log(f"Model already staged: {repo_id}@{revision} ({info.sha[:12]})")
+            return manifest
+        if manifest and info.sha and manifest.revision != info.sha:
+            log(f"{repo_id}@{revision} moved to {info.sha[:12]} (staged: {str(manifest.revision)[:12]}), updating")
+        expected = {}
+        for s in info.siblings or []:
+            lfs = s.lfs if isinstance(s.lfs, dict) or s.lfs is None else vars(s.lfs)
+            expected[s.rfilename] = {"size": s.size, "sha256": (lfs or {}).get("sha256")}
+
+        log(f"Downloading {repo_id}@{revision} ({len(expected)} files)...")
+        snapshot_download(repo_id=repo_id, revision=info.sha or revision, local_dir=str(dest), token=token)
+
+        staged = StagedModel(source=repo_id, kind="huggingface", host_path=str(dest),
+                             container_path=self._container_path(dest), revision=info.sha or revision)
+        local_files = self._walk(dest)
+        for rel, meta in expected.items():
+            p = local_files.get(rel)
+            if p is None:
+                raise ModelIntegrityError(f"{repo_id}: file '{rel}' missing after download")
+            size = p.stat().st_size
+            if meta["size"] is not None and size != meta["size"]:
+                raise ModelIntegrityError(f"{repo_id}: size mismatch for '{rel}' ({size} != {meta['size']})")
+            entry = {"size": size, "mtime": p.stat().st_mtime}
+            if meta["sha256"]:
+                digest = calculate_file_checksum(p)
+                if digest != meta["sha256"]:
+                    raise ModelIntegrityError(f"{repo_id}: SHA256 mismatch for '{rel}'")
+                entry["sha256"] = digest
+            staged.files[rel] = entry
+        staged.size_bytes = sum(m["size"] for m in staged.files.values())
+        self._save_manifest(dest, staged)
+        log(f"Model staged and verified: {staged.size_bytes / (1024 ** 3):.2f} GB")
+        return staged
+
+    # --- MANIFEST ---
+
+    @staticmethod
+    def _walk(root: Path) -> Dict[str, Path]:
+        if root.is_file(): return {root.name: root}
+        if not root.exists(): return {}
+        return {p.relative_to(root).as_posix(): p for p in root.rglob("*")
+                if p.is_file() and ".cache" not in p.relative_to(root).parts}
+
+    @staticmethod
+    def _manifest_path(dest: Path) -> Path:
+        # Sidecar next to the staged dir/file, so it works for both and never ends up in the mount
+        return dest.parent / f".{dest.name}{MANIFEST_NAME}"
+
+    @staticmethod
+    def _lock_path(dest: Path) -> Path:
+        return dest.parent / f".{dest.name}{LOCK_NAME}"
+
+    def _load_manifest(self, dest: Path) -> Optional[StagedModel]:
+        path = self._manifest_path(dest)
+        if not path.exists(): return None
+        try:
+            return StagedModel(**json.loads(path.read_text(encoding='utf-8')))
+        except Exception:
+            return None
+
+    def _save_manifest(self, dest: Path, staged: StagedModel):
+        path = self._manifest_path(dest)
+        ensure_directory(path.parent)
+        path.write_text(json.dumps(asdict(staged), indent=2), encoding='utf-8')
+
+    def _unchanged(self, dest: Path, manifest: StagedModel) -> bool:
+        """Cheap re-validation: all files present with recorded size and mtime."""
+        files = self._walk(dest)
+        if set(files) != set(manifest.files): return False
+        for rel, meta in manifest.files.items():
+            st = files[rel].stat()
+            if st.st_size != meta["size"] or abs(st.st_mtime - meta["mtime"]) > 1e-3:
+                return False
+        return True
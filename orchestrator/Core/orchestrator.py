@@ -11,6 +11,10 @@ Updates v2.4.0:
 - Integrated Ditto Manager for IMatrix/Smart Calibration workflow.
 - Updated BuildRequest with IMatrix flags.
 - Pre-Build Dataset preparation phase.
+
+Updates v2.5.0:
+- Jobs are ordered shortest-job-first using the BuildEngine cost model ('scheduler_policy').
+- Workflow progress is weighted by predicted job durations; queue-wide ETAs.
 """
 
 import os
@@ -18,6 +22,7 @@ import sys
 import json
 import logging
 import asyncio
+import functools
 import uuid
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
@@ -26,7 +31,7 @@ from datetime import datetime
 from enum import Enum
 
 from orchestrator.utils.logging import get_logger
-from orchestrator.Core.builder import BuildEngine, BuildStatus, OptimizationLevel, ModelFormat, BuildConfiguration
+from orchestrator.Core.builder import BuildEngine, BuildStatus, OptimizationLevel, ModelFormat, BuildConfiguration, TERMINAL_STATUSES
 from orchestrator.Core.module_generator import ModuleGenerator
 
 # Optional Imports for Dependency Injection
@@ -41,6 +46,11 @@ try:
 except ImportError:
     DittoCoder = None
 
+try:
+    from orchestrator.Core.consistency_manager import ConsistencyManager
+except ImportError:
+    ConsistencyManager = None
+
 # ============================================================================
 # DATENKLASSEN & ENUMS
 # ============================================================================
@@ -87,6 +97,12 @@ class BuildRequest:
     use_imatrix: bool = False
     dataset_path: Optional[str] = None
     
+    # NEW v2.5.0: Preflight (Matrix Consistency Check)
+    skip_preflight: bool = False
+
+    # NEW v2.5.0: Split-GGUF for very large models ('auto' | 'on' | 'off', None = config 'shard_mode')
+    shard_mode: Optional[str] = None
+    
     def __post_init__(self):
         if not self.request_id:
             self.request_id = f"req_{uuid.uuid4().hex[:8]}"
@@ -106,10 +122,16 @@ class WorkflowState:
     errors: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
     healing_proposal: Optional[Any] = None 
+    # v2.5: Cost-Model Schätzungen (Sekunden) -> gewichteter Fortschritt + ETA
+    predicted_work_s: float = 0.0
+    finished_work_s: float = 0.0
+    eta_seconds: Optional[float] = None
 
     @property
     def progress_percent(self) -> int:
         if self.total_builds == 0: return 0
+        if self.predicted_work_s > 0:
+            return int(min(self.finished_work_s / self.predicted_work_s, 1.0) * 100)
         return int((self.completed_builds / self.total_builds) * 100)
 
 @dataclass
@@ -123,29 +145,32 @@ class BuildJob:
     output_path: str
     status: BuildStatus
     error_log: str = ""
+    predicted_s: float = 0.0 # Cost-Model Schätzung (v2.5)
 
 # ============================================================================
 # ORCHESTRATOR KLASSE
 # ============================================================================
 
 class LLMOrchestrator:
-    def __init__(self, config_manager):
+    def __init__(self, config_manager, build_engine: Optional[BuildEngine] = None):
         self.logger = get_logger(__name__)
         self.config = config_manager
         
-        # Sub-Engines
-        self.build_engine = BuildEngine(config_manager)
+        # Sub-Engines (build_engine injectable, e.g. ReplaySimulator / load tests)
+        self.build_engine = build_engine or BuildEngine(config_manager)
         self.module_generator = ModuleGenerator(Path(config_manager.targets_dir))
         
         # State Management
         self._workflows: Dict[str, WorkflowState] = {}
         self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
         self._active_tasks: Dict[str, asyncio.Task] = {}
+        self._jobs: Dict[str, List[BuildJob]] = {}
         self._lock = asyncio.Lock()
         
         # Dependency Injection Containers
         self.self_healing = None 
         self.ditto = None # NEW: For IMatrix Dataset Generation
+        self.consistency = None # NEW v2.5: Preflight Guardian
 
     async def initialize(self) -> bool:
         """Asynchrone Initialisierung"""
@@ -182,8 +207,33 @@ class LLMOrchestrator:
             return request.request_id
 
     async def get_workflow_status(self, request_id: str) -> Optional[WorkflowState]:
-        """Gibt den aktuellen Status zurück"""
-        return self._workflows.get(request_id)
+        """Gibt den aktuellen Status zurück (inkl. ETA, falls Jobs ausstehen)"""
+        state = self._workflows.get(request_id)
+        if state and state.end_time is None and request_id in self._jobs:
+            state.eta_seconds = (await self.get_queue_eta()).get(request_id, state.eta_seconds)
+        return state
+
+    async def get_queue_eta(self) -> Dict[str, float]:
+        """
+        Sekunden bis zum Abschluss jedes Workflows mit geplanten Jobs. Simuliert die
+        Verteilung aller wartenden Jobs (Cost-Model Dauer) auf die Worker-Slots,
+        belegt mit der Restlaufzeit der laufenden Builds.
+        """
+        loop = asyncio.get_running_loop()
+        busy = await loop.run_in_executor(None, self.build_engine.remaining_seconds)
+        pending = {f"{rid}\x00{j.job_id}": j.predicted_s
+                   for rid, jobs in self._jobs.items() for j in jobs if j.status == BuildStatus.QUEUED}
+        finish = self.build_engine.cost_model.schedule(
+            pending, self.build_engine.worker_pool.total_capacity, busy,
+            shortest_first=self._get_conf("scheduler_policy", "sjf") == "sjf")
+        running_left = max(busy, default=0.0)
+        etas: Dict[str, float] = {}
+        for rid, jobs in self._jobs.items():
+            own = [finish[f"{rid}\x00{j.job_id}"] for j in jobs if f"{rid}\x00{j.job_id}" in finish]
+            if any(j.status == BuildStatus.BUILDING for j in jobs):
+                own.append(running_left)
+            if own: etas[rid] = round(max(own), 1)
+        return etas
 
     async def list_workflows(self) -> List[WorkflowState]:
         """Listet alle bekannten Workflows"""
@@ -198,6 +248,11 @@ class LLMOrchestrator:
             return True
         return False
 
+    def _get_conf(self, key: str, default: Any = None) -> Any:
+        if hasattr(self.config, 'get'):
+            return self.config.get(key, default)
+        return getattr(self.config, key, default)
+
     # --- DEPENDENCY INJECTION ---
 
     def inject_self_healing(self, manager):
@@ -210,6 +265,11 @@ class LLMOrchestrator:
         self.ditto = manager
         self.logger.info("Ditto Manager (AI Agent) injected into Orchestrator.")
 
+    def inject_consistency(self, manager):
+        """Dependency Injection für ConsistencyManager (Matrix Preflight)"""
+        self.consistency = manager
+        self.logger.info("Consistency Manager injected into Orchestrator.")
+
     # --- INTERNAL WORKER ---
 
     def _ensure_worker_running(self):
@@ -236,6 +296,7 @@ class LLMOrchestrator:
                 self._workflows[request.request_id].errors.append(str(e))
         finally:
             self._active_tasks.pop(request.request_id, None)
+            self._jobs.pop(request.request_id, None)
             self._queue.task_done()
             self._ensure_worker_running()
 
@@ -259,9 +320,164 @@ class LLMOrchestrator:
             source_format=ModelFormat.HUGGINGFACE,
             # Pass IMatrix Config
             use_imatrix=req.use_imatrix,
-            dataset_path=req.dataset_path
+            dataset_path=req.dataset_path,
+            request_id=req.request_id,
+            shard_mode=req.shard_mode
         )
 
+    async def _await_build(self, build_id: str, done: asyncio.Future):
+        """
+        Waits for the completion listener; every 'build_status_poll_s' the build status
+        is checked directly, so a lost notification cannot hang the workflow.
+        """
+        poll_s = float(self._get_conf("build_status_poll_s", 30.0))
+        while True:
+            try:
+                return await asyncio.wait_for(asyncio.shield(done), timeout=poll_s)
+            except asyncio.TimeoutError:
+                progress = self.build_engine.get_build_status(build_id)
+                if progress is None:
+                    raise RuntimeError(f"Build {build_id} is unknown to the build engine")
+                if progress.status in TERMINAL_STATUSES:
+                    self.logger.warning(f"Build {build_id} finished without notification, using polled status")
+                    return progress
+
+    async def _execute_job(self, job: BuildJob, req: BuildRequest, state: WorkflowState) -> bool:
+        """Führt einen einzelnen Matrix-Job aus (inkl. Self-Healing). Gibt Erfolg zurück."""
+        loop = asyncio.get_running_loop()
+        state.current_stage = f"Building {job.source_model} for {job.target_architecture}"
+        job.status = BuildStatus.BUILDING
+        success = False
+        
+        try:
+            # 1. Map Job to Config
+            build_config = self._map_job_to_config(job, req)
+            
+            # 2. Execute Async (Non-Blocking). Wartet auf einen freien Worker-Slot.
+            returned_id = await loop.run_in_executor(
+                None, 
+                functools.partial(self.build_engine.build_model, build_config, wait_for_worker=True)
+            )
+            
+            # 3. Await Completion (event-driven, resolved from the build thread)
+            done: asyncio.Future = loop.create_future()
+            
+            def _resolve(progress):
+                if not done.done(): done.set_result(progress)
+            
+            self.build_engine.add_completion_listener(
+                returned_id, lambda p: loop.call_soon_threadsafe(_resolve, p)
+            )
+            status = await self._await_build(returned_id, done)
+            
+            if status.status == BuildStatus.COMPLETED:
+                success = True
+            else:
+                job.error_log = "\n".join(status.errors) or f"Build ended with status {status.status.value}"
+                
+        except Exception as e:
+            self.logger.error(f"Execution Error: {e}")
+            job.error_log = str(e)
+            success = False
+        
+        # --- SELF-HEALING LOOP ---
+        if not success and self.self_healing:
+            self.logger.warning(f"Build failed for {job.job_id}. Activating Self-Healing...")
+            state.status = OrchestrationStatus.HEALING
+            
+            error_log = job.error_log if hasattr(job, 'error_log') else "Unknown Error"
+            context = f"Target: {job.target_architecture}, Model: {job.source_model}"
+            
+            proposal = self.self_healing.analyze_error(error_log, context)
+            
+            if proposal:
+                state.healing_proposal = proposal 
+                self.logger.info(f"Healing Proposal: {proposal.fix_command}")
+            else:
+                self.logger.error("Self-Healing found no solution.")
+            
+            if state.status == OrchestrationStatus.HEALING:
+                state.status = OrchestrationStatus.BUILDING
+
+        state.finished_work_s += job.predicted_s
+        if success:
+            job.status = BuildStatus.COMPLETED
+            state.completed_builds += 1
+            state.artifacts.append(job.output_path)
+        else:
+            job.status = BuildStatus.FAILED
+            state.failed_builds += 1
+            state.errors.append(f"Job {job.job_id} failed.")
+            if req.priority == PriorityLevel.CRITICAL:
+                self.logger.error("Critical build failed. Aborting pipeline.")
+                state.status = OrchestrationStatus.ERROR
+        return success
+
+    def _skip_job(self, job: BuildJob, state: WorkflowState):
+        """Job not started because the pipeline was aborted: counted as failed, progress stays consistent."""
+        job.status = BuildStatus.FAILED
+        job.error_log = "Skipped: pipeline aborted after a critical failure"
+        state.failed_builds += 1
+        state.finished_work_s += job.predicted_s
+
+    def _plan_jobs(self, build_jobs: List[BuildJob], req: BuildRequest, state: WorkflowState) -> List[BuildJob]:
+        """Predicts job durations; 'sjf' policy packs short jobs first (stable for equal estimates)."""
+        for job in build_jobs:
+            try:
+                job.predicted_s = self.build_engine.predict_build(self._map_job_to_config(job, req)).total
+            except Exception as e:
+                self.logger.debug(f"No duration estimate for {job.job_id}: {e}")
+        state.predicted_work_s = sum(j.predicted_s for j in build_jobs)
+        if self._get_conf("scheduler_policy", "sjf") == "sjf":
+            build_jobs = sorted(build_jobs, key=lambda j: j.predicted_s)
+        return build_jobs
+
+    def _preflight(self, build_jobs: List[BuildJob], req: BuildRequest, state: WorkflowState) -> List[BuildJob]:
+        """
+        Prüft die komplette Matrix bevor ein Container startet.
+        Jobs mit ERROR-Issues werden entfernt und als fehlgeschlagen gezählt.
+        """
+        if req.skip_preflight or not build_jobs:
+            return build_jobs
+        if not self.consistency and ConsistencyManager:
+            self.consistency = ConsistencyManager(self.config)
+        if not self.consistency:
+            return build_jobs
+
+        state.current_stage = "Preflight"
+        matrix = [{
+            "job_id": job.job_id,
+            "target": job.target_architecture,
+            "format": job.target_format.value,
+            "quantization": job.quantization or "",
+            "model_name": job.source_model,
+            "use_gpu": req.use_gpu
+        } for job in build_jobs]
+        
+        try:
+            results = self.consistency.evaluate_matrix(matrix)
+        except Exception as e:
+            self.logger.warning(f"Preflight failed, continuing without it: {e}")
+            return build_jobs
+
+        runnable = []
+        for job in build_jobs:
+            issues = results.get(job.job_id, [])
+            for issue in issues:
+                msg = f"[Preflight] {job.job_id}: {issue.component}: {issue.message} (Fix: {issue.suggested_fix})"
+                if issue.severity == "ERROR":
+                    state.errors.append(msg)
+                else:
+                    state.warnings.append(msg)
+            if self.consistency.is_blocking(issues):
+                job.status = BuildStatus.FAILED
+                job.error_log = "; ".join(i.message for i in issues if i.severity == "ERROR")
+                state.failed_builds += 1
+                self.logger.warning(f"Preflight pruned job {job.job_id}: {job.error_log}")
+            else:
+                runnable.append(job)
+        return runnable
+
     async def _run_build_pipeline(self, req: BuildRequest):
         """Die eigentliche Pipeline-Logik"""
         state = self._workflows[req.request_id]
@@ -333,81 +549,49 @@ class LLMOrchestrator:
                             optimization=req.optimization_level,
                             quantization=q,
                             output_path=str(out_dir),
-                            status=BuildStatus.PENDING
+                            status=BuildStatus.QUEUED
                         )
                         build_jobs.append(job)
 
         state.total_builds = len(build_jobs)
-        state.status = OrchestrationStatus.BUILDING
-        
         self.logger.info(f"Generated {len(build_jobs)} build jobs.")
         
-        # 2. Execution Loop
-        loop = asyncio.get_running_loop()
+        # 1b. Preflight: Doomed Jobs entfernen, bevor Images gebaut werden
+        build_jobs = self._preflight(build_jobs, req, state)
+        if state.total_builds and not build_jobs:
+            self.logger.error("Preflight rejected all build jobs.")
+            state.status = OrchestrationStatus.ERROR
+            state.current_stage = "Preflight failed"
+            state.end_time = datetime.now()
+            return
         
-        for job in build_jobs:
-            state.current_stage = f"Building {job.source_model} for {job.target_architecture}"
-            
-            try:
-                # 1. Map Job to Config
-                build_config = self._map_job_to_config(job, req)
-                
-                # 2. Execute Async (Non-Blocking) 
-                returned_id = await loop.run_in_executor(
-                    None, 
-                    self.build_engine.build_model, 
-                    build_config
-                )
-                
-                # 3. Poll for Completion
-                success = False
-                while True:
-                    status = self.build_engine.get_build_status(returned_id)
-                    if not status: 
-                        job.error_log = "Build vanished"
-                        break
-                    
-                    if status.status == BuildStatus.COMPLETED:
-                        success = True
-                        break
-                    if status.status in [BuildStatus.FAILED, BuildStatus.CANCELLED]:
-                        job.error_log = "\n".join(status.errors)
-                        break
-                        
-                    await asyncio.sleep(1)
-                    
-            except Exception as e:
-                self.logger.error(f"Execution Error: {e}")
-                job.error_log = str(e)
-                success = False
-            
-            # --- SELF-HEALING LOOP ---
-            if not success and self.self_healing:
-                self.logger.warning(f"Build failed for {job.job_id}. Activating Self-Healing...")
-                state.status = OrchestrationStatus.HEALING
-                
-                error_log = job.error_log if hasattr(job, 'error_log') else "Unknown Error"
-                context = f"Target: {job.target_architecture}, Model: {job.source_model}"
-                
-                proposal = self.self_healing.analyze_error(error_log, context)
-                
-                if proposal:
-                    state.healing_proposal = proposal 
-                    self.logger.info(f"Healing Proposal: {proposal.fix_command}")
-                else:
-                    self.logger.error("Self-Healing found no solution.")
-                
-                state.status = OrchestrationStatus.BUILDING
-
-            if success:
-                state.completed_builds += 1
-                state.artifacts.append(job.output_path)
-            else:
-                state.failed_builds += 1
-                state.errors.append(f"Job {job.job_id} failed.")
-                if req.priority == PriorityLevel.CRITICAL:
-                    self.logger.error("Critical build failed. Aborting pipeline.")
-                    state.status = OrchestrationStatus.ERROR
+        # 1c. Cost Model: Dauer je Job schätzen, Shortest-Job-First Reihenfolge
+        build_jobs = await asyncio.get_running_loop().run_in_executor(None, self._plan_jobs, build_jobs, req, state)
+        self._jobs[req.request_id] = build_jobs
+        
+        state.status = OrchestrationStatus.BUILDING
+        
+        # 2. Execution (v2.5: Jobs werden über den Worker-Pool der BuildEngine verteilt)
+        if req.parallel_builds and len(build_jobs) > 1:
+            # Nicht mehr Jobs gleichzeitig einreichen als Worker-Slots existieren
+            slots = asyncio.Semaphore(self.build_engine.worker_pool.total_capacity)
+
+            async def _bounded(job: BuildJob) -> bool:
+                async with slots:
+                    if state.status == OrchestrationStatus.ERROR:
+                        self._skip_job(job, state)
+                        return False
+                    return await self._execute_job(job, req, state)
+
+            await asyncio.gather(*[_bounded(job) for job in build_jobs])
+            if state.status == OrchestrationStatus.ERROR:
+                return
+        else:
+            for idx, job in enumerate(build_jobs):
+                await self._execute_job(job, req, state)
+                if state.status == OrchestrationStatus.ERROR:
+                    for skipped in build_jobs[idx + 1:]:
+                        self._skip_job(skipped, state)
                     return
 
         # 3. Finalization
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Qdrant Connection Manager (v2.5.0)
+DIREKTIVE: Goldstandard, ein toter Sidecar darf keinen Chat-Turn blockieren.
+
+Zweck:
+Bisher baute jeder RAG-Aufruf bis zu drei QdrantClients (je 2 s Timeout) und
+prüfte get_collections() -> bis zu ~6 s Stillstand pro Chat/Healing-Analyse,
+wenn Qdrant nicht läuft. Dieser Manager kapselt die Verbindung:
+
+- Ein gepoolter Client (pro URL genau ein QdrantClient, HTTP-Keep-Alive bzw. gRPC-Channel)
+- Circuit Breaker: nach einem fehlgeschlagenen Probe ist der Kreis offen; Aufrufe
+  kehren sofort (Mikrosekunden) mit None zurück. Nach Ablauf der Backoff-Zeit
+  (exponentiell, gedeckelt) darf genau ein Aufrufer einen Probe wagen (half-open).
+- Health Checker (Daemon-Thread): pingt den verbundenen Client periodisch und
+  übernimmt Reconnect-Versuche im Hintergrund, sodass Vordergrund-Aufrufe nur
+  noch den Zustand lesen.
+- Transport: HTTP (Default) oder gRPC ('rag_qdrant_grpc', Port 'rag_qdrant_grpc_port').
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from orchestrator.utils.logging import get_logger
+
+try:
+    from qdrant_client import QdrantClient
+except ImportError:
+    QdrantClient = None
+
+# Transportfehler (httpx/grpc werden von qdrant-client unter diesen Namen gemeldet)
+_CONNECTION_ERROR_NAMES = {
+    "ResponseHandlingException", "ConnectError", "ConnectTimeout", "ReadTimeout", "WriteTimeout",
+    "PoolTimeout", "RemoteProtocolError", "ReadError", "WriteError", "_InactiveRpcError", "RpcError",
+}
+
+
+def is_connection_error(exc: BaseException) -> bool:
+    """True for transport failures (server down/unreachable), False for API errors (e.g. 404)."""
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    return type(exc).__name__ in _CONNECTION_ERROR_NAMES
+
+
+class CircuitBreaker:
+    """
+    closed -> (failure) -> open -> (backoff elapsed) -> half_open -> (success) closed / (failure) open.
+    Backoff: base_delay * 2^(consecutive failures - 1), capped at max_delay.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, base_delay: float = 2.0, max_delay: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.base_delay = float(base_delay)
+        self.max_delay = float(max_delay)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.failures = 0
+        self._open_until = 0.0
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.failures == 0: return self.CLOSED
+        return self.HALF_OPEN if self._trial or self._clock() >= self._open_until else self.OPEN
+
+    @property
+    def retry_in(self) -> float:
+        return max(0.0, self._open_until - self._clock()) if self.failures else 0.0
+
+    def allow(self) -> bool:
+        """Closed: always. Open: no. After the backoff: exactly one caller gets the trial."""
+        with self._lock:
+            if self.failures == 0: return True
+            if self._trial or self._clock() < self._open_until: return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures, self._open_until, self._trial = 0, 0.0, False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            delay = min(self.max_delay, self.base_delay * (2 ** (self.failures - 1)))
+            self._open_until = self._clock() + delay
+            self._trial = False
+
+
+class QdrantConnection:
+    """
+    Single pooled Qdrant client behind a circuit breaker, with an optional background health checker.
+    Args:
+        urls:            Candidate URLs in priority order.
+        timeout:         Request timeout of the client (s).
+        prefer_grpc:     Use the gRPC transport (port 'grpc_port').
+        health_interval: Seconds between background health checks / reconnect attempts.
+        breaker:         CircuitBreaker (default 2 s base, 60 s cap).
+        client_factory:  url -> client (tests); default builds a QdrantClient.
+    """
+
+    def __init__(self, urls: List[str], timeout: float = 2.0, prefer_grpc: bool = False, grpc_port: int = 6334,
+                 health_interval: float = 15.0, breaker: Optional[CircuitBreaker] = None,
+                 client_factory: Optional[Callable[[str], Any]] = None):
+        self.logger = get_logger("QdrantConnection")
+        self.urls = list(dict.fromkeys(u for u in urls if u))
+        self.timeout = float(timeout)
+        self.prefer_grpc = bool(prefer_grpc)
+        self.grpc_port = int(grpc_port)
+        self.health_interval = float(health_interval)
+        self.breaker = breaker or CircuitBreaker()
+        self._factory = client_factory or self._build_client
+        self._pool: Dict[str, Any] = {}
+        self._client: Optional[Any] = None
+        self.url: Optional[str] = None
+        self._probe_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+    def _build_client(self, url: str) -> Any:
+        if not QdrantClient:
+            raise ImportError("qdrant-client not installed")
+        return QdrantClient(url=url, timeout=self.timeout, prefer_grpc=self.prefer_grpc, grpc_port=self.grpc_port)
+
+    @property
+    def client(self) -> Optional[Any]:
+        """Current healthy client (no I/O)."""
+        return self._client
+
+    @property
+    def transport(self) -> str:
+        return "grpc" if self.prefer_grpc else "http"
+
+    def get(self) -> Optional[Any]:
+        """Pooled client, or None at once while the breaker is open. Probes only when the breaker allows."""
+        client = self._client
+        if client is not None: return client
+        if not self.breaker.allow(): return None
+        return self._probe()
+
+    def _probe(self) -> Optional[Any]:
+        with self._probe_lock:
+            if self._client is not None:
+                self.breaker.record_success()
+                return self._client
+            for url in self.urls:
+                try:
+                    client = self._pool.get(url) or self._factory(url)
+                    self._pool[url] = client
+                    client.get_collections()
+                except Exception:
+                    continue
+                self._client, self.url = client, url
+                self.breaker.record_success()
+                self.logger.info(f"Connected to Qdrant at {url} ({self.transport})")
+                return client
+            self.breaker.record_failure()
+            self.logger.debug(f"Qdrant unreachable, next attempt in {self.breaker.retry_in:.0f}s")
+            return None
+
+    def report_failure(self, exc: Optional[BaseException] = None):
+        """Drops the current client after a transport error; the breaker opens."""
+        if self._client is None: return
+        self.logger.warning(f"Qdrant connection lost ({self.url}): {exc}")
+        self._client = None
+        self.breaker.record_failure()
+
+    # --- HEALTH CHECKER ---
+
+    def check_once(self):
+        """One health-check round: ping the connected client or attempt a reconnect when due."""
+        client = self._client
+        if client is not None:
+            try:
+                client.get_collections()
+            except Exception as e:
+                if client is self._client: self.report_failure(e)
+        elif self.breaker.allow():
+            self._probe()
+
+    def _health_loop(self):
+        while not self._stop.wait(self.health_interval):
+            try:
+                self.check_once()
+            except Exception as e:
+                self.logger.debug(f"Qdrant health check error: {e}")
+
+    def start_health_checker(self):
+        if self._health_thread and self._health_thread.is_alive(): return
+        self._stop.clear()
+        self._health_thread = threading.Thread(target=self._health_loop, name="qdrant-health", daemon=True)
+        self._health_thread.start()
+
+    def stop(self):
+        self._stop.set()
+        for client in self._pool.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        self._pool.clear()
+        self._client = None
+
+    def status(self) -> Dict[str, Any]:
+        return {"url": self.url, "transport": self.transport, "circuit": self.breaker.state,
+                "failures": self.breaker.failures, "retry_in_s": round(self.breaker.retry_in, 1)}
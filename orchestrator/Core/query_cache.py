@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - RAG Query Cache (v2.5.0)
+DIREKTIVE: Goldstandard, wiederholte Fragen kosten keinen Netzwerk-Roundtrip.
+
+Zweck:
+DittoCoder._fetch_documentation baut für jedes Modul dieselbe Query
+("{sdk} SDK compilation flags ..."), Chat und Self-Healing stellen ähnliche
+Fragen wiederholt. Zwei In-Memory-Ebenen mit TTL und LRU-Größenlimit:
+
+1. Query-Embedding:  (Embedding-Modell, normalisierte Query) -> Vektor
+2. Suchergebnis:     (Collection, Version, Query, Filter, Limit, Threshold) -> Treffer
+
+Invalidierung: Jede Änderung der Collection (Ingest, Delete, Clear, Storewechsel)
+erhöht den Versionszähler und verwirft Ebene 2. Query-Embeddings bleiben gültig,
+sie hängen nur vom Modell ab. Änderungen aus anderen Prozessen deckt die TTL ab.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from orchestrator.Core.embedding_cache import normalize_text
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU map with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 600.0, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = int(max_entries)
+        self.ttl = float(ttl)
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] > self._clock():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not _MISSING:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _filters_key(filters: Optional[Dict[str, Any]]) -> str:
+    return json.dumps(filters, sort_keys=True, default=str) if filters else ""
+
+
+class QueryCache:
+    """Query -> embedding and search -> results caches, the latter bound to a collection version."""
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.embeddings = TTLCache(max_entries, ttl, clock)
+        self.results = TTLCache(max_entries, ttl, clock)
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def bump(self):
+        """Collection changed: cached results are stale."""
+        with self._lock:
+            self.version += 1
+            self.results.clear()
+
+    # --- LEVEL 1: QUERY EMBEDDINGS ---
+
+    def get_embedding(self, model: str, query: str) -> Optional[Any]:
+        return self.embeddings.get((model, normalize_text(query)))
+
+    def put_embedding(self, model: str, query: str, vector: Any):
+        self.embeddings.put((model, normalize_text(query)), vector)
+
+    # --- LEVEL 2: SEARCH RESULTS ---
+
+    def result_key(self, collection: str, query: str, filters: Optional[Dict[str, Any]],
+                   limit: int, score_threshold: Optional[float]) -> Tuple:
+        return (collection, self.version, normalize_text(query), _filters_key(filters), limit, score_threshold)
+
+    def get_results(self, key: Tuple) -> Optional[list]:
+        hit = self.results.get(key)
+        return list(hit) if hit is not None else None
+
+    def put_results(self, key: Tuple, results: list):
+        if key[1] == self.version:  # a bump during the search makes the result stale already
+            self.results.put(key, list(results))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"version": self.version,
+                "embedding_hits": self.embeddings.hits, "embedding_misses": self.embeddings.misses,
+                "result_hits": self.results.hits, "result_misses": self.results.misses,
+                "entries": len(self.embeddings) + len(self.results)}
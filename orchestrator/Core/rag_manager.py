@@ -11,16 +11,50 @@ Sichert Integrität durch Snapshots und Rollbacks (Guardian Layer).
 Updates v2.3.0:
 - Dynamic root path resolution for Codebase Ingest.
 - Robust initialization sequence.
+
+Updates v2.5.0:
+- Batched, concurrent embeddings (embedding_pipeline.py): many chunks per request,
+  bounded parallelism, retry/backoff, token-budget batch size.
+- ingest_documents(): bulk path for Codebase/URL/Swarm ingest incl. chunks/s.
+- Persistent embedding cache (embedding_cache.py, SQLite): identical chunks are
+  never embedded twice, hit rates in ingest results and get_status().
+- Idempotent, incremental ingest (ingest_manifest.py): deterministic point IDs,
+  per-file manifest, only changed files are re-embedded, stale points deleted.
+- Pluggable embedding backends (embedding_backends.py): litellm, local ONNX /
+  sentence-transformers from models/tiny_models, hashing fallback (air-gapped).
+  Collection dimension follows the backend; backend change -> own collection,
+  dimension conflict -> versioned collection ('<name>_v2', ...).
+- Embedded vector store fallback (local_vector_store.py): without a reachable
+  Qdrant (no Docker) RAG runs in-process (memmap + NumPy cosine, optional IVF).
+  Qdrant is re-probed every 'rag_qdrant_retry_s'; once it is up, local points
+  are synced into it in the background and Qdrant takes over.
+- Connection manager (qdrant_connection.py): one pooled client (HTTP or gRPC),
+  circuit breaker with exponential backoff and a background health checker.
+  While Qdrant is down, calls fail fast instead of probing every URL again.
+- Query cache (query_cache.py): query -> embedding and (query, filters, limit) ->
+  results with TTL; results are bound to a collection version that every
+  ingest/delete/clear/store switch bumps. search() accepts payload 'filters'.
+- Hybrid retrieval (hybrid_retrieval.py): BM25 index maintained alongside the
+  vector store, dense + sparse hits fused with Reciprocal Rank Fusion, optional
+  CPU cross-encoder reranking ('rag_reranker_model'). Sparse-only hits need a
+  normalized BM25 score >= 'rag_sparse_min_score'.
+- Structure-aware chunking (chunkers.py): Python per function/class (ast), shell per
+  function, Markdown per heading, YAML per top-level key, token-limited
+  ('rag_chunk_tokens'); each code chunk carries its file and symbol as header.
+- Streaming codebase ingest (ingest_pipeline.py): parallel directory walk, bounded
+  read -> chunk (process pool) -> embed -> upsert stages (wait=False, size-bounded
+  batches), flat memory on large trees, per-stage throughput in the ingest result.
 """
 
-import uuid
 import time
 import logging
 import json
 import os
+import re
 import shutil
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional, Any, Union
+from typing import List, Dict, Optional, Any, Union, Tuple, Set
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -29,12 +63,22 @@ try:
     from qdrant_client import QdrantClient
     from qdrant_client.http import models as rest
     from qdrant_client.http.exceptions import UnexpectedResponse
-    import litellm
 except ImportError:
     QdrantClient = None
-    litellm = None
 
 from orchestrator.utils.logging import get_logger
+from orchestrator.Core.embedding_pipeline import EmbeddingBatcher, EmbeddingStats
+from orchestrator.Core.embedding_cache import EmbeddingCache
+from orchestrator.Core.ingest_manifest import IngestManifest, point_id
+from orchestrator.Core.embedding_backends import (
+    EmbeddingBackend, create_backend, backend_summary
+)
+from orchestrator.Core.local_vector_store import LocalVectorStore, LocalPoint, NUMPY_AVAILABLE
+from orchestrator.Core.qdrant_connection import QdrantConnection, CircuitBreaker, is_connection_error
+from orchestrator.Core.query_cache import QueryCache
+from orchestrator.Core.hybrid_retrieval import BM25Index, CrossEncoderReranker, rrf_fuse
+from orchestrator.Core.chunkers import Chunk, chunk_chars, chunk_source, with_file_header, CHUNKER_VERSION
+from orchestrator.Core.ingest_pipeline import IngestPipeline, walk_parallel
 
 # Helper inline to avoid circular dependency
 def ensure_directory(path: Path):
@@ -52,8 +96,11 @@ except ImportError:
 # ============================================================================
 
 COLLECTION_NAME = "framework_knowledge"
-VECTOR_SIZE = 1536  # Standard für viele Modelle (z.B. OpenAI, Nomic)
-DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small" 
+VECTOR_SIZE = 1536  # Legacy: Collection ohne Backend-Suffix (litellm, 1536 Dimensionen)
+UPSERT_BATCH_SIZE = 256
+
+# (source_name, content, metadata)
+Document = Tuple[str, str, Optional[Dict[str, Any]]]
 
 @dataclass
 class SearchResult:
@@ -61,6 +108,7 @@ class SearchResult:
     content: str
     source: str
     metadata: Dict[str, Any]
+    point_id: Optional[str] = None
 
 class RAGManager:
     """
@@ -82,6 +130,17 @@ class RAGManager:
         
         self.client: Optional[QdrantClient] = None
         self._connected = False
+        self._batcher: Optional[EmbeddingBatcher] = None
+        self._embedding_cache: Union[EmbeddingCache, None, bool] = None  # False = unavailable
+        self._backend: Optional[EmbeddingBackend] = None
+        self._collection: Optional[str] = None
+        self._local: Optional[LocalVectorStore] = None
+        self._qdrant: Optional[QdrantConnection] = None
+        self._query_cache: Union[QueryCache, None, bool] = None  # False = disabled
+        self._sparse: Dict[str, BM25Index] = {}
+        self._sparse_checked: set = set()
+        self._reranker: Union[CrossEncoderReranker, None, bool] = None  # False = off/unavailable
+        self._sync_thread: Optional[threading.Thread] = None
         
         # Snapshot Directory (Local Backup)
         self.backup_dir = self.app_root / "backups" / "rag_snapshots"
@@ -89,141 +148,463 @@ class RAGManager:
         
         # Check dependencies
         if not QdrantClient:
-            self.logger.warning("Module 'qdrant-client' not found. RAG functionality disabled.")
+            if self._get_conf("rag_local_fallback", True) and NUMPY_AVAILABLE:
+                self.logger.warning("Module 'qdrant-client' not found. Using the embedded vector store.")
+            else:
+                self.logger.warning("Module 'qdrant-client' not found. RAG functionality disabled.")
             return
 
+    def _get_conf(self, key: str, default: Any = None) -> Any:
+        """Centralized safe configuration retrieval."""
+        if self.config:
+            if hasattr(self.config, 'get'):
+                return self.config.get(key, default)
+            return getattr(self.config, key, default)
+        return default
+
     def _connect(self) -> bool:
-        """Versucht, eine Verbindung zum Qdrant-Container herzustellen."""
+        """
+        Verbindet mit Qdrant; ist kein Qdrant erreichbar, mit dem eingebetteten Vector Store.
+        Der Qdrant-Zustand kommt vom Connection Manager (Circuit Breaker): bei totem
+        Sidecar kehrt der Aufruf sofort zurück, Reconnects laufen im Health Checker.
+        """
         if self._connected and self.client:
-            return True
+            if self.is_local:
+                self._maybe_promote()
+                return True
+            if self._qdrant and self._qdrant.client is self.client:
+                return True
+            # Dropped by the health checker or a failed request
+            self._connected, self.client = False, None
 
-        if not QdrantClient: return False
+        client = self.qdrant.get() if self.qdrant else None
+        if client:
+            self.client = client
+            self._connected = True
+            self._collection = None
+            self._ensure_collection()
+            self._collection_changed()
+            return True
 
-        # URL aus Docker-Netzwerk (intern) oder Localhost
-        # Fallback auf Config-Wert falls vorhanden
-        config_url = None
-        if self.config and hasattr(self.config, 'get'):
-             config_url = self.config.get("qdrant_url")
-        
-        potential_urls = []
-        if config_url: potential_urls.append(config_url)
-        potential_urls.extend(["http://localhost:6333", "http://llm-qdrant:6333"])
-        
-        for url in potential_urls:
+        if self._get_conf("rag_local_fallback", True) and NUMPY_AVAILABLE:
             try:
-                client = QdrantClient(url=url, timeout=2.0)
-                # Health Check
-                client.get_collections()
-                self.client = client
-                self._connected = True
-                self._ensure_collection()
-                self.logger.info(f"RAGManager connected to Qdrant at {url}")
-                return True
-            except Exception:
-                continue
-        
-        self.logger.debug("RAGManager could not connect to Qdrant (Container might be down or initializing).")
+                self._local = self._local or self._open_local_store()
+            except Exception as e:
+                self.logger.error(f"Embedded vector store unavailable: {e}")
+                return False
+            self.client = self._local
+            self._connected = True
+            self._collection = None
+            self._ensure_collection()
+            self._collection_changed()
+            self.logger.info(f"RAGManager using embedded vector store at {self._local.root}")
+            return True
+
         return False
 
+    @property
+    def qdrant(self) -> Optional[QdrantConnection]:
+        """Connection manager (created once; None without qdrant-client)."""
+        if self._qdrant is None and QdrantClient:
+            # URL aus Docker-Netzwerk (intern) oder Localhost
+            # Fallback auf Config-Wert falls vorhanden
+            urls = [self._get_conf("qdrant_url", None), "http://localhost:6333", "http://llm-qdrant:6333"]
+            self._qdrant = QdrantConnection(
+                urls,
+                timeout=float(self._get_conf("rag_qdrant_timeout", 2.0)),
+                prefer_grpc=bool(self._get_conf("rag_qdrant_grpc", False)),
+                grpc_port=int(self._get_conf("rag_qdrant_grpc_port", 6334)),
+                health_interval=float(self._get_conf("rag_qdrant_health_s", 15.0)),
+                breaker=CircuitBreaker(base_delay=2.0, max_delay=float(self._get_conf("rag_qdrant_retry_s", 60))))
+            self._qdrant.start_health_checker()
+        return self._qdrant
+
+    def _on_store_error(self, exc: Exception):
+        """Transport errors open the circuit; the next call falls back without probing."""
+        if self._qdrant and not self.is_local and is_connection_error(exc):
+            self._qdrant.report_failure(exc)
+            self._connected, self.client = False, None
+
+    # --- EMBEDDED FALLBACK ---
+
+    @property
+    def is_local(self) -> bool:
+        return self._local is not None and self.client is self._local
+
+    def _open_local_store(self) -> LocalVectorStore:
+        default_path = Path(self._get_conf("cache_dir", self.app_root / "cache")) / "rag" / "vectors"
+        return LocalVectorStore(
+            Path(self._get_conf("rag_local_path", None) or default_path),
+            ivf_lists=int(self._get_conf("rag_local_ivf_lists", 0)),
+            ivf_min_points=int(self._get_conf("rag_local_ivf_min_points", 20000)),
+            nprobe=int(self._get_conf("rag_local_ivf_nprobe", 8)))
+
+    def _maybe_promote(self):
+        """Switches from the embedded store to Qdrant once the health checker reconnected it (no I/O here)."""
+        if not self._qdrant or self._qdrant.client is None: return
+        if self._sync_thread and self._sync_thread.is_alive(): return
+        client = self._qdrant.client
+
+        local_collection = self.collection_name
+        self.client = client
+        self._collection = None
+        self._ensure_collection()
+        self._collection_changed()
+        target = self.collection_name
+        self._sync_thread = threading.Thread(
+            target=self._sync_local_to_qdrant, args=(client, local_collection, target),
+            name="rag-local-sync", daemon=True)
+        self._sync_thread.start()
+
+    def _sync_local_to_qdrant(self, client: Any, local_collection: str, target: str):
+        try:
+            if not self._local.collection_exists(local_collection): return
+            count = self._local.sync_to(
+                client, local_collection, target,
+                point_factory=lambda pid, vec, payload: rest.PointStruct(id=pid, vector=vec, payload=payload),
+                batch_size=int(self._get_conf("rag_upsert_batch_size", UPSERT_BATCH_SIZE)))
+            self.logger.info(f"Synced {count} points from the embedded store into Qdrant '{target}'")
+            if count and not self.is_local and self.collection_name == target:
+                self.rebuild_sparse_index()
+                self._collection_changed()
+        except Exception as e:
+            self.logger.error(f"Sync of embedded vector store into Qdrant failed: {e}")
+
+    def _make_point(self, pid: str, vector: List[float], payload: Dict[str, Any]) -> Any:
+        if self.is_local or not QdrantClient:
+            return LocalPoint(id=pid, vector=vector, payload=payload)
+        return rest.PointStruct(id=pid, vector=vector, payload=payload)
+
+    def _ids_selector(self, ids: List[str]) -> Any:
+        return ids if self.is_local else rest.PointIdsList(points=ids)
+
+    @property
+    def _manifest_collection(self) -> str:
+        """Manifests are bound to the store as well: embedded and Qdrant contents can diverge."""
+        return f"local:{self.collection_name}" if self.is_local else self.collection_name
+
+    @property
+    def backend(self) -> EmbeddingBackend:
+        if self._backend is None:
+            self._backend = create_backend(self._get_conf, self.app_root, self._api_key)
+        return self._backend
+
+    def _base_collection_name(self) -> str:
+        """Collection per embedding backend; the legacy litellm/1536 setup keeps the old name."""
+        b = self.backend
+        if b.name == "litellm" and b.dim == VECTOR_SIZE:
+            return COLLECTION_NAME
+        ident = b.model_id if b.model_id.endswith(str(b.dim)) else f"{b.model_id}_{b.dim}"
+        return f"{COLLECTION_NAME}__" + re.sub(r"[^A-Za-z0-9]+", "_", ident).strip("_").lower()
+
+    @property
+    def collection_name(self) -> str:
+        return self._collection or self._base_collection_name()
+
     def _ensure_collection(self):
-        """Stellt sicher, dass die Vektor-Collection existiert."""
+        """
+        Stellt sicher, dass die Vektor-Collection existiert und zur Backend-Dimension passt.
+        Existiert sie mit anderer Dimension, wird auf '<name>_v2', '_v3', ... ausgewichen.
+        """
         if not self.client: return
 
+        dim = self.backend.dim
+        base = self._base_collection_name()
         try:
             collections = self.client.get_collections()
-            exists = any(c.name == COLLECTION_NAME for c in collections.collections)
+            existing = {c.name for c in collections.collections}
+            name, version = base, 1
+            while name in existing:
+                size = self._collection_size(name)
+                if size in (None, dim): break
+                version += 1
+                self.logger.warning(f"Collection '{name}' has dimension {size}, backend needs {dim}")
+                name = f"{base}_v{version}"
+            self._collection = name
 
-            if not exists:
-                self.logger.info(f"Creating new RAG collection: {COLLECTION_NAME}")
+            if name not in existing:
+                self.logger.info(f"Creating new RAG collection: {name} (dim {dim}, {self.backend.model_id})")
                 self.client.create_collection(
-                    collection_name=COLLECTION_NAME,
-                    vectors_config=rest.VectorParams(
-                        size=VECTOR_SIZE,
+                    collection_name=name,
+                    vectors_config=dim if self.is_local else rest.VectorParams(
+                        size=dim,
                         distance=rest.Distance.COSINE,
                     ),
                 )
         except Exception as e:
             self.logger.error(f"Failed to ensure collection: {e}")
 
-    def _get_embedding(self, text: str) -> List[float]:
-        """Generiert Embeddings mittels litellm."""
-        if not litellm:
-            raise ImportError("litellm not installed")
+    def _collection_size(self, name: str) -> Optional[int]:
+        try:
+            vectors = self.client.get_collection(name).config.params.vectors
+            return getattr(vectors, "size", None)
+        except Exception:
+            return None
 
-        # Config safe access
-        model = DEFAULT_EMBEDDING_MODEL
-        if self.config:
-             model = getattr(self.config, "ai_embedding_model", DEFAULT_EMBEDDING_MODEL) if not hasattr(self.config, 'get') else self.config.get("ai_embedding_model", DEFAULT_EMBEDDING_MODEL)
-        
+    def _embedding_model(self) -> str:
+        """Identity of the embedding backend (cache key)."""
+        return self.backend.model_id
+
+    def _api_key(self) -> str:
         # API Key via SecretsManager if available, else Env
         api_key = os.environ.get("OPENAI_API_KEY", "sk-dummy")
         if self.framework and hasattr(self.framework, 'secrets_manager') and self.framework.secrets_manager:
             s_key = self.framework.secrets_manager.get_secret("openai_api_key")
             if s_key: api_key = s_key
-        
-        try:
-            text = text.replace("\n", " ")
-            response = litellm.embedding(
-                model=model,
-                input=[text],
-                api_key=api_key
+        return api_key
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Ein Embedding-Aufruf für mehrere Texte (aktives Backend)."""
+        return self.backend.embed(texts)
+
+    def _get_embedding(self, text: str) -> List[float]:
+        """Generiert ein einzelnes Embedding (Query-Pfad), Cache zuerst."""
+        cache = self.embedding_cache
+        model = self._embedding_model()
+        if cache:
+            cached = cache.get(model, text)
+            if cached is not None: return cached
+        vector = self._embed_batch([text])[0]
+        if cache: cache.put(model, text, vector)
+        return vector
+
+    @property
+    def embedding_cache(self) -> Optional[EmbeddingCache]:
+        """On-disk embedding cache ('rag_embedding_cache': False disables it)."""
+        if self._embedding_cache is None and self._get_conf("rag_embedding_cache", True):
+            default_path = Path(self._get_conf("cache_dir", self.app_root / "cache")) / "rag" / "embeddings.db"
+            try:
+                self._embedding_cache = EmbeddingCache(
+                    Path(self._get_conf("rag_embedding_cache_path", None) or default_path),
+                    max_bytes=int(float(self._get_conf("rag_embedding_cache_mb", 512)) * 1024 ** 2))
+            except Exception as e:
+                self.logger.warning(f"Embedding cache unavailable: {e}")
+                self._embedding_cache = False
+        return self._embedding_cache or None
+
+    @property
+    def batcher(self) -> EmbeddingBatcher:
+        if self._batcher is None:
+            self._batcher = EmbeddingBatcher(
+                self._embed_batch,
+                max_batch_size=self.backend.request_size,
+                max_batch_tokens=self._get_conf("rag_embed_batch_tokens", 60000),
+                max_concurrency=self.backend.max_concurrency,
+                max_retries=self._get_conf("rag_embed_retries", 4),
             )
-            return response.data[0]["embedding"]
-        except Exception as e:
-            self.logger.error(f"Embedding generation failed ({model}): {e}")
-            raise e
+        return self._batcher
+
+    @property
+    def query_cache(self) -> Optional[QueryCache]:
+        """In-memory query/result cache ('rag_query_cache': False disables it)."""
+        if self._query_cache is None:
+            self._query_cache = QueryCache(
+                ttl=float(self._get_conf("rag_query_cache_ttl_s", 600)),
+                max_entries=int(self._get_conf("rag_query_cache_size", 1024))
+            ) if self._get_conf("rag_query_cache", True) else False
+        return self._query_cache or None
+
+    def _collection_changed(self):
+        """Invalidates cached search results (new collection version)."""
+        if self._query_cache:
+            self._query_cache.bump()
+
+    def embed_texts(self, texts: List[str], stats: Optional[EmbeddingStats] = None) -> List[Optional[List[float]]]:
+        """Batched embeddings in input order (None = failed). Cache hits skip the backend."""
+        stats = stats if stats is not None else EmbeddingStats()
+        cache = self.embedding_cache
+        if not cache:
+            return self.batcher.embed(texts, stats)
+
+        model = self._embedding_model()
+        vectors = cache.get_many(model, texts)
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        stats.cache_hits += len(texts) - len(missing)
+        if missing:
+            fresh = self.batcher.embed([texts[i] for i in missing], stats)
+            cache.put_many(model, [texts[i] for i in missing], fresh)
+            for i, v in zip(missing, fresh):
+                vectors[i] = v
+        return vectors
 
     def _chunk_text(self, text: str, chunk_size: int = 1500, overlap: int = 200) -> List[str]:
         """Zerlegt Text in überlappende Chunks."""
-        chunks = []
-        start = 0
-        text_len = len(text)
+        return chunk_chars(text, chunk_size, overlap)
+
+    @property
+    def chunker_mode(self) -> str:
+        return str(self._get_conf("rag_chunker", "structure")).lower()
 
-        while start < text_len:
-            end = start + chunk_size
-            chunk = text[start:end]
-            chunks.append(chunk)
-            start += (chunk_size - overlap)
-        return chunks
+    @property
+    def chunk_tokens(self) -> int:
+        return int(self._get_conf("rag_chunk_tokens", 512))
+
+    @property
+    def chunker_id(self) -> str:
+        """Identity of the chunking setup (stored in ingest manifests)."""
+        if self.chunker_mode == "chars":
+            return "chars-1500-200"
+        return f"structure-v{CHUNKER_VERSION}-{self.chunk_tokens}"
+
+    def _chunk_document(self, source_name: str, content: str, metadata: Dict[str, Any]) -> List[Chunk]:
+        """Structure-aware chunks ('rag_chunker': 'chars' restores fixed character windows)."""
+        path = metadata.get("filepath") or metadata.get("filename") or source_name
+        return chunk_source(content, path, self.chunker_mode, self.chunk_tokens)
+
+    def _document_chunks(self, source_name: str, content: str, metadata: Dict[str, Any]) -> List[Tuple[int, Chunk]]:
+        """
+        (chunk_index, chunk) pairs. Exported chunks (swarm packs, KB exports) already carry
+        'chunk_index': they are kept as one chunk, so re-import yields the same point ID.
+        """
+        if "chunk_index" in metadata:
+            return [(int(metadata["chunk_index"]), Chunk(content, str(metadata.get("section") or "")))]
+        return list(enumerate(self._chunk_document(source_name, content, metadata)))
 
     def ingest_document(self, source_name: str, content: str, metadata: Dict[str, Any] = None) -> bool:
         """Indiziert ein Dokument in der Vektor-Datenbank."""
-        if not self._connect(): return False
-        if not content.strip(): return False
+        return self.ingest_documents([(source_name, content, metadata)], replace_sources=True)["documents"] > 0
 
-        chunks = self._chunk_text(content)
-        points = []
-        
-        base_meta = metadata or {}
-        base_meta["source"] = source_name
-        base_meta["ingested_at"] = datetime.now().isoformat()
+    def ingest_documents(self, documents: List[Document], replace_sources: bool = False) -> Dict[str, Any]:
+        """
+        Bulk-Ingest: chunkt alle Dokumente, embeddet die Chunks gebatcht/parallel
+        und upsertet in Batches. Ein Dokument zählt, sobald ein Chunk gespeichert ist.
+        Point-IDs sind deterministisch (Quelle, Chunk-Index, Inhalt): Re-Ingest überschreibt.
+        replace_sources=True (Re-Ingest desselben Dokuments): vollständig gespeicherte
+        Dokumente ersetzen ihre Quelle, ältere Chunks derselben 'source' mit gleichem
+        'type'/'origin_pack', die nicht neu geschrieben wurden, werden gelöscht ('replaced').
+        'point_ids' liefert je Dokument die geschriebenen IDs, 'incomplete' die Indizes
+        von Dokumenten mit fehlgeschlagenen Chunks.
+        """
+        result = {"documents": 0, "chunks": 0, "failed_chunks": 0, "seconds": 0.0, "chunks_per_s": 0.0,
+                  "cache_hit_rate": 0.0, "point_ids": [[] for _ in documents], "incomplete": [], "replaced": 0}
+        if not self._connect(): return result
 
-        for i, chunk in enumerate(chunks):
-            try:
-                vector = self._get_embedding(chunk)
+        t0 = time.perf_counter()
+        ingested_at = datetime.now().isoformat()
+        texts: List[str] = []
+        payloads: List[Dict[str, Any]] = []
+        owners: List[int] = []
+        ids: List[str] = []
+        for doc_idx, (source_name, content, metadata) in enumerate(documents):
+            if not content or not content.strip(): continue
+            base_meta = dict(metadata or {})
+            base_meta["source"] = source_name
+            base_meta["ingested_at"] = ingested_at
+            filepath = base_meta.get("filepath")
+            for i, piece in self._document_chunks(source_name, content, base_meta):
+                chunk = with_file_header(filepath, piece) if filepath else piece.text
                 payload = base_meta.copy()
                 payload["content"] = chunk
                 payload["chunk_index"] = i
-                
-                points.append(rest.PointStruct(
-                    id=str(uuid.uuid4()),
-                    vector=vector,
-                    payload=payload
-                ))
-            except Exception as e:
-                self.logger.warning(f"Skipping chunk {i}: {e}")
+                if piece.label: payload["section"] = piece.label
+                texts.append(chunk)
+                payloads.append(payload)
+                owners.append(doc_idx)
+                ids.append(point_id(source_name, i, chunk))
 
-        if points:
-            try:
+        stats = EmbeddingStats()
+        vectors = self.embed_texts(texts, stats)
+
+        points = []
+        stored_docs = set()
+        incomplete = set()
+        for vector, payload, owner, pid in zip(vectors, payloads, owners, ids):
+            if vector is None:
+                incomplete.add(owner)
+                continue
+            points.append(self._make_point(pid, vector, payload))
+            stored_docs.add(owner)
+            result["point_ids"][owner].append(pid)
+
+        upserted = self._upsert(points)
+        if upserted: self._index_sparse(points)
+        if points: self._collection_changed()
+        if not upserted:
+            incomplete.update(stored_docs)
+            stored_docs.clear()
+            points = []
+            result["point_ids"] = [[] for _ in documents]
+        result["incomplete"] = sorted(incomplete)
+        complete = stored_docs - incomplete
+        if replace_sources and complete:
+            # Partially stored documents keep their old chunks rather than losing content
+            scopes = {(documents[i][0], self._source_scope(documents[i][2])) for i in complete if documents[i][0]}
+            result["replaced"] = self._replace_sources(
+                scopes, {pid for i in complete for pid in result["point_ids"][i]})
+
+        result["documents"] = len(stored_docs)
+        result["chunks"] = len(points)
+        result["failed_chunks"] = len(texts) - len(points)
+        result["seconds"] = round(time.perf_counter() - t0, 3)
+        result["chunks_per_s"] = round(len(points) / result["seconds"], 1) if result["seconds"] else 0.0
+        result["cache_hit_rate"] = round(stats.cache_hit_rate, 3)
+        if stats.failed:
+            self.logger.warning(f"Skipped {stats.failed} chunks (embedding failed after {stats.retries} retries)")
+        return result
+
+    SCOPE_KEYS = ("type", "origin_pack")
+
+    def _source_scope(self, metadata: Optional[Dict[str, Any]]) -> Tuple[Any, ...]:
+        """Who owns a source: chunks of another type/pack with the same 'source' are never replaced."""
+        return tuple((metadata or {}).get(key) for key in self.SCOPE_KEYS)
+
+    def _replace_sources(self, sources: Set[Tuple[str, Tuple[Any, ...]]], keep: Set[str]) -> int:
+        """Deletes points of the (source, scope) pairs not in 'keep' (chunks of a previous version). Returns the count."""
+        stale: List[str] = []
+        try:
+            for source, scope in sorted(sources, key=repr):
+                offset = None
+                while True:
+                    records, offset = self.client.scroll(self.collection_name, limit=512, offset=offset,
+                                                         scroll_filter=self._query_filter({"source": source}),
+                                                         with_payload=True, with_vectors=False)
+                    stale.extend(str(r.id) for r in records
+                                 if str(r.id) not in keep and self._source_scope(r.payload) == scope)
+                    if offset is None: break
+        except Exception as e:
+            self.logger.warning(f"Lookup of outdated chunks failed: {e}")
+            return 0
+        if stale and self.delete_points(stale):
+            self.logger.info(f"Removed {len(stale)} outdated chunks of {len(sources)} re-ingested source(s)")
+            return len(stale)
+        return 0
+
+    def delete_points(self, point_ids: List[str]) -> bool:
+        """Löscht Points per ID (veraltete Chunks geänderter/entfernter Dateien)."""
+        if not point_ids: return True
+        if not self._connect(): return False
+        batch_size = int(self._get_conf("rag_upsert_batch_size", UPSERT_BATCH_SIZE))
+        try:
+            for start in range(0, len(point_ids), batch_size):
+                self.client.delete(
+                    collection_name=self.collection_name,
+                    points_selector=self._ids_selector(point_ids[start:start + batch_size])
+                )
+            index = self.sparse_index
+            if index: index.remove(point_ids)
+            return True
+        except Exception as e:
+            self.logger.error(f"Qdrant Delete failed: {e}")
+            self._on_store_error(e)
+            return False
+        finally:
+            self._collection_changed()
+
+    def _upsert(self, points: List[Any], wait: bool = True) -> bool:
+        """Upsert in Batches (Request-Größe begrenzt). wait=False: Qdrant bestätigt vor dem Indexieren."""
+        batch_size = int(self._get_conf("rag_upsert_batch_size", UPSERT_BATCH_SIZE))
+        try:
+            for start in range(0, len(points), batch_size):
                 self.client.upsert(
-                    collection_name=COLLECTION_NAME,
-                    points=points
+                    collection_name=self.collection_name,
+                    points=points[start:start + batch_size],
+                    wait=wait
                 )
-                return True
-            except Exception as e:
-                self.logger.error(f"Qdrant Upsert failed: {e}")
-                return False
-        return False
+            return True
+        except Exception as e:
+            self.logger.error(f"Qdrant Upsert failed: {e}")
+            self._on_store_error(e)
+            return False
 
     # --- DEEP INGEST (WEB/PDF) ---
     def ingest_url(self, url: str) -> Dict[str, Any]:
@@ -248,24 +629,66 @@ class RAGManager:
             if not documents:
                 return {"success": False, "message": "No documents found", "count": 0}
 
-            success_count = 0
+            batch = []
             for doc in documents:
                 meta = doc.metadata or {}
                 meta["root_url"] = url
-                if self.ingest_document(meta.get("source", url), doc.page_content, meta):
-                    success_count += 1
+                batch.append((meta.get("source", url), doc.page_content, meta))
+            stats = self.ingest_documents(batch, replace_sources=True)
+            success_count = stats["documents"]
             
-            return {"success": True, "message": f"Ingested {success_count} documents", "count": success_count}
+            msg = (f"Ingested {success_count} documents ({stats['chunks']} chunks, "
+                   f"{stats['chunks_per_s']} chunks/s, cache hits {stats['cache_hit_rate']:.0%})")
+            self.logger.info(msg)
+            return {"success": True, "message": msg, "count": success_count,
+                    "chunks": stats["chunks"], "chunks_per_s": stats["chunks_per_s"]}
 
         except Exception as e:
             self.logger.error(f"Deep Ingest failed: {e}")
             return {"success": False, "message": str(e)}
 
     # --- CODEBASE INGEST (SELF-AWARENESS) ---
-    def ingest_codebase(self, root_path: Union[str, Path, None] = None) -> Dict[str, Any]:
+    SUPPORTED_CODE_EXT = {'.py', '.sh', '.yml', '.yaml', '.json', '.md', 'Dockerfile'}
+    IGNORED_DIRS = {'.git', '__pycache__', 'venv', '.venv', 'node_modules', 'dist', 'build', 'egg-info'}
+
+    @property
+    def manifest_dir(self) -> Path:
+        return Path(self._get_conf("cache_dir", self.app_root / "cache")) / "rag" / "manifests"
+
+    def _is_code_file(self, name: str) -> bool:
+        return Path(name).suffix in self.SUPPORTED_CODE_EXT or name in self.SUPPORTED_CODE_EXT
+
+    def _walk_codebase(self, root: Path) -> List[str]:
+        """Relative paths of all ingestible files below 'root' (directories scanned in parallel)."""
+        return walk_parallel(root, self.IGNORED_DIRS, self._is_code_file,
+                             int(self._get_conf("rag_ingest_readers", 8)))
+
+    def _code_metadata(self, rel: str) -> Tuple[str, Dict[str, Any]]:
+        rel_path = Path(rel)
+        return f"code:{rel}", {
+            "type": "internal_code",
+            "filepath": rel,
+            "filename": rel_path.name,
+            "extension": rel_path.suffix
+        }
+
+    def ingest_pipeline(self) -> IngestPipeline:
+        processes = int(self._get_conf("rag_ingest_processes", -1))
+        return IngestPipeline(
+            self,
+            read_workers=int(self._get_conf("rag_ingest_readers", 8)),
+            chunk_processes=None if processes < 0 else processes,
+            embed_workers=int(self._get_conf("rag_ingest_embed_workers", 2)),
+            queue_size=int(self._get_conf("rag_ingest_queue_size", 64)),
+            upsert_batch=int(self._get_conf("rag_upsert_batch_size", UPSERT_BATCH_SIZE)),
+        )
+
+    def ingest_codebase(self, root_path: Union[str, Path, None] = None, full: bool = False) -> Dict[str, Any]:
         """
         Scans the local codebase and ingests it into Qdrant.
         Allows Ditto to answer questions about the framework itself.
+        Incremental: only files changed since the last run are re-embedded, points of
+        changed/removed files that were not rewritten are deleted ('full' ignores the manifest).
         """
         if not self._connect():
              return {"success": False, "message": "Qdrant not connected"}
@@ -275,55 +698,64 @@ class RAGManager:
         
         if not root.exists():
              return {"success": False, "message": f"Path not found: {root}"}
-        
-        # GUARDIAN LAYER: Create Snapshot
+
+        t0 = time.perf_counter()
+        pipeline = self.ingest_pipeline()
+        manifest = IngestManifest.for_root(self.manifest_dir, root, self._manifest_collection, self.chunker_id)
+        if manifest.rechunk:
+            self.logger.info(f"Chunker changed ({self.chunker_id}), re-chunking all files")
+        files = pipeline.discover(root, self.IGNORED_DIRS, self._is_code_file)
+        changes = pipeline.timed("detect", lambda: manifest.detect_changes(root, files, force=full), len(files))
+        self.logger.info(f"Codebase Ingest from {root}: {changes.summary()}")
+
+        if not changes.changed and not changes.removed and not manifest.pending_deletes:
+            manifest.save()  # refreshed stat fingerprints of touched files
+            msg = f"Codebase up to date ({len(changes.unchanged)} files unchanged)."
+            return {"success": True, "message": msg, "count": 0, "chunks": 0, "deleted": 0,
+                    "unchanged": len(changes.unchanged), "seconds": round(time.perf_counter() - t0, 3)}
+
+        # GUARDIAN LAYER: Create Snapshot (only if the collection is about to change)
         self.create_snapshot(f"pre_codebase_{int(time.time())}")
 
-        self.logger.info(f"Starting Codebase Ingest from: {root}")
-        
-        supported_ext = {'.py', '.sh', '.yml', '.yaml', '.json', '.md', 'Dockerfile'}
-        ignore_dirs = {'.git', '__pycache__', 'venv', '.venv', 'node_modules', 'dist', 'build', 'egg-info'}
-        
-        total_files = 0
-        success_count = 0
-        
-        for root_dir, dirs, files in os.walk(root):
-            # Modify dirs in-place to skip ignored
-            dirs[:] = [d for d in dirs if d not in ignore_dirs]
-            
-            for file in files:
-                file_path = Path(root_dir) / file
-                
-                if file_path.suffix in supported_ext or file_path.name in supported_ext:
-                    try:
-                        content = file_path.read_text(encoding='utf-8', errors='ignore')
-                        if not content.strip(): continue
-                        
-                        rel_path = file_path.relative_to(root)
-                        meta = {
-                            "source": "codebase",
-                            "type": "internal_code",
-                            "filepath": str(rel_path),
-                            "filename": file,
-                            "extension": file_path.suffix
-                        }
-                        
-                        # Add filename header to content for better context
-                        contextualized_content = f"FILE: {rel_path}\n\n{content}"
-                        
-                        if self.ingest_document(f"code:{rel_path}", contextualized_content, meta):
-                            success_count += 1
-                        total_files += 1
-                        
-                    except Exception as e:
-                        self.logger.warning(f"Failed to ingest {file}: {e}")
-
-        msg = f"Ingested {success_count}/{total_files} code files from {root}."
+        # Streaming: read (threads) -> chunk (processes) -> embed (batched) -> upsert (wait=False)
+        stats = pipeline.run(root, changes.changed, self._code_metadata)
+
+        stale: List[str] = list(manifest.pending_deletes)
+        for rel in changes.changed:
+            if rel in stats.incomplete:
+                manifest.invalidate(rel)  # keep the old points tracked -> retried next run
+                continue
+            new_ids = stats.point_ids[rel]
+            stale.extend(manifest.stale_points(rel, new_ids))
+            manifest.update(rel, changes.fingerprints[rel], new_ids)
+        for rel in changes.removed:
+            stale.extend(manifest.remove(rel))
+
+        deleted = 0
+        if self.delete_points(stale):
+            deleted, manifest.pending_deletes = len(stale), []
+        else:
+            manifest.pending_deletes = stale
+        manifest.save()
+
+        success_count = sum(1 for ids in stats.point_ids.values() if ids)
+        msg = (f"Ingested {success_count}/{len(changes.changed)} changed code files from {root} "
+               f"({stats.chunks} chunks, {stats.chunks_per_s} chunks/s, "
+               f"cache hits {stats.cache_hit_rate:.0%}, {deleted} stale points deleted, "
+               f"{len(changes.unchanged)} unchanged).")
         self.logger.info(msg)
+        self.logger.info(f"Ingest stages: {stats.stage_summary()}")
         return {
             "success": True,
             "message": msg,
-            "count": success_count
+            "count": success_count,
+            "chunks": stats.chunks,
+            "chunks_per_s": stats.chunks_per_s,
+            "cache_hit_rate": stats.cache_hit_rate,
+            "deleted": deleted,
+            "unchanged": len(changes.unchanged),
+            "stages": stats.stages,
+            "seconds": round(time.perf_counter() - t0, 3)
         }
 
     # --- SNAPSHOT & ROLLBACK (v2.0 Guardian) ---
@@ -340,19 +772,35 @@ class RAGManager:
         try:
             self.logger.info(f"Creating Qdrant Snapshot: {name}...")
             # Qdrant creates snapshot on server side (inside container)
-            snapshot_desc = self.client.create_snapshot(collection_name=COLLECTION_NAME)
+            snapshot_desc = self.client.create_snapshot(collection_name=self.collection_name)
             
             self.logger.info(f"Snapshot created successfully: {snapshot_desc.name}")
+            self._prune_snapshots()
             return snapshot_desc.name
         except Exception as e:
             self.logger.error(f"Snapshot creation failed: {e}")
+            self._on_store_error(e)
             return None
 
+    def _prune_snapshots(self):
+        """Keeps the newest 'rag_snapshot_keep' snapshots of the collection (0 = keep all)."""
+        keep = int(self._get_conf("rag_snapshot_keep", 5))
+        if keep <= 0: return
+        try:
+            snaps = sorted(self.client.list_snapshots(self.collection_name),
+                           key=lambda s: (str(getattr(s, "creation_time", "") or ""), s.name))
+            for snap in snaps[:-keep]:
+                self.client.delete_snapshot(collection_name=self.collection_name, snapshot_name=snap.name)
+            if len(snaps) > keep:
+                self.logger.info(f"Pruned {len(snaps) - keep} old snapshot(s), keeping {keep}")
+        except Exception as e:
+            self.logger.warning(f"Snapshot pruning failed: {e}")
+
     def list_snapshots(self) -> List[str]:
         """Lists available snapshots on the server."""
         if not self._connect(): return []
         try:
-            snaps = self.client.list_snapshots(COLLECTION_NAME)
+            snaps = self.client.list_snapshots(self.collection_name)
             return [s.name for s in snaps]
         except Exception:
             return []
@@ -378,41 +826,179 @@ class RAGManager:
 
     # --- SEARCH ---
 
-    def search(self, query: str, limit: int = 3, score_threshold: float = 0.65) -> List[SearchResult]:
-        """Semantische Suche."""
+    @property
+    def default_score_threshold(self) -> float:
+        """'rag_score_threshold' if set (> 0), else the backend's calibrated cut-off."""
+        configured = float(self._get_conf("rag_score_threshold", 0.0) or 0.0)
+        return configured if configured > 0 else self.backend.score_threshold
+
+    def search(self, query: str, limit: int = 3, score_threshold: Optional[float] = None,
+               filters: Optional[Dict[str, Any]] = None) -> List[SearchResult]:
+        """
+        Semantische Suche. 'filters': Payload-Gleichheit, z.B. {"type": "internal_code"}.
+        'score_threshold' None: 'rag_score_threshold', sonst der kalibrierte Wert des Backends.
+        Wiederholte Queries kommen aus dem Query Cache (ohne Embedding-Request und Vektorsuche).
+        Hybrid ('rag_hybrid'): 'score_threshold' gilt für die Dense-Treffer, BM25-Treffer
+        (exakte Flags/Fehlerstrings) kommen per RRF hinzu. Reine BM25-Treffer brauchen einen
+        normalisierten BM25-Score >= 'rag_sparse_min_score', sonst zählen nur Dense-Treffer.
+        'score' bleibt die Cosine (reine BM25-Treffer: normalisierter BM25-Score), der
+        fusionierte Score steht in metadata["fused_score"].
+        """
         if not self._connect(): return []
+        if score_threshold is None:
+            score_threshold = self.default_score_threshold
+
+        cache = self.query_cache
+        key = cache.result_key(self.collection_name, query, filters, limit, score_threshold) if cache else None
+        if cache:
+            cached = cache.get_results(key)
+            if cached is not None: return cached
 
         try:
-            query_vector = self._get_embedding(query)
-            
+            query_vector = cache.get_embedding(self._embedding_model(), query) if cache else None
+            if query_vector is None:
+                query_vector = self._get_embedding(query)
+                if cache: cache.put_embedding(self._embedding_model(), query, query_vector)
+
+            sparse_index = self.sparse_index
+            candidates = max(limit, int(self._get_conf("rag_hybrid_candidates", 20))) if sparse_index else limit
             hits = self.client.search(
-                collection_name=COLLECTION_NAME,
+                collection_name=self.collection_name,
                 query_vector=query_vector,
-                limit=limit,
+                query_filter=self._query_filter(filters),
+                limit=candidates,
                 score_threshold=score_threshold
             )
-            
-            results = []
-            for hit in hits:
-                payload = hit.payload or {}
-                results.append(SearchResult(
-                    score=hit.score,
-                    content=payload.get("content", ""),
-                    source=payload.get("source", "unknown"),
-                    metadata=payload
-                ))
+
+            if sparse_index:
+                self._ensure_sparse_index(sparse_index)
+                results = self._fuse(query, hits, sparse_index.search(query, candidates, filters, normalize=True), limit)
+            else:
+                results = [SearchResult(score=hit.score, content=(hit.payload or {}).get("content", ""),
+                                        source=(hit.payload or {}).get("source", "unknown"),
+                                        metadata=hit.payload or {}, point_id=str(hit.id)) for hit in hits]
+            if cache: cache.put_results(key, results)
             return results
 
         except Exception as e:
             self.logger.error(f"RAG Search failed: {e}")
+            self._on_store_error(e)
             return []
 
+    # --- HYBRID RETRIEVAL ---
+
+    @property
+    def sparse_index(self) -> Optional[BM25Index]:
+        """BM25 index of the active collection/store ('rag_hybrid': False disables it)."""
+        if not self._get_conf("rag_hybrid", True) or not self._connected: return None
+        key = self._manifest_collection
+        index = self._sparse.get(key)
+        if index is None:
+            name = re.sub(r"[^A-Za-z0-9_]+", "_", key)
+            path = Path(self._get_conf("cache_dir", self.app_root / "cache")) / "rag" / "bm25" / f"{name}.db"
+            try:
+                index = self._sparse[key] = BM25Index(path)
+            except Exception as e:
+                self.logger.warning(f"BM25 index unavailable: {e}")
+                return None
+        return index
+
+    def _index_sparse(self, points: List[Any]):
+        index = self.sparse_index
+        if not index: return
+        try:
+            index.add((str(p.id), p.payload.get("content", ""), p.payload) for p in points)
+        except Exception as e:
+            self.logger.warning(f"BM25 indexing failed: {e}")
+
+    def _ensure_sparse_index(self, index: BM25Index):
+        """Backfills an empty BM25 index from the collection once (collections ingested before v2.5)."""
+        key = self._manifest_collection
+        if key in self._sparse_checked: return
+        self._sparse_checked.add(key)
+        if index.doc_count: return
+        self.rebuild_sparse_index()
+
+    def rebuild_sparse_index(self) -> int:
+        """Re-creates the BM25 index from all points of the collection. Returns the number of chunks."""
+        index = self.sparse_index
+        if not index or not self._connect(): return 0
+        index.clear()
+        offset, count = None, 0
+        while True:
+            records, offset = self.client.scroll(self.collection_name, limit=512, offset=offset,
+                                                 with_payload=True, with_vectors=False)
+            index.add((str(r.id), (r.payload or {}).get("content", ""), r.payload or {}) for r in records)
+            count += len(records)
+            if offset is None: break
+        if count: self.logger.info(f"BM25 index rebuilt: {count} chunks")
+        return count
+
+    @property
+    def reranker(self) -> Optional[CrossEncoderReranker]:
+        """Optional cross-encoder ('rag_reranker_model': local model dir)."""
+        if self._reranker is None:
+            model = self._get_conf("rag_reranker_model", None)
+            self._reranker = False
+            if model:
+                try:
+                    self._reranker = CrossEncoderReranker(
+                        Path(model), batch_size=int(self._get_conf("rag_rerank_batch_size", 16)),
+                        threads=self._get_conf("rag_embedding_threads", None))
+                except Exception as e:
+                    self.logger.warning(f"Reranker {model} unavailable ({e}), using fused ranking")
+        return self._reranker or None
+
+    def _fuse(self, query: str, dense_hits: List[Any], sparse_hits: List[Tuple[str, float, Dict[str, Any]]],
+              limit: int) -> List[SearchResult]:
+        """
+        RRF over dense and BM25 rankings, optionally reranked by the cross-encoder.
+        Dense hits already passed 'score_threshold'; BM25 hits without a dense hit must
+        reach 'rag_sparse_min_score' (normalized BM25), so an unrelated query returns nothing.
+        """
+        payloads: Dict[str, Dict[str, Any]] = {}
+        scores: Dict[str, float] = {}
+        for hit in dense_hits:
+            payloads[str(hit.id)] = hit.payload or {}
+            scores[str(hit.id)] = hit.score
+        min_sparse = float(self._get_conf("rag_sparse_min_score", 0.5))
+        sparse_hits = [(doc_id, score, payload) for doc_id, score, payload in sparse_hits
+                       if doc_id in scores or score >= min_sparse]
+        for doc_id, score, payload in sparse_hits:
+            payloads.setdefault(doc_id, payload)
+            scores.setdefault(doc_id, score)
+        fused = rrf_fuse([[str(h.id) for h in dense_hits], [doc_id for doc_id, _, _ in sparse_hits]],
+                         k=int(self._get_conf("rag_rrf_k", 60)))
+
+        reranker = self.reranker
+        if reranker and fused:
+            pool = fused[:max(limit, int(self._get_conf("rag_rerank_candidates", 20)))]
+            rerank_scores = reranker.rerank(query, [payloads[doc_id].get("content", "") for doc_id, _ in pool])
+            fused = sorted(zip([doc_id for doc_id, _ in pool], rerank_scores), key=lambda kv: kv[1], reverse=True)
+
+        return [SearchResult(score=scores[doc_id], content=payloads[doc_id].get("content", ""),
+                             source=payloads[doc_id].get("source", "unknown"),
+                             metadata={**payloads[doc_id], "fused_score": fused_score}, point_id=doc_id)
+                for doc_id, fused_score in fused[:limit]]
+
+    def _query_filter(self, filters: Optional[Dict[str, Any]]) -> Any:
+        if not filters: return None
+        if self.is_local: return dict(filters)
+        return rest.Filter(must=[rest.FieldCondition(key=k, match=rest.MatchValue(value=v))
+                                 for k, v in filters.items()])
+
     def clear_knowledge_base(self) -> bool:
         """Löscht alle gespeicherten Vektoren (Reset)."""
         if not self._connect(): return False
         try:
-            self.client.delete_collection(COLLECTION_NAME)
+            self.client.delete_collection(self.collection_name)
             self._ensure_collection()
+            index = self.sparse_index
+            if index: index.clear()
+            self._collection_changed()
+            # Ingest manifests describe the old points -> next ingest is a full one
+            for manifest in self.manifest_dir.glob("*.json"):
+                manifest.unlink()
             self.logger.info("Knowledge Base cleared.")
             return True
         except Exception as e:
@@ -420,12 +1006,24 @@ class RAGManager:
             return False
 
     def get_status(self) -> Dict[str, Any]:
-        status = {"connected": False, "vector_count": 0}
+        status = {"connected": False, "vector_count": 0, "collection": self.collection_name, "store": "none",
+                  **backend_summary(self.backend)}
+        if self._embedding_cache:
+            status["embedding_cache"] = self._embedding_cache.stats.to_dict()
         if self._connect():
             try:
-                info = self.client.get_collection(COLLECTION_NAME)
+                info = self.client.get_collection(self.collection_name)
                 status["connected"] = True
+                status["store"] = "embedded" if self.is_local else "qdrant"
                 status["vector_count"] = info.points_count
                 status["status"] = info.status.name
-            except: pass
+            except Exception as e:
+                self._on_store_error(e)
+        if self._qdrant:
+            status["qdrant"] = self._qdrant.status()
+        if self._query_cache:
+            status["query_cache"] = self._query_cache.stats()
+        index = self._sparse.get(self._manifest_collection) if self._connected else None
+        if index:
+            status["bm25_chunks"] = index.doc_count
         return status
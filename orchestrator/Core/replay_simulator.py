@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Scheduler Replay Simulator (v2.5.0)
+DIREKTIVE: Goldstandard, Tuning ohne echte Rechenzeit.
+
+Zweck:
+Spielt aufgezeichnete Build-Traces (TraceRecorder) durch die echte Scheduling-Logik
+des LLMOrchestrator (Priority Queue, Preflight-freie Job-Matrix, SJF/FIFO, Semaphore,
+WorkerPoolManager Placement) – nur die BuildEngine ist simuliert.
+
+Zeitraffer: Die simulierte Engine "baut" jeden Job in trace_dauer / speedup
+Sekunden Wall-Clock (Default 3600 -> eine Stunde Workload pro Sekunde).
+Ankunftszeiten der Requests werden ebenso skaliert.
+
+Ausgabe je Kandidaten-Konfiguration (capacity, build_workers, scheduler_policy,
+parallel_builds): Durchsatz, Queue-Latenz-Perzentile (Ankunft -> Worker-Slot),
+Slot-Auslastung und Makespan in simulierten Sekunden.
+
+Grenzen: Timer-Auflösung ~1ms Wall-Clock (= speedup ms simuliert); Jobs, die eine
+Request-Matrix erzeugt, die aber nicht im Trace vorkommen, nutzen die Cost-Model-Schätzung.
+"""
+
+import asyncio
+import logging
+import math
+import tempfile
+import threading
+import time
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+
+from orchestrator.utils.logging import get_logger
+from orchestrator.Core.builder import BuildConfiguration, BuildProgress, BuildStatus, ModelFormat, OptimizationLevel
+from orchestrator.Core.worker_pool import WorkerPoolManager, WorkerUnavailableError
+from orchestrator.Core.cost_model import StageCostModel, BuildEstimate
+from orchestrator.Core.trace_recorder import BuildTrace
+
+# Logger, die pro Job loggen (im Zeitraffer nur Rauschen)
+_NOISY_LOGGERS = ["orchestrator.Core.orchestrator", "WorkerPool", "CostModel"]
+
+
+class SimConfig(dict):
+    """Minimal ConfigManager stand-in (get() + attribute access)."""
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key)
+
+
+class VirtualClock:
+    def __init__(self, speedup: float):
+        self.speedup = speedup
+        self._t0 = time.monotonic()
+
+    def now(self) -> float:
+        """Simulated seconds since start."""
+        return (time.monotonic() - self._t0) * self.speedup
+
+
+@dataclass
+class _SimBuild:
+    build_id: str
+    request_id: str
+    start: float
+    expected_end: float
+    end: Optional[float] = None
+    worker: str = ""
+
+
+class SimulatedBuildEngine:
+    """BuildEngine stand-in: placement via the real WorkerPoolManager, builds are timers."""
+
+    def __init__(self, config: SimConfig, clock: VirtualClock, durations: Dict[Tuple, Tuple[float, str]],
+                 cost_model: StageCostModel, model_sizes: Dict[str, int]):
+        self.config = config
+        self.clock = clock
+        self.cost_model = cost_model
+        self._durations = durations
+        self._model_sizes = model_sizes
+        self.worker_pool = WorkerPoolManager(config, default_client=object(),
+                                             default_capacity=int(config.get("capacity", 2)),
+                                             client_factory=lambda w: object())
+        self._lock = threading.Lock()
+        self._builds: Dict[str, BuildProgress] = {}
+        self._sim: Dict[str, _SimBuild] = {}
+        self._listeners: Dict[str, List] = {}
+        self.unplaceable = 0
+
+    def check_docker(self) -> bool:
+        return True
+
+    def predict_build(self, config: BuildConfiguration, host: Optional[str] = None) -> BuildEstimate:
+        return self.cost_model.predict(config.target_arch, config.quantization, host,
+                                       self._model_sizes.get(config.model_source, 0), config.use_imatrix)
+
+    def build_model(self, config: BuildConfiguration, wait_for_worker: bool = False) -> str:
+        try:
+            worker = self.worker_pool.acquire(config.build_id, timeout=None if wait_for_worker else 0)
+        except WorkerUnavailableError as e:
+            self.unplaceable += 1
+            raise RuntimeError(f"Max concurrent builds reached: {e}")
+
+        key = (config.request_id, config.model_source, config.target_arch, config.quantization)
+        duration, outcome = self._durations.get(key) or (self.predict_build(config).total, "completed")
+        start = self.clock.now()
+        progress = BuildProgress(config.build_id, BuildStatus.BUILDING, "Simulated",
+                                 start_time=datetime.now(), worker=worker.name)
+        with self._lock:
+            self._builds[config.build_id] = progress
+            self._sim[config.build_id] = _SimBuild(config.build_id, config.request_id, start,
+                                                   start + duration, worker=worker.name)
+        timer = threading.Timer(duration / self.clock.speedup, self._finish, args=(config.build_id, outcome))
+        timer.daemon = True
+        timer.start()
+        return config.build_id
+
+    def _finish(self, build_id: str, outcome: str):
+        with self._lock:
+            self._sim[build_id].end = self.clock.now()
+            progress = self._builds[build_id]
+            progress.status = BuildStatus.COMPLETED if outcome == "completed" else BuildStatus.FAILED
+            progress.end_time = datetime.now()
+            listeners = self._listeners.pop(build_id, [])
+        self.worker_pool.release(build_id)
+        for cb in listeners:
+            cb(progress)
+
+    def add_completion_listener(self, build_id: str, callback):
+        with self._lock:
+            progress = self._builds.get(build_id)
+            done = progress is not None and progress.status in (BuildStatus.COMPLETED, BuildStatus.FAILED)
+            if not done:
+                self._listeners.setdefault(build_id, []).append(callback)
+        if done: callback(progress)
+
+    def get_build_status(self, build_id: str) -> Optional[BuildProgress]:
+        return self._builds.get(build_id)
+
+    def remaining_seconds(self) -> List[float]:
+        now = self.clock.now()
+        with self._lock:
+            return [max(b.expected_end - now, 0.0) for b in self._sim.values() if b.end is None]
+
+    def sim_builds(self) -> List[_SimBuild]:
+        with self._lock:
+            return list(self._sim.values())
+
+
+@dataclass
+class SimulationResult:
+    name: str
+    candidate: Dict[str, Any]
+    builds: int = 0
+    failed: int = 0
+    makespan_s: float = 0.0
+    throughput_per_h: float = 0.0
+    queue_p50_s: float = 0.0
+    queue_p90_s: float = 0.0
+    queue_p99_s: float = 0.0
+    utilization: float = 0.0
+    wall_s: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values: return 0.0
+    ordered = sorted(values)
+    idx = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+class ReplaySimulator:
+    """Replays build traces through LLMOrchestrator with a simulated engine."""
+
+    def __init__(self, traces: List[BuildTrace], speedup: float = 3600.0, timeout: float = 600.0):
+        self.logger = get_logger("ReplaySimulator")
+        self.traces = sorted(traces, key=lambda t: t.submitted_at)
+        self.speedup = speedup
+        self.timeout = timeout
+        self.cost_model = StageCostModel(min_samples=1)
+        self.cost_model.fit(list(reversed(self.traces)))  # newest first, like the history
+
+    def _requests(self) -> List[Tuple[float, str, List[BuildTrace]]]:
+        """
+        Groups traces into orchestrator requests: (arrival offset, request id, traces).
+        A recorded request is replayed as one request only if its builds form the full
+        model x target x quant matrix the orchestrator would generate; otherwise each
+        build becomes its own request (no invented jobs).
+        """
+        t0 = self.traces[0].submitted_at if self.traces else 0.0
+        by_request: Dict[str, List[BuildTrace]] = {}
+        for t in self.traces:
+            by_request.setdefault(t.request_id or f"single-{t.build_id}", []).append(t)
+        groups: List[List[BuildTrace]] = []
+        for ts in by_request.values():
+            matrix = len({t.model for t in ts}) * len({t.target for t in ts}) * max(1, len({t.quantization for t in ts}))
+            combos = {(t.model, t.target, t.quantization) for t in ts}
+            if len(combos) == len(ts) == matrix:
+                groups.append(ts)
+            else:
+                groups.extend([t] for t in ts)
+        out = [(min(t.submitted_at for t in ts) - t0, f"sim{i:05d}", ts)
+               for i, ts in enumerate(groups)]
+        return sorted(out, key=lambda x: x[0])
+
+    def run(self, candidate: Dict[str, Any], name: Optional[str] = None) -> SimulationResult:
+        return asyncio.run(self._run(candidate, name or self.describe(candidate)))
+
+    def compare(self, candidates: List[Dict[str, Any]]) -> List[SimulationResult]:
+        return [self.run(c) for c in candidates]
+
+    @staticmethod
+    def describe(candidate: Dict[str, Any]) -> str:
+        return ", ".join(f"{k}={v}" for k, v in candidate.items() if k != "build_workers") or "default"
+
+    async def _run(self, candidate: Dict[str, Any], name: str) -> SimulationResult:
+        from orchestrator.Core.orchestrator import LLMOrchestrator
+
+        requests = self._requests()
+        with tempfile.TemporaryDirectory(prefix="llm-replay-") as tmp:
+            targets_dir = Path(tmp) / "targets"
+            for t in {t.target for t in self.traces}:
+                (targets_dir / t).mkdir(parents=True, exist_ok=True)
+
+            config = SimConfig(targets_dir=str(targets_dir), scheduler_policy="sjf", capacity=2)
+            config.update(candidate)
+            clock = VirtualClock(self.speedup)
+            durations = {}
+            for _, rid, ts in requests:
+                for t in ts:
+                    durations[(rid, t.model, t.target, t.quantization)] = (t.duration_s, t.status)
+            sizes = {t.model: t.model_size_bytes for t in self.traces if t.model_size_bytes}
+            engine = SimulatedBuildEngine(config, clock, durations, self.cost_model, sizes)
+            orch = LLMOrchestrator(config, build_engine=engine)
+            # After construction: get_logger() configures levels on first use
+            levels = {n: logging.getLogger(n).level for n in _NOISY_LOGGERS}
+            for n in _NOISY_LOGGERS: logging.getLogger(n).setLevel(logging.WARNING)
+            try:
+                return await self._replay(orch, engine, clock, requests, candidate, name, tmp)
+            finally:
+                for n, lvl in levels.items(): logging.getLogger(n).setLevel(lvl)
+
+    async def _replay(self, orch, engine: SimulatedBuildEngine, clock: VirtualClock,
+                      requests: List[Tuple[float, str, List[BuildTrace]]], candidate: Dict[str, Any],
+                      name: str, tmp: str) -> SimulationResult:
+        from orchestrator.Core.orchestrator import BuildRequest, WorkflowType, PriorityLevel
+
+        arrivals: Dict[str, float] = {}
+        wall_start = time.monotonic()
+        for offset, rid, ts in requests:
+            delay = offset / self.speedup - (time.monotonic() - wall_start)
+            if delay > 0: await asyncio.sleep(delay)
+            quants = sorted({t.quantization for t in ts if t.quantization})
+            req = BuildRequest(
+                request_id=rid, workflow_type=WorkflowType.SIMPLE_CONVERSION,
+                priority=PriorityLevel(max(t.priority for t in ts)),
+                models=sorted({t.model for t in ts}), targets=sorted({t.target for t in ts}),
+                target_formats=[ModelFormat.GGUF], optimization_level=OptimizationLevel.BALANCED,
+                quantization_options=quants, parallel_builds=bool(candidate.get("parallel_builds", True)),
+                output_base_dir=str(Path(tmp) / "output"), skip_preflight=True)
+            arrivals[rid] = clock.now()
+            await orch.submit_build_request(req)
+
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            states = [orch._workflows.get(rid) for _, rid, _ in requests]
+            if all(s is not None and s.end_time is not None for s in states):
+                break
+            await asyncio.sleep(0.005)
+        else:
+            self.logger.warning(f"Replay '{name}' timed out after {self.timeout}s wall clock")
+
+        return self._summarize(name, candidate, engine, arrivals, time.monotonic() - wall_start)
+
+    def _summarize(self, name: str, candidate: Dict[str, Any], engine: SimulatedBuildEngine,
+                   arrivals: Dict[str, float], wall: float) -> SimulationResult:
+        builds = [b for b in engine.sim_builds() if b.end is not None]
+        result = SimulationResult(name=name, candidate=candidate, builds=len(builds), wall_s=round(wall, 2))
+        if not builds: return result
+        result.failed = sum(1 for b in builds if engine.get_build_status(b.build_id).status == BuildStatus.FAILED)
+        waits = [max(b.start - arrivals.get(b.request_id, b.start), 0.0) for b in builds]
+        first = min(arrivals.values()) if arrivals else min(b.start for b in builds)
+        makespan = max(b.end for b in builds) - first
+        slots = engine.worker_pool.total_capacity
+        result.makespan_s = round(makespan, 1)
+        result.throughput_per_h = round(len(builds) / (makespan / 3600.0), 2) if makespan > 0 else 0.0
+        result.queue_p50_s = round(percentile(waits, 50), 1)
+        result.queue_p90_s = round(percentile(waits, 90), 1)
+        result.queue_p99_s = round(percentile(waits, 99), 1)
+        busy = sum(b.end - b.start for b in builds)
+        result.utilization = round(busy / (slots * makespan), 3) if makespan > 0 and slots else 0.0
+        return result
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Container Stats Collector (v2.5.0)
+DIREKTIVE: Goldstandard, nicht-blockierend, speicherbegrenzt.
+
+Zweck:
+Sammelt Ressourcen-Metriken (CPU/RAM/BlockIO/Netzwerk) eines Build-Containers
+über den Docker Stats-Stream in einem Hintergrund-Thread.
+Ersetzt das blockierende container.stats(stream=False) im Monitor-Loop.
+
+Die Zeitreihe wird auf ein festes Intervall verdichtet und bei Überschreiten
+von max_points durch Zusammenfassen benachbarter Punkte halbiert (Downsampling).
+Ergebnis wird neben den Build-Logs als JSON abgelegt (Kapazitätsplanung).
+
+Stages innerhalb des Build-Containers (convert, quantize, package, ...) werden aus
+dem Log-Stream der Module erkannt (module_stage()); Samples tragen diese Stage,
+die Summary liefert CPU und Block-IO je Stage (IO-gebundene Phasen erkennen).
+Module können eine Stage explizit melden: '>> [STAGE] <name>'.
+"""
+
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Callable, Tuple
+
+from orchestrator.utils.logging import get_logger
+
+
+def calculate_cpu_percent(stats: Dict[str, Any]) -> float:
+    """CPU-Auslastung in % (Docker CLI Formel, 100% = ein Kern)."""
+    try:
+        cpu_stats = stats['cpu_stats']
+        precpu_stats = stats['precpu_stats']
+        cpu_delta = cpu_stats['cpu_usage']['total_usage'] - precpu_stats['cpu_usage']['total_usage']
+        system_delta = cpu_stats['system_cpu_usage'] - precpu_stats['system_cpu_usage']
+
+        if system_delta > 0.0 and cpu_delta > 0.0:
+            online_cpus = cpu_stats.get('online_cpus', len(cpu_stats['cpu_usage'].get('percpu_usage', []))) or 1
+            cpu_percent = (cpu_delta / system_delta) * online_cpus * 100.0
+            return round(cpu_percent, 2)
+        return 0.0
+    except KeyError:
+        return 0.0
+
+
+# Phase markers in module output (build.sh, convert/rknn/rkllm modules); first match wins
+MODULE_STAGE_PATTERNS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"\[IMatrix\] Calculating"), "imatrix"),
+    (re.compile(r"\[IMatrix\] Converting|Converting HF|Converting Hugging Face|Running conversion|Converting \S+ to "),
+     "convert"),
+    (re.compile(r">> Running: .*quantize"), "quantize"),
+    (re.compile(r"=== Packaging"), "package"),
+    (re.compile(r"Installing|Cloning|installation", re.IGNORECASE), "setup"),
+]
+_EXPLICIT_STAGE_RE = re.compile(r">>\s*\[STAGE\]\s*([\w .:/-]+)")
+
+
+def module_stage(line: str) -> Optional[str]:
+    """Stage a module log line announces (None = no phase change)."""
+    explicit = _EXPLICIT_STAGE_RE.search(line)
+    if explicit:
+        return explicit.group(1).strip()
+    for pattern, stage in MODULE_STAGE_PATTERNS:
+        if pattern.search(line):
+            return stage
+    return None
+
+
+def _blkio_bytes(stats: Dict[str, Any]) -> Tuple[int, int]:
+    read = write = 0
+    entries = (stats.get('blkio_stats') or {}).get('io_service_bytes_recursive') or []
+    for e in entries:
+        op = str(e.get('op', '')).lower()
+        if op == 'read': read += e.get('value', 0)
+        elif op == 'write': write += e.get('value', 0)
+    return read, write
+
+
+def _net_bytes(stats: Dict[str, Any]) -> Tuple[int, int]:
+    rx = tx = 0
+    for iface in (stats.get('networks') or {}).values():
+        rx += iface.get('rx_bytes', 0)
+        tx += iface.get('tx_bytes', 0)
+    return rx, tx
+
+
+@dataclass
+class StatsSample:
+    """Ein verdichteter Messpunkt. IO/Net-Werte sind kumulative Bytes."""
+    timestamp: float
+    cpu_percent: float
+    mem_mb: float
+    mem_limit_mb: float
+    blkio_read: int = 0
+    blkio_write: int = 0
+    net_rx: int = 0
+    net_tx: int = 0
+    stage: str = ""
+
+
+class ContainerStatsCollector:
+    """Streaming Stats Sampler für genau einen Container."""
+
+    def __init__(self, container, build_id: str, interval: float = 2.0, max_points: int = 1800,
+                 stage_fn: Optional[Callable[[], str]] = None):
+        self.logger = get_logger("StatsCollector")
+        self.container = container
+        self.build_id = build_id
+        self.interval = interval
+        self.max_points = max(2, max_points)
+        self._stage_fn = stage_fn
+
+        self._samples: List[StatsSample] = []
+        self._bucket: List[StatsSample] = []
+        self._bucket_start = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stream = None
+
+    # --- LIFECYCLE ---
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"stats-{self.build_id}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        # Stream schließen, damit der blockierende Iterator sofort zurückkehrt
+        try:
+            if self._stream is not None and hasattr(self._stream, 'close'):
+                self._stream.close()
+        except Exception: pass
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        with self._lock:
+            self._flush_bucket()
+
+    def _run(self):
+        try:
+            self._stream = self.container.stats(stream=True, decode=True)
+            for raw in self._stream:
+                if self._stop.is_set(): break
+                if not raw or not raw.get('read'): continue
+                self.add_raw(raw)
+        except Exception as e:
+            if not self._stop.is_set():
+                self.logger.debug(f"Stats stream for {self.build_id} ended: {e}")
+
+    # --- AGGREGATION ---
+
+    def add_raw(self, raw: Dict[str, Any], now: Optional[float] = None):
+        """Verarbeitet einen rohen Docker Stats-Frame (auch direkt für Tests nutzbar)."""
+        mem = raw.get('memory_stats') or {}
+        rd, wr = _blkio_bytes(raw)
+        rx, tx = _net_bytes(raw)
+        sample = StatsSample(
+            timestamp=now if now is not None else time.time(),
+            cpu_percent=calculate_cpu_percent(raw),
+            mem_mb=mem.get('usage', 0) / (1024 * 1024),
+            mem_limit_mb=mem.get('limit', 0) / (1024 * 1024),
+            blkio_read=rd, blkio_write=wr, net_rx=rx, net_tx=tx,
+            stage=self._stage_fn() if self._stage_fn else ""
+        )
+        with self._lock:
+            if self._bucket and sample.timestamp - self._bucket_start >= self.interval:
+                self._flush_bucket()
+            if not self._bucket:
+                self._bucket_start = sample.timestamp
+            self._bucket.append(sample)
+
+    def _flush_bucket(self):
+        if not self._bucket: return
+        b = self._bucket
+        self._samples.append(StatsSample(
+            timestamp=b[-1].timestamp,
+            cpu_percent=round(sum(s.cpu_percent for s in b) / len(b), 2),
+            mem_mb=round(max(s.mem_mb for s in b), 2),
+            mem_limit_mb=round(b[-1].mem_limit_mb, 2),
+            blkio_read=b[-1].blkio_read, blkio_write=b[-1].blkio_write,
+            net_rx=b[-1].net_rx, net_tx=b[-1].net_tx,
+            stage=b[-1].stage
+        ))
+        self._bucket = []
+        if len(self._samples) > self.max_points:
+            self._downsample()
+
+    def _downsample(self):
+        """Halbiert die Auflösung: Paare werden gemittelt (CPU) bzw. maximiert (RAM)."""
+        merged = []
+        for i in range(0, len(self._samples) - 1, 2):
+            a, b = self._samples[i], self._samples[i + 1]
+            merged.append(StatsSample(
+                timestamp=b.timestamp,
+                cpu_percent=round((a.cpu_percent + b.cpu_percent) / 2, 2),
+                mem_mb=max(a.mem_mb, b.mem_mb), mem_limit_mb=b.mem_limit_mb,
+                blkio_read=b.blkio_read, blkio_write=b.blkio_write,
+                net_rx=b.net_rx, net_tx=b.net_tx, stage=b.stage
+            ))
+        if len(self._samples) % 2:
+            merged.append(self._samples[-1])
+        self._samples = merged
+        self.interval *= 2
+
+    # --- ACCESS ---
+
+    def latest(self) -> Optional[StatsSample]:
+        with self._lock:
+            if self._bucket: return self._bucket[-1]
+            return self._samples[-1] if self._samples else None
+
+    def get_series(self) -> List[StatsSample]:
+        with self._lock:
+            return list(self._samples) + ([self._bucket[-1]] if self._bucket else [])
+
+    def summary(self) -> Dict[str, Any]:
+        """Peak-/Durchschnittswerte plus IO-Raten und CPU je Stage."""
+        series = self.get_series()
+        if not series:
+            return {"samples": 0}
+
+        duration = max(series[-1].timestamp - series[0].timestamp, 0.0)
+        cpu = [s.cpu_percent for s in series]
+        mem = [s.mem_mb for s in series]
+
+        def peak_rate(attr: str) -> float:
+            best = 0.0
+            for a, b in zip(series, series[1:]):
+                dt = b.timestamp - a.timestamp
+                if dt > 0: best = max(best, (getattr(b, attr) - getattr(a, attr)) / dt)
+            return round(best / (1024 * 1024), 2)
+
+        stages: Dict[str, List[float]] = {}
+        for s in series:
+            stages.setdefault(s.stage or "unknown", []).append(s.cpu_percent)
+        # IO between two samples is booked to the later sample's stage
+        io_by_stage: Dict[str, Dict[str, float]] = {}
+        for a, b in zip(series, series[1:]):
+            io = io_by_stage.setdefault(b.stage or "unknown", {"read_mb": 0.0, "write_mb": 0.0})
+            io["read_mb"] += max(b.blkio_read - a.blkio_read, 0) / (1024 * 1024)
+            io["write_mb"] += max(b.blkio_write - a.blkio_write, 0) / (1024 * 1024)
+
+        return {
+            "samples": len(series),
+            "duration_s": round(duration, 1),
+            "cpu_percent": {"avg": round(sum(cpu) / len(cpu), 2), "peak": max(cpu)},
+            "mem_mb": {"avg": round(sum(mem) / len(mem), 2), "peak": max(mem)},
+            "mem_limit_mb": series[-1].mem_limit_mb,
+            "blkio_mb": {"read": round(series[-1].blkio_read / (1024 * 1024), 2),
+                         "write": round(series[-1].blkio_write / (1024 * 1024), 2),
+                         "peak_read_mb_s": peak_rate("blkio_read"),
+                         "peak_write_mb_s": peak_rate("blkio_write")},
+            "net_mb": {"rx": round(series[-1].net_rx / (1024 * 1024), 2),
+                       "tx": round(series[-1].net_tx / (1024 * 1024), 2)},
+            "cpu_avg_by_stage": {k: round(sum(v) / len(v), 2) for k, v in stages.items()},
+            "io_mb_by_stage": {k: {m: round(v, 2) for m, v in io.items()} for k, io in io_by_stage.items()}
+        }
+
+    def save(self, path: Path) -> Optional[Path]:
+        """Persistiert Zeitreihe + Summary als JSON."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {
+                "build_id": self.build_id,
+                "interval_s": self.interval,
+                "summary": self.summary(),
+                "series": [asdict(s) for s in self.get_series()]
+            }
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            return path
+        except Exception as e:
+            self.logger.warning(f"Failed to persist stats for {self.build_id}: {e}")
+            return None
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Build Trace Recorder (v2.5.0)
+DIREKTIVE: Goldstandard, reproduzierbare Workloads.
+
+Zweck:
+Die BuildEngine zeichnet jeden realen Build bereits in der Build History auf
+(Stage-Zeiten, Ressourcen-Peaks, Worker, Modellgröße, Queue-Wartezeit).
+Der Recorder extrahiert daraus portable Traces (JSONL, eine Zeile pro Build),
+die sich zwischen Hosts teilen und vom ReplaySimulator abspielen lassen.
+
+Trace-Zeile:
+    {"build_id", "request_id", "submitted_at", "target", "model", "quantization",
+     "model_size_bytes", "worker", "status", "stage_timings", "resources", "priority"}
+'submitted_at' = Start - Queue-Wartezeit (Ankunft beim Scheduler).
+"""
+
+import json
+from pathlib import Path
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Any
+
+from orchestrator.utils.logging import get_logger
+from orchestrator.utils.helpers import ensure_directory
+
+
+@dataclass
+class BuildTrace:
+    build_id: str
+    submitted_at: float
+    target: str
+    model: str = ""
+    quantization: Optional[str] = None
+    request_id: Optional[str] = None
+    model_size_bytes: int = 0
+    worker: Optional[str] = None
+    status: str = "completed"
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    resources: Dict[str, Any] = field(default_factory=dict)
+    priority: int = 1  # PriorityLevel.NORMAL
+
+    @property
+    def duration_s(self) -> float:
+        return sum(self.stage_timings.values())
+
+    @classmethod
+    def from_record(cls, record) -> "BuildTrace":
+        started = record.started_at or 0.0
+        return cls(
+            build_id=record.build_id,
+            submitted_at=round(started - (record.queue_wait_s or 0.0), 3),
+            target=record.target, model=record.model, quantization=record.quantization,
+            request_id=record.request_id, model_size_bytes=record.model_size_bytes or 0,
+            worker=record.worker, status=record.status,
+            stage_timings=dict(record.stage_timings), resources=dict(record.resources),
+        )
+
+
+class TraceRecorder:
+    """Exports build traces from the history and loads them for replay."""
+
+    def __init__(self, history=None):
+        self.logger = get_logger("TraceRecorder")
+        self.history = history
+
+    def collect(self, limit: int = 10000, **filters) -> List[BuildTrace]:
+        """Traces of finished builds (oldest first). Filters as BuildHistoryStore.query."""
+        if not self.history: return []
+        filters.setdefault("status", ["completed", "failed", "oom_killed"])
+        records = self.history.query(limit=limit, **filters)
+        traces = [BuildTrace.from_record(r) for r in records if r.stage_timings and r.started_at]
+        return sorted(traces, key=lambda t: t.submitted_at)
+
+    def export(self, path: Path, limit: int = 10000, **filters) -> int:
+        traces = self.collect(limit=limit, **filters)
+        self.save(traces, path)
+        self.logger.info(f"Exported {len(traces)} build traces to {path}")
+        return len(traces)
+
+    @staticmethod
+    def save(traces: List[BuildTrace], path: Path):
+        path = Path(path)
+        ensure_directory(path.parent)
+        with open(path, 'w', encoding='utf-8') as f:
+            for t in traces:
+                f.write(json.dumps(asdict(t)) + "\n")
+
+    @staticmethod
+    def load(path: Path) -> List[BuildTrace]:
+        traces = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    traces.append(BuildTrace(**json.loads(line)))
+        return sorted(traces, key=lambda t: t.submitted_at)
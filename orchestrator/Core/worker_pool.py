@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+LLM Cross-Compiler Framework - Build Worker Pool (v2.5.0)
+DIREKTIVE: Goldstandard, horizontal skalierbar, testbar ohne echte Hardware.
+
+Zweck:
+Abstrahiert die Docker-Endpunkte, auf denen Builds laufen. Jeder Worker ist ein
+Docker-Daemon (lokal, Docker Context oder Remote via tcp/ssh) mit eigener
+Kapazität und Architektur-Labels (z.B. großer x86 Server, nativer arm64 Host).
+Die BuildEngine platziert Jobs anhand von Ziel-Architektur und aktueller Last.
+
+Konfiguration (config.yml):
+    build_workers:
+      - name: big-x86
+        base_url: tcp://10.0.0.5:2376
+        capacity: 4
+        labels: [x86_64, gpu]
+      - name: arm-box
+        context: arm64-native
+        capacity: 2
+        labels: [aarch64]
+        path_map: {"/opt/llm-framework": "/mnt/llm-framework"}
+
+Ohne 'build_workers' wird ein einzelner Worker "local" aus docker.from_env() gebildet
+(identisches Verhalten wie vor v2.5.0). Für Tests kann ein 'client_factory'
+injiziert werden, der Fake-Clients liefert.
+"""
+
+import platform
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Callable
+
+import docker
+
+from orchestrator.utils.logging import get_logger
+
+
+class WorkerUnavailableError(RuntimeError):
+    """Raised when no worker can accept a job within the allowed wait time."""
+    pass
+
+
+@dataclass
+class BuildWorker:
+    """A single Docker endpoint that can execute builds."""
+    name: str
+    base_url: Optional[str] = None
+    context: Optional[str] = None
+    capacity: int = 1
+    labels: List[str] = field(default_factory=list)
+    path_map: Dict[str, str] = field(default_factory=dict)
+    enabled: bool = True
+
+    # Runtime State
+    client: Any = None
+    active_builds: List[str] = field(default_factory=list)
+    healthy: bool = True
+    last_error: str = ""
+
+    @property
+    def load(self) -> float:
+        if self.capacity <= 0: return 1.0
+        return len(self.active_builds) / self.capacity
+
+    @property
+    def free_slots(self) -> int:
+        return max(0, self.capacity - len(self.active_builds))
+
+    def supports(self, arch: Optional[str]) -> bool:
+        if not arch: return False
+        return arch.lower() in [l.lower() for l in self.labels]
+
+    def map_path(self, host_path: str) -> str:
+        """
+        Übersetzt einen Pfad des Orchestrator-Hosts in den Pfad auf dem Worker-Host.
+        Bind-Mounts werden vom Daemon des Workers aufgelöst, daher müssen geteilte
+        Verzeichnisse (NFS etc.) über 'path_map' zugeordnet werden.
+        """
+        if not self.path_map: return host_path
+        # Längstes Präfix gewinnt
+        for local_prefix in sorted(self.path_map, key=len, reverse=True):
+            if host_path == local_prefix or host_path.startswith(local_prefix.rstrip("/") + "/"):
+                return self.path_map[local_prefix] + host_path[len(local_prefix.rstrip("/")):]
+        return host_path
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "endpoint": self.base_url or (f"context:{self.context}" if self.context else "env"),
+            "capacity": self.capacity,
+            "active": len(self.active_builds),
+            "labels": list(self.labels),
+            "healthy": self.healthy,
+            "last_error": self.last_error
+        }
+
+
+class WorkerPoolManager:
+    """
+    Verwaltet alle Build-Worker und entscheidet über die Platzierung von Jobs.
+    Thread-safe: acquire/release werden aus den Executor-Threads aufgerufen.
+    """
+
+    def __init__(self, config_manager=None, default_client=None, default_capacity: int = 2,
+                 client_factory: Optional[Callable[[BuildWorker], Any]] = None):
+        self.logger = get_logger("WorkerPool")
+        self.config = config_manager
+        self._client_factory = client_factory or self._create_client
+        self._cond = threading.Condition()
+        self._workers: Dict[str, BuildWorker] = {}
+        self._assignments: Dict[str, str] = {}  # build_id -> worker name
+
+        worker_defs = self._get_conf("build_workers", []) or []
+        for wdef in worker_defs:
+            if not isinstance(wdef, dict) or not wdef.get("name"):
+                self.logger.warning(f"Ignoring invalid worker definition: {wdef}")
+                continue
+            self.add_worker(BuildWorker(
+                name=wdef["name"],
+                base_url=wdef.get("base_url"),
+                context=wdef.get("context"),
+                capacity=int(wdef.get("capacity", 1)),
+                labels=list(wdef.get("labels", [])),
+                path_map=dict(wdef.get("path_map", {})),
+                enabled=bool(wdef.get("enabled", True))
+            ))
+
+        # Single-Host Fallback (Legacy Verhalten)
+        if not self._workers:
+            local = BuildWorker(name="local", capacity=default_capacity, labels=[self._host_arch()])
+            local.client = default_client
+            self.add_worker(local)
+
+    def _get_conf(self, key: str, default: Any = None) -> Any:
+        if self.config:
+            if hasattr(self.config, 'get'):
+                return self.config.get(key, default)
+            return getattr(self.config, key, default)
+        return default
+
+    @staticmethod
+    def _host_arch() -> str:
+        machine = platform.machine().lower()
+        return {"amd64": "x86_64", "arm64": "aarch64"}.get(machine, machine)
+
+    def _create_client(self, worker: BuildWorker):
+        """Creates a Docker client for the worker endpoint (URL, Context or Env)."""
+        if worker.base_url:
+            return docker.DockerClient(base_url=worker.base_url)
+        if worker.context:
+            ctx = docker.ContextAPI.get_context(worker.context)
+            if not ctx:
+                raise ValueError(f"Docker context '{worker.context}' not found")
+            return docker.DockerClient(base_url=ctx.Host, tls=ctx.TLSConfig)
+        return docker.from_env()
+
+    # --- REGISTRY ---
+
+    def add_worker(self, worker: BuildWorker):
+        if worker.client is None and worker.enabled:
+            try:
+                worker.client = self._client_factory(worker)
+            except Exception as e:
+                worker.healthy = False
+                worker.last_error = str(e)
+                self.logger.warning(f"Worker '{worker.name}' unavailable: {e}")
+        with self._cond:
+            self._workers[worker.name] = worker
+            self._cond.notify_all()
+        self.logger.info(f"Registered build worker '{worker.name}' (capacity: {worker.capacity}, labels: {worker.labels})")
+
+    def remove_worker(self, name: str) -> bool:
+        with self._cond:
+            worker = self._workers.get(name)
+            if not worker or worker.active_builds: return False
+            del self._workers[name]
+            return True
+
+    def get_worker(self, name: str) -> Optional[BuildWorker]:
+        return self._workers.get(name)
+
+    def list_workers(self) -> List[BuildWorker]:
+        with self._cond:
+            return list(self._workers.values())
+
+    def has_label(self, label: str) -> bool:
+        """True if at least one worker advertises the label (e.g. 'gpu')."""
+        return any(w.supports(label) for w in self._workers.values() if w.enabled)
+
+    @property
+    def total_capacity(self) -> int:
+        return sum(w.capacity for w in self._workers.values() if w.enabled) or 1
+
+    def check_health(self) -> Dict[str, bool]:
+        """Pings all workers and updates their health state."""
+        result = {}
+        for worker in self.list_workers():
+            try:
+                if worker.client is None:
+                    worker.client = self._client_factory(worker)
+                worker.client.ping()
+                worker.healthy = True
+                worker.last_error = ""
+            except Exception as e:
+                worker.healthy = False
+                worker.last_error = str(e)
+            result[worker.name] = worker.healthy
+        with self._cond:
+            self._cond.notify_all()
+        return result
+
+    # --- PLACEMENT ---
+
+    def _select(self, arch: Optional[str], required_labels: List[str]) -> Optional[BuildWorker]:
+        """
+        Placement-Strategie:
+        1. Nur gesunde, aktivierte Worker mit freien Slots und allen Pflicht-Labels.
+        2. Native Architektur bevorzugt (kein QEMU/Cross-Overhead).
+        3. Innerhalb der Gruppe: geringste Last, dann größte freie Kapazität.
+        """
+        candidates = [
+            w for w in self._workers.values()
+            if w.enabled and w.healthy and w.client is not None and w.free_slots > 0
+            and all(w.supports(l) for l in required_labels)
+        ]
+        if not candidates: return None
+        candidates.sort(key=lambda w: (not w.supports(arch), w.load, -w.free_slots, w.name))
+        return candidates[0]
+
+    def acquire(self, build_id: str, arch: Optional[str] = None,
+                required_labels: Optional[List[str]] = None, timeout: Optional[float] = 0) -> BuildWorker:
+        """
+        Reserves a slot on the best matching worker.
+        timeout=0 -> non-blocking, None -> wait forever.
+        """
+        required = [l for l in (required_labels or []) if l]
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                # Fail fast if no worker could ever take the job (unhealthy or missing labels)
+                if not any(w.enabled and w.healthy and w.client is not None
+                           and all(w.supports(l) for l in required) for w in self._workers.values()):
+                    raise WorkerUnavailableError(f"No healthy build worker matches labels {required or '-'}")
+
+                worker = self._select(arch, required)
+                if worker:
+                    worker.active_builds.append(build_id)
+                    self._assignments[build_id] = worker.name
+                    self.logger.info(f"Placed {build_id} on worker '{worker.name}' "
+                                     f"(arch: {arch or 'any'}, load: {len(worker.active_builds)}/{worker.capacity})")
+                    return worker
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise WorkerUnavailableError(
+                        f"No build worker available for arch '{arch or 'any'}' (labels: {required or '-'})")
+                self._cond.wait(timeout=remaining)
+
+    def release(self, build_id: str):
+        with self._cond:
+            name = self._assignments.pop(build_id, None)
+            worker = self._workers.get(name) if name else None
+            if worker and build_id in worker.active_builds:
+                worker.active_builds.remove(build_id)
+            self._cond.notify_all()
+
+    def worker_for(self, build_id: str) -> Optional[BuildWorker]:
+        name = self._assignments.get(build_id)
+        return self._workers.get(name) if name else None
+
+    def get_status(self) -> List[Dict[str, Any]]:
+        return [w.to_dict() for w in self.list_workers()]
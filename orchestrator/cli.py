@@ -35,9 +35,12 @@ from rich.prompt import Prompt, Confirm
 
 from orchestrator.Core.framework import FrameworkManager, FrameworkConfig
 from orchestrator.Core.orchestrator import LLMOrchestrator, BuildRequest, WorkflowType, PriorityLevel, OrchestrationStatus
-from orchestrator.Core.builder import BuildEngine, ModelFormat, OptimizationLevel
+from orchestrator.Core.builder import BuildEngine, BuildStatus, ModelFormat, OptimizationLevel, TERMINAL_STATUSES
 from orchestrator.Core.module_generator import ModuleGenerator
 from orchestrator.Core.deployment_manager import DeploymentManager
+from orchestrator.Core.cache_warmer import CacheWarmer
+from orchestrator.Core.cache_manager import CacheManager
+from orchestrator.Core.gguf_split import SPLIT_RE, MANIFEST_SUFFIX
 from orchestrator.utils.logging import get_logger
 from orchestrator.utils.validation import ValidationError
 
@@ -507,11 +510,15 @@ def build():
 # --- NEU v2.4.0: IMatrix Flags ---
 @click.option('--imatrix/--no-imatrix', default=False, help='Enable Smart Calibration (IMatrix) for quantization')
 @click.option('--dataset', type=click.Path(exists=True), help='Custom calibration dataset path (txt)')
+@click.option('--skip-preflight', is_flag=True, help='Skip the consistency preflight of the build matrix')
+@click.option('--shard', 'shard_mode', default=None,
+              type=click.Choice(['auto', 'on', 'off']),
+              help='Split GGUF build (auto: only for models above shard_threshold_gb; default: config shard_mode)')
 @pass_context
 def start_build(ctx: FrameworkContext, model: str, target: str, format: str, 
                 quantization: Optional[str], output_dir: Optional[str], 
                 optimization: str, priority: str, parallel: bool, follow: bool, gpu: bool,
-                imatrix: bool, dataset: Optional[str]):
+                imatrix: bool, dataset: Optional[str], skip_preflight: bool, shard_mode: Optional[str]):
     """Start a new build job"""
     
     try:
@@ -555,7 +562,9 @@ def start_build(ctx: FrameworkContext, model: str, target: str, format: str,
             use_gpu=gpu,
             # Pass IMatrix Flags to Orchestrator
             use_imatrix=imatrix,
-            dataset_path=dataset
+            dataset_path=dataset,
+            skip_preflight=skip_preflight,
+            shard_mode=shard_mode
         )
         
         loop = asyncio.new_event_loop()
@@ -589,7 +598,8 @@ def start_build(ctx: FrameworkContext, model: str, target: str, format: str,
                             if workflow_status.status == OrchestrationStatus.HEALING: status_color = "magenta"
                             
                             console.print(f"[{status_color}]Status: {workflow_status.status.value} - {workflow_status.current_stage}[/{status_color}]")
-                            console.print(f"[cyan]Progress: {workflow_status.progress_percent}% ({workflow_status.completed_builds}/{workflow_status.total_builds} builds)[/cyan]")
+                            eta = f", ETA {workflow_status.eta_seconds / 60:.0f} min" if workflow_status.eta_seconds else ""
+                            console.print(f"[cyan]Progress: {workflow_status.progress_percent}% ({workflow_status.completed_builds}/{workflow_status.total_builds} builds{eta})[/cyan]")
                             
                             # Show Healing Info
                             if workflow_status.healing_proposal:
@@ -618,48 +628,282 @@ def start_build(ctx: FrameworkContext, model: str, target: str, format: str,
 
 @build.command('status')
 @click.argument('request_id', required=False)
-@click.option('--all', '-a', is_flag=True, help='Show all builds')
+@click.option('--all', '-a', 'show_all', is_flag=True, help='Include finished builds (default: active builds only)')
+@click.option('--target', '-t', help='Filter by target')
+@click.option('--model', '-m', help='Filter by model source')
+@click.option('--state', 'states', multiple=True, help='Filter by status (repeatable)')
+@click.option('--since', type=click.DateTime(), help='Only builds started after this time')
+@click.option('--until', type=click.DateTime(), help='Only builds started before this time')
+@click.option('--limit', '-n', default=50, show_default=True, help='Maximum number of rows')
 @pass_context
-def build_status(ctx: FrameworkContext, request_id: Optional[str], all: bool):
-    """Check build status"""
+def build_status(ctx: FrameworkContext, request_id: Optional[str], show_all: bool, target: Optional[str],
+                 model: Optional[str], states: tuple, since: Optional[datetime], until: Optional[datetime], limit: int):
+    """Check build status (reads the persistent build history)"""
     try:
+        history = ctx.build_engine.history if ctx.build_engine else None
+        if not request_id:
+            if not history:
+                console.print("[red]Build history not available[/red]")
+                sys.exit(1)
+            if not states and not show_all:
+                states = tuple(s.value for s in BuildStatus if s not in TERMINAL_STATUSES)
+            filters = dict(target=target, model=model, status=list(states) or None, since=since, until=until)
+            records = history.query(limit=limit, **filters)
+            if not records:
+                hint = "" if show_all else " (use --all to include finished builds)"
+                console.print(f"[yellow]No builds found{hint}[/yellow]")
+                return
+
+            title = "Build History" if show_all else "Active Builds"
+            table = Table(title=f"{title} ({len(records)} of {history.count(**filters)})")
+            table.add_column("Build ID", style="cyan", no_wrap=True)
+            table.add_column("Target", style="magenta")
+            table.add_column("Model", style="green")
+            table.add_column("Quant")
+            table.add_column("Status", style="yellow")
+            table.add_column("Started")
+            table.add_column("Duration", justify="right")
+
+            for r in records:
+                started = datetime.fromtimestamp(r.started_at).strftime("%Y-%m-%d %H:%M") if r.started_at else "-"
+                table.add_row(r.build_id, r.target, r.model, r.quantization or "-", r.status, started,
+                              f"{r.duration_s:.0f}s" if r.duration_s is not None else "-")
+            console.print(table)
+            return
+
+        # Live workflow of this process first, then the persistent history
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         try:
-            if all or not request_id:
-                workflows = loop.run_until_complete(ctx.orchestrator.list_workflows())
-                if not workflows:
-                    console.print("[yellow]No builds found[/yellow]")
-                    return
-                
-                table = Table(title="Build Status")
-                table.add_column("Request ID", style="cyan", no_wrap=True)
-                table.add_column("Status", style="yellow")
-                table.add_column("Progress", style="blue")
-                
-                for workflow in workflows:
-                    table.add_row(
-                        workflow.request_id[:12] + "...",
-                        workflow.status.value,
-                        f"{workflow.progress_percent}%"
-                    )
-                console.print(table)
-            else:
-                workflow_status = loop.run_until_complete(ctx.orchestrator.get_workflow_status(request_id))
-                if not workflow_status:
-                    console.print(f"[red]Build '{request_id}' not found[/red]")
-                    sys.exit(1)
-                
-                console.print(f"[bold]ID:[/bold] {workflow_status.request_id}")
-                console.print(f"[bold]Status:[/bold] {workflow_status.status.value}")
-                console.print(f"[bold]Progress:[/bold] {workflow_status.progress_percent}%")
-                
+            workflow_status = loop.run_until_complete(ctx.orchestrator.get_workflow_status(request_id)) \
+                if ctx.orchestrator else None
         finally:
             loop.close()
+        if workflow_status:
+            console.print(f"[bold]ID:[/bold] {workflow_status.request_id}")
+            console.print(f"[bold]Status:[/bold] {workflow_status.status.value}")
+            console.print(f"[bold]Progress:[/bold] {workflow_status.progress_percent}%")
+            if workflow_status.eta_seconds:
+                console.print(f"[bold]ETA:[/bold] {workflow_status.eta_seconds / 60:.0f} min")
+            return
+
+        record = history.get(request_id) if history else None
+        records = [record] if record else (history.query(request_id=request_id, limit=1000) if history else [])
+        if not records:
+            console.print(f"[red]Build '{request_id}' not found[/red]")
+            sys.exit(1)
+        for r in records:
+            console.print(f"[bold]ID:[/bold] {r.build_id}  [bold]Status:[/bold] {r.status}  "
+                          f"[bold]Worker:[/bold] {r.worker or '-'}")
+            console.print(f"  {r.model} -> {r.target} ({r.quantization or '-'})")
+            if r.stage_timings:
+                console.print("  Stages: " + ", ".join(f"{k} {v:.0f}s" for k, v in r.stage_timings.items()))
+            for err in r.errors[-3:]:
+                console.print(f"  [red]{err}[/red]")
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
         sys.exit(1)
 
+# ============================================================================
+# BUILD WORKER COMMANDS (NEU V2.5)
+# ============================================================================
+
+@cli.group()
+def workers():
+    """Inspect the distributed build worker pool"""
+    pass
+
+@workers.command('list')
+@click.option('--check', is_flag=True, help='Ping all workers before listing')
+@pass_context
+def list_workers(ctx: FrameworkContext, check: bool):
+    """List build workers with capacity, load and health."""
+    if not ctx.build_engine:
+        console.print("[red]Build engine not available[/red]")
+        sys.exit(1)
+
+    pool = ctx.build_engine.worker_pool
+    if check:
+        with console.status("Checking workers...", spinner="dots"):
+            pool.check_health()
+
+    table = Table(title="Build Workers")
+    table.add_column("Name", style="cyan")
+    table.add_column("Endpoint", style="magenta")
+    table.add_column("Labels", style="green")
+    table.add_column("Load", justify="right")
+    table.add_column("Health", style="yellow")
+    for w in pool.get_status():
+        health = "✅ OK" if w["healthy"] else f"❌ {w['last_error'][:40]}"
+        table.add_row(w["name"], w["endpoint"], ", ".join(w["labels"]), f"{w['active']}/{w['capacity']}", health)
+    console.print(table)
+
+# ============================================================================
+# TRACE / REPLAY COMMANDS (NEU V2.5)
+# ============================================================================
+
+@cli.group()
+def trace():
+    """Export build traces and replay them against scheduler configurations"""
+    pass
+
+@trace.command('export')
+@click.option('--output', '-o', required=True, type=click.Path(), help='Trace file (JSONL)')
+@click.option('--target', '-t', help='Filter by target')
+@click.option('--since', type=click.DateTime(), help='Only builds started after this time')
+@click.option('--until', type=click.DateTime(), help='Only builds started before this time')
+@click.option('--limit', '-n', default=10000, show_default=True, help='Maximum number of builds')
+@pass_context
+def trace_export(ctx: FrameworkContext, output: str, target: Optional[str], since: Optional[datetime],
+                 until: Optional[datetime], limit: int):
+    """Export finished builds from the history as a replayable trace."""
+    from orchestrator.Core.trace_recorder import TraceRecorder
+    history = ctx.build_engine.history if ctx.build_engine else None
+    if not history:
+        console.print("[red]Build history not available[/red]")
+        sys.exit(1)
+    count = TraceRecorder(history).export(Path(output), limit=limit, target=target, since=since, until=until)
+    console.print(f"[green]Exported {count} build traces to {output}[/green]")
+
+@trace.command('replay')
+@click.argument('trace_file', type=click.Path(exists=True))
+@click.option('--capacity', '-c', 'capacities', multiple=True, type=int, help='Local build slots (repeatable)')
+@click.option('--policy', '-p', 'policies', multiple=True, type=click.Choice(['sjf', 'fifo']),
+              help='Scheduler policy (repeatable)')
+@click.option('--speedup', default=3600.0, show_default=True, help='Simulated seconds per wall-clock second')
+@click.option('--json', 'as_json', is_flag=True, help='Output JSON')
+@pass_context
+def trace_replay(ctx: FrameworkContext, trace_file: str, capacities, policies, speedup: float, as_json: bool):
+    """Replay a trace against every capacity x policy combination."""
+    from orchestrator.Core.trace_recorder import TraceRecorder
+    from orchestrator.Core.replay_simulator import ReplaySimulator
+
+    traces = TraceRecorder.load(Path(trace_file))
+    if not traces:
+        console.print("[yellow]Trace file is empty[/yellow]")
+        return
+    if capacities:
+        setups = [{"capacity": c} for c in capacities]
+    else:
+        # Baseline = the live scheduler: local slots of the build engine plus configured workers
+        engine = ctx.build_engine
+        slots = engine.max_concurrent_builds if engine else ctx.config.get("max_concurrent_builds", 2)
+        setups = [{"capacity": slots, "build_workers": ctx.config.get("build_workers") or []}]
+    candidates = [{**setup, "scheduler_policy": p}
+                  for setup in setups
+                  for p in (policies or (ctx.config.get("scheduler_policy", "sjf"),))]
+    sim = ReplaySimulator(traces, speedup=speedup)
+    with console.status(f"Replaying {len(traces)} builds...", spinner="dots"):
+        results = sim.compare(candidates)
+
+    if as_json:
+        console.print_json(json.dumps([asdict(r) for r in results]))
+        return
+    table = Table(title=f"Replay of {len(traces)} builds")
+    table.add_column("Candidate", style="cyan")
+    table.add_column("Builds", justify="right")
+    table.add_column("Builds/h", justify="right", style="green")
+    table.add_column("Queue p50", justify="right")
+    table.add_column("Queue p90", justify="right")
+    table.add_column("Queue p99", justify="right", style="yellow")
+    table.add_column("Utilization", justify="right")
+    table.add_column("Makespan", justify="right")
+    for r in results:
+        table.add_row(r.name, str(r.builds), f"{r.throughput_per_h:.2f}", f"{r.queue_p50_s:.0f}s",
+                      f"{r.queue_p90_s:.0f}s", f"{r.queue_p99_s:.0f}s", f"{r.utilization:.0%}",
+                      f"{r.makespan_s / 3600:.1f}h")
+    console.print(table)
+
+# ============================================================================
+# CACHE COMMANDS (NEU V2.5)
+# ============================================================================
+
+@cli.group()
+def cache():
+    """Manage build caches (images, git mirrors, tools, models)"""
+    pass
+
+@cache.command('warm')
+@click.option('--target', '-t', 'targets', multiple=True, help='Target to warm (repeatable, default: all)')
+@click.option('--only', 'kinds', multiple=True, type=click.Choice(['image', 'target_image', 'git', 'tool']),
+              help='Restrict to task kinds (repeatable)')
+@click.option('--jobs', '-j', default=4, show_default=True, help='Parallel tasks')
+@click.option('--json', 'as_json', is_flag=True, help='Output JSON summary')
+@pass_context
+def cache_warm(ctx: FrameworkContext, targets, kinds, jobs: int, as_json: bool):
+    """Pre-pull images, build toolchains, mirror repos and fetch tools."""
+    if not ctx.build_engine:
+        console.print("[red]Build engine not available[/red]")
+        sys.exit(1)
+
+    warmer = CacheWarmer(ctx.build_engine)
+    tasks = warmer.plan(list(targets) or None, list(kinds) or None)
+    if not tasks:
+        console.print("[yellow]Nothing to warm.[/yellow]")
+        return
+
+    def report(task):
+        if as_json or task.status == "running": return
+        icon = {"done": "✅", "skipped": "⏭️ ", "failed": "❌"}.get(task.status, "•")
+        size = f"{task.size_bytes / (1024 * 1024):.1f} MB" if task.size_bytes else ""
+        console.print(f"{icon} {task.kind:<12} {task.name:<24} {size:>12} {task.duration_s:>7.1f}s {task.error[:60]}")
+
+    if not as_json:
+        console.print(f"[cyan]Warming {len(tasks)} cache entries ({jobs} parallel)...[/cyan]")
+    warmer.warm(tasks, max_workers=jobs, on_progress=report)
+
+    summary = CacheWarmer.summarize(tasks)
+    if as_json:
+        console.print(json.dumps(summary, indent=2))
+    else:
+        console.print(f"[bold]Total: {summary['total_mb']} MB, {summary['by_status']}[/bold]")
+    if summary["by_status"].get("failed"):
+        sys.exit(1)
+
+def _cache_manager(ctx: FrameworkContext) -> CacheManager:
+    if ctx.build_engine:
+        return ctx.build_engine.cache_manager
+    cm = ctx.framework_manager.config if ctx.framework_manager else ctx.config
+    return CacheManager(Path(ctx.config.get("cache_dir", "cache")), cm)
+
+@cache.command('stats')
+@click.option('--json', 'as_json', is_flag=True, help='Output JSON')
+@pass_context
+def cache_stats(ctx: FrameworkContext, as_json: bool):
+    """Show cache usage per subtree against its quota."""
+    stats = _cache_manager(ctx).stats()
+    if as_json:
+        console.print(json.dumps(stats, indent=2))
+        return
+
+    table = Table(title="Cache Usage")
+    table.add_column("Subtree", style="cyan")
+    table.add_column("Entries", justify="right")
+    table.add_column("Pinned", justify="right")
+    table.add_column("Used (GB)", justify="right")
+    table.add_column("Quota (GB)", justify="right")
+    table.add_column("Usage", justify="right")
+    for name, s in stats.items():
+        color = "red" if s["usage_percent"] > 100 else "yellow" if s["usage_percent"] > 80 else "green"
+        table.add_row(name, str(s["entries"]), str(s["pinned"]), f"{s['used_gb']:.2f}",
+                      f"{s['quota_gb']:.0f}", f"[{color}]{s['usage_percent']:.0f}%[/{color}]")
+    console.print(table)
+
+@cache.command('gc')
+@click.option('--dry-run', is_flag=True, help='Only show what would be evicted')
+@click.option('--subtree', '-s', 'subtrees', multiple=True, help='Restrict to subtree (repeatable)')
+@click.option('--policy', type=click.Choice(['lru', 'lfu']), help='Override eviction policy')
+@pass_context
+def cache_gc(ctx: FrameworkContext, dry_run: bool, subtrees, policy: Optional[str]):
+    """Evict unpinned cache entries until every subtree is within its quota."""
+    report = _cache_manager(ctx).collect(list(subtrees) or None, dry_run=dry_run, policy=policy)
+    verb = "Would evict" if dry_run else "Evicted"
+    for e in report["evicted"]:
+        console.print(f"🗑️  {verb} {e['subtree']}:{e['name']} ({e['size_gb']} GB)")
+    for err in report["errors"]:
+        console.print(f"[red]{err}[/red]")
+    console.print(f"[bold]{verb} {len(report['evicted'])} entries, {report['freed_gb']} GB ({report['policy']})[/bold]")
+
 # ============================================================================
 # SECRETS MANAGEMENT COMMANDS (NEU V2.0)
 # ============================================================================
@@ -741,6 +985,41 @@ def list_artifacts(ctx: FrameworkContext):
     
     console.print(table)
 
+@deploy.command('list')
+@click.option('--target', '-t', help='Filter by target')
+@click.option('--model', '-m', help='Filter by model source')
+@click.option('--limit', '-n', default=50, show_default=True, help='Maximum number of builds')
+@pass_context
+def deploy_list(ctx: FrameworkContext, target: Optional[str], model: Optional[str], limit: int):
+    """List deployable artifacts of completed builds (from the build history)."""
+    if not ctx.build_engine:
+        console.print("[red]Build engine not available[/red]")
+        sys.exit(1)
+
+    artifacts = ctx.build_engine.history.list_artifacts(limit=limit, target=target, model=model)
+    if not artifacts:
+        console.print("[yellow]No completed builds with artifacts found.[/yellow]")
+        return
+
+    # Split GGUF: show the manifest once instead of every shard
+    manifests = {(a["build_id"], str(Path(a["path"]).parent), Path(a["path"]).name[:-len(MANIFEST_SUFFIX)])
+                 for a in artifacts if a["path"].endswith(MANIFEST_SUFFIX)}
+    artifacts = [a for a in artifacts if not (
+        (m := SPLIT_RE.match(Path(a["path"]).name))
+        and (a["build_id"], str(Path(a["path"]).parent), m["name"]) in manifests)]
+
+    table = Table(title="Deployable Artifacts")
+    table.add_column("Build ID", style="cyan", no_wrap=True)
+    table.add_column("Target", style="magenta")
+    table.add_column("Model", style="green")
+    table.add_column("Finished")
+    table.add_column("Artifact", style="bold yellow")
+    for a in artifacts:
+        finished = datetime.fromtimestamp(a["ended_at"]).strftime("%Y-%m-%d %H:%M") if a["ended_at"] else "-"
+        missing = "" if Path(a["path"]).exists() else " [red](missing)[/red]"
+        table.add_row(a["build_id"], a["target"], a["model"], finished, Path(a["path"]).name + missing)
+    console.print(table)
+
 @deploy.command('package')
 @click.argument('artifact_name')
 @click.option('--profile', required=True, help="Target Hardware Profile (from targets/profiles)")
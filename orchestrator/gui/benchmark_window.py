@@ -8,6 +8,9 @@ Führt Performance-Tests (llama-bench) im Container aus und visualisiert Ergebni
 Updates v2.3.0:
 - Robust DockerManager access via Framework.
 - Safe Config access.
+
+Updates v2.5.0:
+- Benchmarks run via exec in a warm container from the DockerManager pool.
 """
 
 import json
@@ -45,8 +48,8 @@ class BenchmarkWorker(QThread):
                  self.error.emit("Docker Manager not initialized.")
                  return
 
-            # Wir nutzen den DockerManager, um einen temporären Container für den Benchmark zu starten
-            client = self.docker_manager.client
+            # Wiederholte Benchmarks laufen per exec im warmen Container des DockerManager-Pools
+            pool = self.docker_manager.container_pool
             
             # Image aus Config holen (v2.3)
             # Hier vereinfacht: Wir nehmen das Standard-Builder-Image oder ein spezialisiertes Benchmark-Image
@@ -71,27 +74,24 @@ class BenchmarkWorker(QThread):
             cmd_str = " ".join(cmd)
             self.progress.emit(f"Running: {cmd_str}")
             
-            # Run container (synchron warten)
+            # Exec im warmen Container (synchron warten)
             # Wichtig: Volumes müssen korrekt gemountet sein, damit das Modell gefunden wird
-            # Wir nutzen hier den DockerManager 'run_container' Wrapper falls verfügbar, sonst direkt client
             
             # Volume Mapping für Cache (wo Modelle liegen)
             # Annahme: Framework Cache ist lokal vorhanden
             cache_host = self.config.get("cache_dir", "./cache")
             
-            container = client.containers.run(
+            exit_code, output = pool.run(
                 img, 
-                command=cmd,
+                cmd,
                 volumes={
                     str(cache_host): {'bind': '/build-cache', 'mode': 'rw'}
-                },
-                remove=True,
-                detach=False, # Wait for finish
-                stdout=True,
-                stderr=True
+                }
             )
+            if exit_code != 0:
+                self.error.emit(f"llama-bench exited with code {exit_code}")
+                return
             
-            output = container.decode('utf-8')
             results = self._parse_results(output)
             self.finished.emit(results)
             
@@ -24,6 +24,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtGui import QIcon
 from orchestrator.utils.localization import get_instance as get_i18n
+from orchestrator.Core.gguf_split import MANIFEST_SUFFIX
 
 class DeploymentWorker(QThread):
     """
@@ -182,7 +183,27 @@ class DeploymentWindow(QWidget):
     def refresh_data(self):
         # Artifacts
         self.list_artifacts.clear()
+        listed = set()
         
+        # 1. Completed builds from the persistent build history (newest first, indexed query)
+        docker_mgr = self.framework.get_component("docker_manager") if hasattr(self.framework, 'get_component') else None
+        history = getattr(getattr(docker_mgr, 'builder', None), 'history', None)
+        if history:
+            try:
+                for art in history.list_artifacts(limit=200):
+                    path = Path(art["path"])
+                    # Golden ZIPs; split GGUF builds have no ZIP, their manifest is the entry point
+                    is_split = path.name.endswith(MANIFEST_SUFFIX)
+                    if not (path.suffix == '.zip' or is_split) or not path.exists() or str(path) in listed: continue
+                    icon = "🧩" if is_split else "📦"
+                    list_item = QListWidgetItem(f"{icon} {path.name}  ({art['target']}, {art['build_id']})")
+                    list_item.setData(Qt.UserRole, str(path))
+                    self.list_artifacts.addItem(list_item)
+                    listed.add(str(path))
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"Build history unavailable: {e}")
+        
+        # 2. Everything else in output_dir (artifacts from before the history existed)
         # Safe config access
         get_cfg = getattr(self.framework.config, 'get', lambda k, d=None: getattr(self.framework.config, k, d))
         output_dir = Path(get_cfg("output_dir", "output"))
@@ -191,6 +212,17 @@ class DeploymentWindow(QWidget):
             for item in output_dir.glob("*"):
                 # Zeige nur relevante Dateien (z.B. ZIPs oder Ordner, aber keine Logs)
                 if item.name.startswith("deploy_"): continue # Verstecke bereits erstellte Pakete
+                if str(item) in listed or str(item.resolve()) in listed: continue
+                manifests = sorted(item.glob(f"*{MANIFEST_SUFFIX}")) if item.is_dir() else []
+                if manifests:
+                    # Split GGUF output dir: deploy through its manifest(s) (manifest + shards)
+                    for manifest in manifests:
+                        if str(manifest) in listed: continue
+                        list_item = QListWidgetItem(f"🧩 {item.name}/{manifest.name}")
+                        list_item.setData(Qt.UserRole, str(manifest))
+                        self.list_artifacts.addItem(list_item)
+                        listed.add(str(manifest))
+                    continue
                 if item.is_dir() or item.suffix in ['.zip', '.tar.gz', '.bin']:
                     list_item = QListWidgetItem(item.name)
                     # Add simple visual distinction
@@ -223,11 +255,15 @@ class DeploymentWindow(QWidget):
             QMessageBox.warning(self, "Warning", "Please select a Hardware Profile.")
             return
 
-        # Strip icon prefix if present
-        raw_name = artifact_item.text().replace("📁 ", "").replace("📦 ", "")
-        
-        get_cfg = getattr(self.framework.config, 'get', lambda k, d=None: getattr(self.framework.config, k, d))
-        artifact_path = Path(get_cfg("output_dir", "output")) / raw_name
+        # History entries carry their full path, plain output_dir entries only a name
+        artifact_path = artifact_item.data(Qt.UserRole)
+        if artifact_path:
+            artifact_path = Path(artifact_path)
+        else:
+            # Strip icon prefix if present
+            raw_name = artifact_item.text().replace("📁 ", "").replace("📦 ", "")
+            get_cfg = getattr(self.framework.config, 'get', lambda k, d=None: getattr(self.framework.config, k, d))
+            artifact_path = Path(get_cfg("output_dir", "output")) / raw_name
         
         target_ip = self.txt_ip.text().strip()
         user = self.txt_user.text().strip()
@@ -20,6 +20,8 @@ import zipfile
 import tarfile
 import re
 import ctypes
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 
@@ -123,3 +125,35 @@ def sanitize_filename(name: str) -> str:
     """Removes illegal characters for filenames."""
     name = str(name).strip().replace(" ", "_")
     return re.sub(r'(?u)[^-\w.]', '', name)
+
+@contextmanager
+def file_lock(path: Union[str, Path]):
+    """
+    Exclusive inter-process lock on 'path' (created if missing), blocking.
+    POSIX: fcntl.flock, Windows: msvcrt.locking. Also serializes threads,
+    since every call opens its own file handle.
+    """
+    path = Path(path)
+    ensure_directory(path.parent)
+    with open(path, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)  # LK_LOCK gives up after ~10s
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+LLM Framework - RAG Chunking Report (v2.5.0)
+DIREKTIVE: Embedding-Kosten und Chunk-Qualität vor/nach dem Chunker-Wechsel belegen.
+
+Zerlegt eine Codebase (Default: dieses Repo, gleiche Dateiauswahl wie
+RAGManager.ingest_codebase) einmal mit den alten Zeichenfenstern (1500/200,
+'FILE:'-Header nur im ersten Chunk) und einmal mit den strukturbewussten
+Chunkern. Je Dateityp:
+
+    chunks       Anzahl der Embedding-Inputs
+    tokens       Summe der Tokens (= Embedding-Kosten)
+    split defs   Python-Funktionen/Klassen (<= Token-Limit), die über mehrere Chunks verteilt sind
+
+Usage:
+    python scripts/chunking_report.py
+    python scripts/chunking_report.py --root /path/to/repo --max-tokens 512 --usd-per-mtok 0.02
+"""
+
+import argparse
+import ast
+import json
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.Core.rag_manager import RAGManager
+from orchestrator.Core.chunkers import chunk_chars, chunk_document, detect_kind
+from orchestrator.Core.embedding_pipeline import estimate_tokens
+
+
+def python_defs(content: str, max_tokens: int):
+    """Source of all functions/classes small enough to fit one chunk."""
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return []
+    lines = content.splitlines(keepends=True)
+    return [d for d in ("".join(lines[n.lineno - 1:n.end_lineno]) for n in ast.walk(tree)
+                        if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)))
+            if estimate_tokens(d) <= max_tokens]
+
+
+def main() -> int:
+    repo = Path(__file__).resolve().parent.parent
+    parser = argparse.ArgumentParser(description="Chunk count / embedding cost: character windows vs. structure-aware")
+    parser.add_argument("--root", default=str(repo))
+    parser.add_argument("--max-tokens", type=int, default=512)
+    parser.add_argument("--usd-per-mtok", type=float, default=0.02, help="Embedding price (text-embedding-3-small)")
+    parser.add_argument("--json", dest="json_out", help="Write the report as JSON")
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    with tempfile.TemporaryDirectory() as tmp:
+        rag = RAGManager(SimpleNamespace(config={}, info=SimpleNamespace(installation_path=tmp)))
+        files = sorted(rag._walk_codebase(root))
+
+    report = {}
+    for rel in files:
+        content = (root / rel).read_text(encoding="utf-8", errors="ignore")
+        if not content.strip(): continue
+        kind = detect_kind(rel) or "other"
+        old = chunk_chars(f"FILE: {rel}\n\n{content}")
+        new = []
+        for piece in chunk_document(content, rel, max_tokens=args.max_tokens):
+            header = f"FILE: {rel}" + (f" :: {piece.label}" if piece.label else "")
+            new.append(f"{header}\n\n{piece.text}")
+
+        row = report.setdefault(kind, {"files": 0, "defs": 0, "old": {"chunks": 0, "tokens": 0, "split_defs": 0},
+                                       "new": {"chunks": 0, "tokens": 0, "split_defs": 0}})
+        row["files"] += 1
+        defs = python_defs(content, args.max_tokens) if kind == "python" else []
+        row["defs"] += len(defs)
+        for name, chunks in (("old", old), ("new", new)):
+            row[name]["chunks"] += len(chunks)
+            row[name]["tokens"] += sum(estimate_tokens(c) for c in chunks)
+            row[name]["split_defs"] += sum(1 for d in defs if not any(d in c for c in chunks))
+
+    total = {"files": 0, "defs": 0, "old": {"chunks": 0, "tokens": 0, "split_defs": 0},
+             "new": {"chunks": 0, "tokens": 0, "split_defs": 0}}
+    for row in report.values():
+        total["files"] += row["files"]
+        total["defs"] += row["defs"]
+        for name in ("old", "new"):
+            for key in ("chunks", "tokens", "split_defs"):
+                total[name][key] += row[name][key]
+    report["total"] = total
+
+    print(f"📦 {total['files']} files from {root} (max {args.max_tokens} tokens/chunk)")
+    print(f"   {'type':<10}{'files':>6}{'chunks old':>12}{'new':>7}{'tokens old':>12}{'new':>9}"
+          f"{'split defs old':>16}{'new':>5}")
+    for kind, row in sorted(report.items(), key=lambda kv: kv[0] == "total"):
+        print(f"   {kind:<10}{row['files']:>6}{row['old']['chunks']:>12}{row['new']['chunks']:>7}"
+              f"{row['old']['tokens']:>12}{row['new']['tokens']:>9}"
+              f"{row['old']['split_defs']:>16}{row['new']['split_defs']:>5}")
+    for name in ("old", "new"):
+        usd = total[name]["tokens"] / 1e6 * args.usd_per_mtok
+        print(f"   {name}: {total[name]['chunks']} chunks, {total[name]['tokens']} tokens, ${usd:.4f} per full ingest")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
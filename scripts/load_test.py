@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+LLM Framework - Orchestrator Load Test (v2.5.0)
+DIREKTIVE: Regressions-Gate für den Framework-Overhead (kein Docker nötig).
+
+Reicht tausende Requests gegen den FakeDockerClient ein und prüft Scheduler-
+Latenz, Overhead je Build, CPU und Speicher gegen Schwellwerte.
+
+Usage:
+    python scripts/load_test.py --requests 2000 --capacity 8
+    python scripts/load_test.py --gate --json load_report.json   # CI: exit 1 bei Verstoß
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.Core.load_harness import LoadHarness, LoadProfile, LoadThresholds
+
+
+def main() -> int:
+    defaults, limits = LoadProfile(), LoadThresholds()
+    parser = argparse.ArgumentParser(description="Orchestrator load test with a fake Docker backend")
+    parser.add_argument("--requests", type=int, default=defaults.requests)
+    parser.add_argument("--quantizations", type=int, default=defaults.quantizations, help="Builds per request")
+    parser.add_argument("--capacity", type=int, default=defaults.capacity, help="Build slots")
+    parser.add_argument("--build-seconds", type=float, default=defaults.build_seconds)
+    parser.add_argument("--log-lines", type=int, default=defaults.log_lines, help="Container log lines per build")
+    parser.add_argument("--policy", choices=["sjf", "fifo"], default=defaults.scheduler_policy)
+    parser.add_argument("--timeout", type=float, default=defaults.timeout)
+    parser.add_argument("--json", dest="json_out", help="Write the report as JSON")
+    parser.add_argument("--gate", action="store_true", help="Exit 1 if a threshold is violated")
+    parser.add_argument("--max-dispatch-p99-ms", type=float, default=limits.max_dispatch_p99_ms)
+    parser.add_argument("--max-overhead-p99-ms", type=float, default=limits.max_overhead_p99_ms)
+    parser.add_argument("--max-cpu-ms-per-job", type=float, default=limits.max_cpu_ms_per_job)
+    parser.add_argument("--max-mem-kb-per-job", type=float, default=limits.max_mem_kb_per_job)
+    args = parser.parse_args()
+
+    profile = LoadProfile(requests=args.requests, quantizations=args.quantizations, capacity=args.capacity,
+                          build_seconds=args.build_seconds, log_lines=args.log_lines,
+                          scheduler_policy=args.policy, timeout=args.timeout)
+    thresholds = LoadThresholds(max_dispatch_p99_ms=args.max_dispatch_p99_ms,
+                                max_overhead_p99_ms=args.max_overhead_p99_ms,
+                                max_cpu_ms_per_job=args.max_cpu_ms_per_job,
+                                max_mem_kb_per_job=args.max_mem_kb_per_job)
+
+    print(f"🚀 Load test: {profile.requests} requests x {profile.quantizations} builds, capacity {profile.capacity}")
+    report = LoadHarness(profile).run()
+    for key, value in LoadHarness.to_dict(report).items():
+        print(f"   {key:<18} {value}")
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(LoadHarness.to_dict(report), indent=2), encoding="utf-8")
+
+    violations = report.check(thresholds)
+    for v in violations:
+        print(f"❌ {v}")
+    if not violations:
+        print("✅ All thresholds met")
+    return 1 if args.gate and violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+LLM Framework - RAG Retrieval Benchmark (v2.5.0)
+DIREKTIVE: Messbar statt gefühlt: Recall und Latenz je Retrieval-Pfad.
+
+Indiziert eine Codebase (Default: dieses Repo) in eine temporäre Knowledge Base
+(eingebetteter Vector Store, Default-Backend 'hashing' = offline) und erzeugt
+Exact-Match-Queries aus seltenen Tokens (Flags, Identifier, dotted names wie
+'-DGGML_NEON=ON' oder 'rknn.build'). Relevant ist jeder Chunk, der das Token
+wörtlich enthält. Ohne --threshold gilt der kalibrierte Default des Backends
+(wie bei search()). Verglichen werden:
+
+    dense    bisheriger Pfad (nur Vektorsuche)
+    dense@0  Vektorsuche ohne Score-Cut-off (Recall-Obergrenze von dense)
+    hybrid   BM25 + Vektorsuche, RRF
+    rerank   hybrid + Cross-Encoder (nur mit --reranker)
+
+Usage:
+    python scripts/rag_retrieval_benchmark.py
+    python scripts/rag_retrieval_benchmark.py --queries 300 --k 5 --threshold 0.0
+    python scripts/rag_retrieval_benchmark.py --backend onnx --reranker models/tiny_models/ms-marco-MiniLM
+"""
+
+import argparse
+import json
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.Core.rag_manager import RAGManager
+
+# Tokens worth an exact lookup: flags, snake_case / dotted identifiers, key=value
+_CANDIDATE_RE = re.compile(r"(?<![\w.-])(-{1,2}[A-Za-z][\w.=-]{4,}|[A-Za-z]\w*(?:[._]\w+)+)")
+_TEMPLATES = ["{t}", "error with {t} during build", "how is {t} configured", "{t} failed"]
+
+
+def build_queries(chunks, count: int, seed: int):
+    """Rare tokens (in 1-3 chunks) -> (query, set of relevant chunk ids)."""
+    postings = {}
+    for chunk_id, content in chunks.items():
+        for token in set(_CANDIDATE_RE.findall(content)):
+            if len(token) >= 6: postings.setdefault(token, set()).add(chunk_id)
+    rare = sorted(t for t, ids in postings.items() if len(ids) <= 3)
+    rng = random.Random(seed)
+    picked = rng.sample(rare, min(count, len(rare)))
+    return [(rng.choice(_TEMPLATES).format(t=t), postings[t]) for t in picked]
+
+
+def run_mode(rag: RAGManager, conf: dict, queries, k: int, threshold: float, hybrid: bool, rerank: bool):
+    conf["rag_hybrid"] = hybrid
+    rag._reranker = None if rerank else False
+    hits, recall, latencies = 0, 0.0, []
+    for query, relevant in queries:
+        t0 = time.perf_counter()
+        results = rag.search(query, limit=k, score_threshold=threshold)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        found = {r.point_id for r in results} & relevant
+        hits += bool(found)
+        recall += len(found) / min(k, len(relevant))
+    latencies.sort()
+    n = max(len(queries), 1)
+    return {"hit_rate": round(hits / n, 3), f"recall@{k}": round(recall / n, 3),
+            "p50_ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+            "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else 0.0}
+
+
+def main() -> int:
+    repo = Path(__file__).resolve().parent.parent
+    parser = argparse.ArgumentParser(description="Recall/latency of dense vs. hybrid RAG retrieval")
+    parser.add_argument("--root", default=str(repo), help="Codebase to index")
+    parser.add_argument("--backend", default="hashing", help="rag_embedding_backend for the benchmark")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="score_threshold (default: the backend's calibrated search() default)")
+    parser.add_argument("--reranker", help="Cross-encoder model dir (adds the 'rerank' mode)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", dest="json_out", help="Write the report as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="rag-bench-") as tmp:
+        conf = {"rag_embedding_backend": args.backend, "cache_dir": tmp, "rag_query_cache": False,
+                "rag_qdrant_retry_s": 10 ** 6, "rag_reranker_model": args.reranker or ""}
+        rag = RAGManager(SimpleNamespace(config=conf, info=SimpleNamespace(installation_path=tmp)))
+        ingest = rag.ingest_codebase(args.root)
+        if not ingest.get("success"):
+            print(f"❌ Ingest failed: {ingest.get('message')}")
+            return 1
+
+        # Chunk contents by point id (ground truth is literal containment)
+        chunks, offset = {}, None
+        while True:
+            records, offset = rag.client.scroll(rag.collection_name, limit=512, offset=offset, with_payload=True)
+            chunks.update((str(r.id), (r.payload or {}).get("content", "")) for r in records)
+            if offset is None: break
+
+        queries = build_queries(chunks, args.queries, args.seed)
+        threshold = rag.default_score_threshold if args.threshold is None else args.threshold
+        if rag.backend.name == "hashing":
+            print("⚠️  'hashing' is a lexical stand-in, not a semantic model: dense recall is a lower bound. "
+                  "Use --backend onnx/sentence-transformers for real dense numbers.")
+        print(f"🔎 {len(chunks)} chunks ({rag.backend.model_id}), {len(queries)} exact-match queries, "
+              f"k={args.k}, threshold={threshold}")
+        # dense@0: Vektorsuche ohne Cut-off = Recall-Obergrenze des Dense-Pfads (fairer Vergleich zu hybrid)
+        modes = [("dense", False, False, threshold)]
+        if threshold > 0: modes.append(("dense@0", False, False, 0.0))
+        modes.append(("hybrid", True, False, threshold))
+        if args.reranker: modes.append(("rerank", True, True, threshold))
+        report = {"chunks": len(chunks), "queries": len(queries), "backend": rag.backend.model_id,
+                  "k": args.k, "threshold": threshold}
+        for name, hybrid, rerank, mode_threshold in modes:
+            report[name] = run_mode(rag, conf, queries, args.k, mode_threshold, hybrid, rerank)
+            print(f"   {name:<8} " + "  ".join(f"{key} {value}" for key, value in report[name].items()))
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -44,7 +44,7 @@ if [[ "$JOB_TYPE" == "imatrix" ]]; then
 
     # 1. Convert to F16 (Intermediate)
     echo ">> [IMatrix] Converting to intermediate F16 GGUF..."
-    INTERMEDIATE="/tmp/model-f16.gguf"
+    INTERMEDIATE="${SCRATCH_DIR:-/tmp}/model-f16.gguf"
     if [ -f "$CONVERT_SCRIPT" ]; then
         python3 "$CONVERT_SCRIPT" "$MODEL_SOURCE" --outfile "$INTERMEDIATE" --outtype f16
     else
@@ -71,16 +71,69 @@ fi
 # 1. NORMAL BUILD DISPATCH
 # ==============================================================================
 
+# Sharded GGUF (SHARDED_BUILD=1, set by the framework for very large models):
+# F16 is written directly as split GGUF (no single huge intermediate), quantized with
+# --keep-split on QUANT_THREADS (container CPU budget), artifacts stay split.
+# llama.cpp opens a split set only through its first shard, so the shards are
+# quantized by one llama-quantize process with a thread pool, not one process each.
+function build_gguf_sharded() {
+    local q_type="$1"
+    local use_matrix="${USE_IMATRIX:-0}"
+    local matrix_file="${IMATRIX_PATH:-}"
+    local split_size="${SPLIT_MAX_SIZE:-8G}"
+    local threads="${QUANT_THREADS:-$(nproc)}"
+    local f16_dir="${SCRATCH_DIR:-$OUTPUT_DIR}/f16-split"
+
+    echo ">> Building sharded GGUF (Quant: $q_type, max shard: $split_size, threads: $threads)..."
+    mkdir -p "$f16_dir"
+
+    local f16_entry
+    f16_entry=$(ls "$f16_dir"/model-f16-00001-of-*.gguf 2>/dev/null | head -n1 || true)
+    if [ -z "$f16_entry" ]; then
+        echo ">> Converting HF -> split GGUF F16..."
+        python3 "$CONVERT_SCRIPT" "$MODEL_SOURCE" --outfile "$f16_dir/model-f16.gguf" --outtype f16 \
+            --split-max-size "$split_size"
+        # Small models yield a single (unsplit) file
+        f16_entry=$(ls "$f16_dir"/model-f16-00001-of-*.gguf 2>/dev/null | head -n1 || echo "$f16_dir/model-f16.gguf")
+    fi
+
+    local quant_cmd=("$QUANTIZE_BIN" "--keep-split")
+    if [[ "$use_matrix" == "1" ]] && [[ -f "$matrix_file" ]]; then
+        echo ">> Applying IMatrix optimization..."
+        quant_cmd+=("--imatrix" "$matrix_file")
+    fi
+    # Output prefix: llama-quantize appends -0000N-of-0000M.gguf per shard
+    quant_cmd+=("$f16_entry" "$OUTPUT_DIR/model-${q_type}" "$q_type" "$threads")
+
+    echo ">> Running: ${quant_cmd[*]}"
+    "${quant_cmd[@]}"
+
+    # Unsplit input -> single output file without suffix
+    if [ -f "$OUTPUT_DIR/model-${q_type}" ]; then
+        mv "$OUTPUT_DIR/model-${q_type}" "$OUTPUT_DIR/model-${q_type}.gguf"
+    fi
+    rm -rf "$f16_dir"
+}
+
 # Helper for GGUF Quantization
 function build_gguf() {
     local q_type="$1"
     local use_matrix="${USE_IMATRIX:-0}"
     local matrix_file="${IMATRIX_PATH:-}"
 
+    if [[ "${SHARDED_BUILD:-0}" == "1" ]]; then
+        build_gguf_sharded "$q_type"
+        return
+    fi
+
     echo ">> Building GGUF (Quant: $q_type, IMatrix: $use_matrix)..."
 
     # Step 1: Convert to F16 first (Gold standard for quantization input)
+    # Intermediate goes to the scratch volume if the framework provides one (SCRATCH_DIR)
     local f16_file="$OUTPUT_DIR/model-f16.gguf"
+    if [[ "$q_type" != "f16" ]] && [[ -n "${SCRATCH_DIR:-}" ]]; then
+        f16_file="$SCRATCH_DIR/model-f16.gguf"
+    fi
     if [ ! -f "$f16_file" ]; then
         echo ">> Converting HF -> GGUF F16..."
         python3 "$CONVERT_SCRIPT" "$MODEL_SOURCE" --outfile "$f16_file" --outtype f16
@@ -180,7 +233,10 @@ fi
 
 # --- PACKAGING ---
 echo "=== Packaging ==="
-if [ -d "$OUTPUT_DIR" ]; then
+if [[ "${SHARDED_BUILD:-0}" == "1" ]]; then
+    # Split shards are packaged by the framework (manifest), a tarball would double the footprint
+    echo "Sharded build: skipping tarball."
+elif [ -d "$OUTPUT_DIR" ]; then
     cd "$OUTPUT_DIR" && tar -czf "rockchip_deployment.tar.gz" *
     echo "Artifacts packaged."
 else
@@ -11,6 +11,10 @@
 # $JOB_TYPE        - 'build' (default) or 'imatrix'
 # $USE_IMATRIX     - '1' or '0' (for build job)
 # $IMATRIX_PATH    - Path to pre-calculated matrix
+# $SCRATCH_DIR     - Volume for large intermediates (optional)
+# $SHARDED_BUILD   - '1' for very large models: split GGUF end-to-end
+# $SPLIT_MAX_SIZE  - Max shard size (e.g. 8G, sharded build only)
+# $QUANT_THREADS   - Quantization threads (container CPU budget, sharded build only)
 
 set -euo pipefail
 
@@ -65,7 +69,7 @@ if [[ "$JOB_TYPE" == "imatrix" ]]; then
 
     # 1. Convert to F16 (Intermediate)
     echo ">> [IMatrix] Converting to intermediate F16 GGUF..."
-    INTERMEDIATE="/tmp/model-f16.gguf"
+    INTERMEDIATE="${SCRATCH_DIR:-/tmp}/model-f16.gguf"
     # We use python3 explicitly
     python3 "$CONVERT_SCRIPT" "$MODEL_SOURCE" --outfile "$INTERMEDIATE" --outtype f16
 
@@ -96,12 +100,57 @@ if [[ "${USE_IMATRIX:-0}" == "1" ]]; then
     fi
 fi
 
+# Sharded GGUF (SHARDED_BUILD=1, set by the framework for very large models):
+# F16 is written directly as split GGUF (no single huge intermediate), quantized with
+# --keep-split on QUANT_THREADS (container CPU budget), artifacts stay split.
+# llama.cpp opens a split set only through its first shard, so the shards are
+# quantized by one llama-quantize process with a thread pool, not one process each.
+function build_gguf_sharded() {
+    local q_type="$1"
+    local split_size="${SPLIT_MAX_SIZE:-8G}"
+    local threads="${QUANT_THREADS:-$(nproc)}"
+    local f16_dir="${SCRATCH_DIR:-$OUTPUT_DIR}/f16-split"
+
+    if [ -z "$QUANTIZE_BIN" ] || [ -z "$CONVERT_SCRIPT" ]; then
+        echo "❌ Error: Sharded build requires llama-quantize and the conversion script in this container."
+        exit 1
+    fi
+
+    echo ">> Building sharded GGUF (Quant: $q_type, max shard: $split_size, threads: $threads)..."
+    mkdir -p "$f16_dir"
+
+    local f16_entry
+    f16_entry=$(ls "$f16_dir"/model-f16-00001-of-*.gguf 2>/dev/null | head -n1 || true)
+    if [ -z "$f16_entry" ]; then
+        echo ">> Converting HF -> split GGUF F16..."
+        python3 "$CONVERT_SCRIPT" "$MODEL_SOURCE" --outfile "$f16_dir/model-f16.gguf" --outtype f16 \
+            --split-max-size "$split_size"
+        # Small models yield a single (unsplit) file
+        f16_entry=$(ls "$f16_dir"/model-f16-00001-of-*.gguf 2>/dev/null | head -n1 || echo "$f16_dir/model-f16.gguf")
+    fi
+
+    # IMATRIX_ARGS is intentionally unquoted: "--imatrix <file>" or empty
+    # Output prefix: llama-quantize appends -0000N-of-0000M.gguf per shard
+    local quant_cmd=("$QUANTIZE_BIN" "--keep-split" $IMATRIX_ARGS "$f16_entry" "$OUTPUT_DIR/model-${q_type}" "$q_type" "$threads")
+    echo ">> Running: ${quant_cmd[*]}"
+    "${quant_cmd[@]}"
+
+    # Unsplit input -> single output file without suffix
+    if [ -f "$OUTPUT_DIR/model-${q_type}" ]; then
+        mv "$OUTPUT_DIR/model-${q_type}" "$OUTPUT_DIR/model-${q_type}.gguf"
+    fi
+    rm -rf "$f16_dir"
+}
+
 # --- SDK SETUP ---
 # [SDK_SETUP_COMMANDS]
 
 # --- CONVERSION & QUANTIZATION LOGIC ---
 echo ">> Starting Logic for Task: ${MODEL_TASK:-LLM} / Quant: $QUANT_TYPE"
 
+if [[ "${SHARDED_BUILD:-0}" == "1" ]]; then
+    build_gguf_sharded "$QUANT_TYPE"
+else
 case "$QUANT_TYPE" in
 [QUANTIZATION_LOGIC]
 
@@ -123,9 +172,16 @@ case "$QUANT_TYPE" in
         echo ">> Original model copied to output (FP16/Source Precision)."
         ;;
 esac
+fi
 
 # --- PACKAGING ---
 echo "=== Packaging Artifacts ==="
+if [[ "${SHARDED_BUILD:-0}" == "1" ]]; then
+    # Split shards are packaged by the framework (manifest), an archive would double the footprint
+    echo "Sharded build: skipping packaging commands."
+else
+    :
 # [PACKAGING_COMMANDS]
+fi
 
 echo "Build completed successfully."
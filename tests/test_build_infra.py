@@ -0,0 +1,868 @@
+#!/usr/bin/env python3
+"""
+Unit Tests für die Build-Infrastruktur (Worker Pool, Scheduling, Cache).
+DIREKTIVE: Keine echten Docker-Daemons, alle Clients sind Fakes.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from orchestrator.Core.worker_pool import WorkerPoolManager, WorkerUnavailableError
+from orchestrator.Core.consistency_manager import ConsistencyManager
+from orchestrator.Core.stats_collector import ContainerStatsCollector, module_stage
+from orchestrator.Core.container_pool import WarmContainerPool
+from orchestrator.Core.model_stager import ModelStager
+from orchestrator.Core.cache_warmer import CacheWarmer
+from orchestrator.Core.cache_manager import CacheManager
+from orchestrator.Core.build_history import BuildHistoryStore, BuildRecord
+from orchestrator.Core.cost_model import StageCostModel
+from orchestrator.Core.trace_recorder import TraceRecorder, BuildTrace
+from orchestrator.Core.replay_simulator import ReplaySimulator
+from orchestrator.Core.load_harness import LoadHarness, LoadProfile, LoadThresholds
+from orchestrator.Core.disk_planner import DiskSpaceEstimator, DiskReservationManager, InsufficientDiskSpaceError
+from orchestrator.Core.gguf_split import SplitManifest, write_manifests, split_set_files
+from orchestrator.Core.event_monitor import DockerEventMonitor, LABEL_BUILD_ID, LABEL_ROLE
+
+
+class FakeDockerClient:
+    """Minimaler Docker-Client Ersatz (nur ping)."""
+    def __init__(self, name: str, alive: bool = True):
+        self.name = name
+        self.alive = alive
+
+    def ping(self):
+        if not self.alive:
+            raise ConnectionError(f"{self.name} down")
+        return True
+
+
+def _pool(workers):
+    config = {"build_workers": workers}
+    return WorkerPoolManager(config, client_factory=lambda w: FakeDockerClient(w.name))
+
+
+class TestWorkerPool:
+
+    def test_native_architecture_preferred(self):
+        pool = _pool([
+            {"name": "x86", "capacity": 4, "labels": ["x86_64"]},
+            {"name": "arm", "capacity": 1, "labels": ["aarch64"]},
+        ])
+        assert pool.acquire("b1", arch="aarch64").name == "arm"
+        # Native worker full -> falls back to least loaded other worker
+        assert pool.acquire("b2", arch="aarch64").name == "x86"
+
+    def test_least_loaded_and_release(self):
+        pool = _pool([
+            {"name": "a", "capacity": 2, "labels": ["x86_64"]},
+            {"name": "b", "capacity": 2, "labels": ["x86_64"]},
+        ])
+        first = pool.acquire("b1", arch="x86_64").name
+        second = pool.acquire("b2", arch="x86_64").name
+        assert first != second
+        pool.release("b1")
+        assert pool.worker_for("b1") is None
+        assert pool.acquire("b3", arch="x86_64").name == first
+
+    def test_capacity_exhausted_non_blocking(self):
+        pool = _pool([{"name": "only", "capacity": 1, "labels": ["x86_64"]}])
+        pool.acquire("b1")
+        with pytest.raises(WorkerUnavailableError):
+            pool.acquire("b2", timeout=0)
+
+    def test_required_labels_fail_fast(self):
+        pool = _pool([{"name": "cpu", "capacity": 2, "labels": ["x86_64"]}])
+        with pytest.raises(WorkerUnavailableError):
+            pool.acquire("b1", required_labels=["gpu"], timeout=None)
+
+    def test_path_mapping(self):
+        pool = _pool([{"name": "nfs", "labels": [], "path_map": {"/opt/llm": "/mnt/llm"}}])
+        worker = pool.get_worker("nfs")
+        assert worker.map_path("/opt/llm/cache/models") == "/mnt/llm/cache/models"
+        assert worker.map_path("/opt/llmx/file") == "/opt/llmx/file"
+
+
+class TestMatrixPreflight:
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        cache = tmp_path / "cache"
+        cache.mkdir()
+        (cache / "target_hardware_config.txt").write_text("Total_RAM_MB=6000\n")
+        config = SimpleNamespace(cache_dir=str(cache), targets_dir=str(Path(__file__).parent.parent / "targets"))
+        return ConsistencyManager(SimpleNamespace(config=config))
+
+    def test_rknn_quant_follows_module_mapping(self, manager):
+        for quant in ("Q8_0", "i8", "INT8", "FP16", "f16"):
+            issues = manager.check_build_compatibility({"target": "Rockchip", "format": "rknn", "quantization": quant})
+            assert not [i for i in issues if i.component == "Quantization"], quant
+        # Unmapped values (K-quants, W4A16, ...) are silently defaulted by the module -> warning, not pruned
+        for quant in ("Q4_K_M", "W4A16", "int8"):
+            issues = manager.check_build_compatibility({"target": "Generic", "format": "rknn", "quantization": quant})
+            quant_issues = [i for i in issues if i.component == "Quantization"]
+            assert [i.severity for i in quant_issues] == ["WARNING"], quant
+            assert "'i8'" in quant_issues[0].message
+
+    def test_matrix_prunes_and_deduplicates(self, manager):
+        jobs = [
+            {"job_id": "j1", "target": "Generic", "format": "gguf", "quantization": "Q4_K_M", "model_name": "tiny-1b"},
+            {"job_id": "j2", "target": "Generic", "format": "gguf", "quantization": "Q4_K_M", "model_name": "big-70b"},
+            {"job_id": "j3", "target": "Generic", "format": "gguf", "quantization": "Q4_K_M", "model_name": "big-70b"},
+        ]
+        results = manager.evaluate_matrix(jobs)
+        assert not manager.is_blocking(results["j1"])
+        assert manager.is_blocking(results["j2"])
+        assert results["j2"] is results["j3"]
+
+    def test_ram_requirement_parses_parameter_count(self, manager):
+        from orchestrator.Core.consistency_manager import parse_param_billions
+        assert parse_param_billions("mixtral-8x7b-instruct") == 56
+        assert parse_param_billions("gemma-2-27b") == 27 and parse_param_billions("qwen2.5-0.5b") == 0.5
+        assert parse_param_billions("my7bmodel") is None
+        assert parse_param_billions("tinyllama_1.1b") == 1.1 and parse_param_billions("llama_7b_chat") == 7
+
+        ram = lambda name, hw=None: [i.severity for i in manager._check_resources(
+            hw or {"Total_RAM_MB": "6000"}, {"model_name": name}) if i.component == "RAM"]
+        assert ram("llama-2-7b") == ["WARNING"] and ram("gemma-2-27b") == ["ERROR"]
+        assert ram("phi-3-mini") == []
+        # Size unknown: never pruned, however little RAM
+        assert ram("phi-3-mini", {"Total_RAM_MB": "1000"}) == ["WARNING"]
+
+    def test_hardware_profile_cached(self, manager):
+        first = manager._load_hardware_profile()
+        assert manager._load_hardware_profile() is first
+
+
+def _stats_frame(cpu_total: int, mem_mb: int, read_bytes: int) -> dict:
+    return {
+        "read": "2026-01-01T00:00:00Z",
+        "cpu_stats": {"cpu_usage": {"total_usage": cpu_total}, "system_cpu_usage": 100, "online_cpus": 1},
+        "precpu_stats": {"cpu_usage": {"total_usage": 0}, "system_cpu_usage": 0},
+        "memory_stats": {"usage": mem_mb * 1024 * 1024, "limit": 4096 * 1024 * 1024},
+        "blkio_stats": {"io_service_bytes_recursive": [{"op": "Read", "value": read_bytes}]},
+    }
+
+
+def test_stats_collector_downsamples_and_summarizes():
+    collector = ContainerStatsCollector(container=None, build_id="b1", interval=1.0, max_points=8)
+    for t in range(60):
+        collector.add_raw(_stats_frame(50, 100 + t, t * 1024 * 1024), now=float(t))
+    collector.stop()
+
+    assert len(collector.get_series()) <= 8
+    summary = collector.summary()
+    assert summary["cpu_percent"]["avg"] == 50.0
+    assert summary["mem_mb"]["peak"] == 159
+    assert summary["blkio_mb"]["read"] == 59.0
+
+
+def test_stats_samples_are_tagged_with_module_phases():
+    lines = [">> Building GGUF (Quant: Q4_K_M, IMatrix: 0)...", ">> Converting HF -> GGUF F16...",
+             ">> Running: /app/llama.cpp/llama-quantize in.gguf out.gguf Q4_K_M", "=== Packaging ===",
+             ">> [STAGE] upload"]
+    assert [module_stage(l) for l in lines] == [None, "convert", "quantize", "package", "upload"]
+
+    stage = {"name": "convert"}
+    collector = ContainerStatsCollector(container=None, build_id="b1", interval=1.0,
+                                        stage_fn=lambda: stage["name"])
+    for t in range(10):
+        if t == 5: stage["name"] = "quantize"
+        # convert reads 10 MB/s, quantize is CPU-bound (no IO)
+        collector.add_raw(_stats_frame(50, 100, min(t, 4) * 10 * 1024 * 1024), now=float(t))
+    collector.stop()
+    io = collector.summary()["io_mb_by_stage"]
+    assert io["convert"]["read_mb"] == 40.0 and io["quantize"]["read_mb"] == 0.0
+
+
+def test_event_monitor_routes_by_build_label():
+    monitor = DockerEventMonitor(client=None)
+    received = []
+    monitor.subscribe("b1", received.append)
+
+    def raw(build_id, action, **attrs):
+        return {"Type": "container", "Action": action, "timeNano": 1_000_000_000,
+                "Actor": {"ID": "abc123", "Attributes": {LABEL_BUILD_ID: build_id, LABEL_ROLE: "build", **attrs}}}
+
+    monitor.dispatch(raw("b1", "oom"))
+    monitor.dispatch(raw("b1", "die", exitCode="137"))
+    monitor.dispatch(raw("b2", "die", exitCode="0"))
+    monitor.dispatch(raw("b1", "exec_start: sh"))  # not watched
+
+    assert [e.action for e in received] == ["oom", "die"]
+    assert received[1].exit_code == 137 and received[1].role == "build"
+
+
+class FakeExecClient:
+    """Docker-Client Ersatz mit containers.run(detach) und exec API."""
+    def __init__(self):
+        self.created = []
+        self.containers = SimpleNamespace(run=self._run, list=lambda **kw: [])
+        self.api = SimpleNamespace(
+            exec_create=lambda cid, cmd, **kw: {"Id": " ".join(cmd)},
+            exec_start=lambda eid, stream=True: iter([f"ran {eid}\n".encode()]),
+            exec_inspect=lambda eid: {"ExitCode": 0},
+        )
+
+    def _run(self, image, **kwargs):
+        c = SimpleNamespace(id=f"c{len(self.created)}", name=kwargs.get("name"), status="running",
+                            reload=lambda: None, removed=False)
+        c.remove = lambda force=False: setattr(c, "removed", True)
+        self.created.append(c)
+        return c
+
+
+def test_warm_pool_reuses_and_recycles():
+    client = FakeExecClient()
+    pool = WarmContainerPool(client, {"warm_pool_max_uses": 3})
+    vols = {"/models": {"bind": "/models", "mode": "ro"}}
+
+    for i in range(3):
+        exit_code, out = pool.run("runtime:latest", ["llama-perplexity", f"m{i}"], volumes=vols)
+        assert exit_code == 0 and out == f"ran llama-perplexity m{i}\n"
+    assert pool.stats["cold_starts"] == 1 and pool.stats["warm_hits"] == 2
+    # max_uses reached -> recycled, next run starts a fresh container
+    assert client.created[0].removed
+    pool.run("runtime:latest", ["true"], volumes=vols)
+    # Different volume set -> separate container
+    pool.run("runtime:latest", ["true"], volumes={"/other": {"bind": "/models", "mode": "ro"}})
+    assert len(client.created) == 3
+
+    pool.shutdown()
+    assert all(c.removed for c in client.created)
+
+
+def test_warm_pool_orphan_cleanup_spares_live_owners():
+    import os
+    import socket
+    import time
+    from orchestrator.Core import container_pool as cp
+    from orchestrator.Core.fake_docker import FakeDockerClient as SimDockerClient
+
+    client = SimDockerClient()
+    host, now = socket.gethostname(), time.time()
+
+    def warm(name, **labels):
+        client.containers.run("runtime", name=name, detach=True, labels={cp.LABEL_POOL: "local", **labels})
+
+    def owner(pid, started, created=now, host=host):
+        return {cp.LABEL_OWNER: f"o{pid}", cp.LABEL_OWNER_HOST: host, cp.LABEL_OWNER_PID: str(pid),
+                cp.LABEL_OWNER_STARTED: f"{started:.0f}", cp.LABEL_CREATED: f"{created:.0f}"}
+
+    pool = cp.WarmContainerPool(client, {"warm_pool_max_age": 600})
+    warm("mine", **cp.owner_labels(), **{cp.LABEL_CREATED: f"{now - 9999:.0f}"})
+    warm("live", **owner(os.getpid(), cp.PROCESS_STARTED))  # other instance in a live process
+    warm("remote", **owner(1, 0, host="elsewhere"))
+    warm("remote-old", **owner(1, 0, created=now - 3600, host="elsewhere"))
+    warm("dead", **owner(2 ** 22 + 17, now))
+    warm("legacy")
+
+    removed = pool.cleanup_orphans()
+    left = {c.name for c in client.containers.list(all=True)}
+    assert removed == 3 and left == {"mine", "live", "remote"}
+
+
+def test_model_stager_local_copy_and_reuse(tmp_path):
+    src = tmp_path / "my-model"
+    src.mkdir()
+    (src / "config.json").write_text("{}")
+    (src / "model.safetensors").write_bytes(b"x" * 1024)
+
+    stager = ModelStager(tmp_path / "cache")
+    logs = []
+    staged = stager.stage(str(src), log=logs.append, local_mode="copy")
+    assert staged.kind == "local" and staged.size_bytes == 1026
+    key = Path(staged.host_path).parent.name
+    assert staged.container_path == f"/build-cache/models/local/{key}/my-model"
+    assert (Path(staged.host_path) / "model.safetensors").exists()
+
+    # Another source with the same name gets its own stage, the first one stays intact
+    other = tmp_path / "elsewhere" / "my-model"
+    other.mkdir(parents=True)
+    (other / "config.json").write_text("{}")
+    second = stager.stage(str(other), local_mode="copy")
+    assert Path(second.host_path) != Path(staged.host_path) and Path(second.host_path).name == "my-model"
+    assert (Path(staged.host_path) / "model.safetensors").exists()
+
+    # Unchanged source -> manifest hit, no second copy
+    assert stager.stage(str(src), log=logs.append, local_mode="copy").files == staged.files
+    assert logs[-1].startswith("Model already staged")
+
+    # Unknown source (neither path nor repo id) -> legacy in-container handling
+    assert stager.stage("not a model") is None
+
+
+def test_model_stager_mounts_hf_cache_snapshot_read_only(tmp_path):
+    # HF cache layout: snapshots/<rev>/file -> ../../blobs/<hash>
+    repo = tmp_path / "models--org--tiny"
+    (repo / "blobs").mkdir(parents=True)
+    (repo / "blobs" / "abc").write_bytes(b"w" * 64)
+    snapshot = repo / "snapshots" / "rev1"
+    snapshot.mkdir(parents=True)
+    (snapshot / "model.safetensors").symlink_to("../../blobs/abc")
+
+    staged = ModelStager(tmp_path / "cache").stage(str(snapshot))
+    assert staged.kind == "mount" and staged.size_bytes == 64
+    assert staged.mount_source == str(repo)
+    assert staged.container_path == "/build-cache/source/models--org--tiny/snapshots/rev1"
+    assert staged.volumes() == {str(repo): {"bind": "/build-cache/source/models--org--tiny", "mode": "ro"}}
+    assert not (tmp_path / "cache" / "models" / "local").exists()
+
+
+def test_model_stager_caps_mount_root_and_copies_instead(tmp_path):
+    # A link into an unrelated tree would widen the mount to their common ancestor (e.g. $HOME)
+    blob = tmp_path / "home" / ".cache" / "huggingface" / "blob"
+    blob.parent.mkdir(parents=True)
+    blob.write_bytes(b"w" * 32)
+    src = tmp_path / "home" / "models" / "linked"
+    src.mkdir(parents=True)
+    (src / "model.safetensors").symlink_to(blob)
+
+    logs = []
+    staged = ModelStager(tmp_path / "cache").stage(str(src), log=logs.append)
+    assert staged.kind == "local" and staged.size_bytes == 32
+    assert any("copying instead" in line for line in logs)
+
+    # Configured roots may be mounted as a whole
+    staged = ModelStager(tmp_path / "cache2", mount_roots=[tmp_path / "home"]).stage(str(src))
+    assert staged.kind == "mount" and staged.mount_source == str(tmp_path / "home")
+
+
+def test_model_stager_hf_download_is_locked_pinned_and_named(tmp_path, monkeypatch):
+    import sys
+    import threading
+    import time
+    from types import ModuleType
+
+    downloads, pinned = [], []
+
+    def snapshot_download(repo_id, revision, local_dir, token=None):
+        assert pinned and Path(pinned[0]) == Path(local_dir)  # pinned before any byte is written
+        downloads.append(local_dir)
+        time.sleep(0.1)
+        Path(local_dir).mkdir(parents=True, exist_ok=True)
+        (Path(local_dir) / "config.json").write_text("{}")
+
+    hub = ModuleType("huggingface_hub")
+    hub.snapshot_download = snapshot_download
+    head = {"sha": "abc123"}
+    hub.HfApi = lambda token=None: SimpleNamespace(model_info=lambda repo, revision, files_metadata: SimpleNamespace(
+        sha=head["sha"], siblings=[SimpleNamespace(rfilename="config.json", size=2, lfs=None)]))
+    monkeypatch.setitem(sys.modules, "huggingface_hub", hub)
+
+    stager = ModelStager(tmp_path / "cache")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(stager.stage("org/tiny-llm", pin=pinned.append)))
+               for _ in range(2)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+
+    assert len(downloads) == 1 and len(results) == 2
+    assert all(r.files == results[0].files for r in results)
+    # Modules derive MODEL_NAME via basename(MODEL_SOURCE)
+    assert results[0].container_path == "/build-cache/models/org--tiny-llm@main/tiny-llm"
+    assert Path(results[0].host_path).name == "tiny-llm"
+
+    # Same commit: reused. Branch moved: re-resolved and downloaded again
+    assert stager.stage("org/tiny-llm").revision == "abc123" and len(downloads) == 1
+    head["sha"] = "def456"
+    assert stager.stage("org/tiny-llm").revision == "def456" and len(downloads) == 2
+
+
+def test_cache_warm_plan(tmp_path):
+    target = tmp_path / "targets" / "Board"
+    target.mkdir(parents=True)
+    (target / "target.yml").write_text("tools:\n  - name: mytool\n    url: https://example.com/mytool\n")
+
+    config = {
+        "image_trivy": "aquasec/trivy:latest",
+        "source_repositories": {"core.llama_cpp": {"url": "https://github.com/ggerganov/llama.cpp"},
+                                "tiny_models": {"url": "https://huggingface.co/x/y"}},
+    }
+    engine = SimpleNamespace(config=config, cache_dir=tmp_path / "cache", targets_dir=tmp_path / "targets",
+                             base_dir=tmp_path, docker_client=None)
+    warmer = CacheWarmer(engine)
+    tasks = warmer.plan()
+    assert [(t.kind, t.name) for t in tasks] == [
+        ("image", "trivy"), ("target_image", "Board"), ("git", "llama_cpp"), ("tool", "mytool")]
+
+    # Without Docker the image tasks fail, other kinds are unaffected
+    warmer.warm([tasks[0]])
+    assert tasks[0].status == "failed" and "Docker" in tasks[0].error
+
+
+def test_cache_warm_pulls_digest_and_registry_refs():
+    from docker.errors import ImageNotFound
+    from orchestrator.Core.cache_warmer import WarmTask
+    pulls = []
+
+    def get(ref): raise ImageNotFound(ref)
+
+    def pull(repo, tag=None):
+        pulls.append((repo, tag))
+        return SimpleNamespace(attrs={"Size": 42})
+
+    client = SimpleNamespace(images=SimpleNamespace(get=get, pull=pull))
+    engine = SimpleNamespace(config={}, cache_dir=Path("cache"), targets_dir=Path("targets"), docker_client=client)
+    warmer = CacheWarmer(engine)
+    for ref in ("aquasec/trivy@sha256:" + "a" * 64, "registry:5000/org/img:1.2", "debian"):
+        task = WarmTask("image", "img", ref)
+        warmer._pull_image(task)
+        assert task.size_bytes == 42
+    assert pulls == [("aquasec/trivy", "sha256:" + "a" * 64), ("registry:5000/org/img", "1.2"), ("debian", "latest")]
+
+
+def test_cache_gc_lru_respects_pins_and_quota(tmp_path):
+    import os
+    cache = tmp_path / "cache"
+    models = cache / "models"
+    for i, name in enumerate(["old", "mid", "new"]):
+        d = models / name
+        d.mkdir(parents=True)
+        (d / "w.bin").write_bytes(b"x" * 1024 * 1024)
+        os.utime(d, (1000 + i, 1000 + i))
+    (models / ".old.staged.json").write_text("{}")
+
+    manager = CacheManager(cache, {"cache_quotas": {"models": 1.5 / 1024}})  # 1.5 MB
+    manager.pin("models", "old", "build-1")
+    manager.touch("models", "new")
+
+    preview = manager.collect(["models"], dry_run=True)
+    assert [e["name"] for e in preview["evicted"]] == ["mid", "new"]
+    assert (models / "mid").exists()
+
+    # After unpinning, the least recently used entry ('old') goes first
+    manager.unpin("build-1")
+    report = manager.collect(["models"])
+    assert [e["name"] for e in report["evicted"]] == ["old", "mid"]
+    assert not (models / ".old.staged.json").exists()
+    assert (models / "new").exists()
+    assert manager.entry_for_path(models / "local" / "x" / "file") == ("models", "local/x")
+
+
+def _pin_many(cache, worker, count):
+    manager = CacheManager(cache)
+    for i in range(count):
+        manager.pin("models", f"m{i % 3}", f"{worker}-{i}")
+
+
+def test_cache_index_pins_survive_concurrent_processes(tmp_path):
+    import multiprocessing
+    cache = tmp_path / "cache"
+    ctx = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+    procs = [ctx.Process(target=_pin_many, args=(cache, f"p{w}", 25)) for w in range(4)]
+    for p in procs: p.start()
+    for p in procs: p.join(60)
+
+    pins = CacheManager(cache)._load()["pins"]
+    assert sum(len(owners) for owners in pins.values()) == 100
+
+
+def test_disk_estimate_from_safetensors_and_reservations(tmp_path):
+    import json, shutil, struct
+    model = tmp_path / "model"
+    model.mkdir()
+    header = json.dumps({"w": {"dtype": "BF16", "shape": [1000, 1000], "data_offsets": [0, 2000000]}}).encode()
+    (model / "model.safetensors").write_bytes(struct.pack("<Q", len(header)) + header + b"\0" * 2000000)
+
+    est = DiskSpaceEstimator().estimate(str(model), "Q4_K_M", safety_margin=1.0)
+    assert est.basis == "safetensors" and est.params == 1000000
+    assert est.f16_bytes == 2000000 and est.quant_bytes == int(1000000 * 4.85 / 8)
+    assert est.download_bytes == 0
+
+    free = shutil.disk_usage(tmp_path).free
+    ledger = DiskReservationManager(min_free_gb=0)
+    ledger.reserve("a", {tmp_path / "builds": free // 2, tmp_path / "out": free // 4})
+    # Same filesystem: the second job only sees what is left after 'a'
+    with pytest.raises(InsufficientDiskSpaceError):
+        ledger.reserve("b", {tmp_path: free // 2})
+    assert "b" not in [r["build_id"] for r in ledger.get_status()]
+    ledger.release("a")
+    ledger.reserve("b", {tmp_path: free // 2})
+
+
+def test_build_history_indexed_queries(tmp_path):
+    from datetime import datetime
+    from orchestrator.Core.builder import BuildConfiguration, BuildProgress, BuildStatus, ModelFormat
+
+    store = BuildHistoryStore(tmp_path / "history.db")
+    for i in range(30):
+        cfg = BuildConfiguration(build_id=f"b{i:03d}", timestamp="", model_source=f"org/m{i % 3}",
+                                 target_arch="Rockchip" if i % 2 else "NVIDIA", target_format=ModelFormat.GGUF,
+                                 output_dir=str(tmp_path / "out"), quantization="Q4_K_M", request_id="req_1")
+        prog = BuildProgress(cfg.build_id, BuildStatus.QUEUED, "Initializing", start_time=datetime.fromtimestamp(1000 + i))
+        store.record(BuildRecord.from_build(cfg, prog))
+        prog.enter_stage("Building Image")
+        prog.close_stage()
+        prog.status = BuildStatus.COMPLETED if i % 5 else BuildStatus.FAILED
+        prog.end_time = datetime.fromtimestamp(1100 + i)
+        prog.artifacts.append(str(tmp_path / f"b{i}.zip"))
+        store.record(BuildRecord.from_build(cfg, prog))  # upsert
+
+    assert store.count() == 30
+    assert store.count(target="Rockchip", status="failed") == 3
+    newest = store.query(limit=2, model="org/m0")
+    assert [r.build_id for r in newest] == ["b027", "b024"] and newest[0].duration_s == 100.0
+    assert "Building Image" in newest[0].stage_timings and newest[0].config["target_format"] == "gguf"
+    assert store.count(since=datetime.fromtimestamp(1020), until=datetime.fromtimestamp(1025)) == 5
+    assert store.status_counts() == {"completed": 24, "failed": 6}
+    assert len(store.list_artifacts(limit=100, target="NVIDIA")) == 12
+    store.close()
+
+    # A second process sees the same history
+    assert BuildHistoryStore(tmp_path / "history.db").get("b001").status == "completed"
+
+
+def test_cost_model_learns_size_scaling_and_schedules_sjf():
+    gb = 1024 ** 3
+    records = [BuildRecord(build_id=f"b{i}", target="Rockchip", quantization="Q4_K_M", worker="local",
+                           status="completed", model_size_bytes=size * gb,
+                           stage_timings={"Building Image": 100.0, "Running modules": 50.0 + 60.0 * size})
+               for i, size in enumerate([1, 2, 4, 7])]
+    model = StageCostModel(min_samples=2)
+    model.fit(records)
+
+    est = model.predict("Rockchip", "q4_k_m", model_size_bytes=13 * gb)
+    assert list(est.stages) == ["Building Image", "Running modules"]
+    assert est.stages["Running modules"] == pytest.approx(50 + 60 * 13, rel=0.01)
+    assert est.samples == 4
+    # Unknown host falls back to (target, quant); unknown target to the global level
+    assert model.predict("Rockchip", "Q4_K_M", host="gpu-1", model_size_bytes=gb).total == pytest.approx(210, rel=0.01)
+    assert model.predict("NVIDIA").stages["Building Image"] == 100.0
+
+    assert model.remaining(est, "Running modules", 100.0) == pytest.approx(est.stages["Running modules"] - 100, rel=0.01)
+
+    # Two slots, one busy for 50s: shortest jobs first
+    finish = model.schedule({"long": 300.0, "short": 10.0, "mid": 60.0}, slots=2, busy_until=[50.0])
+    assert finish == {"short": 10.0, "mid": 70.0, "long": 350.0}
+
+
+def test_trace_roundtrip_and_replay_capacity(tmp_path):
+    traces = [BuildTrace(build_id=f"b{i}", submitted_at=1000.0 + 60 * i, target="Rockchip", model=f"org/m{i}",
+                         quantization="Q4_K_M", request_id=f"r{i}",
+                         stage_timings={"Building Image": 300.0, "Running modules": 600.0})
+              for i in range(6)]
+    TraceRecorder.save(traces, tmp_path / "trace.jsonl")
+    loaded = TraceRecorder.load(tmp_path / "trace.jsonl")
+    assert [t.build_id for t in loaded] == [t.build_id for t in traces]
+    assert loaded[0].duration_s == 900.0
+
+    sim = ReplaySimulator(loaded, speedup=20000, timeout=30)
+    one, two = sim.compare([{"capacity": 1}, {"capacity": 2}])
+    assert one.builds == two.builds == 6 and one.failed == 0
+    assert two.throughput_per_h > one.throughput_per_h
+    assert two.queue_p90_s < one.queue_p90_s
+
+
+def test_load_harness_runs_real_engine_on_fake_docker():
+    report = LoadHarness(LoadProfile(requests=40, quantizations=2, capacity=4, build_seconds=0.01,
+                                     log_lines=50, timeout=60)).run()
+    assert not report.timed_out
+    assert report.builds == 80 and report.completed == 80 and report.failed == 0
+    # start + die per build container reached the event monitor path
+    assert report.events >= 160
+    assert report.cpu_ms_per_job > 0 and report.dispatch_p99_ms >= report.dispatch_p50_ms
+    assert report.check(LoadThresholds(max_dispatch_p99_ms=60_000, max_overhead_p99_ms=60_000,
+                                       max_cpu_ms_per_job=10_000, max_mem_kb_per_job=1e9)) == []
+    assert any("cpu_ms_per_job" in v for v in report.check(LoadThresholds(max_cpu_ms_per_job=0.0)))
+
+
+def test_split_gguf_manifest_roundtrip_and_incomplete_set(tmp_path):
+    out = tmp_path / "output"
+    out.mkdir()
+    for i, size in enumerate((300, 200, 100), start=1):
+        (out / f"model-q4_k_m-{i:05d}-of-00003.gguf").write_bytes(b"\1" * size)
+    (out / "model-f16.gguf").write_bytes(b"\0")   # not split -> no manifest
+
+    written = write_manifests(out, quantization="Q4_K_M")
+    assert [p.name for p in written] == ["model-q4_k_m.gguf-split.json"]
+    manifest = SplitManifest.load(written[0])
+    assert manifest.count == 3 and manifest.total_bytes == 600 and manifest.quantization == "Q4_K_M"
+    assert manifest.entry == "model-q4_k_m-00001-of-00003.gguf"
+    assert manifest.verify(out, check_hash=True) == []
+
+    files = split_set_files(out / "model-q4_k_m-00002-of-00003.gguf")
+    assert files[0] == written[0] and len(files) == 4
+    assert split_set_files(out / "model-f16.gguf") == [out / "model-f16.gguf"]
+
+    (out / "model-q4_k_m-00003-of-00003.gguf").write_bytes(b"\2" * 100)
+    assert any("checksum" in p for p in manifest.verify(out, check_hash=True))
+    (out / "model-q4_k_m-00003-of-00003.gguf").unlink()
+    assert any("missing" in p for p in manifest.verify(out))
+    with pytest.raises(ValueError, match=r"missing shard\(s\) \[3\]"):
+        write_manifests(out)
+
+
+    # Shared output dir: another build's (still incomplete) set is not touched
+    ours = [out / f"other-q8_0-{i:05d}-of-00002.gguf" for i in (1, 2)]
+    for p in ours: p.write_bytes(b"\3" * 10)
+    written = write_manifests(out, files=ours)
+    assert [p.name for p in written] == ["other-q8_0.gguf-split.json"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
+
+
+def _fake_engine(tmp_path, **client_kwargs):
+    """Real BuildEngine against the in-process FakeDockerClient (one build slot)."""
+    from orchestrator.Core.builder import BuildEngine
+    from orchestrator.Core.fake_docker import FakeDockerClient as SimDockerClient
+    from orchestrator.Core.replay_simulator import SimConfig
+
+    target = tmp_path / "targets" / "Sim"
+    (target / "modules").mkdir(parents=True)
+    (target / "Dockerfile").write_text("FROM debian:bookworm-slim\n", encoding="utf-8")
+    (target / "modules" / "build.sh").write_text("#!/bin/sh\n", encoding="utf-8")
+    model = tmp_path / "models" / "tiny-model"
+    model.mkdir(parents=True)
+    (model / "config.json").write_text("{}", encoding="utf-8")
+    config = SimConfig(
+        targets_dir=str(tmp_path / "targets"), output_dir=str(tmp_path / "output"),
+        cache_dir=str(tmp_path / "cache"), logs_dir=str(tmp_path / "logs"), models_dir=str(tmp_path / "models"),
+        model_prefetch=False, disk_preflight=False, stats_interval=0.05,
+    )
+    client = SimDockerClient(build_seconds=0.05, log_lines=10, **client_kwargs)
+    return BuildEngine(config, max_concurrent_builds=1, docker_client=client), client, model
+
+
+def _fake_build_config(model, tmp_path, build_id="b1"):
+    from orchestrator.Core.builder import BuildConfiguration, ModelFormat
+    return BuildConfiguration(build_id=build_id, timestamp="now", model_source=str(model), target_arch="Sim",
+                              target_format=ModelFormat.GGUF, output_dir=str(tmp_path / "output" / build_id),
+                              quantization="Q4_K_M", enable_hadolint=False)
+
+
+def _await_build(engine, build_id, timeout=20.0):
+    import threading
+    done = threading.Event()
+    engine.add_completion_listener(build_id, lambda p: done.set())
+    assert done.wait(timeout), "build did not finish"
+    return engine.get_build_status(build_id)
+
+
+def test_oom_event_with_exit_zero_does_not_fail_the_build(tmp_path):
+    from orchestrator.Core.builder import BuildStatus
+    engine, client, model = _fake_engine(tmp_path, oom_event=True, exit_code=0)
+    try:
+        progress = _await_build(engine, engine.build_model(_fake_build_config(model, tmp_path)))
+        assert progress.status == BuildStatus.COMPLETED, progress.errors
+        assert any("OOM-killed" in w for w in progress.warnings)
+    finally:
+        engine.shutdown()
+        client.close()
+
+    engine, client, model = _fake_engine(tmp_path / "oom", oom_event=True, exit_code=137)
+    try:
+        progress = _await_build(engine, engine.build_model(_fake_build_config(model, tmp_path / "oom")))
+        assert progress.status == BuildStatus.OOM_KILLED
+    finally:
+        engine.shutdown()
+        client.close()
+
+
+def test_stale_git_mirror_is_refreshed_or_bypassed(tmp_path):
+    import os
+    import shutil
+    import subprocess
+    import time
+    from orchestrator.Core.builder import BuildProgress
+    from orchestrator.Core.cache_warmer import git_mirror_path, git_mirror_fetched_at, update_git_mirror
+
+    if not shutil.which("git"): pytest.skip("git not installed")
+    upstream = tmp_path / "upstream"
+    git = ["git", "-C", str(upstream), "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run(["git", "init", "-q", str(upstream)], check=True)
+    subprocess.run(git + ["commit", "-q", "--allow-empty", "-m", "init"], check=True)
+
+    engine, client, _ = _fake_engine(tmp_path / "tree")
+    try:
+        mirror = git_mirror_path(engine.cache_dir, "llama_cpp")
+        update_git_mirror(mirror, str(upstream))
+        progress = BuildProgress(build_id="b1", status=None, current_stage="", progress_percent=0)
+
+        assert engine._fresh_git_mirror("llama_cpp", str(upstream), progress) == mirror
+        assert "fetched 0.0h ago" in progress.logs[-1]
+
+        # Two days old -> refreshed from upstream before use
+        stamp = mirror.parent / f".{mirror.name}.fetched"
+        stamp.write_text(str(time.time() - 48 * 3600))
+        assert engine._fresh_git_mirror("llama_cpp", str(upstream), progress) == mirror
+        assert time.time() - git_mirror_fetched_at(mirror) < 60
+
+        # Stale and upstream unreachable -> build falls back to the upstream URL
+        os.rename(upstream, tmp_path / "moved")
+        stamp.write_text(str(time.time() - 48 * 3600))
+        assert engine._fresh_git_mirror("llama_cpp", str(upstream), progress) is None
+        assert any("refresh failed" in w for w in progress.warnings)
+    finally:
+        engine.shutdown()
+        client.close()
+
+
+def test_failed_preflight_releases_slot_and_disk_reservation(tmp_path, monkeypatch):
+    import threading
+    engine, client, model = _fake_engine(tmp_path)
+    try:
+        engine.config["disk_preflight"] = True
+        engine.disk_reservations.min_free = 0
+        monkeypatch.setattr(engine, "_disk_requirements", lambda config, client: {tmp_path: 1024})
+        caller = threading.get_ident()
+        seen = []
+
+        def broken_prediction(config, host=None):
+            seen.append(threading.get_ident())
+            assert engine.disk_reservations.get_status() and engine.worker_pool.total_capacity == 1
+            raise ValueError("history store unavailable")
+
+        monkeypatch.setattr(engine, "predict_build", broken_prediction)
+        # Preflight runs on the build thread: the caller gets the id back immediately
+        progress = _await_build(engine, engine.build_model(_fake_build_config(model, tmp_path, "b1")))
+        assert seen and caller not in seen
+        assert progress.status.value == "failed" and any("history store" in e for e in progress.errors)
+        assert engine.disk_reservations.get_status() == []
+
+        # The single slot is free again: the next build runs to completion
+        monkeypatch.undo()
+        engine.config["disk_preflight"] = False
+        progress = _await_build(engine, engine.build_model(_fake_build_config(model, tmp_path, "b2")))
+        assert progress.status.value == "completed"
+    finally:
+        engine.shutdown()
+        client.close()
+
+
+def test_disk_ledger_only_counts_unwritten_reservations(tmp_path, monkeypatch):
+    from collections import namedtuple
+    from orchestrator.Core import disk_planner
+    Usage = namedtuple("Usage", "total used free")
+    GB_T = 1024 ** 3
+    disk = {"used": 0}
+    monkeypatch.setattr(disk_planner.shutil, "disk_usage",
+                        lambda p: Usage(100 * GB_T, disk["used"], 100 * GB_T - disk["used"]))
+
+    ledger = DiskReservationManager(min_free_gb=0)
+    ledger.reserve("a", {tmp_path / "builds": 60 * GB_T})
+    assert ledger.available(tmp_path) == 40 * GB_T
+    # 'a' wrote 50 of its 60 GB: free shrank by 50, only 10 GB are still promised
+    disk["used"] = 50 * GB_T
+    assert ledger.available(tmp_path) == 40 * GB_T
+    ledger.reserve("b", {tmp_path: 30 * GB_T})
+    disk["used"] = 70 * GB_T  # 'a' done (+10), 'b' wrote 10
+    assert ledger.available(tmp_path) == 10 * GB_T
+
+    # 'a' finished: its 60 GB stay used, 'b' gets no credit for them (nor for its own 10 GB so far)
+    ledger.release("a")
+    assert ledger.available(tmp_path) == 0
+    disk["used"] = 80 * GB_T  # 'b' wrote 10 more
+    assert ledger.available(tmp_path) == 0
+    ledger.release("b")
+    assert ledger.available(tmp_path) == 20 * GB_T
+
+
+def test_sharding_only_injected_for_targets_that_handle_it(tmp_path):
+    from orchestrator.Core.builder import BuildEngine, BuildProgress
+    repo_targets = Path(__file__).parent.parent / "targets"
+    assert BuildEngine._supports_sharding(repo_targets / "Rockchip")
+    assert BuildEngine._supports_sharding(repo_targets / "_template")
+
+    engine, client, model = _fake_engine(tmp_path)
+    try:
+        config = _fake_build_config(model, tmp_path)
+        config.shard_mode = "on"
+        target = engine.targets_dir / "Sim"
+        progress = BuildProgress(build_id="b1", status=None, current_stage="")
+        env = {}
+        engine._inject_sharding(config, env, progress, target)
+        assert "SHARDED_BUILD" not in env and any("SHARDED_BUILD" in w for w in progress.warnings)
+
+        (target / "modules" / "build.sh").write_text('#!/bin/sh\n[ "$SHARDED_BUILD" = 1 ] && echo split\n')
+        engine._inject_sharding(config, env, progress, target)
+        assert env["SHARDED_BUILD"] == "1" and env["SPLIT_MAX_SIZE"].endswith("G")
+    finally:
+        engine.shutdown()
+        client.close()
+
+
+def test_completion_listener_fires_when_finalization_steps_fail(tmp_path, monkeypatch):
+    engine, client, model = _fake_engine(tmp_path)
+    try:
+        def locked(*args, **kwargs):
+            raise RuntimeError("database is locked")
+
+        monkeypatch.setattr(engine.history, "record", locked)
+        monkeypatch.setattr(engine.cache_manager, "unpin", locked)
+        progress = _await_build(engine, engine.build_model(_fake_build_config(model, tmp_path)))
+        assert progress.status.value == "completed" and progress.eta_seconds == 0.0
+
+        # Registered after the build finished: fired immediately
+        late = []
+        engine.add_completion_listener(progress.build_id, late.append)
+        assert late == [progress]
+    finally:
+        engine.shutdown()
+        client.close()
+
+
+def test_local_model_is_mounted_without_prefetch(tmp_path):
+    from orchestrator.Core.builder import BuildProgress
+    engine, client, model = _fake_engine(tmp_path)
+    try:
+        config = _fake_build_config(model, tmp_path)
+        progress = BuildProgress(build_id="b1", status=None, current_stage="")
+        assert engine._get_conf("model_prefetch") is False
+        engine._await_model_prefetch(config, progress, engine._start_model_prefetch(config, progress))
+        assert engine._model_source_env(config) == "/build-cache/source/tiny-model"
+        assert engine._model_volumes(config) == {str(model.resolve()): {"bind": "/build-cache/source/tiny-model", "mode": "ro"}}
+    finally:
+        engine.shutdown()
+        client.close()
+
+
+def test_shard_mode_config_and_golden_zip_follow_this_build(tmp_path):
+    from orchestrator.Core.builder import BuildProgress
+    engine, client, model = _fake_engine(tmp_path)
+    try:
+        config = _fake_build_config(model, tmp_path)
+        assert config.shard_mode is None and engine._shard_size_gb(config) is None
+        engine.config["shard_mode"] = "on"
+        assert engine._shard_size_gb(config) == 8.0
+
+        # A manifest of an earlier sharded build in the shared output dir does not suppress the ZIP
+        out = Path(config.output_dir)
+        out.mkdir(parents=True)
+        (out / "old-q4_k_m.gguf-split.json").write_text("{}")
+        (out / "model-q4_k_m.gguf").write_bytes(b"\1" * 16)
+        progress = BuildProgress(build_id="b1", status=None, current_stage="")
+        progress.artifacts.append(str(out / "model-q4_k_m.gguf"))
+        engine._create_golden_artifact(config, progress)
+        assert progress.artifacts[-1].endswith(".zip") and Path(progress.artifacts[-1]).exists()
+    finally:
+        engine.shutdown()
+        client.close()
+
+
+def test_log_listener_streams_backlog_then_new_lines_until_completion(tmp_path):
+    from orchestrator.Core.builder import BuildProgress, BuildStatus
+    engine, client, model = _fake_engine(tmp_path)
+    try:
+        assert engine.add_log_listener("missing", print) is False
+        progress = BuildProgress(build_id="b1", status=None, current_stage="")
+        progress.add_log("queued")
+        engine._builds["b1"] = progress
+        lines = []
+        assert engine.add_log_listener("b1", lines.append)
+        progress.add_log("building")
+        assert [line.rsplit("] ", 1)[-1] for line in lines] == ["queued", "building"]
+
+        progress.status = BuildStatus.COMPLETED
+        engine._notify_completion(progress)
+        progress.add_log("after completion")
+        assert len(lines) == 2 and len(progress.logs) == 3
+    finally:
+        engine.shutdown()
+        client.close()
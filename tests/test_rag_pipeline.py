@@ -0,0 +1,622 @@
+#!/usr/bin/env python3
+"""
+Unit Tests für die RAG-Pipeline (Embeddings, Caches, Indizes, Chunking).
+DIREKTIVE: Keine echten Embedding-APIs oder Qdrant-Server, alle Backends sind Fakes.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from orchestrator.Core.embedding_pipeline import EmbeddingBatcher, EmbeddingStats
+from orchestrator.Core.embedding_cache import EmbeddingCache
+from orchestrator.Core.ingest_manifest import IngestManifest, point_id
+from orchestrator.Core.embedding_backends import HashingBackend, create_backend
+from orchestrator.Core.qdrant_connection import CircuitBreaker, QdrantConnection, is_connection_error
+from orchestrator.Core.query_cache import QueryCache
+from orchestrator.Core.hybrid_retrieval import BM25Index, rrf_fuse, tokenize
+from orchestrator.Core.chunkers import chunk_document, split_shell, split_yaml
+
+
+class FlakyEmbedder:
+    """Batch embedder: deterministic 3-d vectors, fails the first 'fail_first' calls."""
+    def __init__(self, fail_first: int = 0):
+        self.fail_first = fail_first
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, texts):
+        with self._lock:
+            self.calls.append(list(texts))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            fail = len(self.calls) <= self.fail_first
+        try:
+            if fail:
+                raise TimeoutError("rate limited")
+            return [[float(len(t)), 1.0, 0.0] for t in texts]
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_embedding_batcher_batches_by_count_and_tokens_with_retry():
+    texts = [f"chunk {i} " + "x" * (40 * (i % 3)) for i in range(50)]
+    embedder = FlakyEmbedder(fail_first=2)
+    sleeps = []
+    batcher = EmbeddingBatcher(embedder, max_batch_size=8, max_batch_tokens=60, max_concurrency=4,
+                               max_retries=3, sleep=sleeps.append)
+
+    plan = batcher.plan_batches(texts)
+    assert [i for b in plan for i in b] == list(range(50))
+    assert all(len(b) <= 8 for b in plan)
+
+    stats = EmbeddingStats()
+    vectors = batcher.embed(texts, stats)
+    assert [v[0] for v in vectors] == [float(len(t)) for t in texts]
+    assert stats.embedded == 50 and stats.failed == 0 and stats.batches == len(plan)
+    assert stats.retries == 2 and len(sleeps) == 2
+    assert len(embedder.calls) == len(plan) + 2 < len(texts)
+    assert embedder.max_in_flight <= 4
+
+    # Permanent failure: positions stay None, the run does not raise
+    broken = EmbeddingBatcher(FlakyEmbedder(fail_first=10 ** 6), max_retries=1, sleep=lambda s: None)
+    stats = EmbeddingStats()
+    assert broken.embed(["a", "b"], stats) == [None, None]
+    assert stats.failed == 2 and stats.chunks_per_s == 0.0
+
+
+def test_embedding_cache_hits_normalized_text_and_evicts_lru(tmp_path):
+    cache = EmbeddingCache(tmp_path / "emb.db", max_bytes=12 * (64 * 4 + 96))
+    vec = [0.25] * 64
+    cache.put_many("m1", [f"text {i}" for i in range(5)], [vec] * 5)
+
+    # Whitespace-normalized key, float32 roundtrip, model is part of the key
+    assert cache.get("m1", "  text\n 0 ") == vec
+    assert cache.get("m2", "text 0") is None
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+    cache.get_many("m1", ["text 1", "text 2"])      # refresh -> most recently used
+    cache.put_many("m1", [f"new {i}" for i in range(8)], [vec] * 8)
+    assert cache.stats.evictions > 0 and cache.stats.bytes <= cache.max_bytes
+    assert cache.get("m1", "text 1") == vec and cache.get("m1", "text 3") is None
+
+    # Persistent: a second instance sees the same entries and byte count
+    cache.close()
+    reopened = EmbeddingCache(tmp_path / "emb.db", max_bytes=cache.max_bytes)
+    assert reopened.stats.entries == cache.stats.entries and reopened.get("m1", "text 1") == vec
+
+
+def test_ingest_manifest_detects_changes_and_stale_points(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    (root / "a.py").write_text("print('a')\n")
+    (root / "b.md").write_text("# B\n")
+    assert point_id("code:a.py", 0, "x") == point_id("code:a.py", 0, "x") != point_id("code:a.py", 1, "x")
+
+    manifest = IngestManifest.for_root(tmp_path / "manifests", root, "coll")
+    changes = manifest.detect_changes(root, ["a.py", "b.md"])
+    assert sorted(changes.added) == ["a.py", "b.md"] and not changes.unchanged
+    for rel in changes.changed:
+        manifest.update(rel, changes.fingerprints[rel], [point_id(rel, 0, "old"), point_id(rel, 1, "old")])
+    manifest.save()
+
+    # Unchanged tree: nothing to do; a touched file with equal content stays unchanged
+    manifest = IngestManifest.for_root(tmp_path / "manifests", root, "coll")
+    (root / "b.md").write_text("# B\n")
+    changes = manifest.detect_changes(root, ["a.py", "b.md"])
+    assert sorted(changes.unchanged) == ["a.py", "b.md"] and not changes.changed
+
+    # Modified + removed file
+    (root / "a.py").write_text("print('a2')\n")
+    changes = manifest.detect_changes(root, ["a.py"])
+    assert changes.modified == ["a.py"] and changes.removed == ["b.md"]
+    keep = point_id("a.py", 0, "old")
+    assert manifest.stale_points("a.py", [keep, point_id("a.py", 0, "new")]) == [point_id("a.py", 1, "old")]
+    assert len(manifest.remove("b.md")) == 2
+
+    # Another collection (reset / new backend) -> full re-ingest
+    assert IngestManifest.for_root(tmp_path / "manifests", root, "other").files == {}
+
+
+def test_hashing_backend_is_deterministic_normalized_and_selected_offline(tmp_path):
+    backend = HashingBackend(dim=256)
+    a, b, c = backend.embed(["cmake -DGGML_NEON=ON build", "cmake -DGGML_NEON=ON build", "python wheel install"])
+    assert a == b and len(a) == 256
+    assert abs(sum(v * v for v in a) - 1.0) < 1e-9
+    assert sum(x * y for x, y in zip(a, b)) > sum(x * y for x, y in zip(a, c))
+
+    conf = {"rag_embedding_backend": "hashing", "rag_hashing_dim": 128}
+    chosen = create_backend(lambda k, d=None: conf.get(k, d), tmp_path, lambda: "")
+    assert chosen.name == "hashing" and chosen.dim == 128 and chosen.model_id == "hashing-v1-128"
+
+    # Local backend requested but no model in models/tiny_models -> hashing fallback
+    conf = {"rag_embedding_backend": "onnx"}
+    assert create_backend(lambda k, d=None: conf.get(k, d), tmp_path, lambda: "").name == "hashing"
+
+
+def test_auto_backend_prefers_local_model_and_needs_configured_litellm(tmp_path, monkeypatch):
+    from orchestrator.Core import embedding_backends as eb
+    monkeypatch.setattr(eb, "litellm", object())  # installed
+    monkeypatch.delenv("OPENAI_API_BASE", raising=False)
+    auto = lambda conf: eb.create_backend(lambda k, d=None: conf.get(k, d), tmp_path, lambda: conf.get("key", "sk-dummy"))
+
+    # Installed but neither key nor endpoint configured -> offline hashing, no failing API calls
+    assert auto({}).name == "hashing"
+    assert auto({"key": "sk-real"}).name == "litellm"
+    assert auto({"ai_embedding_model": "ollama/nomic-embed-text"}).name == "litellm"
+
+    # A local model in models/tiny_models wins over a configured litellm
+    model = tmp_path / "models" / "tiny_models" / "minilm"
+    model.mkdir(parents=True)
+    (model / "modules.json").write_text("[]")
+    monkeypatch.setattr(eb, "_local_backend", lambda d, threads, batch: HashingBackend(dim=8))
+    assert auto({"key": "sk-real"}).dim == 8
+    assert auto({"key": "sk-real", "rag_embedding_backend": "litellm"}).name == "litellm"
+
+
+def test_litellm_backend_probes_unknown_dimensions(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+    from orchestrator.Core import embedding_backends as eb
+    calls = []
+
+    def embedding(model, input, api_key):
+        calls.append(model)
+        if model == "ollama/offline": raise ConnectionError("ollama not running")
+        return SimpleNamespace(data=[{"index": i, "embedding": [0.0] * 1024} for i in range(len(input))])
+
+    monkeypatch.setattr(eb, "litellm", SimpleNamespace(embedding=embedding))
+    litellm = lambda conf: eb.create_backend(lambda k, d=None: {"rag_embedding_backend": "litellm", **conf}.get(k, d),
+                                             tmp_path, lambda: "sk-real")
+
+    # Tagged known model: no request; unknown model: one probe request
+    assert litellm({"ai_embedding_model": "ollama/nomic-embed-text:latest"}).dim == 768 and calls == []
+    assert litellm({"ai_embedding_model": "ollama/bge-m3"}).dim == 1024 and calls == ["ollama/bge-m3"]
+    assert litellm({"ai_embedding_model": "ollama/bge-m3", "rag_embedding_dim": 512}).dim == 512
+    assert len(calls) == 1
+
+    # Probe fails: never guess a collection size, use the offline backend instead
+    assert litellm({"ai_embedding_model": "ollama/offline"}).name == "hashing"
+
+
+def test_local_vector_store_search_delete_persist_and_sync(tmp_path):
+    pytest.importorskip("numpy")
+    from orchestrator.Core.local_vector_store import LocalVectorStore, LocalPoint
+
+    store = LocalVectorStore(tmp_path / "vectors")
+    store.create_collection("kb", vectors_config=4)
+    points = [LocalPoint(id=f"p{i}", vector=[float(i == j) for j in range(4)], payload={"content": f"c{i}"})
+              for i in range(4)]
+    store.upsert("kb", points + [LocalPoint(id="mix", vector=[1.0, 1.0, 0.0, 0.0], payload={})])
+
+    hits = store.search("kb", query_vector=[2.0, 0.1, 0.0, 0.0], limit=2)
+    assert [h.id for h in hits] == ["p0", "mix"] and hits[0].payload == {"content": "c0"}
+    assert store.search("kb", [0.0, 0.0, 0.0, 1.0], limit=5, score_threshold=0.9)[0].id == "p3"
+
+    # Delete tombstones the row, a re-upsert reuses it; state survives a reopen
+    store.delete("kb", points_selector=["p0"])
+    store.upsert("kb", [LocalPoint(id="p1", vector=[0.0, 1.0, 0.0, 0.0], payload={"content": "new"})])
+    store.close()
+    store = LocalVectorStore(tmp_path / "vectors")
+    assert store.get_collection("kb").points_count == 4
+    assert store.search("kb", [1.0, 0.0, 0.0, 0.0], limit=1)[0].id == "mix"
+    assert store.search("kb", [0.0, 1.0, 0.0, 0.0], limit=1)[0].payload == {"content": "new"}
+
+    # Growth beyond the initial capacity + IVF partitions still find exact matches
+    ivf = LocalVectorStore(tmp_path / "ivf", ivf_lists=8, ivf_min_points=400, nprobe=8)
+    ivf.create_collection("big", vectors_config=16)
+    backend = HashingBackend(dim=16)
+    texts = [f"document {i} topic {i % 37}" for i in range(1500)]
+    ivf.upsert("big", [LocalPoint(id=str(i), vector=v, payload={}) for i, v in enumerate(backend.embed(texts))])
+    assert ivf._get("big").ivf is not None
+    assert ivf.search("big", backend.embed([texts[777]])[0], limit=1)[0].id == "777"
+
+    class Sink:
+        def __init__(self): self.points = []
+        def upsert(self, collection_name, points): self.points.extend(points)
+    sink = Sink()
+    assert store.sync_to(sink, "kb", "remote", batch_size=2) == 4 and len({p.id for p in sink.points}) == 4
+
+
+def _upsert_many(root, worker, count):
+    from orchestrator.Core.local_vector_store import LocalVectorStore, LocalPoint
+    store = LocalVectorStore(root)
+    for i in range(count):
+        vector = [1.0, float(worker), float(i), 1.0]
+        store.upsert("kb", [LocalPoint(id=f"w{worker}-{i}", vector=vector, payload={"worker": worker, "i": i})])
+    store.close()
+
+
+def test_local_vector_store_writers_in_several_processes_do_not_collide(tmp_path):
+    pytest.importorskip("numpy")
+    import multiprocessing
+    from orchestrator.Core.local_vector_store import LocalVectorStore, LocalPoint
+
+    root = tmp_path / "vectors"
+    reader = LocalVectorStore(root)
+    reader.create_collection("kb", vectors_config=4)
+    reader.upsert("kb", [LocalPoint(id="seed", vector=[0.0, 0.0, 0.0, 1.0], payload={})])
+    ctx = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+    procs = [ctx.Process(target=_upsert_many, args=(root, w, 150)) for w in range(3)]
+    for p in procs: p.start()
+    for p in procs: p.join(120)
+
+    # The long-lived instance picks up the other processes' rows (incl. matrix growth)
+    assert reader.get_collection("kb").points_count == 451
+    records, _ = reader.scroll("kb", limit=1000, with_vectors=True)
+    for r in records:
+        if r.id == "seed": continue
+        worker, i = r.payload["worker"], r.payload["i"]
+        assert r.id == f"w{worker}-{i}"
+        expected = [1.0, float(worker), float(i), 1.0]
+        norm = sum(x * x for x in expected) ** 0.5
+        assert r.vector == pytest.approx([x / norm for x in expected], abs=1e-5)
+
+
+def test_rag_snapshots_are_pruned_to_the_configured_count(tmp_path):
+    rag = _local_rag(tmp_path, rag_snapshot_keep=2)
+    rag.ingest_documents([("a.md", "flash the bootloader", {})])
+    names = []
+    for _ in range(4):
+        names.append(rag.create_snapshot())
+        time.sleep(0.01)
+    assert rag.list_snapshots() == names[-2:]
+
+
+def test_qdrant_connection_circuit_breaker_backoff_and_pooling():
+    now = [0.0]
+    attempts = []
+
+    class FakeClient:
+        def __init__(self, url): self.url, self.up = url, True
+        def get_collections(self):
+            attempts.append(self.url)
+            if not (server_up[0] and self.up): raise ConnectionError("refused")
+
+    server_up = [False]
+    built = []
+    def factory(url):
+        built.append(url)
+        return FakeClient(url)
+
+    conn = QdrantConnection(["http://a:6333", "http://b:6333", "http://a:6333"],
+                            breaker=CircuitBreaker(base_delay=2.0, max_delay=8.0, clock=lambda: now[0]),
+                            client_factory=factory)
+    assert conn.get() is None and attempts == ["http://a:6333", "http://b:6333"]
+    assert conn.breaker.state == "open" and conn.breaker.retry_in == 2.0
+
+    # Open circuit: no I/O at all until the backoff elapsed, then exponential backoff up to the cap
+    for _ in range(100): assert conn.get() is None
+    assert len(attempts) == 2
+    for expected in (4.0, 8.0, 8.0):
+        now[0] += conn.breaker.retry_in
+        assert conn.breaker.state == "half_open" and conn.get() is None
+        assert conn.breaker.retry_in == expected
+    assert len(attempts) == 8 and built == ["http://a:6333", "http://b:6333"]  # clients are pooled
+
+    # Background health check reconnects; foreground calls reuse the single client
+    server_up[0] = True
+    now[0] += conn.breaker.retry_in
+    conn.check_once()
+    client = conn.client
+    assert client is not None and conn.get() is client and conn.breaker.state == "closed"
+    assert conn.status()["url"] == "http://a:6333" and conn.status()["transport"] == "http"
+
+    # Health check detects the outage, drops the client and opens the circuit
+    server_up[0] = False
+    conn.check_once()
+    assert conn.client is None and conn.get() is None and conn.breaker.state == "open"
+
+    assert is_connection_error(TimeoutError()) and not is_connection_error(ValueError("404"))
+
+
+def test_query_cache_ttl_lru_and_version_invalidation():
+    now = [0.0]
+    cache = QueryCache(ttl=60, max_entries=2, clock=lambda: now[0])
+    cache.put_embedding("m", "arm64  SDK flags", [0.1, 0.2])
+    assert cache.get_embedding("m", "arm64 SDK flags") == [0.1, 0.2]
+    assert cache.get_embedding("other-model", "arm64 SDK flags") is None
+
+    key = cache.result_key("kb", "arm64 SDK flags", {"type": "internal_code"}, 5, 0.65)
+    assert key != cache.result_key("kb", "arm64 SDK flags", None, 5, 0.65)
+    assert key != cache.result_key("kb", "arm64 SDK flags", {"type": "internal_code"}, 3, 0.65)
+    cache.put_results(key, ["hit"])
+    assert cache.get_results(key) == ["hit"]
+
+    # Collection changed: results go, query embeddings stay; a result computed before the bump is not stored
+    cache.bump()
+    assert cache.get_results(key) is None and cache.get_embedding("m", "arm64 SDK flags") == [0.1, 0.2]
+    cache.put_results(key, ["stale"])
+    new_key = cache.result_key("kb", "arm64 SDK flags", {"type": "internal_code"}, 5, 0.65)
+    assert cache.get_results(new_key) is None
+
+    # TTL expiry and LRU bound
+    cache.put_results(new_key, ["fresh"])
+    now[0] += 61
+    assert cache.get_results(new_key) is None and cache.get_embedding("m", "arm64 SDK flags") is None
+    for q in ("a", "b", "c"): cache.put_embedding("m", q, [1.0])
+    assert cache.get_embedding("m", "a") is None and cache.get_embedding("m", "c") == [1.0]
+    assert cache.stats()["version"] == 1
+
+
+def test_bm25_index_finds_exact_flags_and_rrf_fuses_rankings(tmp_path):
+    tokens = tokenize("cmake -DGGML_NEON=ON; rknn.build failed: E0042.")
+    assert {"-dggml_neon=on", "ggml_neon", "neon", "rknn.build", "rknn", "e0042"} <= set(tokens)
+
+    index = BM25Index(tmp_path / "bm25.db")
+    index.add([
+        ("a", "cmake -DGGML_NEON=ON -DGGML_CUDA=OFF for the RK3588 build", {"source": "a.sh", "type": "code"}),
+        ("b", "Generic notes about building llama.cpp with cmake", {"source": "b.md", "type": "doc"}),
+        ("c", "rknn.build raised E0042: unsupported operator", {"source": "c.log", "type": "log"}),
+    ])
+    assert [doc for doc, _, _ in index.search("-DGGML_NEON=ON", limit=3)] == ["a"]
+    assert index.search("GGML_NEON", limit=1)[0][0] == "a"
+    assert index.search("rknn.build E0042", limit=1)[0][:1] == ("c",)
+    assert [doc for doc, _, _ in index.search("cmake", limit=5, filters={"type": "doc"})] == ["b"]
+
+    # Re-adding replaces, remove/clear keep the statistics consistent; the index is persistent
+    index.add([("a", "completely different text", {})])
+    assert index.search("-DGGML_NEON=ON", limit=3) == [] and index.doc_count == 3
+    index.remove(["c"])
+    index.close()
+    reopened = BM25Index(tmp_path / "bm25.db")
+    assert reopened.doc_count == 2 and reopened.search("E0042") == []
+    reopened.clear()
+    assert reopened.doc_count == 0
+
+    fused = rrf_fuse([["x", "y", "z"], ["z", "w"]], k=60)
+    assert fused[0][0] == "z" and {d for d, _ in fused} == {"x", "y", "z", "w"}
+
+
+PY_SOURCE = """import os
+
+# helper comment
+@staticmethod
+def alpha(x):
+    return x + 1
+
+
+class Builder:
+    \"\"\"Doc.\"\"\"
+    def run(self):
+        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n        step = 1\n"""
+
+
+def test_structure_chunkers_keep_definitions_sections_and_keys_intact(tmp_path):
+    chunks = chunk_document(PY_SOURCE, "tools/build.py", max_tokens=120)
+    alpha = next(c for c in chunks if "def alpha" in c.text)
+    assert "# helper comment\n@staticmethod\ndef alpha(x):\n    return x + 1" in alpha.text
+    assert "alpha" in alpha.label and all(c.label for c in chunks)
+    run_parts = [c for c in chunks if c.label == "Builder.run"]
+    assert len(run_parts) > 1 and all(len(c.text) // 4 <= 120 for c in run_parts)  # oversized -> line windows
+
+    shell = "#!/bin/bash\nset -e\n\n# builds it\nbuild_gguf() {\n  echo a\n}\n\nfunction deploy {\n  echo b\n}\nbuild_gguf\n"
+    segments = [(label, text) for label, text in split_shell(shell, 100) if text.strip()]
+    assert [label for label, _ in segments] == ["script", "build_gguf", "deploy", "script"]
+    assert segments[1][1].startswith("# builds it\nbuild_gguf() {")
+    assert len(chunk_document(shell, "build.sh", max_tokens=100)) == 1  # small neighbours are packed
+
+    md = "# Guide\nintro\n## Flags\n```\n# not a heading\n```\ntext\n## Deploy\nsteps\n"
+    assert [c.label for c in chunk_document(md, "README.md", max_tokens=10)] == \
+        ["Guide", "Guide > Flags", "Guide > Deploy"]
+
+    yml = "# target\nname: rk3588\nflags:\n  - -DGGML_NEON=ON\n- x\n---\nother: 1\n"
+    parts = split_yaml(yml, 100)
+    assert [label for label, _ in parts] == ["name", "flags", "other"] and parts[0][1].startswith("# target")
+    assert "- x\n---\n" in parts[1][1]
+
+    # Unparsable Python and unknown types fall back to character windows
+    assert len(chunk_document("def broken(:\n" * 200, "bad.py", max_tokens=50)) > 1
+    assert chunk_document("x" * 5000, "data.bin", max_tokens=100)[0].label == ""
+
+    # Chunker change -> every file counts as modified, old points stay tracked for deletion
+    root = tmp_path / "repo"
+    root.mkdir()
+    (root / "a.py").write_text(PY_SOURCE)
+    manifest = IngestManifest.for_root(tmp_path / "m", root, "coll", chunker="chars")
+    changes = manifest.detect_changes(root, ["a.py"])
+    manifest.update("a.py", changes.fingerprints["a.py"], ["old-id"])
+    manifest.save()
+    assert not IngestManifest.for_root(tmp_path / "m", root, "coll", chunker="chars").detect_changes(root, ["a.py"]).changed
+    rechunk = IngestManifest.for_root(tmp_path / "m", root, "coll", chunker="structure-v1-512")
+    assert rechunk.rechunk and rechunk.detect_changes(root, ["a.py"]).modified == ["a.py"]
+    assert rechunk.stale_points("a.py", ["new-id"]) == ["old-id"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
+
+
+class FakeIngestTarget:
+    """Minimal RAGManager surface used by IngestPipeline; embedding fails for texts containing 'BROKEN'."""
+    chunker_mode = "structure"
+    chunk_tokens = 64
+
+    def __init__(self):
+        from types import SimpleNamespace
+        self.backend = SimpleNamespace(request_size=4, max_concurrency=1)
+        self.upserts = []
+        self.indexed = 0
+        self.changed = 0
+        self._lock = threading.Lock()
+
+    def embed_texts(self, texts, stats=None):
+        return [None if "BROKEN" in t else [float(len(t)), 1.0] for t in texts]
+
+    def _make_point(self, pid, vector, payload):
+        return (pid, vector, payload)
+
+    def _upsert(self, points, wait=True):
+        with self._lock: self.upserts.append((len(points), wait))
+        return True
+
+    def _index_sparse(self, points):
+        self.indexed += len(points)
+
+    def _collection_changed(self):
+        self.changed += 1
+
+
+def test_ingest_pipeline_streams_files_and_tracks_incomplete(tmp_path):
+    from orchestrator.Core.ingest_pipeline import IngestPipeline, chunk_file, walk_parallel
+
+    for i in range(12):
+        pkg = tmp_path / f"pkg{i % 3}" / "sub"
+        pkg.mkdir(parents=True, exist_ok=True)
+        body = "".join(f"def f{i}_{n}():\n    return {n}\n\n\n" for n in range(8))
+        (pkg / f"mod{i}.py").write_text(body)
+    (tmp_path / "pkg0" / "broken.py").write_text("def bad():\n    return 'BROKEN'\n")
+    (tmp_path / "empty.md").write_text("  \n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "skip.py").write_text("x = 1\n")
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    files = walk_parallel(tmp_path, {"node_modules"}, lambda name: name.endswith((".py", ".md")), workers=4)
+    assert len(files) == 14 and files == sorted(files)
+    assert not any("node_modules" in f for f in files)
+
+    pieces = chunk_file("pkg0/sub/mod0.py", (tmp_path / "pkg0/sub/mod0.py").read_text(), "structure", 64)
+    assert pieces[0][0].startswith("FILE: pkg0/sub/mod0.py :: f0_0")
+    assert chunk_file("empty.md", "  \n", "structure", 64) == []
+
+    target = FakeIngestTarget()
+    pipeline = IngestPipeline(target, read_workers=3, chunk_processes=0, embed_workers=2,
+                              queue_size=2, upsert_batch=5)
+    result = pipeline.run(tmp_path, files, lambda rel: (f"code:{rel}", {"filepath": rel}))
+
+    assert result.incomplete == {"pkg0/broken.py"}
+    assert result.point_ids["empty.md"] == []
+    expected = {rel: [point_id(f"code:{rel}", i, text) for i, (text, _) in
+                      enumerate(chunk_file(rel, (tmp_path / rel).read_text(), "structure", 64))]
+                for rel in files if rel != "pkg0/broken.py"}
+    assert result.point_ids == expected
+    assert result.chunks == sum(len(ids) for ids in expected.values()) == target.indexed
+    assert result.failed_chunks == 1
+    # Size-bounded, non-blocking upserts; one version bump for the whole run
+    assert all(n <= 5 and wait is False for n, wait in target.upserts)
+    assert target.changed == 1
+    assert {"read", "chunk", "embed", "upsert", "sparse"} <= set(result.stages)
+    assert result.stages["read"]["items"] == 14 and result.stages["chunk"]["chunks"] == result.chunks + 1
+
+
+def _local_rag(tmp_path, **conf):
+    """RAGManager on the embedded vector store with the offline hashing backend."""
+    pytest.importorskip("numpy")
+    from types import SimpleNamespace
+    from orchestrator.Core.rag_manager import RAGManager
+    config = {"rag_embedding_backend": "hashing", "rag_hybrid": True, **conf}
+    return RAGManager(SimpleNamespace(info=SimpleNamespace(installation_path=str(tmp_path)), config=config))
+
+
+def test_reingest_replaces_chunks_of_the_same_source(tmp_path):
+    rag = _local_rag(tmp_path)
+    old = "\n\n".join(f"## Step {i}\nflash the legacy bootloader variant {i} " * 20 for i in range(6))
+    first = rag.ingest_documents([("guide.md", old, {}), ("other.md", "unrelated notes about quantization", {})])
+    assert first["chunks"] > 2 and first["replaced"] == 0
+
+    second = rag.ingest_documents([("guide.md", "## Setup\nuse the new SPI flashing tool", {})], replace_sources=True)
+    assert second["replaced"] == first["chunks"] - 1
+    sources = {}
+    records, _ = rag.client.scroll(rag.collection_name, limit=100)
+    for r in records: sources.setdefault(r.payload["source"], []).append(r.payload["content"])
+    assert sources["guide.md"] == ["## Setup\nuse the new SPI flashing tool"]
+    assert len(sources["other.md"]) == 1
+    assert not [h for h in rag.sparse_index.search("legacy bootloader", 5)]
+
+
+def test_exported_chunks_reimport_without_second_header_or_duplicate(tmp_path):
+    rag = _local_rag(tmp_path)
+    code = "def foo():\n    return 1\n\n\ndef bar():\n    return 2\n"
+    rag.ingest_documents([("code:a.py", code, {"type": "internal_code", "filepath": "a.py"})])
+    records, _ = rag.client.scroll(rag.collection_name, limit=100)
+    exported = [(r.payload["source"], r.payload["content"],
+                 {k: v for k, v in r.payload.items() if k not in ("content", "source")}) for r in records]
+
+    rag.ingest_documents(exported)
+    again, _ = rag.client.scroll(rag.collection_name, limit=100)
+    assert sorted(str(r.id) for r in again) == sorted(str(r.id) for r in records)
+    assert all(r.payload["content"].count("FILE: a.py") == 1 for r in again)
+
+def test_pack_import_never_replaces_chunks_it_does_not_own(tmp_path):
+    rag = _local_rag(tmp_path)
+    code = {"type": "internal_code", "filepath": "pkg/a.py"}
+    rag.ingest_documents([("code:pkg/a.py", "def flash():\n    return 'spi'", code)], replace_sources=True)
+
+    # Swarm packs reuse sources (or none at all): plain bulk ingest only adds
+    pack = rag.ingest_documents([("code:pkg/a.py", "community notes on flashing", {"origin_pack": "p1.json"}),
+                                 ("", "sourceless tip one", {"origin_pack": "p1.json"})])
+    assert pack["replaced"] == 0
+    other = rag.ingest_documents([("", "sourceless tip two", {"origin_pack": "p2.json"})])
+    assert other["replaced"] == 0
+
+    # Opt-in replacement is limited to the same type/pack
+    again = rag.ingest_documents([("code:pkg/a.py", "updated community notes", {"origin_pack": "p1.json"})],
+                                 replace_sources=True)
+    assert again["replaced"] == 1
+    records, _ = rag.client.scroll(rag.collection_name, limit=100)
+    contents = sorted(r.payload["content"] for r in records)
+    assert len([c for c in contents if "def flash" in c]) == 1
+    assert "community notes on flashing" not in contents and "updated community notes" in contents
+    assert "sourceless tip one" in contents and "sourceless tip two" in contents
+
+
+def test_hybrid_search_drops_irrelevant_sparse_hits_and_keeps_cosine(tmp_path):
+    rag = _local_rag(tmp_path)
+    rag.ingest_documents([
+        ("build.sh", "cmake -B build -DGGML_NEON=ON -DCMAKE_BUILD_TYPE=Release\nhow the toolchain is a cross build", {}),
+        ("convert.py", "def convert(model):\n    # do a quantization pass, I think q4_k_m is a good default\n    return model", {}),
+        ("README.md", "## Flashing\nhow do I flash a board with the rknn toolkit", {}),
+    ])
+
+    # Only filler words overlap: no dense hit above the threshold, no strong BM25 hit
+    assert rag.search("how do I bake a chocolate cake", limit=3, score_threshold=0.65) == []
+
+    hits = rag.search("-DGGML_NEON=ON", limit=3, score_threshold=0.65)
+    assert [h.source for h in hits] == ["build.sh"]
+    assert 0.0 < hits[0].score <= 1.0 and 0.0 < hits[0].metadata["fused_score"] < 0.1
+
+
+def test_search_defaults_to_the_backend_calibrated_threshold(tmp_path):
+    rag = _local_rag(tmp_path, rag_hybrid=False)
+    rag.ingest_documents([("build.sh", "cmake -B build -DGGML_NEON=ON -DCMAKE_BUILD_TYPE=Release", {})])
+    assert rag.default_score_threshold == rag.backend.score_threshold < 0.65
+
+    # Dense-only: the legacy 0.65 drops the hashing backend's exact match, the calibrated cut-off keeps it
+    assert rag.search("enable -DGGML_NEON=ON in cmake", score_threshold=0.65) == []
+    assert [h.source for h in rag.search("enable -DGGML_NEON=ON in cmake")] == ["build.sh"]
+    rag.config["rag_score_threshold"] = 0.99
+    assert rag.default_score_threshold == 0.99
+
+
+class StubReranker:
+    """Cross-encoder stand-in: scores chunks by whether they mention 'rknn'."""
+    def __init__(self):
+        self.calls = []
+
+    def rerank(self, query, texts):
+        self.calls.append((query, list(texts)))
+        return [5.0 if "rknn" in t else -1.0 for t in texts]
+
+
+def test_hybrid_search_reranks_pool_and_keeps_cosine(tmp_path):
+    rag = _local_rag(tmp_path)
+    rag.ingest_documents([
+        ("build.sh", "flash the board with the cmake toolchain build", {}),
+        ("README.md", "flash the board with the rknn toolkit", {}),
+    ])
+    stub = StubReranker()
+    rag._reranker = stub
+
+    hits = rag.search("flash the board", limit=2, score_threshold=0.0)
+    assert len(stub.calls) == 1 and stub.calls[0][0] == "flash the board"
+    assert [h.source for h in hits] == ["README.md", "build.sh"]
+    # Result score stays the cosine/BM25 value, the reranker score is the fused one
+    assert all(0.0 < h.score <= 1.0 for h in hits)
+    assert hits[0].metadata["fused_score"] == 5.0 and hits[1].metadata["fused_score"] == -1.0